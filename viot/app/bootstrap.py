@@ -9,6 +9,24 @@ from app.common.exception.handler import register_exception_handlers
 from app.common.fastapi import JSONResponse, setup_openapi
 from app.config import app_settings
 from app.extension.redis.client import RedisClient
+from app.module.auth.repository.permission_scope_cache_repository import (
+    PermissionScopeCacheRepository,
+)
+from app.module.auth.repository.principal_cache_repository import PrincipalCacheRepository
+from app.module.device.service.device_credential_service import DeviceCredentialService
+from app.module.device.service.gateway_service import GatewayService
+from app.module.device_data.service.connect_log_ingestion_service import (
+    ConnectLogIngestionService,
+)
+from app.module.device_data.service.device_data_ingestion_service import (
+    DeviceDataIngestionService,
+)
+from app.module.device_data.service.device_data_storage_service import DeviceDataStorageService
+from app.module.device_data.service.device_data_stream_service import DeviceDataStreamService
+from app.module.emqx.client import EmqxApiClient
+from app.module.rule_action.service.emqx_rule_outbox_service import EmqxRuleOutboxService
+from app.module.rule_action.service.emqx_rule_reconcile_service import EmqxRuleReconcileService
+from app.module.rule_action.service.rule_trigger_service import RuleTriggerService
 
 from . import __version__
 
@@ -17,9 +35,43 @@ from . import __version__
 async def _lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     redis_client = injector.get(RedisClient)
     await redis_client.open()
+    principal_cache_repository = injector.get(PrincipalCacheRepository)
+    await principal_cache_repository.start()
+    permission_scope_cache_repository = injector.get(PermissionScopeCacheRepository)
+    await permission_scope_cache_repository.start()
+    device_credential_service = injector.get(DeviceCredentialService)
+    await device_credential_service.start()
+    gateway_service = injector.get(GatewayService)
+    await gateway_service.start()
+    device_data_ingestion_service = injector.get(DeviceDataIngestionService)
+    await device_data_ingestion_service.start()
+    connect_log_ingestion_service = injector.get(ConnectLogIngestionService)
+    await connect_log_ingestion_service.start()
+    device_data_storage_service = injector.get(DeviceDataStorageService)
+    await device_data_storage_service.start()
+    emqx_api_client = injector.get(EmqxApiClient)
+    await emqx_api_client.open()
+    rule_trigger_service = injector.get(RuleTriggerService)
+    await rule_trigger_service.start()
+    emqx_rule_outbox_service = injector.get(EmqxRuleOutboxService)
+    await emqx_rule_outbox_service.start()
+    emqx_rule_reconcile_service = injector.get(EmqxRuleReconcileService)
+    await emqx_rule_reconcile_service.start()
 
     yield
 
+    await emqx_rule_reconcile_service.stop()
+    await emqx_rule_outbox_service.stop()
+    await rule_trigger_service.stop()
+    await emqx_api_client.close()
+    await device_data_storage_service.stop()
+    await device_data_ingestion_service.stop()
+    await connect_log_ingestion_service.stop()
+    await injector.get(DeviceDataStreamService).stop()
+    await gateway_service.stop()
+    await device_credential_service.stop()
+    await permission_scope_cache_repository.stop()
+    await principal_cache_repository.stop()
     await redis_client.close()
 
 
@@ -50,6 +102,7 @@ def setup_modules() -> None:
     """
     from app.celery_worker.module import CeleryWorkerModule
     from app.database.module import DatabaseModule
+    from app.extension.notification.module import NotificationModule
     from app.extension.redis.module import RedisModule
     from app.module.auth.module import AuthModule
     from app.module.device.module import DeviceModule
@@ -62,6 +115,7 @@ def setup_modules() -> None:
     injector.binder.install(DatabaseModule)
     injector.binder.install(RedisModule)
     injector.binder.install(CeleryWorkerModule)
+    injector.binder.install(NotificationModule)
     injector.binder.install(EmailModule)
 
     injector.binder.install(AuthModule)
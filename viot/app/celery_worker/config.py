@@ -18,6 +18,13 @@ class CelerySettings(BaseSettings):
     BACKEND_REDIS_PREFIX: str = "viot:celery"
     BACKEND_REDIS_TIMEOUT: float = 5.0
 
+    EMAIL_BATCH_SIZE: int = 100
+    """Emails handed to a single batched send task."""
+    EMAIL_MAX_RETRIES: int = 3
+    """A batched send task is retried this many times with the emails that failed."""
+    EMAIL_RETRY_BACKOFF_SEC: float = 30
+    """Delay before retrying a batched send task, doubled on every retry."""
+
     TASK_PACKAGES: list[str] = [
         "app.celery_worker.tasks.email",
     ]
@@ -1,27 +1,41 @@
+from typing import Any, NoReturn
+
+from celery import Task
+
 from app.extension.email.enums import TemplateType
-from app.extension.email.utils import get_template, render, send
+from app.extension.email.utils import get_template, render, send, send_many, subject_map
 
 from ..celery import celery_app
+from ..config import celery_settings
 from .enums import EmailTaskType
 
 
+def _retry(task: "Task[Any, Any]", kwargs: dict[str, Any]) -> NoReturn:
+    """Retry a batched send task with `kwargs`, holding the messages that failed."""
+    raise task.retry(
+        args=(),
+        kwargs=kwargs,
+        countdown=celery_settings.EMAIL_RETRY_BACKOFF_SEC * 2**task.request.retries,
+    )
+
+
 @celery_app.task(name=EmailTaskType.VERIFY_ACCOUNT)
 def send_verify_account_email(email: str, name: str, verify_url: str) -> None:
     template = get_template(TemplateType.VERIFY_ACCOUNT)
     html_content = render(template=template, ctx={"name": name, "url": verify_url})
-    send(to=email, subject="Verify your account", html_content=html_content)
+    send(to=email, subject=subject_map[TemplateType.VERIFY_ACCOUNT], html_content=html_content)
 
 
 @celery_app.task(name=EmailTaskType.RESET_PASSWORD)
-def send_reset_password_email(email: str, name: str, ui_link: str) -> None:
+def send_reset_password_email(email: str, name: str, link: str) -> None:
     template = get_template(TemplateType.RESET_PASSWORD)
-    html_content = render(template=template, ctx={"name": name, "link": ui_link})
-    send(to=email, subject="Reset your password", html_content=html_content)
+    html_content = render(template=template, ctx={"name": name, "link": link})
+    send(to=email, subject=subject_map[TemplateType.RESET_PASSWORD], html_content=html_content)
 
 
 @celery_app.task(name=EmailTaskType.TEAM_INVITATION)
 def send_team_invitation_email(
-    email: str, name: str, invitor_name: str, team_name: str, ui_link: str
+    email: str, name: str, invitor_name: str, team_name: str, link: str
 ) -> None:
     template = get_template(TemplateType.TEAM_INVITATION)
     html_content = render(
@@ -30,7 +44,28 @@ def send_team_invitation_email(
             "name": name,
             "invitor_name": invitor_name,
             "team_name": team_name,
-            "link": ui_link,
+            "link": link,
         },
     )
-    send(to=email, subject="You are invited to a team", html_content=html_content)
+    send(to=email, subject=subject_map[TemplateType.TEAM_INVITATION], html_content=html_content)
+
+
+@celery_app.task(
+    name=EmailTaskType.RULE_ALERT, bind=True, max_retries=celery_settings.EMAIL_MAX_RETRIES
+)
+def send_rule_alert_emails(self: "Task[Any, Any]", alerts: list[dict[str, Any]]) -> None:
+    failed = send_many(TemplateType.RULE_ALERT, alerts)
+    if failed:
+        _retry(self, {"alerts": failed})
+
+
+@celery_app.task(name=EmailTaskType.BATCH, bind=True, max_retries=celery_settings.EMAIL_MAX_RETRIES)
+def send_email_batch(self: "Task[Any, Any]", template: str, messages: list[dict[str, Any]]) -> None:
+    """
+    Send a group of emails of one template over the worker's SMTP connection. Each
+    message holds the recipient (`email`) and the context of the template. The
+    task is retried with the messages that failed to send.
+    """
+    failed = send_many(TemplateType[template], messages)
+    if failed:
+        _retry(self, {"template": template, "messages": failed})
@@ -5,3 +5,5 @@ class EmailTaskType(StrEnum):
     VERIFY_ACCOUNT = "send_verify_account_email"
     RESET_PASSWORD = "send_reset_password_email"
     TEAM_INVITATION = "send_team_invitation_email"
+    RULE_ALERT = "send_rule_alert_emails"
+    BATCH = "send_email_batch"
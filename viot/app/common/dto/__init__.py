@@ -1,16 +1,28 @@
 from .base import BaseInDto, BaseOutDto, ErrorDto
-from .paging import PagingDto
-from .types import NameStr, NameWithNumberStr, PageQuery, PageSizeQuery, QueryStr, TeamSlug
+from .paging import CursorPagingDto, PagingDto
+from .types import (
+    CursorQuery,
+    NameStr,
+    NameWithNumberStr,
+    PageQuery,
+    PageSizeQuery,
+    QueryStr,
+    TeamSlug,
+    WithTotalQuery,
+)
 
 __all__ = [
     "BaseInDto",
     "BaseOutDto",
     "ErrorDto",
     "PagingDto",
+    "CursorPagingDto",
     "NameStr",
     "NameWithNumberStr",
     "TeamSlug",
     "QueryStr",
     "PageQuery",
     "PageSizeQuery",
+    "CursorQuery",
+    "WithTotalQuery",
 ]
@@ -15,6 +15,8 @@ class PagingDto(BaseOutDto, Generic[T]):
     total_items: int
     page: int
     page_size: int
+    approximate: bool = False
+    """Whether `total_items` is an estimate"""
 
     @computed_field  # type: ignore
     @property
@@ -30,3 +32,19 @@ class PagingDto(BaseOutDto, Generic[T]):
     @property
     def has_previous_page(self) -> bool:
         return self.page > 1
+
+
+class CursorPagingDto(BaseOutDto, Generic[T]):
+    """Cursor paging DTO"""
+
+    items: list[T]
+    page_size: int
+    next_cursor: str | None
+    total_items: int | None = None
+    approximate: bool = False
+    """Whether `total_items` is an estimate"""
+
+    @computed_field  # type: ignore
+    @property
+    def has_next_page(self) -> bool:
+        return self.next_cursor is not None
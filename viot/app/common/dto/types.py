@@ -36,6 +36,19 @@ PageSizeQuery = Annotated[
     Query(ge=1, le=50, alias="pageSize", description="Maximum amount of entities in one page"),
 ]
 
+CursorQuery = Annotated[
+    str | None,
+    Query(
+        alias="after",
+        description="Cursor of the page to fetch, `nextCursor` of the previous page."
+        " Omit to fetch the first page.",
+    ),
+]
+WithTotalQuery = Annotated[
+    bool,
+    Query(alias="withTotal", description="Also count the total number of items."),
+]
+
 # Sorting
 OrderByQuery = Annotated[
     SortDirection,
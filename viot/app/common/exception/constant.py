@@ -12,6 +12,7 @@ class MessageError:
     CONFLICT = "CONFLICT"
     TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
     VALIDATION_ERROR = "VALIDATION_ERROR"
+    INVALID_CURSOR = "INVALID_CURSOR"
 
 
 class MessageErrorExample:
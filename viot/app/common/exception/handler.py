@@ -9,6 +9,7 @@ from app.common.exception.base import InternalServerException
 from app.common.exception.constant import MessageError
 from app.common.fastapi.serializer import JSONResponse
 from app.config import app_settings
+from app.database.repository.pagination import InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,19 @@ def register_exception_handlers(app: FastAPI) -> None:
             ),
         )
 
+    @app.exception_handler(InvalidCursorError)
+    async def handle_invalid_cursor_error(  # type: ignore
+        request: Request, exc: InvalidCursorError
+    ) -> JSONResponse[ErrorDto]:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=ErrorDto(
+                status=status.HTTP_400_BAD_REQUEST,
+                error_code=MessageError.INVALID_CURSOR,
+                message=str(exc),
+            ),
+        )
+
     @app.exception_handler(InternalServerException)
     async def handle_viot_http_exception(  # type: ignore
         request: Request, exc: InternalServerException
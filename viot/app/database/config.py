@@ -16,6 +16,12 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    COUNT_ESTIMATE_THRESHOLD: int = 100_000
+    """The `estimate` count strategy trusts planner estimates from this many rows up."""
+    COUNT_CACHE_TTL_SEC: int = 300
+    """Counts of the `cached` strategy live at most this long, for writes that bypass
+    `CrudRepository.save/delete`."""
+
     @computed_field  # type: ignore
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
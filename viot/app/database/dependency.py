@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .context import session_ctx
 from .engine import async_engine
+from .session import run_after_commit_callbacks
 
 
 async def get_session() -> AsyncGenerator[None, None]:
@@ -39,6 +40,7 @@ async def get_session() -> AsyncGenerator[None, None]:
                 yield
         finally:
             session_ctx.reset(token)
+        await run_after_commit_callbacks(session)
 
 
 DependSession = Depends(get_session)
@@ -1,12 +1,16 @@
 from contextvars import ContextVar
 
-from injector import Module, provider
+from injector import Binder, Module, SingletonScope, provider
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .context import session_ctx
+from .repository.count import CountCache
 
 
 class DatabaseModule(Module):
+    def configure(self, binder: Binder) -> None:
+        binder.bind(CountCache, to=CountCache, scope=SingletonScope)
+
     # def configure(self, binder: Binder) -> None:
     # binder.bind(ContextVar[AsyncSession], session_ctx, SingletonScope)
     # Error: raise UnknownProvider('couldn\'t determine provider for %r to %r' % (interface, to))
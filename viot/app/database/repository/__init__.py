@@ -1,12 +1,26 @@
+from .count import CountCache, CountResult, CountStrategy
 from .crud import AsyncSqlalchemyRepository, CrudRepository, ICrudRepository
-from .pagination import Filter, Page, Pageable, PageableRepository, Sort
+from .pagination import (
+    CursorPage,
+    Filter,
+    KeysetPageable,
+    Page,
+    Pageable,
+    PageableRepository,
+    Sort,
+)
 
 __all__ = [
     "AsyncSqlalchemyRepository",
+    "CountCache",
+    "CountResult",
+    "CountStrategy",
     "CrudRepository",
     "ICrudRepository",
     "PageableRepository",
+    "CursorPage",
     "Filter",
+    "KeysetPageable",
     "Page",
     "Pageable",
     "Sort",
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+from collections.abc import Iterable, Sequence
+from typing import Any, Literal, NamedTuple
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+from sqlalchemy import Select, Table, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.util import find_tables
+
+from app.extension.redis.client import RedisClient
+
+from ..config import db_settings
+
+logger = logging.getLogger(__name__)
+
+CountStrategy = Literal["exact", "estimate", "cached"]
+"""
+How paginated listings count their total.
+
+- `exact`: `count(*)` over the filtered query.
+- `estimate`: the planner's row estimate (`EXPLAIN`), when it is at least
+  `COUNT_ESTIMATE_THRESHOLD`. Smaller results are counted exactly.
+- `cached`: an exact count cached in Redis until a table it reads is written
+  through `CrudRepository.save/delete`, or `COUNT_CACHE_TTL_SEC` at most.
+"""
+
+_dialect = postgresql.dialect()
+
+
+class CountResult(NamedTuple):
+    total: int
+    approximate: bool = False
+
+
+class CountCache:
+    """
+    Redis cache of exact row counts.
+
+    Every table has a version counter that `invalidate` bumps. A cached count keeps
+    the versions of the tables it was computed from and is only served while they
+    are unchanged, so a write does not need to know which counts it affects.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._ttl = db_settings.COUNT_CACHE_TTL_SEC
+
+    async def get(self, key: str, tables: Sequence[str]) -> tuple[int | None, str | None]:
+        """
+        Return the cached count, if still valid, and the current versions of
+        `tables` to store a fresh count with. Both are `None` if Redis is down.
+        """
+        try:
+            cached, *versions = await self._redis_client.mget(
+                [f"count:{key}", *(f"count_version:{table}" for table in tables)]
+            )
+        except RedisError as e:
+            logger.warning(f"Error while reading count cache: {e}")
+            return None, None
+
+        stamp = ",".join(version or "0" for version in versions)
+        if cached is not None:
+            cached_stamp, _, total = cached.rpartition(":")
+            if cached_stamp == stamp:
+                return int(total), stamp
+        return None, stamp
+
+    async def set(self, key: str, stamp: str, total: int) -> None:
+        try:
+            await self._redis_client.set(f"count:{key}", f"{stamp}:{total}", ex=self._ttl)
+        except RedisError as e:
+            logger.warning(f"Error while writing count cache: {e}")
+
+    async def invalidate(self, tables: Iterable[str]) -> None:
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                for table in tables:
+                    pipe.incr(f"count_version:{table}")
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Error while invalidating count cache: {e}")
+
+
+def _compile(stmt: Select[Any]) -> str:
+    return str(stmt.compile(dialect=_dialect, compile_kwargs={"literal_binds": True}))
+
+
+async def count_rows(
+    session: AsyncSession,
+    stmt: Select[Any],
+    strategy: CountStrategy,
+    count_cache: CountCache,
+) -> CountResult:
+    """Count the rows `stmt` returns, ignoring its ordering and limits."""
+    stmt = stmt.order_by(None).limit(None).offset(None)
+    count_stmt = select(func.count()).select_from(stmt.subquery())
+
+    if strategy == "estimate":
+        plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {_compile(stmt)}"))).scalar_one()
+        if isinstance(plan, str | bytes):
+            plan = msgspec.json.decode(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate >= db_settings.COUNT_ESTIMATE_THRESHOLD:
+            return CountResult(estimate, approximate=True)
+
+    elif strategy == "cached":
+        key = hashlib.sha1(_compile(count_stmt).encode()).hexdigest()
+        tables = sorted(
+            {t.name for t in find_tables(stmt, include_joins=True) if isinstance(t, Table)}
+        )
+        cached, stamp = await count_cache.get(key, tables)
+        if cached is not None:
+            return CountResult(cached)
+        total = (await session.execute(count_stmt)).scalar_one()
+        if stamp is not None:
+            await count_cache.set(key, stamp, total)
+        return CountResult(total)
+
+    return CountResult((await session.execute(count_stmt)).scalar_one())
@@ -1,13 +1,18 @@
 from abc import ABC, abstractmethod
 from collections.abc import Iterable, Sequence
 from contextvars import ContextVar
+from functools import partial
 from typing import Any, Generic, TypeVar, get_args
 
 from injector import inject
-from sqlalchemy import delete, select
+from sqlalchemy import Select, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import class_mapper
 
 from app.database.base import Base
+from app.database.session import after_commit
+
+from .count import CountCache, CountResult, CountStrategy, count_rows
 
 TModel = TypeVar("TModel")
 TPrimaryKey = TypeVar("TPrimaryKey")
@@ -50,6 +55,9 @@ class CrudRepository(AsyncSqlalchemyRepository, ICrudRepository[TBaseModel, TPri
 
     To use this repository, you need to provide the model type and the primary key type.
 
+    `save` and `delete` invalidate the cached counts (see `CountStrategy`) of the
+    tables of the model once the transaction commits.
+
     Example:
     ```python
     class UserRepository(CrudRepository[Product, int]):
@@ -64,6 +72,11 @@ class CrudRepository(AsyncSqlalchemyRepository, ICrudRepository[TBaseModel, TPri
             cls._model = get_args(cls.__orig_bases__[0])[0]
         return super().__new__(cls)  # type: ignore
 
+    @inject
+    def __init__(self, session_ctx: ContextVar[AsyncSession], count_cache: CountCache) -> None:
+        super().__init__(session_ctx)
+        self._count_cache = count_cache
+
     async def find(self, id: TPrimaryKey) -> TBaseModel | None:
         return await self.session.get(self._model, id, populate_existing=True)
 
@@ -73,12 +86,29 @@ class CrudRepository(AsyncSqlalchemyRepository, ICrudRepository[TBaseModel, TPri
     async def save(self, obj: TBaseModel) -> TBaseModel:
         self.session.add(obj)
         await self.session.flush()
+        await self._invalidate_counts(type(obj))
         return obj
 
     async def delete(self, obj: TBaseModel) -> None:
         await self.session.delete(obj)
         await self.session.flush()
+        await self._invalidate_counts(type(obj))
 
     async def delete_by_id(self, id: TPrimaryKey) -> None:
         stmt = delete(self._model).where(self._model.id == id)
         await self.session.execute(stmt)
+        await self._invalidate_counts(self._model)
+
+    async def count(self, stmt: Select[Any], strategy: CountStrategy = "exact") -> CountResult:
+        """Count the rows `stmt` returns, ignoring its ordering and limits."""
+        return await count_rows(self.session, stmt, strategy, self._count_cache)
+
+    async def _invalidate_counts(self, *models: type[Base]) -> None:
+        """
+        Call after bulk statements on `models`, which bypass `save` and `delete`.
+
+        The versions are bumped after the commit: bumped earlier, a concurrent count
+        could still read the old rows and cache them under the new versions.
+        """
+        tables = [table.name for model in models for table in class_mapper(model).tables]
+        await after_commit(partial(self._count_cache.invalidate, tables))
@@ -1,13 +1,15 @@
+import base64
 from collections.abc import Sequence
 from typing import Any, Generic, Literal, TypeVar
 
 import msgspec
-from sqlalchemy import Column, ColumnElement, and_, func, select
-from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy import Column, ColumnElement, and_, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, class_mapper
 from sqlalchemy.sql import Select, asc, desc
 
 from app.database.repository.crud import CrudRepository
 
+from .count import CountStrategy
 from .crud import TBaseModel, TModel, TPrimaryKey
 
 SortDirection = Literal["asc", "desc"]
@@ -97,11 +99,13 @@ class Pageable:
         page_size: int = 20,
         sorts: list[Sort] | None = None,
         filters: list[Filter] | None = None,
+        count_strategy: CountStrategy = "exact",
     ) -> None:
         self.page = max(1, page)
         self.page_size = max(1, min(10, page_size))
         self.sorts = sorts or []
         self.filters = filters or []
+        self.count_strategy = count_strategy
 
     def apply(self, query: Select[TSelect], model: type[TModel]) -> Select[TSelect]:
         # Apply filters
@@ -117,11 +121,105 @@ class Pageable:
         return query.offset((self.page - 1) * self.page_size).limit(self.page_size)
 
 
+class InvalidCursorError(ValueError):
+    """Raised for a cursor that was not issued by `encode_cursor` for the same columns."""
+
+    def __init__(self) -> None:
+        super().__init__("Invalid pagination cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(msgspec.json.encode(values)).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute[Any]]) -> list[Any]:
+    """Decode a cursor back to the values of `columns`, converted to their Python type."""
+    try:
+        values = msgspec.json.decode(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursorError
+        return [
+            msgspec.convert(value, column.type.python_type, strict=False)
+            for value, column in zip(values, columns, strict=True)
+        ]
+    except (ValueError, msgspec.DecodeError):
+        # ValueError covers binascii.Error and non-ASCII cursors
+        raise InvalidCursorError
+
+
+class KeysetPageable:
+    """
+    Cursor based paging.
+
+    Rows are ordered by `sorts` followed by the primary key of the model, so the
+    order is total, and a page starts right after the row encoded in `after`.
+    Fetching any page costs the same as the first one, given an index over the
+    filtered and sorted columns. All sorts share one direction, so the position
+    is a single row-value comparison.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 20,
+        sorts: list[Sort] | None = None,
+        filters: list[Filter] | None = None,
+        after: str | None = None,
+        with_total: bool = False,
+        count_strategy: CountStrategy = "exact",
+    ) -> None:
+        self.page_size = max(1, min(10, page_size))
+        self.sorts = sorts or []
+        self.filters = filters or []
+        self.after = after
+        self.with_total = with_total
+        self.count_strategy = count_strategy
+
+        directions = {sort.direction for sort in self.sorts}
+        if len(directions) > 1:
+            raise ValueError("Keyset paging requires every sort in the same direction")
+        self.direction: SortDirection = directions.pop() if directions else "asc"
+
+    def key_columns(self, model: type[TModel]) -> list[InstrumentedAttribute[Any]]:
+        columns: list[InstrumentedAttribute[Any]] = [
+            getattr(model, sort.field) if isinstance(sort.field, str) else sort.field
+            for sort in self.sorts
+        ]
+        mapper = class_mapper(model)
+        for primary_key in mapper.primary_key:
+            column = getattr(model, mapper.get_property_by_column(primary_key).key)
+            if not any(column is c for c in columns):
+                columns.append(column)
+        return columns
+
+    def apply(self, query: Select[TSelect], model: type[TModel]) -> Select[TSelect]:
+        if self.filters:
+            query = query.where(and_(*[filter.apply(model) for filter in self.filters]))
+
+        columns = self.key_columns(model)
+        if self.after is not None:
+            position = tuple_(*columns)
+            values = tuple_(*decode_cursor(self.after, columns))
+            query = query.where(position > values if self.direction == "asc" else position < values)
+
+        order_func = asc if self.direction == "asc" else desc
+        # One extra row tells whether there is a next page.
+        return query.order_by(*[order_func(c) for c in columns]).limit(self.page_size + 1)
+
+
 class Page(msgspec.Struct, Generic[TModel]):
     items: Sequence[TModel]
     total_items: int
     page: int
     page_size: int
+    approximate: bool = False
+
+
+class CursorPage(msgspec.Struct, Generic[TModel]):
+    items: Sequence[TModel]
+    page_size: int
+    next_cursor: str | None
+    total_items: int | None = None
+    approximate: bool = False
 
 
 class PageableRepository(CrudRepository[TBaseModel, TPrimaryKey]):
@@ -134,19 +232,48 @@ class PageableRepository(CrudRepository[TBaseModel, TPrimaryKey]):
         # Apply filters, sorting, and pagination
         query = pageable.apply(base_query, self._model)
 
-        # Count query (apply only filters)
-        count_query = select(func.count()).select_from(
-            pageable.apply(base_query, self._model).order_by(None).limit(None).subquery()
-        )
-
         # Execute queries
         result = await self.session.execute(query)
         if use_unique:
             items = result.unique().scalars().all()
         else:
             items = result.scalars().all()
-        total_items = (await self.session.execute(count_query)).scalar_one()
+        total = await self.count(query, pageable.count_strategy)
 
         return Page(
-            items=items, total_items=total_items, page=pageable.page, page_size=pageable.page_size
+            items=items,
+            total_items=total.total,
+            page=pageable.page,
+            page_size=pageable.page_size,
+            approximate=total.approximate,
+        )
+
+    async def find_all_with_cursor(
+        self, pageable: KeysetPageable, use_unique: bool = False
+    ) -> CursorPage[TBaseModel]:
+        result = await self.session.execute(pageable.apply(select(self._model), self._model))
+        items = result.unique().scalars().all() if use_unique else result.scalars().all()
+
+        next_cursor = None
+        if len(items) > pageable.page_size:
+            items = items[: pageable.page_size]
+            next_cursor = encode_cursor(
+                [getattr(items[-1], c.key) for c in pageable.key_columns(self._model)]
+            )
+
+        total_items, approximate = None, False
+        if pageable.with_total:
+            count_query = select(self._model)
+            if pageable.filters:
+                count_query = count_query.where(
+                    and_(*[filter.apply(self._model) for filter in pageable.filters])
+                )
+            total_items, approximate = await self.count(count_query, pageable.count_strategy)
+
+        return CursorPage(
+            items=items,
+            page_size=pageable.page_size,
+            next_cursor=next_cursor,
+            total_items=total_items,
+            approximate=approximate,
         )
@@ -0,0 +1,56 @@
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .context import session_ctx
+from .engine import async_engine
+
+_AFTER_COMMIT = "after_commit"
+
+
+async def after_commit(callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run `callback` once the transaction of the current session is committed, or
+    right away if there is no session in the context.
+
+    Use it for side effects that must not be observed before the changes they
+    follow, e.g. evicting a cache that a concurrent request could otherwise refill
+    with the data of the uncommitted transaction. Callbacks are dropped on rollback.
+    """
+    session = session_ctx.get(None)
+    if session is None:
+        await callback()
+        return
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def run_after_commit_callbacks(session: AsyncSession) -> None:
+    """Run the callbacks registered with `after_commit`, once the session committed."""
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        await callback()
+
+
+@asynccontextmanager
+async def transactional_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a new session bound to the repository context for work running outside
+    of a request scope (background tasks, streaming responses, websockets).
+
+    The transaction is committed when the block exits normally and rolled back
+    otherwise.
+
+    **Example Usage:**
+    ```python
+    async with transactional_session():
+        await device_data_repository.copy_batch(batch)
+    ```
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False, autoflush=False) as session:
+        token = session_ctx.set(session)
+        try:
+            async with session.begin():
+                yield session
+        finally:
+            session_ctx.reset(token)
+        await run_after_commit_callbacks(session)
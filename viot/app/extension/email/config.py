@@ -14,6 +14,8 @@ class EmailSettings(BaseSettings):
     SMTP_SSL: bool = False
     SMTP_USER: str
     SMTP_PASSWORD: str
+    SMTP_TIMEOUT_SEC: float = 10.0
+    """Timeout of the SMTP connection and of each command on it."""
 
 
 @lru_cache
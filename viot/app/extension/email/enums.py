@@ -5,3 +5,4 @@ class TemplateType(Enum):
     VERIFY_ACCOUNT = auto()
     RESET_PASSWORD = auto()
     TEAM_INVITATION = auto()
+    RULE_ALERT = auto()
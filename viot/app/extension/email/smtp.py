@@ -0,0 +1,72 @@
+import logging
+import smtplib
+from email.message import EmailMessage
+
+from .config import email_settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection is reopened and the message sent again
+_RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def build_message(*, to: str, subject: str, html_content: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = email_settings.SMTP_USER
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(html_content, subtype="html")
+    return message
+
+
+class SmtpClient:
+    """
+    A single authenticated SMTP connection, opened on first use and kept open
+    across messages, so a batch costs one handshake and login instead of one per
+    message.
+
+    When the server dropped the connection (idle timeout, per-connection message
+    limit, network error), it is reopened and the message sent once more.
+    """
+
+    def __init__(self) -> None:
+        self._smtp: smtplib.SMTP | None = None
+
+    def send(self, *, to: str, subject: str, html_content: str) -> None:
+        message = build_message(to=to, subject=subject, html_content=html_content)
+        try:
+            self._connect().send_message(message)
+        except _RECONNECT_ERRORS as e:
+            logger.warning(f"SMTP connection lost ({e!r}), reconnecting")
+            self.close()
+            self._connect().send_message(message)
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+    def _connect(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp: smtplib.SMTP
+            if email_settings.SMTP_SSL:
+                smtp = smtplib.SMTP_SSL(
+                    email_settings.SMTP_HOST,
+                    email_settings.SMTP_PORT,
+                    timeout=email_settings.SMTP_TIMEOUT_SEC,
+                )
+            else:
+                smtp = smtplib.SMTP(
+                    email_settings.SMTP_HOST,
+                    email_settings.SMTP_PORT,
+                    timeout=email_settings.SMTP_TIMEOUT_SEC,
+                )
+                if email_settings.SMTP_TLS:
+                    smtp.starttls()
+            smtp.login(email_settings.SMTP_USER, email_settings.SMTP_PASSWORD)
+            self._smtp = smtp
+        return self._smtp
@@ -1,43 +1,55 @@
 import logging
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
-import yagmail  # type: ignore
 from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
-from .config import email_settings
 from .enums import TemplateType
 from .exceptions import TemplateNotFoundException
+from .smtp import SmtpClient
 
 logger = logging.getLogger(__name__)
 
 
-_yagmail = yagmail.SMTP(
-    host=email_settings.SMTP_HOST,
-    port=email_settings.SMTP_PORT,
-    smtp_starttls=email_settings.SMTP_TLS,
-    smtp_ssl=email_settings.SMTP_SSL,
-    user=email_settings.SMTP_USER,
-    password=email_settings.SMTP_PASSWORD,
-)
+# One connection per worker process, reused by every task it runs
+_smtp_client = SmtpClient()
 _template_dir = Path(__file__).parent / "templates" / "html"
-_env = Environment(loader=FileSystemLoader(_template_dir), autoescape=select_autoescape(["html"]))
+# Templates never change at runtime, skip the freshness check on every lookup
+_env = Environment(
+    loader=FileSystemLoader(_template_dir),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+_templates: dict[TemplateType, Template] = {}
 
 
 template_map: dict[TemplateType, str] = {
     TemplateType.VERIFY_ACCOUNT: "verify-account.html",
     TemplateType.RESET_PASSWORD: "reset-password.html",
     TemplateType.TEAM_INVITATION: "team-invite-member.html",
+    TemplateType.RULE_ALERT: "rule-alert.html",
+}
+
+# Formatted with the context of the template
+subject_map: dict[TemplateType, str] = {
+    TemplateType.VERIFY_ACCOUNT: "Verify your account",
+    TemplateType.RESET_PASSWORD: "Reset your password",
+    TemplateType.TEAM_INVITATION: "You are invited to a team",
+    TemplateType.RULE_ALERT: "Rule {rule_name} triggered",
 }
 
 
 def get_template(message_type: TemplateType) -> Template:
-    """Get the Jinja2 template for the given message type."""
-    template_key = template_map.get(message_type, "")
-    try:
-        template = _env.get_template(template_key)
-    except Exception:
-        raise TemplateNotFoundException(f"Template not found for message type: {message_type}")
+    """Get the Jinja2 template for the given message type, compiled once per process."""
+    template = _templates.get(message_type)
+    if template is None:
+        template_key = template_map.get(message_type, "")
+        try:
+            template = _env.get_template(template_key)
+        except Exception:
+            raise TemplateNotFoundException(f"Template not found for message type: {message_type}")
+        _templates[message_type] = template
     return template
 
 
@@ -47,5 +59,37 @@ def render(*, template: Template, ctx: dict[str, Any]) -> str:
 
 
 def send(*, to: str, subject: str, html_content: str) -> None:
-    _yagmail.send(to=to, subject=subject, contents=[html_content])  # type: ignore
+    _smtp_client.send(to=to, subject=subject, html_content=html_content)
     logger.info(f"Email sent to {to}")
+
+
+def send_many(
+    template_type: TemplateType, messages: Iterable[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Render and send messages of one template over the shared connection. Each
+    message holds the recipient (`email`) and the context of the template.
+
+    A message that can not be rendered is logged and dropped, it would fail the same
+    way on a retry. A message that fails to send does not abort the batch either.
+
+    Returns:
+        list[dict[str, Any]]: The messages that failed to send.
+    """
+    template = get_template(template_type)
+    subject = subject_map[template_type]
+    failed: list[dict[str, Any]] = []
+    for message in messages:
+        try:
+            to = message["email"]
+            html_content = render(template=template, ctx=message)
+            formatted_subject = subject.format(**message)
+        except Exception as e:
+            logger.error(f"Dropped {template_type.name} email with invalid context: {e!r}")
+            continue
+        try:
+            send(to=to, subject=formatted_subject, html_content=html_content)
+        except Exception as e:
+            logger.error(f"Error while sending email to {to}: {e!r}")
+            failed.append(message)
+    return failed
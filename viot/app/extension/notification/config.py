@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class NotificationSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="VIOT_NOTIFICATION_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    EMAIL_BACKEND: Literal["celery", "stream"] = "celery"
+    """
+    Where `IEmailService` hands emails to: the Celery worker, or the Redis stream
+    consumed by the asyncio worker (`python -m app.notification_worker`). The stream
+    lives on the Redis server of `RedisSettings`.
+    """
+
+    STREAM: str = "viot:notifications"
+    STREAM_MAXLEN: int = 100_000
+    """Approximate length the stream is trimmed to on every write."""
+    GROUP: str = "viot-notification-workers"
+    DEAD_LETTER_STREAM: str = "viot:notifications:dead"
+    """Notifications still failing after `MAX_ATTEMPTS` are moved there."""
+
+    READ_COUNT: int = 100
+    """Messages read from the stream at once."""
+    READ_BLOCK_MS: int = 5000
+    CONCURRENCY: int = 200
+    """Notifications a worker process delivers at once."""
+    MAX_ATTEMPTS: int = 5
+    RETRY_BACKOFF_SEC: float = 5.0
+    """Delay before a failed notification is delivered again, doubled on each attempt."""
+    MAX_RETRY_BACKOFF_SEC: float = 120.0
+    """Kept under `CLAIM_IDLE_SEC`, or a waiting retry is taken over by another worker."""
+    CLAIM_IDLE_SEC: int = 300
+    """Messages of a dead consumer left unacknowledged this long are taken over."""
+    CLAIM_INTERVAL_SEC: int = 60
+
+    SMTP_POOL_SIZE: int = 5
+    """SMTP connections a worker process keeps open, most servers cap them per client."""
+
+    WEBHOOK_MAX_CONNECTIONS: int = 100
+    WEBHOOK_TIMEOUT_SEC: float = 10.0
+
+
+@lru_cache
+def get_notification_settings() -> NotificationSettings:
+    return NotificationSettings()
+
+
+notification_settings = get_notification_settings()
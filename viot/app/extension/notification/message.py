@@ -0,0 +1,24 @@
+from typing import Any
+
+import msgspec
+
+
+class EmailNotification(msgspec.Struct, tag="email"):
+    template: str
+    """Name of a `TemplateType`."""
+    to: str
+    ctx: dict[str, Any]
+    """Context of the template, also used to format the subject."""
+
+
+class WebhookNotification(msgspec.Struct, tag="webhook"):
+    url: str
+    method: str = "POST"
+    headers: dict[str, str] = msgspec.field(default_factory=dict)
+    payload: Any = None
+
+
+Notification = EmailNotification | WebhookNotification
+
+encoder = msgspec.json.Encoder()
+decoder = msgspec.json.Decoder(Notification)
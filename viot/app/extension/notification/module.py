@@ -0,0 +1,8 @@
+from injector import Binder, Module, SingletonScope
+
+from .publisher import NotificationPublisher
+
+
+class NotificationModule(Module):
+    def configure(self, binder: Binder) -> None:
+        binder.bind(NotificationPublisher, to=NotificationPublisher, scope=SingletonScope)
@@ -0,0 +1,34 @@
+from collections.abc import Iterable
+
+from redis import Redis
+
+from ..redis.config import redis_settings
+from .config import notification_settings
+from .message import Notification, encoder
+
+
+class NotificationPublisher:
+    """
+    Appends notifications to the Redis stream read by the notification worker.
+
+    Publishing blocks like `Celery.send_task` does, it is a single round trip
+    however many notifications are published at once.
+    """
+
+    def __init__(self) -> None:
+        self._redis = Redis(
+            host=redis_settings.SERVER,
+            port=redis_settings.PORT,
+            socket_timeout=5,
+        )
+
+    def publish(self, notifications: Iterable[Notification]) -> None:
+        with self._redis.pipeline(transaction=False) as pipe:
+            for notification in notifications:
+                pipe.xadd(
+                    notification_settings.STREAM,
+                    {"data": encoder.encode(notification), "attempts": 0},
+                    maxlen=notification_settings.STREAM_MAXLEN,
+                    approximate=True,
+                )
+            pipe.execute()
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from collections.abc import Callable
+
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from .client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class EvictionChannel:
+    """
+    Broadcast evictions of a process-local cache to every process through Redis
+    pub/sub.
+
+    `publish` sends a key and every subscribed process, the publisher included,
+    passes it to `on_evict`. Messages published while a process is not subscribed
+    are lost, so `on_reset` is called whenever the subscription fails and the cache
+    must drop everything it holds.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        channel: str,
+        *,
+        on_evict: Callable[[str], None],
+        on_reset: Callable[[], None],
+    ) -> None:
+        self._redis_client = redis_client
+        self._channel = channel
+        self._on_evict = on_evict
+        self._on_reset = on_reset
+
+        self._pubsub: PubSub | None = None
+        self._reader: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        self._pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._channel)
+        self._reader = asyncio.create_task(self._run_reader(self._pubsub))
+
+    async def stop(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()  # type: ignore[attr-defined]
+            self._pubsub = None
+
+    async def publish(self, key: str) -> None:
+        """Evict `key` locally and in every other process."""
+        self._on_evict(key)
+        try:
+            await self._redis_client.publish(self._channel, key)
+        except RedisError as e:
+            logger.warning(f"Error while publishing eviction on {self._channel}: {e}")
+
+    async def _run_reader(self, pubsub: PubSub) -> None:
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except RedisError as e:
+                logger.error(f"Error while reading evictions on {self._channel}: {e}")
+                self._on_reset()
+                await asyncio.sleep(1.0)
+                continue
+            if message is not None and message["type"] == "message":
+                self._on_evict(message["data"])
@@ -10,7 +10,9 @@ from app.module.device_data.model.connect_log import ConnectLog
 from app.module.device_data.model.device_attribute import DeviceAttribute
 from app.module.device_data.model.device_data import DeviceData
 from app.module.device_data.model.device_data_latest import DeviceDataLatest
+from app.module.device_data.model.device_data_retention import DeviceDataRetention
 from app.module.rule_action.model.action import Action
+from app.module.rule_action.model.emqx_rule_outbox import EmqxRuleOutbox
 from app.module.rule_action.model.rule import Rule
 from app.module.rule_action.model.rule_action import RuleAction
 from app.module.team.model.team import Team
@@ -33,7 +35,9 @@ __all__ = [
     "DeviceAttribute",
     "DeviceData",
     "DeviceDataLatest",
+    "DeviceDataRetention",
     "Rule",
     "Action",
     "RuleAction",
+    "EmqxRuleOutbox",
 ]
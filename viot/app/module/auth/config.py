@@ -10,6 +10,24 @@ class AuthSettings(BaseSettings):
 
     JWT_SECRET: str
 
+    PERMISSION_CACHE_TTL_SEC: int = 300
+    """Lifetime of the permission scopes of a team member cached in Redis"""
+    PERMISSION_LOCAL_CACHE_TTL_SEC: float = 5.0
+    """
+    Lifetime of the permission scopes cached in process. Evictions are broadcast, this
+    bounds staleness while a process is not subscribed.
+    """
+    PERMISSION_LOCAL_CACHE_SIZE: int = 10_000
+    """Number of (user, team) permission scope sets kept in process"""
+
+    PRINCIPAL_CACHE_TTL_SEC: float = 30.0
+    """
+    Lifetime of the principals cached in process. Evictions are broadcast to every
+    process, this bounds staleness when one is missed (Redis unreachable).
+    """
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    """Number of principals kept in process"""
+
 
 @lru_cache
 def get_auth_settings() -> AuthSettings:
@@ -14,7 +14,7 @@ from ..dependency import DependCurrentUser
 from ..dto.auth_dto import LoginDto, RegisterDto, TokenDto
 from ..dto.reset_password_dto import ForgotPasswordDto, ResetPasswordDto
 from ..dto.user_dto import UserDto
-from ..model.user import User
+from ..principal import Principal
 from ..service.auth_service import AuthService
 from ..service.password_reset_service import PasswordResetService
 from ..service.token_service import TokenService
@@ -71,7 +71,7 @@ class AuthController(Controller):
     async def logout(
         self,
         *,
-        user: Annotated[User, DependCurrentUser],
+        user: Annotated[Principal, DependCurrentUser],
         refresh_token: Annotated[str, Cookie(..., alias="refreshToken")],
         response: Response,
     ) -> JSONResponse[None]:
@@ -1,12 +1,13 @@
-from collections.abc import Callable
 from functools import lru_cache
 from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import Depends, Path
+from fastapi import Depends, Path, Query, WebSocketException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app import injector
+from app.common.exception.base import InternalServerException
+from app.database.session import transactional_session
 from app.module.auth.permission import Permission
 
 from .constants import ViotUserRole
@@ -16,7 +17,8 @@ from .exception.auth_exception import (
     UserNotVerifiedException,
     ViotRoleException,
 )
-from .model.user import User
+from .principal import Principal
+from .repository.principal_cache_repository import PrincipalCacheRepository
 from .repository.user_repository import UserRepository
 from .service.permission_service import PermissionService
 from .utils.token_utils import AccessToken, parse_access_token
@@ -29,6 +31,11 @@ def get_user_repository() -> UserRepository:
     return injector.get(UserRepository)
 
 
+@lru_cache
+def get_principal_cache_repository() -> PrincipalCacheRepository:
+    return injector.get(PrincipalCacheRepository)
+
+
 async def get_access_token(
     *,
     header: Annotated[HTTPAuthorizationCredentials | None, Depends(_http_bearer)],
@@ -43,19 +50,64 @@ async def get_current_user(
     *,
     access_token: Annotated[AccessToken, Depends(get_access_token)],
     user_repository: Annotated[UserRepository, Depends(get_user_repository)],
-) -> User:
-    """Get current user dependency"""
-    user = await user_repository.find(id=access_token.user_id)
-    if user is None:
-        raise UnauthorizedException
-    if user.email_verified_at is None:
+    principal_cache_repository: Annotated[
+        PrincipalCacheRepository, Depends(get_principal_cache_repository)
+    ],
+) -> Principal:
+    """
+    Get current user dependency.
+
+    Resolves to the cached `Principal` of the user, load the `User` from its id when
+    more is needed.
+    """
+    return await _get_active_user(access_token.user_id, user_repository, principal_cache_repository)
+
+
+async def get_websocket_user(
+    *,
+    token: Annotated[str, Query(...)],
+    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
+    principal_cache_repository: Annotated[
+        PrincipalCacheRepository, Depends(get_principal_cache_repository)
+    ],
+) -> Principal:
+    """
+    Get current user dependency for websocket endpoints.
+
+    Browsers cannot set headers on the websocket handshake, so the access token is
+    passed in the `token` query parameter. Websocket routes run without a request
+    session, the lookup opens its own.
+    """
+    try:
+        async with transactional_session():
+            return await _get_active_user(
+                parse_access_token(token).user_id, user_repository, principal_cache_repository
+            )
+    except InternalServerException as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.message)
+
+
+async def _get_active_user(
+    user_id: UUID,
+    user_repository: UserRepository,
+    principal_cache_repository: PrincipalCacheRepository,
+) -> Principal:
+    principal = principal_cache_repository.find(user_id)
+    if principal is None:
+        user = await user_repository.find(id=user_id)
+        if user is None:
+            raise UnauthorizedException
+        principal = Principal.from_model(user)
+        principal_cache_repository.save(principal)
+
+    if not principal.email_verified:
         raise UserNotVerifiedException
-    if user.disabled:
+    if principal.disabled:
         raise UserDisabledException
-    return user
+    return principal
 
 
-def RequireGlobalRole(role: ViotUserRole) -> Callable[[User], User]:
+def RequireGlobalRole(role: ViotUserRole) -> Any:
     """
     Create a dependency that requires a specific Viot user role.
 
@@ -75,7 +127,9 @@ def RequireGlobalRole(role: ViotUserRole) -> Callable[[User], User]:
     ```
     """
 
-    async def require_viot_role(user: Annotated[User, Depends(get_current_user)]) -> User:
+    async def require_viot_role(
+        user: Annotated[Principal, Depends(get_current_user)],
+    ) -> Principal:
         if user.role != role:
             raise ViotRoleException(role)
         return user
@@ -114,7 +168,7 @@ def RequireTeamPermission(permission: Permission) -> Any:
     """
 
     async def require_team_permission(
-        user: Annotated[User, Depends(get_current_user)],
+        user: Annotated[Principal, Depends(get_current_user)],
         team_id: Annotated[UUID, Path(...)],
         permission_service: Annotated[PermissionService, Depends(get_permission_service)],
     ) -> None:
@@ -123,3 +177,36 @@ def RequireTeamPermission(permission: Permission) -> Any:
         )
 
     return Depends(require_team_permission)
+
+
+def RequireWebSocketTeamPermission(permission: Permission) -> Any:
+    """
+    Websocket counterpart of `RequireTeamPermission`.
+
+    The handshake is rejected with a policy violation close code if the user
+    doesn't have the specified team permission.
+
+    Usage:
+    ```python
+        @websocket("/team/{team_id}/stream")
+        async def stream(
+            websocket: WebSocket,
+            _: Annotated[None, RequireWebSocketTeamPermission(TeamResourcePermission.VIEW)],
+        ): ...
+    ```
+    """
+
+    async def require_websocket_team_permission(
+        user: Annotated[Principal, Depends(get_websocket_user)],
+        team_id: Annotated[UUID, Path(...)],
+        permission_service: Annotated[PermissionService, Depends(get_permission_service)],
+    ) -> None:
+        try:
+            async with transactional_session():
+                await permission_service.validate_user_access_team_resource(
+                    user_id=user.id, team_id=team_id, permission_scope=permission.scope
+                )
+        except InternalServerException as e:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.message)
+
+    return Depends(require_websocket_team_permission)
@@ -5,6 +5,8 @@ from .controller.permission_controller import PermissionController
 from .controller.team_role_controller import TeamRoleController
 from .controller.user_controller import UserController
 from .repository.password_reset_repository import PasswordResetRepository
+from .repository.permission_scope_cache_repository import PermissionScopeCacheRepository
+from .repository.principal_cache_repository import PrincipalCacheRepository
 from .repository.refresh_token_repository import RefreshTokenRepository
 from .repository.role_permission_repository import RolePermissionRepository
 from .repository.role_repository import RoleRepository
@@ -24,6 +26,8 @@ class AuthModule(Module):
         binder.bind(UserTeamRoleRepository, UserTeamRoleRepository, SingletonScope)
         binder.bind(RoleRepository, RoleRepository, SingletonScope)
         binder.bind(RolePermissionRepository, RolePermissionRepository, SingletonScope)
+        binder.bind(PermissionScopeCacheRepository, PermissionScopeCacheRepository, SingletonScope)
+        binder.bind(PrincipalCacheRepository, PrincipalCacheRepository, SingletonScope)
 
         binder.bind(AuthService, AuthService, SingletonScope)
         binder.bind(UserService, UserService, SingletonScope)
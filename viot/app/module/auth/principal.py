@@ -0,0 +1,24 @@
+from uuid import UUID
+
+import msgspec
+
+from .constants import ViotUserRole
+from .model.user import User
+
+
+class Principal(msgspec.Struct, frozen=True):
+    """The authenticated user, as much of it as authorization needs."""
+
+    id: UUID
+    role: ViotUserRole
+    email_verified: bool
+    disabled: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            email_verified=user.email_verified_at is not None,
+            disabled=user.disabled,
+        )
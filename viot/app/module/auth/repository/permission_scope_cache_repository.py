@@ -0,0 +1,127 @@
+import logging
+import time
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.common.cache import TTLCache
+from app.database.session import after_commit
+from app.extension.redis.client import RedisClient
+from app.extension.redis.eviction import EvictionChannel
+
+from ..config import auth_settings
+
+logger = logging.getLogger(__name__)
+
+_json_encoder = msgspec.json.Encoder()
+_scopes_decoder = msgspec.json.Decoder(list[str])
+
+
+class PermissionScopeCacheRepository:
+    """
+    Permission scopes of a user in a team, cached in two tiers: a small in-process
+    LRU with a short TTL in front of one Redis hash per team.
+
+    Each hash field holds "<expires at, epoch seconds>:<JSON scopes>" for a user, so
+    evicting a whole team (a role changed) is a single `DEL` while entries still
+    expire one by one. Evictions run after the current transaction commits, see
+    `after_commit`, and clear the local tier of every process (see
+    `EvictionChannel`).
+
+    Redis errors are logged and reported as a cache miss, so callers fall back to
+    the database.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._ttl = auth_settings.PERMISSION_CACHE_TTL_SEC
+        self._local: TTLCache[tuple[UUID, UUID], frozenset[str]] = TTLCache(
+            maxsize=auth_settings.PERMISSION_LOCAL_CACHE_SIZE,
+            ttl=auth_settings.PERMISSION_LOCAL_CACHE_TTL_SEC,
+        )
+        self._evictions = EvictionChannel(
+            redis_client,
+            "permission_scope_evictions",
+            on_evict=self._on_evict,
+            on_reset=self._local.clear,
+        )
+
+    async def start(self) -> None:
+        await self._evictions.start()
+
+    async def stop(self) -> None:
+        await self._evictions.stop()
+        self._local.clear()
+
+    async def find(self, *, user_id: UUID, team_id: UUID) -> frozenset[str] | None:
+        """Return the cached scopes of the user in the team, or `None` on a miss."""
+        scopes = self._local.get((user_id, team_id))
+        if scopes is not None:
+            return scopes
+
+        try:
+            entry = await self._redis_client.hget(self._name(team_id), str(user_id))
+        except RedisError as e:
+            logger.warning(f"Error while reading permission scope cache: {e}")
+            return None
+        if entry is None:
+            return None
+        expires_at, _, scopes_json = entry.partition(":")
+        if int(expires_at) <= time.time():
+            return None
+
+        scopes = frozenset(_scopes_decoder.decode(scopes_json))
+        self._local.set((user_id, team_id), scopes)
+        return scopes
+
+    async def save(self, *, user_id: UUID, team_id: UUID, scopes: frozenset[str]) -> None:
+        self._local.set((user_id, team_id), scopes)
+        entry = f"{int(time.time()) + self._ttl}:{_json_encoder.encode(sorted(scopes)).decode()}"
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(self._name(team_id), str(user_id), entry)
+                pipe.expire(self._name(team_id), self._ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Error while writing permission scope cache: {e}")
+
+    async def evict_member(self, *, user_id: UUID, team_id: UUID) -> None:
+        """Evict the scopes of a user in a team, once the current transaction commits."""
+
+        async def evict() -> None:
+            try:
+                await self._redis_client.hdel(self._name(team_id), str(user_id))
+            except RedisError as e:
+                logger.warning(f"Error while evicting permission scope cache: {e}")
+            # After Redis, so no process refills its local tier from the stale entry
+            await self._evictions.publish(f"{team_id}:{user_id}")
+
+        await after_commit(evict)
+
+    async def evict_team(self, *, team_id: UUID) -> None:
+        """Evict the scopes of every member of a team, once the current transaction commits."""
+
+        async def evict() -> None:
+            try:
+                await self._redis_client.delete(self._name(team_id))
+            except RedisError as e:
+                logger.warning(f"Error while evicting permission scope cache: {e}")
+            await self._evictions.publish(str(team_id))
+
+        await after_commit(evict)
+
+    def _on_evict(self, key: str) -> None:
+        team_id, _, user_id = key.partition(":")
+        if user_id:
+            self._local.pop((UUID(user_id), UUID(team_id)))
+        else:
+            for local_key in self._local.keys():
+                if local_key[1] == UUID(team_id):
+                    self._local.pop(local_key)
+
+    @staticmethod
+    def _name(team_id: UUID) -> str:
+        return f"team_permission_scopes:{team_id}"
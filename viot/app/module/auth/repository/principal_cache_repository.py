@@ -0,0 +1,52 @@
+from uuid import UUID
+
+from injector import inject
+
+from app.common.cache import TTLCache
+from app.database.session import after_commit
+from app.extension.redis.client import RedisClient
+from app.extension.redis.eviction import EvictionChannel
+
+from ..config import auth_settings
+from ..principal import Principal
+
+
+class PrincipalCacheRepository:
+    """
+    Principals of the authenticated users, cached in process.
+
+    Nothing is stored in Redis, it only carries evictions (see `EvictionChannel`).
+    `PRINCIPAL_CACHE_TTL_SEC` bounds staleness while a process is not subscribed.
+
+    Evict a principal whenever a field it holds changes, or the user should be
+    reloaded (password changed, account deleted).
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._principals: TTLCache[UUID, Principal] = TTLCache(
+            maxsize=auth_settings.PRINCIPAL_CACHE_SIZE, ttl=auth_settings.PRINCIPAL_CACHE_TTL_SEC
+        )
+        self._evictions = EvictionChannel(
+            redis_client,
+            "principal_evictions",
+            on_evict=lambda user_id: self._principals.pop(UUID(user_id)),
+            on_reset=self._principals.clear,
+        )
+
+    async def start(self) -> None:
+        await self._evictions.start()
+
+    async def stop(self) -> None:
+        await self._evictions.stop()
+        self._principals.clear()
+
+    def find(self, user_id: UUID) -> Principal | None:
+        return self._principals.get(user_id)
+
+    def save(self, principal: Principal) -> None:
+        self._principals.set(principal.id, principal)
+
+    async def evict(self, user_id: UUID) -> None:
+        """Evict the principal in every process, once the current transaction commits."""
+        await after_commit(lambda: self._evictions.publish(str(user_id)))
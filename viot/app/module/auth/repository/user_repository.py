@@ -2,7 +2,7 @@ from datetime import datetime
 from uuid import UUID
 
 import msgspec
-from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy import delete, exists, select, update
 
 from app.database.repository import CrudRepository, Page, Pageable
 
@@ -36,21 +36,19 @@ class UserRepository(CrudRepository[User, UUID]):
             .where(UserTeamRole.team_id == team_id)
         )
         query = pageable.apply(stmt, self._model)
-        count_query = select(func.count()).select_from(
-            pageable.apply(stmt, self._model).order_by(None).limit(None).subquery()
-        )
 
         items = (await self.session.execute(query)).fetchall()
-        total_items = (await self.session.execute(count_query)).scalar_one()
+        total = await self.count(query, pageable.count_strategy)
 
         return Page(
             items=[
                 TeamMember(user=user, role=role, joined_at=joined_at)
                 for user, role, joined_at in items
             ],
-            total_items=total_items,
+            total_items=total.total,
             page=pageable.page,
             page_size=pageable.page_size,
+            approximate=total.approximate,
         )
 
     async def find_user_by_id_and_team_id(self, user_id: UUID, team_id: UUID) -> TeamMember | None:
@@ -84,6 +82,7 @@ class UserRepository(CrudRepository[User, UUID]):
     async def delete_by_id(self, id: UUID) -> None:
         stmt = delete(User).where(User.id == id)
         await self.session.execute(stmt)
+        await self._invalidate_counts(User, UserTeamRole)
 
     async def delete_user_by_id_and_team_id(self, user_id: UUID, team_id: UUID) -> None:
         stmt = (
@@ -92,3 +91,4 @@ class UserRepository(CrudRepository[User, UUID]):
             .where(UserTeamRole.team_id == team_id)
         )
         await self.session.execute(stmt)
+        await self._invalidate_counts(UserTeamRole)
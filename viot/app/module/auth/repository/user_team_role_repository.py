@@ -27,6 +27,17 @@ class UserTeamRoleRepository(AsyncSqlalchemyRepository):
         )
         return bool(result.scalar())
 
+    async def find_permission_scopes_by_user_id_and_team_id(
+        self, *, user_id: UUID, team_id: UUID
+    ) -> set[str]:
+        stmt = (
+            select(text("permission_scope"))
+            .select_from(UserTeamPermissionScopeView)
+            .where(text("user_id = :user_id AND team_id = :team_id"))
+        )
+        result = await self.session.execute(stmt, {"user_id": user_id, "team_id": team_id})
+        return set(result.scalars().all())
+
     async def save(self, obj: UserTeamRole) -> UserTeamRole:
         self.session.add(obj)
         await self.session.flush()
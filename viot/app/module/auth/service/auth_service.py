@@ -20,6 +20,7 @@ from ..exception.user_exception import UserEmailAlreadyExistsException
 from ..model.refresh_token import RefreshToken
 from ..model.user import User
 from ..repository.password_reset_repository import PasswordResetRepository
+from ..repository.principal_cache_repository import PrincipalCacheRepository
 from ..repository.refresh_token_repository import RefreshTokenRepository
 from ..repository.user_repository import UserRepository
 from ..utils.jwt_utils import create_jwt_token, parse_jwt_token
@@ -37,11 +38,13 @@ class AuthService:
         refresh_token_repository: RefreshTokenRepository,
         password_reset_repository: PasswordResetRepository,
         email_service: IEmailService,
+        principal_cache_repository: PrincipalCacheRepository,
     ) -> None:
         self._user_repository = user_repository
         self._refresh_token_repository = refresh_token_repository
         self._password_reset_repository = password_reset_repository
         self._email_service = email_service
+        self._principal_cache_repository = principal_cache_repository
 
     async def login(self, *, login_dto: LoginDto) -> TokenDto:
         user = await self._user_repository.find_by_email(email=login_dto.email)
@@ -109,3 +112,4 @@ class AuthService:
         except Exception as e:
             logger.warning(f"Failed to verify email: {e}")
             raise InvalidVerifyEmailTokenException
+        await self._principal_cache_repository.evict(user_id)
@@ -15,6 +15,7 @@ from ..exception.auth_exception import (
 )
 from ..model.password_reset import PasswordReset
 from ..repository.password_reset_repository import PasswordResetRepository
+from ..repository.principal_cache_repository import PrincipalCacheRepository
 from ..repository.user_repository import UserRepository
 from ..utils.password_utils import hash_password, verify_password
 
@@ -26,10 +27,12 @@ class PasswordResetService:
         user_repository: UserRepository,
         password_reset_repository: PasswordResetRepository,
         email_service: IEmailService,
+        principal_cache_repository: PrincipalCacheRepository,
     ):
         self._user_repository = user_repository
         self._password_reset_repository = password_reset_repository
         self._email_service = email_service
+        self._principal_cache_repository = principal_cache_repository
 
     async def forgot_password(self, *, email: str) -> None:
         user = await self._user_repository.find_by_email(email=email)
@@ -67,5 +70,6 @@ class PasswordResetService:
         await self._user_repository.update_password(
             user_id=user.id, hashed_password=hash_password(reset_password_dto.password)
         )
+        await self._principal_cache_repository.evict(user.id)
 
         await self._password_reset_repository.delete(password_reset)
@@ -5,6 +5,7 @@ from injector import inject
 from ..dto.permission_dto import PermissionDto
 from ..exception.permission_exception import ResourceAccessDeniedException
 from ..repository.permission_repository import PermissionRepository
+from ..repository.permission_scope_cache_repository import PermissionScopeCacheRepository
 from ..repository.user_team_role_repository import UserTeamRoleRepository
 
 
@@ -14,9 +15,11 @@ class PermissionService:
         self,
         permission_repository: PermissionRepository,
         user_team_role_repository: UserTeamRoleRepository,
+        permission_scope_cache_repository: PermissionScopeCacheRepository,
     ) -> None:
         self._permission_repository = permission_repository
         self._user_team_role_repository = user_team_role_repository
+        self._permission_scope_cache_repository = permission_scope_cache_repository
 
     async def get_all_permissions(self) -> list[PermissionDto]:
         permissions = await self._permission_repository.find_all()
@@ -25,7 +28,26 @@ class PermissionService:
     async def validate_user_access_team_resource(
         self, *, user_id: UUID, team_id: UUID, permission_scope: str
     ) -> None:
-        if not await self._user_team_role_repository.is_user_has_permission_in_team(
-            user_id=user_id, team_id=team_id, permission_scope=permission_scope
-        ):
+        scopes = await self.get_user_permission_scopes_in_team(user_id=user_id, team_id=team_id)
+        if permission_scope not in scopes:
             raise ResourceAccessDeniedException
+
+    async def get_user_permission_scopes_in_team(
+        self, *, user_id: UUID, team_id: UUID
+    ) -> frozenset[str]:
+        """Permission scopes of the user in the team, empty if the user is not a member."""
+        scopes = await self._permission_scope_cache_repository.find(
+            user_id=user_id, team_id=team_id
+        )
+        if scopes is not None:
+            return scopes
+
+        scopes = frozenset(
+            await self._user_team_role_repository.find_permission_scopes_by_user_id_and_team_id(
+                user_id=user_id, team_id=team_id
+            )
+        )
+        await self._permission_scope_cache_repository.save(
+            user_id=user_id, team_id=team_id, scopes=scopes
+        )
+        return scopes
@@ -22,6 +22,7 @@ from ..exception.role_exception import (
 from ..model.permission import Permission
 from ..model.role import Role
 from ..repository.permission_repository import PermissionRepository
+from ..repository.permission_scope_cache_repository import PermissionScopeCacheRepository
 from ..repository.role_permission_repository import RolePermissionRepository
 from ..repository.role_repository import RoleRepository
 
@@ -36,11 +37,13 @@ class TeamRoleService:
         team_repository: TeamRepository,
         permission_repository: PermissionRepository,
         role_permission_repository: RolePermissionRepository,
+        permission_scope_cache_repository: PermissionScopeCacheRepository,
     ) -> None:
         self._role_repository = role_repository
         self._team_repository = team_repository
         self._permission_repository = permission_repository
         self._role_permission_repository = role_permission_repository
+        self._permission_scope_cache_repository = permission_scope_cache_repository
 
     async def get_roles_by_team_id(self, *, team_id: UUID) -> list[RoleDto]:
         if not await self._team_repository.exists_by_id(team_id):
@@ -123,9 +126,11 @@ class TeamRoleService:
             await self._role_permission_repository.bulk_save_on_conflict_do_nothing(
                 [{"role_id": role.id, "permission_id": permission.id} for permission in permissions]
             )
+            await self._permission_scope_cache_repository.evict_team(team_id=team_id)
 
         return RoleDto.from_model(role, role_update_dto.scopes)
 
     async def delete_role(self, *, role_id: int, team_id: UUID) -> None:
         await self.validate_not_modify_owner_role(role_id=role_id)
         await self._role_repository.delete_by_id_and_team_id(role_id=role_id, team_id=team_id)
+        await self._permission_scope_cache_repository.evict_team(team_id=team_id)
@@ -5,6 +5,7 @@ from injector import inject
 
 from ..dto.user_dto import ChangePasswordDto, UserDto, UserUpdateDto
 from ..exception.user_exception import PasswordNotMatchException, UserNotFoundException
+from ..repository.principal_cache_repository import PrincipalCacheRepository
 from ..repository.user_repository import UserRepository
 from ..utils.password_utils import hash_password, verify_password
 
@@ -13,8 +14,17 @@ logger = logging.getLogger(__name__)
 
 class UserService:
     @inject
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self, user_repository: UserRepository, principal_cache_repository: PrincipalCacheRepository
+    ):
         self._user_repository = user_repository
+        self._principal_cache_repository = principal_cache_repository
+
+    async def get_user(self, *, user_id: UUID) -> UserDto:
+        user = await self._user_repository.find(user_id)
+        if not user:
+            raise UserNotFoundException
+        return UserDto.from_model(user)
 
     async def change_password(
         self, *, user_id: UUID, change_password_dto: ChangePasswordDto
@@ -28,6 +38,7 @@ class UserService:
         await self._user_repository.update_password(
             user_id, hash_password(change_password_dto.new_password)
         )
+        await self._principal_cache_repository.evict(user_id)
 
     async def update_user(self, *, user_id: UUID, user_update_dto: UserUpdateDto) -> UserDto:
         user = await self._user_repository.find(user_id)
@@ -42,3 +53,4 @@ class UserService:
 
     async def delete_user_by_id(self, *, user_id: UUID) -> None:
         await self._user_repository.delete_by_id(user_id)
+        await self._principal_cache_repository.evict(user_id)
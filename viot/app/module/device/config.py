@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DeviceSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="VIOT_DEVICE_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    SUB_DEVICE_CACHE_TTL_SEC: float = 300
+    SUB_DEVICE_CACHE_MAX_SIZE: int = 10000
+    SUB_DEVICE_RELOAD_INTERVAL_SEC: float = 10
+
+    CREDENTIAL_CACHE_TTL_SEC: float = 3600
+    """
+    Lifetime of a cached device credential. Evictions are broadcast to every process,
+    this bounds staleness when one is missed.
+    """
+    CREDENTIAL_NEGATIVE_CACHE_TTL_SEC: float = 10
+    """How long an unknown device id is answered from memory, so a connect flood skips the DB."""
+    CREDENTIAL_CACHE_MAX_SIZE: int = 500_000
+    CREDENTIAL_WARM_BATCH_SIZE: int = 10_000
+    """Number of credentials loaded per round trip while warming the cache at startup"""
+
+
+@lru_cache
+def get_device_settings() -> DeviceSettings:
+    return DeviceSettings()
+
+
+device_settings: DeviceSettings = get_device_settings()
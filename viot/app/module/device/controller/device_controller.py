@@ -7,7 +7,7 @@ from fastapi.params import Path
 from injector import inject
 
 from app.common.controller import Controller
-from app.common.dto.types import PageQuery, PageSizeQuery
+from app.common.dto.types import CursorQuery, PageSizeQuery, WithTotalQuery
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import RequireTeamPermission
@@ -37,8 +37,9 @@ class DeviceController(Controller):
         self,
         *,
         team_id: Annotated[UUID, Path(...)],
-        page: PageQuery,
         page_size: PageSizeQuery,
+        after: CursorQuery = None,
+        with_total: WithTotalQuery = False,
         device_type: DeviceType = Query(
             None,
             alias="type",
@@ -48,7 +49,11 @@ class DeviceController(Controller):
         """Get all devices belong to team"""
         return JSONResponse(
             content=await self._device_service.get_all_devices_belong_to_team(
-                team_id=team_id, page=page, page_size=page_size, device_type=device_type
+                team_id=team_id,
+                page_size=page_size,
+                after=after,
+                with_total=with_total,
+                device_type=device_type,
             ),
             status_code=200,
         )
@@ -2,9 +2,9 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from app.common.dto import BaseOutDto, PagingDto
+from app.common.dto import BaseOutDto, CursorPagingDto
 from app.common.dto.base import BaseInDto
-from app.database.repository.pagination import Page
+from app.database.repository.pagination import CursorPage
 
 from ..constants import DeviceStatus, DeviceType
 from ..model.device import Device
@@ -35,12 +35,13 @@ class DeviceDto(BaseOutDto):
         return cls.model_validate(device)
 
 
-class PagingDeviceDto(PagingDto[DeviceDto]):
+class PagingDeviceDto(CursorPagingDto[DeviceDto]):
     @classmethod
-    def from_page(cls, page: Page[Device]) -> "PagingDeviceDto":
+    def from_page(cls, page: CursorPage[Device]) -> "PagingDeviceDto":
         return cls(
             items=[DeviceDto.from_model(device) for device in page.items],
-            total_items=page.total_items,
-            page=page.page,
             page_size=page.page_size,
+            next_cursor=page.next_cursor,
+            total_items=page.total_items,
+            approximate=page.approximate,
         )
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import SMALLINT, TEXT, Boolean, DateTime, ForeignKey
+from sqlalchemy import SMALLINT, TEXT, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,11 +27,14 @@ class Device(Base, DateTimeMixin):
     image_url: Mapped[str | None] = mapped_column(TEXT, init=False)
     disabled: Mapped[bool] = mapped_column(Boolean, insert_default=False, init=False)
     last_connection: Mapped[datetime | None] = mapped_column(DateTime(True), init=False)
+    status_changed_at: Mapped[datetime | None] = mapped_column(DateTime(True), init=False)
     meta_data: Mapped[dict[str, Any]] = mapped_column(JSONB, insert_default={}, init=False)
     team_id: Mapped[UUID] = mapped_column(
         ForeignKey("teams.id", onupdate="CASCADE", ondelete="CASCADE")
     )
 
+    __table_args__ = (Index("devices_team_id_created_at_id_idx", "team_id", "created_at", "id"),)
+
     __mapper_args__ = {
         "polymorphic_on": device_type,
         "polymorphic_identity": DeviceType.DEVICE,
@@ -1,10 +1,42 @@
+from collections.abc import AsyncGenerator, Sequence
+from datetime import datetime
+from typing import NamedTuple
 from uuid import UUID
 
-from sqlalchemy import delete, exists, select
+from sqlalchemy import case, delete, exists, select, text
 
 from app.database.repository import PageableRepository
 
-from ..model.device import Device
+from ..constants import DeviceStatus, DeviceType
+from ..model.device import Device, SubDevice
+
+
+class DeviceCredential(NamedTuple):
+    id: UUID
+    token: str
+    disabled: bool
+    device_type: DeviceType
+    team_id: UUID
+
+
+_credential_columns = (Device.id, Device.token, Device.disabled, Device.device_type, Device.team_id)
+
+# A status older than the last status change already stored, connect or disconnect,
+# is stale (e.g. written late by another worker) and is skipped.
+_UPDATE_CONNECTION_BATCH_QUERY = """
+    UPDATE devices
+    SET status = s.status,
+        status_changed_at = s.ts,
+        last_connection = COALESCE(s.last_connection, devices.last_connection)
+    FROM unnest(
+        CAST(:device_id AS uuid[]),
+        CAST(:status AS smallint[]),
+        CAST(:ts AS timestamptz[]),
+        CAST(:last_connection AS timestamptz[])
+    ) AS s(device_id, status, ts, last_connection)
+    WHERE devices.id = s.device_id
+    AND (devices.status_changed_at IS NULL OR devices.status_changed_at <= s.ts)
+"""
 
 
 class DeviceRepository(PageableRepository[Device, UUID]):
@@ -15,7 +47,66 @@ class DeviceRepository(PageableRepository[Device, UUID]):
     async def delete_by_device_id_and_team_id(self, device_id: UUID, team_id: UUID) -> None:
         stmt = delete(Device).where(Device.id == device_id, Device.team_id == team_id)
         await self.session.execute(stmt)
+        await self._invalidate_counts(Device)
 
     async def exists_by_id_and_team_id(self, device_id: UUID, team_id: UUID) -> bool:
         stmt = select(exists().where(Device.id == device_id, Device.team_id == team_id))
         return (await self.session.execute(stmt)).scalar() or False
+
+    async def find_credential_by_id(self, device_id: UUID) -> DeviceCredential | None:
+        stmt = select(*_credential_columns).where(Device.id == device_id)
+        row = (await self.session.execute(stmt)).one_or_none()
+        return DeviceCredential(*row) if row is not None else None
+
+    async def stream_credentials(
+        self, batch_size: int
+    ) -> AsyncGenerator[list[DeviceCredential], None]:
+        """Yield the credentials of every device, `batch_size` at a time."""
+        result = await self.session.stream(
+            select(*_credential_columns).execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield [DeviceCredential(*row) for row in partition]
+
+    async def update_connection_batch(
+        self,
+        *,
+        device_ids: Sequence[UUID],
+        statuses: Sequence[DeviceStatus],
+        ts: Sequence[datetime],
+        last_connections: Sequence[datetime | None],
+    ) -> None:
+        """
+        Set the status of many devices in one `UPDATE ... FROM unnest(...)`.
+        `last_connection` is left unchanged where the given value is `None`.
+        """
+        await self.session.execute(
+            text(_UPDATE_CONNECTION_BATCH_QUERY),
+            {
+                "device_id": device_ids,
+                "status": statuses,
+                "ts": ts,
+                "last_connection": last_connections,
+            },
+        )
+
+    async def find_sub_device_ids_by_gateway_id(self, gateway_id: UUID) -> Sequence[UUID]:
+        stmt = select(SubDevice.id).where(SubDevice.gateway_id == gateway_id)
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def find_gateway_id_by_device_id_and_team_id(
+        self, device_id: UUID, team_id: UUID
+    ) -> UUID | None:
+        """Id of the gateway itself, or of the gateway a sub-device is attached to."""
+        sub_devices = SubDevice.__table__
+        stmt = (
+            select(
+                case(
+                    (Device.device_type == DeviceType.GATEWAY, Device.id),
+                    else_=sub_devices.c.gateway_id,
+                )
+            )
+            .outerjoin(sub_devices, sub_devices.c.id == Device.id)
+            .where(Device.id == device_id, Device.team_id == team_id)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
@@ -0,0 +1,128 @@
+import logging
+from uuid import UUID
+
+from injector import inject
+
+from app.common.cache import TTLCache
+from app.database.session import after_commit, transactional_session
+from app.extension.redis.client import RedisClient
+from app.extension.redis.eviction import EvictionChannel
+
+from ..config import device_settings
+from ..repository.device_repository import DeviceCredential, DeviceRepository
+
+logger = logging.getLogger(__name__)
+
+_TEAM_PREFIX = "team:"
+
+
+class DeviceCredentialService:
+    """
+    Credentials of the devices (token, disabled flag, type), cached in process for
+    the EMQX authentication hook.
+
+    The cache is warmed at startup, so a reconnect storm after a broker restart is
+    answered from memory. Devices missing from it are loaded one by one, unknown ids
+    are remembered for `CREDENTIAL_NEGATIVE_CACHE_TTL_SEC`. Evictions are broadcast
+    to every process (see `EvictionChannel`), call `evict` whenever a cached field of
+    a device changes (disabled, token) or the device is deleted.
+    """
+
+    @inject
+    def __init__(self, device_repository: DeviceRepository, redis_client: RedisClient) -> None:
+        self._device_repository = device_repository
+        self._credentials: TTLCache[UUID, DeviceCredential] = TTLCache(
+            maxsize=device_settings.CREDENTIAL_CACHE_MAX_SIZE,
+            ttl=device_settings.CREDENTIAL_CACHE_TTL_SEC,
+        )
+        self._unknown: TTLCache[UUID, bool] = TTLCache(
+            maxsize=device_settings.CREDENTIAL_CACHE_MAX_SIZE,
+            ttl=device_settings.CREDENTIAL_NEGATIVE_CACHE_TTL_SEC,
+        )
+        # Loads in flight, an eviction drops them so their result is not cached
+        self._loads: dict[UUID, object] = {}
+        self._evictions = EvictionChannel(
+            redis_client,
+            "device_credential_evictions",
+            on_evict=self._on_evict,
+            on_reset=self._reset,
+        )
+
+    async def start(self) -> None:
+        await self._evictions.start()
+        try:
+            async with transactional_session():
+                await self.warm()
+        except Exception as e:
+            logger.error(f"Failed to warm device credential cache: {e}")
+
+    async def stop(self) -> None:
+        await self._evictions.stop()
+        self._reset()
+
+    async def warm(self) -> None:
+        """Load the credentials of every device."""
+        count = 0
+        async for credentials in self._device_repository.stream_credentials(
+            device_settings.CREDENTIAL_WARM_BATCH_SIZE
+        ):
+            for credential in credentials:
+                self._credentials.set(credential.id, credential)
+            count += len(credentials)
+        logger.info(f"Warmed device credential cache with {count} devices")
+
+    async def get_credential(self, device_id: UUID) -> DeviceCredential | None:
+        credential = self._credentials.get(device_id)
+        if credential is not None or self._unknown.get(device_id):
+            return credential
+
+        load = self._loads[device_id] = object()
+        try:
+            credential = await self._device_repository.find_credential_by_id(device_id)
+        finally:
+            evicted = self._loads.get(device_id) is not load
+            if not evicted:
+                del self._loads[device_id]
+        if not evicted:
+            if credential is None:
+                self._unknown.set(device_id, True)
+            else:
+                self._credentials.set(device_id, credential)
+        return credential
+
+    async def save(self, credential: DeviceCredential) -> None:
+        """Cache the credential of a new device, once the current transaction commits."""
+
+        async def save() -> None:
+            self._unknown.pop(credential.id)
+            self._credentials.set(credential.id, credential)
+
+        await after_commit(save)
+
+    async def evict(self, device_id: UUID) -> None:
+        """Evict a device in every process, once the current transaction commits."""
+        await after_commit(lambda: self._evictions.publish(str(device_id)))
+
+    async def evict_team(self, team_id: UUID) -> None:
+        """Evict every device of a team, once the current transaction commits."""
+        await after_commit(lambda: self._evictions.publish(f"{_TEAM_PREFIX}{team_id}"))
+
+    def _on_evict(self, key: str) -> None:
+        if key.startswith(_TEAM_PREFIX):
+            team_id = UUID(key.removeprefix(_TEAM_PREFIX))
+            for device_id in self._credentials.keys():
+                credential = self._credentials.get(device_id)
+                if credential is not None and credential.team_id == team_id:
+                    self._credentials.pop(device_id)
+            # The team of a device being loaded is not known yet
+            self._loads.clear()
+        else:
+            device_id = UUID(key)
+            self._credentials.pop(device_id)
+            self._unknown.pop(device_id)
+            self._loads.pop(device_id, None)
+
+    def _reset(self) -> None:
+        self._credentials.clear()
+        self._unknown.clear()
+        self._loads.clear()
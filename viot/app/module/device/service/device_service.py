@@ -2,7 +2,7 @@ from uuid import UUID
 
 from injector import inject
 
-from app.database.repository import Filter, Pageable
+from app.database.repository import Filter, KeysetPageable, Sort
 from app.module.team.exception.team_exception import TeamNotFoundException
 from app.module.team.repository.team_repository import TeamRepository
 
@@ -10,7 +10,9 @@ from ..constants import DeviceType
 from ..dto.device_dto import DeviceCreateDto, DeviceDto, PagingDeviceDto
 from ..exception.device_exception import DeviceNotFoundException
 from ..model.device import Device
-from ..repository.device_repository import DeviceRepository
+from ..repository.device_repository import DeviceCredential, DeviceRepository
+from .device_credential_service import DeviceCredentialService
+from .gateway_service import GatewayService
 
 
 class DeviceService:
@@ -19,9 +21,13 @@ class DeviceService:
         self,
         device_repository: DeviceRepository,
         team_repository: TeamRepository,
+        gateway_service: GatewayService,
+        device_credential_service: DeviceCredentialService,
     ) -> None:
         self._device_repository = device_repository
         self._team_repository = team_repository
+        self._gateway_service = gateway_service
+        self._device_credential_service = device_credential_service
 
     async def get_device_by_id_and_team_id(self, *, device_id: UUID, team_id: UUID) -> DeviceDto:
         device = await self._device_repository.find_by_device_id_and_team_id(device_id, team_id)
@@ -30,13 +36,26 @@ class DeviceService:
         return DeviceDto.from_model(device)
 
     async def get_all_devices_belong_to_team(
-        self, *, team_id: UUID, page: int, page_size: int, device_type: DeviceType | None
+        self,
+        *,
+        team_id: UUID,
+        page_size: int,
+        after: str | None,
+        with_total: bool,
+        device_type: DeviceType | None,
     ) -> PagingDeviceDto:
         filters = [Filter(field="team_id", operator="eq", value=team_id)]
         if device_type is not None:
             filters.append(Filter(field="device_type", operator="eq", value=device_type))
-        pageable = Pageable(page=page, page_size=page_size, filters=filters)
-        device_page = await self._device_repository.find_all_with_paging(pageable)
+        pageable = KeysetPageable(
+            page_size=page_size,
+            sorts=[Sort(field="created_at", direction="desc")],
+            filters=filters,
+            after=after,
+            with_total=with_total,
+            count_strategy="cached",
+        )
+        device_page = await self._device_repository.find_all_with_cursor(pageable)
         return PagingDeviceDto.from_page(device_page)
 
     async def create_device(
@@ -52,7 +71,22 @@ class DeviceService:
             description=device_create_dto.description,
         )
         device = await self._device_repository.save(device)
+        await self._device_credential_service.save(
+            DeviceCredential(
+                id=device.id,
+                token=device.token,
+                disabled=device.disabled,
+                device_type=device.device_type,
+                team_id=device.team_id,
+            )
+        )
         return DeviceDto.from_model(device)
 
     async def delete_device_by_id_and_team_id(self, *, device_id: UUID, team_id: UUID) -> None:
+        gateway_id = await self._device_repository.find_gateway_id_by_device_id_and_team_id(
+            device_id, team_id
+        )
         await self._device_repository.delete_by_device_id_and_team_id(device_id, team_id)
+        if gateway_id is not None:
+            await self._gateway_service.evict(gateway_id)
+        await self._device_credential_service.evict(device_id)
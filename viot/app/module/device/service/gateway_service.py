@@ -0,0 +1,87 @@
+from uuid import UUID
+
+from injector import inject
+
+from app.common.cache import TTLCache
+from app.database.session import after_commit
+from app.extension.redis.client import RedisClient
+from app.extension.redis.eviction import EvictionChannel
+
+from ..config import device_settings
+from ..repository.device_repository import DeviceRepository
+
+
+class GatewayService:
+    """
+    Sub-devices attached to each gateway, cached in process for the EMQX hooks.
+
+    Evictions are broadcast to every process (see `EvictionChannel`), call `evict`
+    whenever a gateway or one of its sub-devices is deleted.
+    """
+
+    @inject
+    def __init__(self, device_repository: DeviceRepository, redis_client: RedisClient) -> None:
+        self._device_repository = device_repository
+        self._sub_device_ids: TTLCache[UUID, frozenset[UUID]] = TTLCache(
+            maxsize=device_settings.SUB_DEVICE_CACHE_MAX_SIZE,
+            ttl=device_settings.SUB_DEVICE_CACHE_TTL_SEC,
+        )
+        self._reloaded: TTLCache[UUID, bool] = TTLCache(
+            maxsize=device_settings.SUB_DEVICE_CACHE_MAX_SIZE,
+            ttl=device_settings.SUB_DEVICE_RELOAD_INTERVAL_SEC,
+        )
+        self._evictions = EvictionChannel(
+            redis_client,
+            "gateway_sub_device_evictions",
+            on_evict=self._on_evict,
+            on_reset=self._reset,
+        )
+
+    async def start(self) -> None:
+        await self._evictions.start()
+
+    async def stop(self) -> None:
+        await self._evictions.stop()
+        self._reset()
+
+    async def get_sub_device_ids(self, gateway_id: UUID) -> frozenset[UUID]:
+        sub_device_ids = self._sub_device_ids.get(gateway_id)
+        if sub_device_ids is None:
+            sub_device_ids = await self._load_sub_device_ids(gateway_id)
+        return sub_device_ids
+
+    async def filter_owned_sub_device_ids(
+        self, gateway_id: UUID, sub_device_ids: set[UUID]
+    ) -> set[UUID]:
+        """
+        Return the subset of `sub_device_ids` attached to the gateway.
+
+        Ids missing from the cached map trigger a reload (at most once per
+        `SUB_DEVICE_RELOAD_INTERVAL_SEC`), so a sub-device attached after the map
+        was cached is accepted without waiting for the TTL.
+        """
+        owned = await self.get_sub_device_ids(gateway_id)
+        if not sub_device_ids <= owned and self._reloaded.get(gateway_id) is None:
+            owned = await self._load_sub_device_ids(gateway_id)
+        return sub_device_ids & owned
+
+    async def evict(self, gateway_id: UUID) -> None:
+        """Evict a gateway in every process, once the current transaction commits."""
+        await after_commit(lambda: self._evictions.publish(str(gateway_id)))
+
+    async def _load_sub_device_ids(self, gateway_id: UUID) -> frozenset[UUID]:
+        sub_device_ids = frozenset(
+            await self._device_repository.find_sub_device_ids_by_gateway_id(gateway_id)
+        )
+        self._sub_device_ids.set(gateway_id, sub_device_ids)
+        self._reloaded.set(gateway_id, True)
+        return sub_device_ids
+
+    def _on_evict(self, key: str) -> None:
+        gateway_id = UUID(key)
+        self._sub_device_ids.pop(gateway_id)
+        self._reloaded.pop(gateway_id)
+
+    def _reset(self) -> None:
+        self._sub_device_ids.clear()
+        self._reloaded.clear()
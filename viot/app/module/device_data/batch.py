@@ -0,0 +1,184 @@
+import asyncio
+from collections.abc import Iterator, Mapping
+from datetime import datetime
+from itertools import repeat
+from typing import Any
+from uuid import UUID
+
+import msgspec
+
+from .constants import ConnectStatus
+from .typed_value import encode_typed_values
+
+DEVICE_DATA_COLUMNS = ("device_id", "ts", "key", "bool_v", "str_v", "long_v", "double_v", "json_v")
+CONNECT_LOG_COLUMNS = ("device_id", "ts", "connect_status", "ip")
+
+_json_encoder = msgspec.json.Encoder()
+
+
+def _encode_json(value: Any) -> str:
+    return _json_encoder.encode(value).decode()
+
+
+class DeviceDataBatch:
+    """
+    Columnar buffer of data points waiting to be written to `device_data`.
+
+    Every value is routed to its typed column on append (see `encode_typed_values`),
+    so the batch can be handed to `COPY` (row-wise via `records`) or to an `unnest`
+    statement (column-wise via the attributes) without another pass over the data.
+    `json_v` is kept pre-encoded as a JSON string.
+    """
+
+    __slots__ = DEVICE_DATA_COLUMNS
+
+    def __init__(self) -> None:
+        self.device_id: list[UUID] = []
+        self.ts: list[datetime] = []
+        self.key: list[str] = []
+        self.bool_v: list[bool | None] = []
+        self.str_v: list[str | None] = []
+        self.long_v: list[int | None] = []
+        self.double_v: list[float | None] = []
+        self.json_v: list[str | None] = []
+
+    def __len__(self) -> int:
+        return len(self.key)
+
+    def append(self, device_id: UUID, ts: datetime, key: str, value: Any) -> None:
+        self.extend(device_id, ts, {key: value})
+
+    def extend(self, device_id: UUID, ts: datetime, payload: Mapping[str, Any]) -> None:
+        """Append every key of a telemetry payload, skipping `null` values."""
+        columns = encode_typed_values(payload, _encode_json)
+        n = len(columns.key)
+        self.device_id.extend(repeat(device_id, n))
+        self.ts.extend(repeat(ts, n))
+        self.key.extend(columns.key)
+        self.bool_v.extend(columns.bool_v)
+        self.str_v.extend(columns.str_v)
+        self.long_v.extend(columns.long_v)
+        self.double_v.extend(columns.double_v)
+        self.json_v.extend(columns.json_v)
+
+    def extend_batch(self, other: "DeviceDataBatch") -> None:
+        """Append every data point of another batch."""
+        for column in DEVICE_DATA_COLUMNS:
+            getattr(self, column).extend(getattr(other, column))
+
+    def latest(self) -> "DeviceDataBatch":
+        """Collapse the batch to the newest data point per (device_id, key)."""
+        newest: dict[tuple[UUID, str], int] = {}
+        for i, (device_id, key, ts) in enumerate(
+            zip(self.device_id, self.key, self.ts, strict=True)
+        ):
+            j = newest.get((device_id, key))
+            if j is None or ts >= self.ts[j]:
+                newest[(device_id, key)] = i
+
+        latest = DeviceDataBatch()
+        for i in newest.values():
+            for column in DEVICE_DATA_COLUMNS:
+                getattr(latest, column).append(getattr(self, column)[i])
+        return latest
+
+    def records(self) -> Iterator[tuple[Any, ...]]:
+        """Iterate over the rows in `DEVICE_DATA_COLUMNS` order."""
+        return zip(
+            self.device_id,
+            self.ts,
+            self.key,
+            self.bool_v,
+            self.str_v,
+            self.long_v,
+            self.double_v,
+            self.json_v,
+            strict=True,
+        )
+
+
+class ConnectLogBatch:
+    """Columnar buffer of connect/disconnect events waiting to be written to `connect_logs`."""
+
+    __slots__ = CONNECT_LOG_COLUMNS
+
+    def __init__(self) -> None:
+        self.device_id: list[UUID] = []
+        self.ts: list[datetime] = []
+        self.connect_status: list[ConnectStatus] = []
+        self.ip: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.device_id)
+
+    def append(self, device_id: UUID, ts: datetime, connect_status: ConnectStatus, ip: str) -> None:
+        self.device_id.append(device_id)
+        self.ts.append(ts)
+        self.connect_status.append(connect_status)
+        self.ip.append(ip)
+
+    def extend_batch(self, other: "ConnectLogBatch") -> None:
+        """Append every event of another batch."""
+        for column in CONNECT_LOG_COLUMNS:
+            getattr(self, column).extend(getattr(other, column))
+
+    def latest(self) -> "ConnectLogBatch":
+        """
+        Collapse the batch to the newest connect or disconnect per device.
+        Failed attempts do not change the device status and are left out.
+        """
+        newest: dict[UUID, int] = {}
+        for i, (device_id, ts, connect_status) in enumerate(
+            zip(self.device_id, self.ts, self.connect_status, strict=True)
+        ):
+            if connect_status == ConnectStatus.FAILED:
+                continue
+            j = newest.get(device_id)
+            if j is None or ts >= self.ts[j]:
+                newest[device_id] = i
+
+        latest = ConnectLogBatch()
+        for i in newest.values():
+            for column in CONNECT_LOG_COLUMNS:
+                getattr(latest, column).append(getattr(self, column)[i])
+        return latest
+
+
+class FlushRetry:
+    """
+    Tracks the consecutive failed flushes of a write-behind buffer. The failed batch
+    is kept for `FLUSH_MAX_RETRIES` more flushes, each one delayed by an exponential
+    backoff capped at `FLUSH_MAX_RETRY_BACKOFF_SEC`.
+    """
+
+    def __init__(self, max_retries: int, backoff: float, max_backoff: float) -> None:
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self.failures = 0
+        self._retry_at = 0.0
+
+    async def wait(self) -> None:
+        """Wait until the backoff of the last failure has passed."""
+        delay = self._retry_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def failed(self) -> bool:
+        """
+        Record a failed flush.
+
+        Returns:
+            bool: Whether the batch should be kept for another try.
+        """
+        self.failures += 1
+        if self.failures > self._max_retries:
+            self.succeeded()
+            return False
+        backoff = min(self._backoff * 2 ** (self.failures - 1), self._max_backoff)
+        self._retry_at = asyncio.get_running_loop().time() + backoff
+        return True
+
+    def succeeded(self) -> None:
+        self.failures = 0
+        self._retry_at = 0.0
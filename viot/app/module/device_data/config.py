@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DeviceDataSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="VIOT_DEVICE_DATA_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    INGEST_BATCH_SIZE: int = 5000
+    """Flush the ingestion buffer once it holds this many data points."""
+    INGEST_FLUSH_INTERVAL_SEC: float = 1.0
+    """Flush the ingestion buffer at least this often, even if it is not full."""
+    INGEST_MAX_PENDING: int = 50000
+    """Producers wait for a flush once this many data points are buffered."""
+
+    FLUSH_MAX_RETRIES: int = 5
+    """A batch that failed to be written is retried this many times before it is dropped."""
+    FLUSH_RETRY_BACKOFF_SEC: float = 1.0
+    """Delay before retrying a failed batch, doubled on each failure."""
+    FLUSH_MAX_RETRY_BACKOFF_SEC: float = 30.0
+
+    CONNECT_LOG_BATCH_SIZE: int = 1000
+    """Flush the connect log buffer once it holds this many events."""
+    CONNECT_LOG_FLUSH_INTERVAL_SEC: float = 1.0
+    """Flush the connect log buffer at least this often, even if it is not full."""
+    CONNECT_LOG_MAX_PENDING: int = 50000
+    """Connect events are dropped once this many are buffered, so producers never wait."""
+
+    LATEST_CACHE_TTL_SEC: int = 3600
+    """Latest values of a device stay cached this long after its last write."""
+
+    DOWNSAMPLE_FETCH_SIZE: int = 10000
+    """Rows fetched per round trip from the server-side cursor of a downsampled query."""
+
+    EXPORT_FETCH_SIZE: int = 10000
+    """Rows fetched per round trip, and written per chunk, by a timeseries export."""
+
+    BACKTEST_FETCH_SIZE: int = 50000
+    """Rows fetched per round trip, and evaluated per chunk, by a rule backtest."""
+
+    STREAM_QUEUE_SIZE: int = 256
+    """Messages buffered per live stream socket. The oldest is dropped when a client lags."""
+
+    COMPRESS_AFTER_DAYS: int = 7
+    """Chunks of `device_data` older than this are compressed."""
+    DROP_AFTER_DAYS: int | None = None
+    """Chunks of `device_data` older than this are dropped for every team. `None` keeps them."""
+    RETENTION_JOB_INTERVAL_SEC: float = 3600
+    """How often per-team retention settings are enforced, by a single worker."""
+    POLICIES_LOCK_TTL_SEC: float = 300
+    """Storage policies are applied by the first worker to start within this window."""
+
+
+@lru_cache
+def get_device_data_settings() -> DeviceDataSettings:
+    return DeviceDataSettings()
+
+
+device_data_settings: DeviceDataSettings = get_device_data_settings()
@@ -1,5 +1,8 @@
 from enum import IntEnum, StrEnum
 
+# Field of a gateway payload entry holding the id of the sub-device it belongs to
+SUB_DEVICE_KEY = "sub_device_id"
+
 
 class ConnectStatus(IntEnum):
     """Connect status
@@ -50,6 +53,30 @@ class IntervalType(StrEnum):
     YEAR = "year"
 
 
+class DownsampleMethod(StrEnum):
+    """Downsample method
+
+    LTTB = lttb
+    MINMAX = minmax
+    """
+
+    LTTB = "lttb"
+    MINMAX = "minmax"
+
+
+class ExportFormat(StrEnum):
+    """Export format
+
+    NDJSON = ndjson
+    CSV = csv
+    PARQUET = parquet
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
 class Timezone(StrEnum):
     """
     Timezone represents a timezone string.
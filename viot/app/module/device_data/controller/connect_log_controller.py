@@ -7,7 +7,7 @@ from fastapi import Path, Query
 from injector import inject
 
 from app.common.controller import Controller
-from app.common.dto.types import OrderByQuery, PageQuery, PageSizeQuery
+from app.common.dto.types import CursorQuery, OrderByQuery, PageSizeQuery, WithTotalQuery
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import RequireTeamPermission
@@ -39,8 +39,9 @@ class ConnectLogController(Controller):
         *,
         team_id: Annotated[UUID, Path(...)],
         device_id: Annotated[UUID, Path(...)],
-        page: PageQuery,
         page_size: PageSizeQuery,
+        after: CursorQuery = None,
+        with_total: WithTotalQuery = False,
         start_date: Annotated[datetime | None, Query(...)] = None,
         end_date: Annotated[datetime | None, Query(...)] = None,
         order_by: OrderByQuery,
@@ -50,8 +51,9 @@ class ConnectLogController(Controller):
             content=await self._connect_log_service.get_connect_logs(
                 team_id=team_id,
                 device_id=device_id,
-                page=page,
                 page_size=page_size,
+                after=after,
+                with_total=with_total,
                 start_date=start_date,
                 end_date=end_date,
                 order_by=order_by,
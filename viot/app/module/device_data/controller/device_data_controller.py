@@ -3,6 +3,7 @@ from uuid import UUID
 
 from classy_fastapi import get
 from fastapi import Path, Query
+from fastapi.responses import StreamingResponse
 from injector import inject
 
 from app.common.controller import Controller
@@ -17,7 +18,9 @@ from ..dto.device_data_dto import (
     KeySetQuery,
     LatestDataPointDto,
     TimeseriesAggregationQueryDto,
+    TimeseriesExportQueryDto,
 )
+from ..export import MEDIA_TYPES
 from ..service.device_attribute_service import DeviceAttributeService
 from ..service.device_data_service import DeviceDataService
 
@@ -157,3 +160,34 @@ class DeviceDataController(Controller):
             ),
             status_code=200,
         )
+
+    @get(
+        "/{device_id}/timeseries/export",
+        summary="Export timeseries data by keys",
+        status_code=200,
+        response_class=StreamingResponse,
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.READ)],
+    )
+    async def export_timeseries_data_by_keys(
+        self,
+        *,
+        device_id: Annotated[UUID, Path(...)],
+        query_dto: Annotated[TimeseriesExportQueryDto, Query(...)],
+    ) -> StreamingResponse:
+        """
+        Streams every raw data point of the range as a file, without the `limit`
+        of the timeseries endpoint.
+
+        Formats are `ndjson` (one `{"ts", "key", "value"}` object per line), `csv`
+        (`ts,key,value` columns) and `parquet` (typed value columns, requires the
+        `parquet` extra).
+        """
+        return StreamingResponse(
+            content=self._device_data_service.export_timeseries_data(
+                device_id=device_id, query_dto=query_dto
+            ),
+            media_type=MEDIA_TYPES[query_dto.format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{device_id}.{query_dto.format}"'
+            },
+        )
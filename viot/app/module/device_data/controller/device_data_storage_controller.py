@@ -0,0 +1,82 @@
+from typing import Annotated
+from uuid import UUID
+
+from classy_fastapi import get, put
+from fastapi import Body, Path
+from injector import inject
+
+from app.common.controller import Controller
+from app.common.fastapi.serializer import JSONResponse
+from app.database.dependency import DependSession
+from app.module.auth.constants import ViotUserRole
+from app.module.auth.dependency import RequireGlobalRole, RequireTeamPermission
+from app.module.auth.permission import TeamDeviceDataPermission, TeamProfilePermission
+
+from ..dto.device_data_storage_dto import (
+    CompressionStatsDto,
+    DeviceDataRetentionDto,
+    DeviceDataRetentionUpdateDto,
+)
+from ..service.device_data_storage_service import DeviceDataStorageService
+
+
+class DeviceDataStorageController(Controller):
+    @inject
+    def __init__(self, device_data_storage_service: DeviceDataStorageService) -> None:
+        super().__init__(tags=["Device Data Storage"], dependencies=[DependSession])
+        self._device_data_storage_service = device_data_storage_service
+
+    @get(
+        "/teams/{team_id}/device-data/retention",
+        summary="Get device data retention of a team",
+        status_code=200,
+        responses={200: {"model": DeviceDataRetentionDto}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.READ)],
+    )
+    async def get_team_retention(
+        self, *, team_id: Annotated[UUID, Path(...)]
+    ) -> JSONResponse[DeviceDataRetentionDto]:
+        """Get how long device data of the team is kept. `null` means forever."""
+        return JSONResponse(
+            content=await self._device_data_storage_service.get_team_retention(team_id=team_id),
+            status_code=200,
+        )
+
+    @put(
+        "/teams/{team_id}/device-data/retention",
+        summary="Update device data retention of a team",
+        status_code=200,
+        responses={200: {"model": DeviceDataRetentionDto}},
+        dependencies=[RequireTeamPermission(TeamProfilePermission.MANAGE)],
+    )
+    async def update_team_retention(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        retention_update_dto: Annotated[DeviceDataRetentionUpdateDto, Body(...)],
+    ) -> JSONResponse[DeviceDataRetentionDto]:
+        """
+        Update how long device data of the team is kept.
+
+        Expired data is deleted periodically, not immediately.
+        """
+        return JSONResponse(
+            content=await self._device_data_storage_service.update_team_retention(
+                team_id=team_id, retention_update_dto=retention_update_dto
+            ),
+            status_code=200,
+        )
+
+    @get(
+        "/device-data/compression-stats",
+        summary="Get device data compression stats",
+        status_code=200,
+        responses={200: {"model": CompressionStatsDto}},
+        dependencies=[RequireGlobalRole(ViotUserRole.ADMIN)],
+    )
+    async def get_compression_stats(self) -> JSONResponse[CompressionStatsDto]:
+        """Get the compression ratio of the device data hypertable."""
+        return JSONResponse(
+            content=await self._device_data_storage_service.get_compression_stats(),
+            status_code=200,
+        )
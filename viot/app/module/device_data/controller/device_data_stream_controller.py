@@ -0,0 +1,69 @@
+import asyncio
+from typing import Annotated
+from uuid import UUID
+
+from classy_fastapi import websocket
+from fastapi import Path, WebSocket, WebSocketException, status
+from injector import inject
+
+from app.common.controller import Controller
+from app.common.exception.base import InternalServerException
+from app.database.session import transactional_session
+from app.module.auth.dependency import RequireWebSocketTeamPermission
+from app.module.auth.permission import TeamDeviceDataPermission
+from app.module.device.service.device_service import DeviceService
+
+from ..service.device_data_stream_service import DeviceDataStreamService
+
+
+class DeviceDataStreamController(Controller):
+    @inject
+    def __init__(
+        self,
+        device_data_stream_service: DeviceDataStreamService,
+        device_service: DeviceService,
+    ) -> None:
+        # No `DependSession` here, a request session would stay open for the
+        # whole lifetime of the socket.
+        super().__init__(prefix="/teams/{team_id}/devices", tags=["Device Data"])
+        self._device_data_stream_service = device_data_stream_service
+        self._device_service = device_service
+
+    @websocket("/{device_id}/timeseries/stream")
+    async def stream_timeseries(
+        self,
+        websocket: WebSocket,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        device_id: Annotated[UUID, Path(...)],
+        _: Annotated[None, RequireWebSocketTeamPermission(TeamDeviceDataPermission.READ)],
+    ) -> None:
+        """
+        Push the data points of a device as they are ingested.
+
+        Each message is a JSON list of `{"ts", "key", "value"}` points. The access
+        token is passed in the `token` query parameter.
+        """
+        try:
+            async with transactional_session():
+                await self._device_service.get_device_by_id_and_team_id(
+                    device_id=device_id, team_id=team_id
+                )
+        except InternalServerException as e:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.message)
+
+        await websocket.accept()
+        async with self._device_data_stream_service.subscribe(device_id) as messages:
+            sender = asyncio.create_task(self._forward(websocket, messages))
+            try:
+                # Clients don't send anything, receiving only detects the disconnect.
+                while (await websocket.receive())["type"] != "websocket.disconnect":
+                    pass
+            finally:
+                sender.cancel()
+                await asyncio.gather(sender, return_exceptions=True)
+
+    @staticmethod
+    async def _forward(websocket: WebSocket, messages: asyncio.Queue[str]) -> None:
+        while True:
+            await websocket.send_text(await messages.get())
@@ -0,0 +1,51 @@
+import logging
+from typing import Any
+from uuid import UUID
+
+import msgspec
+
+from .constants import SUB_DEVICE_KEY
+
+logger = logging.getLogger(__name__)
+
+_sub_device_payload_decoder = msgspec.json.Decoder(list[dict[str, Any]] | dict[str, Any])
+
+
+def decode_sub_device_payload(data: bytes) -> dict[UUID, dict[str, Any]]:
+    """
+    Split a gateway message published on `v2/devices/sub/data` into one payload
+    per sub-device.
+
+    A message is either a single object or an array of objects, each naming its
+    sub-device with `sub_device_id`:
+    ```json
+    [
+        {"sub_device_id": "0b1c...", "temperature": 25.5},
+        {"sub_device_id": "9f3a...", "temperature": 24.1, "humidity": 60}
+    ]
+    ```
+    Entries for the same sub-device are merged. Entries without a valid
+    `sub_device_id` are skipped.
+
+    Raises:
+        msgspec.DecodeError: If the message is not a JSON object or array of objects.
+    """
+    entries = _sub_device_payload_decoder.decode(data)
+    if isinstance(entries, dict):
+        entries = [entries]
+
+    payloads: dict[UUID, dict[str, Any]] = {}
+    for entry in entries:
+        raw_id = entry.pop(SUB_DEVICE_KEY, None)
+        try:
+            sub_device_id = UUID(raw_id)
+        except (TypeError, ValueError, AttributeError):
+            logger.warning(f"Skipping sub-device entry with invalid {SUB_DEVICE_KEY}: {raw_id}")
+            continue
+
+        payload = payloads.get(sub_device_id)
+        if payload is None:
+            payloads[sub_device_id] = entry
+        else:
+            payload.update(entry)
+    return payloads
@@ -0,0 +1,76 @@
+"""
+Reduce a timeseries to a fixed number of points while keeping its visual shape.
+
+Both functions take the timestamps `x` (sorted ascending) and values `y` as
+NumPy arrays and return the indices of the points to keep, in ascending order.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+
+def lttb(x: npt.NDArray[np.number], y: npt.NDArray[np.number], n: int) -> npt.NDArray[np.intp]:
+    """
+    Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are split
+    into `n - 2` buckets of equal size. Each bucket keeps the point that forms the
+    largest triangle with the point kept from the previous bucket and the average
+    of the next bucket. Bucket bounds and averages are computed up front, only the
+    (inherently sequential) choice of the kept point loops over the buckets.
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # n - 1 edges delimit the n - 2 buckets over x[1:size - 1]. Buckets hold at
+    # least one point because n < size.
+    edges = np.linspace(1, size - 1, n - 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # The third vertex of a bucket is the average of the next one, or the last
+    # point for the last bucket.
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n, dtype=np.intp)
+    selected[0] = a = 0
+    selected[-1] = size - 1
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x: npt.NDArray[np.number], y: npt.NDArray[np.number], n: int) -> npt.NDArray[np.intp]:
+    """
+    Keep the minimum and the maximum of `n // 2` buckets of equal size.
+
+    Cheaper than `lttb` and never hides a spike, at the cost of a noisier line.
+    """
+    size = len(x)
+    if n >= size or n < 2:
+        return np.arange(size)
+
+    edges = np.linspace(0, size, n // 2 + 1).astype(np.intp)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+
+    def first_index_of(bucket_values: npt.NDArray[np.number]) -> npt.NDArray[np.intp]:
+        # Every bucket holds its own extreme, so the first match at or after the
+        # start of a bucket lies inside it.
+        matches = np.flatnonzero(y == np.repeat(bucket_values, counts))
+        return matches[np.searchsorted(matches, starts)]
+
+    return np.union1d(
+        first_index_of(np.minimum.reduceat(y, starts)),
+        first_index_of(np.maximum.reduceat(y, starts)),
+    )
@@ -1,7 +1,7 @@
 from datetime import datetime
 
-from app.common.dto import BaseOutDto, PagingDto
-from app.database.repository.pagination import Page
+from app.common.dto import BaseOutDto, CursorPagingDto
+from app.database.repository.pagination import CursorPage
 
 from ..constants import ConnectStatus
 from ..model.connect_log import ConnectLog
@@ -18,12 +18,13 @@ class ConnectLogDto(BaseOutDto):
         return cls.model_validate(connect_log)
 
 
-class PagingConnectLogDto(PagingDto[ConnectLogDto]):
+class PagingConnectLogDto(CursorPagingDto[ConnectLogDto]):
     @classmethod
-    def from_page(cls, page: Page[ConnectLog]) -> "PagingConnectLogDto":
+    def from_page(cls, page: CursorPage[ConnectLog]) -> "PagingConnectLogDto":
         return cls(
             items=[ConnectLogDto.from_model(log) for log in page.items],
-            total_items=page.total_items,
-            page=page.page,
             page_size=page.page_size,
+            next_cursor=page.next_cursor,
+            total_items=page.total_items,
+            approximate=page.approximate,
         )
@@ -8,7 +8,13 @@ from app.common.dto import BaseOutDto
 from app.common.dto.base import BaseInDto
 from app.database.repository.pagination import SortDirection
 
-from ..constants import AggregationType, IntervalType, Timezone
+from ..constants import (
+    AggregationType,
+    DownsampleMethod,
+    ExportFormat,
+    IntervalType,
+    Timezone,
+)
 from ..model.device_data import DeviceData
 from ..model.device_data_latest import DeviceDataLatest
 
@@ -23,7 +29,7 @@ def keys_comma_separated_values(value: str) -> set[str]:
 KeySetQuery = Annotated[set[str], Depends(keys_comma_separated_values)]
 
 
-class TimeseriesAggregationQueryDto(BaseInDto):
+class TimeseriesRangeQueryDto(BaseInDto):
     keys__: str = Field(
         alias="keys",
         description="A string value representing the comma-separated list of telemetry keys.",
@@ -36,6 +42,30 @@ class TimeseriesAggregationQueryDto(BaseInDto):
     end_date: datetime = Field(
         alias="endDate", description="A string value representing the end date in ISO format, UTC."
     )
+
+    @computed_field  # type: ignore
+    @property
+    def keys(self) -> set[str]:
+        return keys_comma_separated_values(self.keys__)
+
+    @field_validator("start_date", mode="before")
+    @classmethod
+    def transform_start_date(cls, value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+    @field_validator("end_date", mode="before")
+    @classmethod
+    def transform_end_date(cls, value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+    @model_validator(mode="after")
+    def validate_range(self) -> Self:
+        if self.start_date >= self.end_date:
+            raise ValueError("End date must be greater than start date")
+        return self
+
+
+class TimeseriesAggregationQueryDto(TimeseriesRangeQueryDto):
     interval_type: IntervalType | None = Field(
         None, alias="intervalType", description="A string value representing the interval type."
     )
@@ -58,11 +88,28 @@ class TimeseriesAggregationQueryDto(BaseInDto):
         alias="limit",
         description=(
             "An integer value that represents a max number of timeseries data points to fetch."
-            " This parameter is used only when the `agg` parameter is not provided."
+            " This parameter is used only when the `agg` and `downsample` parameters"
+            " are not provided."
         ),
         ge=0,
         le=500,
     )
+    downsample: DownsampleMethod | None = Field(
+        None,
+        alias="downsample",
+        description=(
+            "A string value representing the downsample method. The numeric data points"
+            " of the whole range are reduced to `points` points per key."
+            " Cannot be combined with `agg`."
+        ),
+    )
+    points: int = Field(
+        500,
+        alias="points",
+        description="An integer value representing the max number of points per key.",
+        ge=3,
+        le=5000,
+    )
     timezone: Timezone | None = Field(
         None,
         description="A string value representing the timezone.",
@@ -73,11 +120,6 @@ class TimeseriesAggregationQueryDto(BaseInDto):
         description="Sort order. asc (ascending) or desc (descending).",
     )
 
-    @computed_field  # type: ignore
-    @property
-    def keys(self) -> set[str]:
-        return keys_comma_separated_values(self.keys__)
-
     @computed_field  # type: ignore
     @property
     def interval_in_timedelta(self) -> timedelta:
@@ -104,23 +146,21 @@ class TimeseriesAggregationQueryDto(BaseInDto):
     def is_aggregate_query(self) -> bool:
         return self.interval > 0 and self.interval_type is not None and self.agg is not None
 
-    @field_validator("start_date", mode="before")
-    @classmethod
-    def transform_start_date(cls, value: str) -> datetime:
-        return datetime.fromisoformat(value).replace(tzinfo=None)
-
-    @field_validator("end_date", mode="before")
-    @classmethod
-    def transform_end_date(cls, value: str) -> datetime:
-        return datetime.fromisoformat(value).replace(tzinfo=None)
-
     @model_validator(mode="after")
     def validate_dto(self) -> Self:
-        if self.start_date >= self.end_date:
-            raise ValueError("End date must be greater than start date")
+        if self.downsample is not None and self.is_aggregate_query:
+            raise ValueError("Downsample cannot be combined with aggregation")
         return self
 
 
+class TimeseriesExportQueryDto(TimeseriesRangeQueryDto):
+    format: ExportFormat = Field(
+        ExportFormat.NDJSON,
+        alias="format",
+        description="A string value representing the export file format.",
+    )
+
+
 class LatestDataPointDto(BaseOutDto):
     ts: datetime
     key: str
@@ -0,0 +1,44 @@
+from typing import Any
+
+from pydantic import Field
+from sqlalchemy import Row
+
+from app.common.dto import BaseInDto, BaseOutDto
+
+
+class DeviceDataRetentionUpdateDto(BaseInDto):
+    retention_days: int | None = Field(
+        ..., ge=1, description="Number of days device data is kept. `null` keeps data forever."
+    )
+
+
+class DeviceDataRetentionDto(BaseOutDto):
+    retention_days: int | None
+
+
+class CompressionStatsDto(BaseOutDto):
+    total_chunks: int
+    compressed_chunks: int
+    before_compression_bytes: int
+    after_compression_bytes: int
+    compression_ratio: float | None
+
+    @classmethod
+    def from_row(cls, row: Row[Any] | None) -> "CompressionStatsDto":
+        if row is None or not row.number_compressed_chunks:
+            return cls(
+                total_chunks=(row.total_chunks or 0) if row is not None else 0,
+                compressed_chunks=0,
+                before_compression_bytes=0,
+                after_compression_bytes=0,
+                compression_ratio=None,
+            )
+        before = row.before_compression_total_bytes or 0
+        after = row.after_compression_total_bytes or 0
+        return cls(
+            total_chunks=row.total_chunks,
+            compressed_chunks=row.number_compressed_chunks,
+            before_compression_bytes=before,
+            after_compression_bytes=after,
+            compression_ratio=round(before / after, 2) if after else None,
+        )
@@ -0,0 +1,9 @@
+from app.common.exception import BadRequestException
+
+
+class ExportFormatUnavailableException(BadRequestException):
+    def __init__(self, *, format: str, extra: str) -> None:
+        super().__init__(
+            code="EXPORT_FORMAT_UNAVAILABLE",
+            message=f"Export format {format} requires the '{extra}' extra to be installed",
+        )
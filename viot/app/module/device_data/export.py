@@ -0,0 +1,128 @@
+"""
+Encoders turning chunks of `device_data` rows into the bytes of an export file.
+
+Rows are `(ts, key, bool_v, str_v, long_v, double_v, json_v)` tuples, with `json_v`
+as JSON text. Every encoder consumes one chunk at a time and yields its encoded
+bytes right away, so an export never holds more than one chunk in memory.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import Any
+
+import msgspec
+
+from .constants import ExportFormat
+from .exception.device_data_exception import ExportFormatUnavailableException
+from .typed_value import decode_typed_value
+
+ExportRows = Sequence[Sequence[Any]]
+ExportEncoder = Callable[[AsyncIterator[ExportRows]], AsyncIterator[bytes]]
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+_json_encoder = msgspec.json.Encoder()
+
+
+def get_export_encoder(format: ExportFormat) -> ExportEncoder:
+    """
+    Return the encoder of `format`.
+
+    Optional dependencies are imported here rather than in the encoders, so a
+    missing one fails the request before the response starts.
+    """
+    if format == ExportFormat.PARQUET:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ExportFormatUnavailableException(format=format, extra="parquet")
+        return _encode_parquet
+    if format == ExportFormat.CSV:
+        return _encode_csv
+    return _encode_ndjson
+
+
+def _value(row: Sequence[Any]) -> Any:
+    _, _, bool_v, str_v, long_v, double_v, json_v = row
+    if json_v is not None:
+        return msgspec.Raw(json_v)
+    return decode_typed_value(bool_v, str_v, long_v, double_v, None)
+
+
+async def _encode_ndjson(chunks: AsyncIterator[ExportRows]) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        yield _json_encoder.encode_lines(
+            [{"ts": row[0], "key": row[1], "value": _value(row)} for row in rows]
+        )
+
+
+def _csv_value(row: Sequence[Any]) -> Any:
+    _, _, bool_v, str_v, long_v, double_v, json_v = row
+    if bool_v is not None:
+        return "true" if bool_v else "false"
+    if json_v is not None:
+        return json_v
+    return decode_typed_value(None, str_v, long_v, double_v, None)
+
+
+async def _encode_csv(chunks: AsyncIterator[ExportRows]) -> AsyncIterator[bytes]:
+    yield b"ts,key,value\r\n"
+    async for rows in chunks:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows((row[0].isoformat(), row[1], _csv_value(row)) for row in rows)
+        yield buffer.getvalue().encode()
+
+
+class _ParquetSink(io.RawIOBase):
+    """Write-only file handing out what was written since the last `drain`."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _encode_parquet(chunks: AsyncIterator[ExportRows]) -> AsyncIterator[bytes]:
+    """Typed columns are kept as is, every chunk becomes one row group."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("ts", pa.timestamp("us", tz="UTC")),
+            ("key", pa.string()),
+            ("bool_v", pa.bool_()),
+            ("str_v", pa.string()),
+            ("long_v", pa.int64()),
+            ("double_v", pa.float64()),
+            ("json_v", pa.string()),
+        ]
+    )
+    sink = _ParquetSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for rows in chunks:
+            columns = list(zip(*rows, strict=True))
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
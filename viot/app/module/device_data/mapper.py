@@ -1,4 +1,6 @@
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from itertools import groupby
+from operator import attrgetter
 from typing import Any
 
 from sqlalchemy import Row
@@ -7,6 +9,17 @@ from .dto.device_data_dto import AggregatedData
 
 
 class AggregatedDataMapper:
+    @staticmethod
+    def map_rows_by_key(
+        rows: Sequence[Row[Any]],
+        convert_method: Callable[[Sequence[Row[Any]]], list[AggregatedData]],
+    ) -> dict[str, list[AggregatedData]]:
+        """Split multi-key aggregation rows, ordered by key, and convert each key's rows."""
+        return {
+            key: convert_method(list(key_rows))
+            for key, key_rows in groupby(rows, key=attrgetter("key"))
+        }
+
     @staticmethod
     def map_from_avg_rows(rows: Sequence[Row[Any]]) -> list[AggregatedData]:
         data: list[AggregatedData] = []
@@ -16,6 +16,8 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.base import Base
 
+from ..typed_value import TypedValue, decode_typed_value
+
 
 class DeviceDataLatest(Base):
     __tablename__ = "device_data_latest"
@@ -37,15 +39,5 @@ class DeviceDataLatest(Base):
     )
 
     @property
-    def value(self) -> bool | str | int | float | dict[str, Any] | None:
-        if self.bool_v is not None:
-            return self.bool_v
-        if self.str_v is not None:
-            return self.str_v
-        if self.long_v is not None:
-            return self.long_v
-        if self.double_v is not None:
-            return self.double_v
-        if self.json_v is not None:
-            return self.json_v
-        return None
+    def value(self) -> TypedValue | None:
+        return decode_typed_value(self.bool_v, self.str_v, self.long_v, self.double_v, self.json_v)
@@ -0,0 +1,16 @@
+from uuid import UUID
+
+from sqlalchemy import INTEGER, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.database.mixin import DateTimeMixin
+
+
+class DeviceDataRetention(Base, DateTimeMixin):
+    __tablename__ = "device_data_retention"
+
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("teams.id", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True
+    )
+    retention_days: Mapped[int] = mapped_column(INTEGER)
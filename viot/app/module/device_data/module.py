@@ -2,13 +2,22 @@ from injector import Binder, Module, SingletonScope
 
 from .controller.connect_log_controller import ConnectLogController
 from .controller.device_data_controller import DeviceDataController
+from .controller.device_data_storage_controller import DeviceDataStorageController
+from .controller.device_data_stream_controller import DeviceDataStreamController
 from .repository.device_attribute_repository import DeviceAttributeRepository
 from .repository.device_data_aggregation_repository import DeviceDataAggregationRepository
+from .repository.device_data_latest_cache_repository import DeviceDataLatestCacheRepository
 from .repository.device_data_latest_repository import DeviceDataLatestRepository
 from .repository.device_data_repository import DeviceDataRepository
+from .repository.device_data_retention_repository import DeviceDataRetentionRepository
+from .repository.device_data_storage_repository import DeviceDataStorageRepository
+from .service.connect_log_ingestion_service import ConnectLogIngestionService
 from .service.connect_log_service import ConnectLogService
 from .service.device_attribute_service import DeviceAttributeService
+from .service.device_data_ingestion_service import DeviceDataIngestionService
 from .service.device_data_service import DeviceDataService
+from .service.device_data_storage_service import DeviceDataStorageService
+from .service.device_data_stream_service import DeviceDataStreamService
 
 
 class DeviceDataModule(Module):
@@ -21,10 +30,29 @@ class DeviceDataModule(Module):
             to=DeviceDataAggregationRepository,
             scope=SingletonScope,
         )
+        binder.bind(
+            DeviceDataLatestCacheRepository,
+            to=DeviceDataLatestCacheRepository,
+            scope=SingletonScope,
+        )
+        binder.bind(
+            DeviceDataStorageRepository, to=DeviceDataStorageRepository, scope=SingletonScope
+        )
+        binder.bind(
+            DeviceDataRetentionRepository, to=DeviceDataRetentionRepository, scope=SingletonScope
+        )
 
         binder.bind(DeviceDataService, to=DeviceDataService, scope=SingletonScope)
         binder.bind(DeviceAttributeService, to=DeviceAttributeService, scope=SingletonScope)
         binder.bind(ConnectLogService, to=ConnectLogService, scope=SingletonScope)
+        binder.bind(DeviceDataIngestionService, to=DeviceDataIngestionService, scope=SingletonScope)
+        binder.bind(ConnectLogIngestionService, to=ConnectLogIngestionService, scope=SingletonScope)
+        binder.bind(DeviceDataStorageService, to=DeviceDataStorageService, scope=SingletonScope)
+        binder.bind(DeviceDataStreamService, to=DeviceDataStreamService, scope=SingletonScope)
 
         binder.bind(DeviceDataController, to=DeviceDataController, scope=SingletonScope)
         binder.bind(ConnectLogController, to=ConnectLogController, scope=SingletonScope)
+        binder.bind(
+            DeviceDataStorageController, to=DeviceDataStorageController, scope=SingletonScope
+        )
+        binder.bind(DeviceDataStreamController, to=DeviceDataStreamController, scope=SingletonScope)
@@ -1,11 +1,13 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, delete
+from sqlalchemy import and_, delete, text
 
 from app.database.repository import PageableRepository
 
+from ..batch import CONNECT_LOG_COLUMNS, ConnectLogBatch
 from ..model.connect_log import ConnectLog
+from ..sql_queries import INSERT_CONNECT_LOG_BATCH_QUERY
 
 
 class ConnectLogRepository(PageableRepository[ConnectLog, tuple[UUID, datetime]]):
@@ -24,3 +26,10 @@ class ConnectLogRepository(PageableRepository[ConnectLog, tuple[UUID, datetime]]
 
         stmt = delete(ConnectLog).where(and_(*conditions))
         await self.session.execute(stmt)
+
+    async def insert_batch(self, batch: ConnectLogBatch) -> None:
+        """Write a batch with a single `INSERT ... SELECT unnest(...)`, skipping duplicates."""
+        await self.session.execute(
+            text(INSERT_CONNECT_LOG_BATCH_QUERY),
+            {column: getattr(batch, column) for column in CONNECT_LOG_COLUMNS},
+        )
@@ -12,11 +12,18 @@ from ..dto.device_data_dto import AggregatedData
 from ..mapper import AggregatedDataMapper
 from ..sql_queries import (
     FIND_AVG_QUERY,
+    FIND_AVG_ROLLUP_QUERY,
     FIND_COUNT_QUERY,
+    FIND_COUNT_ROLLUP_QUERY,
     FIND_MAX_QUERY,
+    FIND_MAX_ROLLUP_QUERY,
     FIND_MIN_QUERY,
+    FIND_MIN_ROLLUP_QUERY,
     FIND_SUM_QUERY,
+    FIND_SUM_ROLLUP_QUERY,
     FROM_WHERE_CLAUSE,
+    ROLLUP_GROUP_CLAUSE,
+    ROLLUP_SOURCE_CTE,
 )
 
 QUERY_MAP: dict[AggregationType, str] = {
@@ -26,6 +33,13 @@ QUERY_MAP: dict[AggregationType, str] = {
     AggregationType.SUM: FIND_SUM_QUERY,
     AggregationType.COUNT: FIND_COUNT_QUERY,
 }
+ROLLUP_QUERY_MAP: dict[AggregationType, str] = {
+    AggregationType.AVG: FIND_AVG_ROLLUP_QUERY,
+    AggregationType.MAX: FIND_MAX_ROLLUP_QUERY,
+    AggregationType.MIN: FIND_MIN_ROLLUP_QUERY,
+    AggregationType.SUM: FIND_SUM_ROLLUP_QUERY,
+    AggregationType.COUNT: FIND_COUNT_ROLLUP_QUERY,
+}
 CONVERT_METHOD_MAP: dict[AggregationType, Callable[[Sequence[Row[Any]]], list[AggregatedData]]] = {
     AggregationType.AVG: AggregatedDataMapper.map_from_avg_rows,
     AggregationType.MAX: AggregatedDataMapper.map_from_max_rows,
@@ -33,6 +47,38 @@ CONVERT_METHOD_MAP: dict[AggregationType, Callable[[Sequence[Row[Any]]], list[Ag
     AggregationType.SUM: AggregatedDataMapper.map_from_sum_rows,
     AggregationType.COUNT: AggregatedDataMapper.map_from_count_rows,
 }
+# Continuous aggregates, coarsest first (see the `device_data_continuous_aggregates` migration)
+ROLLUPS: tuple[tuple[timedelta, str], ...] = (
+    (timedelta(days=1), "device_data_daily"),
+    (timedelta(hours=1), "device_data_hourly"),
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def select_rollup(
+    *, bucket_width: timedelta, start_date: datetime, end_date: datetime, timezone: Timezone
+) -> tuple[timedelta, str] | None:
+    """
+    Pick the coarsest rollup that can answer the query exactly.
+
+    A rollup qualifies when its width divides `bucket_width`, `start_date` falls on
+    a rollup bucket boundary (so every requested bucket is made of whole rollup
+    buckets) and the range covers at least one rollup bucket. Rollups are bucketed
+    in UTC, so other timezones always read the raw data.
+    """
+    if timezone != Timezone.UTC:
+        return None
+
+    start = start_date.replace(tzinfo=None)
+    for width, rollup in ROLLUPS:
+        if (
+            bucket_width % width == timedelta(0)
+            and (start - _EPOCH) % width == timedelta(0)
+            and end_date - start_date >= width
+        ):
+            return width, rollup
+    return None
 
 
 class DeviceDataAggregationRepository(AsyncSqlalchemyRepository):
@@ -41,25 +87,45 @@ class DeviceDataAggregationRepository(AsyncSqlalchemyRepository):
         *,
         aggregation_type: AggregationType,
         device_id: UUID,
-        key: str,
+        keys: set[str],
         start_date: datetime,
         end_date: datetime,
         bucket_width: timedelta,
         timezone: Timezone,
-    ) -> list[AggregatedData]:
-        query = QUERY_MAP[aggregation_type]
+    ) -> dict[str, list[AggregatedData]]:
+        """
+        Aggregate all `keys` in a single query. Keys without data in the range are
+        missing from the result.
+
+        When a continuous aggregate fits the query (see `select_rollup`), whole
+        rollup buckets are read from it and only the tail after the last whole
+        rollup bucket is read from `device_data`.
+        """
         convert_method = CONVERT_METHOD_MAP[aggregation_type]
+        params: dict[str, Any] = {
+            "device_id": device_id,
+            "keys": list(keys),
+            "start_date": start_date,
+            "end_date": end_date,
+            "bucket_width": bucket_width,
+            "timezone": timezone,
+        }
+
+        rollup = select_rollup(
+            bucket_width=bucket_width, start_date=start_date, end_date=end_date, timezone=timezone
+        )
+        if rollup is None:
+            return await self._execute(
+                QUERY_MAP[aggregation_type] + FROM_WHERE_CLAUSE, params, convert_method
+            )
 
+        width, rollup_name = rollup
+        params["rollup_end_date"] = start_date + (end_date - start_date) // width * width
         return await self._execute(
-            query,
-            {
-                "device_id": device_id,
-                "key": key,
-                "start_date": start_date,
-                "end_date": end_date,
-                "bucket_width": bucket_width,
-                "timezone": timezone,
-            },
+            ROLLUP_SOURCE_CTE.format(rollup=rollup_name)
+            + ROLLUP_QUERY_MAP[aggregation_type]
+            + ROLLUP_GROUP_CLAUSE,
+            params,
             convert_method,
         )
 
@@ -68,7 +134,7 @@ class DeviceDataAggregationRepository(AsyncSqlalchemyRepository):
         query: str,
         params: dict[str, Any],
         convert_method: Callable[[Sequence[Row[Any]]], list[AggregatedData]],
-    ) -> list[AggregatedData]:
-        stmt = text(query + FROM_WHERE_CLAUSE)
+    ) -> dict[str, list[AggregatedData]]:
+        stmt = text(query)
         rows = (await self.session.execute(stmt, params)).fetchall()
-        return convert_method(rows)
+        return AggregatedDataMapper.map_rows_by_key(rows, convert_method)
@@ -0,0 +1,152 @@
+import logging
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.extension.redis.client import RedisClient
+
+from ..batch import DeviceDataBatch
+from ..config import device_data_settings
+from ..model.device_data_latest import DeviceDataLatest
+from ..typed_value import decode_typed_value
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+COMPLETE_FIELD = "__complete__"
+"""Set on a device hash once it holds every key of the device, see `save_all`."""
+
+# Each field holds "<ts in microseconds>:<JSON value>". A field is only overwritten
+# by a newer entry, so concurrent write-through and read-through fills cannot move
+# a key back in time. ARGV = [ttl, complete, field1, entry1, field2, entry2, ...]
+_SAVE_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+for i = 3, #ARGV, 2 do
+    local current = redis.call('HGET', KEYS[1], ARGV[i])
+    if not current
+        or tonumber(string.match(current, '^(%d+)')) < tonumber(string.match(ARGV[i + 1], '^(%d+)'))
+    then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+if ARGV[2] == '1' then
+    redis.call('HSET', KEYS[1], '__complete__', '1')
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
+
+_json_encoder = msgspec.json.Encoder()
+_json_decoder = msgspec.json.Decoder()
+
+
+class CachedDataPoint(NamedTuple):
+    ts: datetime
+    key: str
+    value: Any
+
+
+def _encode_entry(ts: datetime, json_value: str) -> str:
+    # Timestamps without a timezone are stored as UTC by `timestamptz` too
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return f"{(ts - _EPOCH) // timedelta(microseconds=1)}:{json_value}"
+
+
+def _decode_entry(key: str, entry: str) -> CachedDataPoint:
+    ts, _, value = entry.partition(":")
+    return CachedDataPoint(
+        ts=_EPOCH + timedelta(microseconds=int(ts)), key=key, value=_json_decoder.decode(value)
+    )
+
+
+class DeviceDataLatestCacheRepository:
+    """
+    Latest value of every telemetry key, one Redis hash per device.
+
+    Write-through keeps every cached field fresh, so a partially filled hash can
+    still answer lookups of the keys it holds. Listing all keys of a device needs
+    the hash to be complete, which only a fill from the database guarantees.
+
+    Redis errors are logged and reported as a cache miss, so callers fall back to
+    the database.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._save_script = redis_client.register_script(_SAVE_SCRIPT)
+        self._ttl = device_data_settings.LATEST_CACHE_TTL_SEC
+
+    async def find_all(self, device_id: UUID) -> list[CachedDataPoint] | None:
+        """Return every cached key of the device, or `None` if the hash is not complete."""
+        try:
+            entries: dict[str, str] = await self._redis_client.hgetall(self._name(device_id))
+        except RedisError as e:
+            logger.warning(f"Error while reading latest data cache: {e}")
+            return None
+        if entries.pop(COMPLETE_FIELD, None) is None:
+            return None
+        return [_decode_entry(key, entry) for key, entry in entries.items()]
+
+    async def find_by_keys(
+        self, device_id: UUID, keys: Iterable[str]
+    ) -> list[CachedDataPoint] | None:
+        """
+        Return the cached values of `keys`, or `None` if one of them is missing
+        from a hash that is not complete.
+        """
+        keys = list(keys)
+        try:
+            *entries, complete = await self._redis_client.hmget(
+                self._name(device_id), [*keys, COMPLETE_FIELD]
+            )
+        except RedisError as e:
+            logger.warning(f"Error while reading latest data cache: {e}")
+            return None
+        if complete is None and None in entries:
+            return None
+        return [
+            _decode_entry(key, entry)
+            for key, entry in zip(keys, entries, strict=True)
+            if entry is not None
+        ]
+
+    async def save_all(self, device_id: UUID, data: Sequence[DeviceDataLatest]) -> None:
+        """Fill the hash with every key of the device and mark it complete."""
+        args: list[Any] = [self._ttl, 1]
+        for d in data:
+            args += (d.key, _encode_entry(d.ts, _json_encoder.encode(d.value).decode()))
+        try:
+            await self._save_script(keys=[self._name(device_id)], args=args)
+        except RedisError as e:
+            logger.warning(f"Error while filling latest data cache: {e}")
+
+    async def save_batch(self, batch: DeviceDataBatch) -> None:
+        """Write through a batch holding at most one data point per (device_id, key)."""
+        args_by_device: dict[UUID, list[Any]] = {}
+        for device_id, ts, key, bool_v, str_v, long_v, double_v, json_v in batch.records():
+            if json_v is None:
+                json_v = _json_encoder.encode(
+                    decode_typed_value(bool_v, str_v, long_v, double_v, None)
+                ).decode()
+            args = args_by_device.setdefault(device_id, [self._ttl, 0])
+            args += (key, _encode_entry(ts, json_v))
+
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                for device_id, args in args_by_device.items():
+                    await self._save_script(keys=[self._name(device_id)], args=args, client=pipe)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Error while writing through latest data cache: {e}")
+
+    @staticmethod
+    def _name(device_id: UUID) -> str:
+        return f"device_data_latest:{device_id}"
@@ -1,11 +1,13 @@
 from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from app.database.repository import AsyncSqlalchemyRepository
 
+from ..batch import DEVICE_DATA_COLUMNS, DeviceDataBatch
 from ..model.device_data_latest import DeviceDataLatest
+from ..sql_queries import UPSERT_DEVICE_DATA_LATEST_BATCH_QUERY
 
 
 class DeviceDataLatestRepository(AsyncSqlalchemyRepository):
@@ -19,6 +21,20 @@ class DeviceDataLatestRepository(AsyncSqlalchemyRepository):
         )
         return (await self.session.execute(stmt)).scalars().all()
 
+    async def find_all_by_device_id(self, device_id: UUID) -> Sequence[DeviceDataLatest]:
+        stmt = select(DeviceDataLatest).where(DeviceDataLatest.device_id == device_id)
+        return (await self.session.execute(stmt)).scalars().all()
+
     async def find_all_keys_by_device_id(self, device_id: UUID) -> Sequence[str]:
         stmt = select(DeviceDataLatest.key).where(DeviceDataLatest.device_id == device_id)
         return (await self.session.execute(stmt)).scalars().all()
+
+    async def upsert_batch(self, batch: DeviceDataBatch) -> None:
+        """
+        Upsert a batch holding at most one data point per (device_id, key),
+        see `DeviceDataBatch.latest`. Rows older than the stored value are ignored.
+        """
+        await self.session.execute(
+            text(UPSERT_DEVICE_DATA_LATEST_BATCH_QUERY),
+            {column: getattr(batch, column) for column in DEVICE_DATA_COLUMNS},
+        )
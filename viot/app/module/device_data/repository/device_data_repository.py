@@ -1,13 +1,26 @@
-from collections.abc import Sequence
-from datetime import datetime
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import BIGINT, TEXT, Integer, Row, cast, func, select, text
 
 from app.database.repository import AsyncSqlalchemyRepository
 from app.database.repository.pagination import SortDirection
 
+from ..batch import DEVICE_DATA_COLUMNS, DeviceDataBatch
+from ..config import device_data_settings
+from ..constants import DownsampleMethod
+from ..downsample import lttb, minmax
+from ..dto.device_data_dto import AggregatedData
 from ..model.device_data import DeviceData
+from ..sql_queries import INSERT_DEVICE_DATA_BATCH_QUERY
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+_DOWNSAMPLERS = {DownsampleMethod.LTTB: lttb, DownsampleMethod.MINMAX: minmax}
 
 
 class DeviceDataRepository(AsyncSqlalchemyRepository):
@@ -34,3 +47,169 @@ class DeviceDataRepository(AsyncSqlalchemyRepository):
         stmt = stmt.limit(limit)
 
         return (await self.session.execute(stmt)).scalars().all()
+
+    async def find_downsampled_data_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: set[str],
+        start_date: datetime,
+        end_date: datetime,
+        method: DownsampleMethod,
+        points: int,
+    ) -> dict[str, list[AggregatedData]]:
+        """
+        Reduce the numeric data points of every key in the range to at most `points`.
+
+        Rows are read in `ts` order through a server-side cursor, `DOWNSAMPLE_FETCH_SIZE`
+        at a time, and only their timestamp (in microseconds) and value are kept as
+        NumPy arrays. Booleans count as 0 and 1, string and JSON values are skipped.
+        """
+        value = func.coalesce(
+            DeviceData.double_v, DeviceData.long_v, cast(DeviceData.bool_v, Integer)
+        )
+        stmt = (
+            select(
+                DeviceData.key,
+                cast(func.extract("epoch", DeviceData.ts) * 1_000_000, BIGINT),
+                value,
+            )
+            .filter(
+                DeviceData.device_id == device_id,
+                DeviceData.key.in_(keys),
+                DeviceData.ts >= start_date,
+                DeviceData.ts <= end_date,
+                value.is_not(None),
+            )
+            .order_by(DeviceData.ts.asc())
+            .execution_options(yield_per=device_data_settings.DOWNSAMPLE_FETCH_SIZE)
+        )
+
+        chunks: dict[str, list[tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]]] = {}
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            row_keys, row_ts, row_values = (
+                np.asarray(column) for column in zip(*rows, strict=True)
+            )
+            for key in np.unique(row_keys):
+                mask = row_keys == key
+                chunks.setdefault(str(key), []).append(
+                    (row_ts[mask].astype(np.int64), row_values[mask].astype(np.float64))
+                )
+
+        downsample = _DOWNSAMPLERS[method]
+        result_map: dict[str, list[AggregatedData]] = {}
+        for key, key_chunks in chunks.items():
+            ts = np.concatenate([c[0] for c in key_chunks])
+            values = np.concatenate([c[1] for c in key_chunks])
+            result_map[key] = [
+                AggregatedData(
+                    ts=_EPOCH + timedelta(microseconds=int(ts[i])), value=float(values[i])
+                )
+                for i in downsample(ts, values, points)
+            ]
+        return result_map
+
+    async def stream_data_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: set[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        Yield the rows of the range in `ts` order, `EXPORT_FETCH_SIZE` at a time, from
+        a server-side cursor.
+
+        Rows are `(ts, key, bool_v, str_v, long_v, double_v, json_v)` with `json_v`
+        left as JSON text, so it can be written out without a decode/encode cycle.
+        """
+        stmt = (
+            select(
+                DeviceData.ts,
+                DeviceData.key,
+                DeviceData.bool_v,
+                DeviceData.str_v,
+                DeviceData.long_v,
+                DeviceData.double_v,
+                cast(DeviceData.json_v, TEXT),
+            )
+            .filter(
+                DeviceData.device_id == device_id,
+                DeviceData.key.in_(keys),
+                DeviceData.ts >= start_date,
+                DeviceData.ts <= end_date,
+            )
+            .order_by(DeviceData.ts.asc())
+            .execution_options(yield_per=device_data_settings.EXPORT_FETCH_SIZE)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
+
+    async def stream_points_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: set[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        Yield the data points of the range in `ts` order, `BACKTEST_FETCH_SIZE` at a
+        time, from a server-side cursor.
+
+        Rows are `(ts, key, number, str_v)` with `ts` in microseconds since the epoch
+        and `number` the numeric value (booleans as 0 and 1). JSON values are skipped.
+        """
+        number = func.coalesce(
+            DeviceData.double_v, DeviceData.long_v, cast(DeviceData.bool_v, Integer)
+        )
+        stmt = (
+            select(
+                cast(func.extract("epoch", DeviceData.ts) * 1_000_000, BIGINT),
+                DeviceData.key,
+                number,
+                DeviceData.str_v,
+            )
+            .filter(
+                DeviceData.device_id == device_id,
+                DeviceData.key.in_(keys),
+                DeviceData.ts >= start_date,
+                DeviceData.ts <= end_date,
+                DeviceData.json_v.is_(None),
+            )
+            .order_by(DeviceData.ts.asc())
+            .execution_options(yield_per=device_data_settings.BACKTEST_FETCH_SIZE)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
+
+    async def copy_batch(self, batch: DeviceDataBatch) -> None:
+        """
+        Write a batch with `COPY ... FROM STDIN` on the underlying asyncpg connection.
+
+        `COPY` is all or nothing: if any row collides with an existing primary key,
+        or belongs to a deleted device, the whole batch fails with
+        `UniqueViolationError` or `ForeignKeyViolationError` and the caller should
+        retry with `insert_batch`.
+        """
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(  # type: ignore
+            DeviceData.__tablename__,
+            records=batch.records(),
+            columns=DEVICE_DATA_COLUMNS,
+        )
+
+    async def insert_batch(self, batch: DeviceDataBatch) -> None:
+        """
+        Write a batch with a single `INSERT ... SELECT unnest(...)`, skipping
+        duplicates and points of deleted devices.
+        """
+        await self.session.execute(
+            text(INSERT_DEVICE_DATA_BATCH_QUERY),
+            {column: getattr(batch, column) for column in DEVICE_DATA_COLUMNS},
+        )
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row, text
+
+from app.database.repository import AsyncSqlalchemyRepository
+
+from ..sql_queries import DELETE_TEAM_DEVICE_DATA_BEFORE_QUERY, FIND_COMPRESSION_STATS_QUERY
+
+
+class DeviceDataStorageRepository(AsyncSqlalchemyRepository):
+    """TimescaleDB compression and retention management of the `device_data` hypertable."""
+
+    async def set_compression_policy(self, compress_after: timedelta) -> None:
+        await self.session.execute(
+            text("SELECT remove_compression_policy('device_data', if_exists => true)")
+        )
+        await self.session.execute(
+            text("SELECT add_compression_policy('device_data', compress_after => :compress_after)"),
+            {"compress_after": compress_after},
+        )
+
+    async def set_retention_policy(self, drop_after: timedelta | None) -> None:
+        await self.session.execute(
+            text("SELECT remove_retention_policy('device_data', if_exists => true)")
+        )
+        if drop_after is not None:
+            await self.session.execute(
+                text("SELECT add_retention_policy('device_data', drop_after => :drop_after)"),
+                {"drop_after": drop_after},
+            )
+
+    async def find_compression_stats(self) -> Row[Any] | None:
+        return (await self.session.execute(text(FIND_COMPRESSION_STATS_QUERY))).first()
+
+    async def delete_team_data_before(self, *, team_id: UUID, before: datetime) -> int:
+        result = await self.session.execute(
+            text(DELETE_TEAM_DEVICE_DATA_BEFORE_QUERY), {"team_id": team_id, "before": before}
+        )
+        return result.rowcount  # type: ignore
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from injector import inject
+
+from app.database.session import transactional_session
+from app.module.device.constants import DeviceStatus
+from app.module.device.repository.device_repository import DeviceRepository
+
+from ..batch import ConnectLogBatch, FlushRetry
+from ..config import device_data_settings
+from ..constants import ConnectStatus
+from ..repository.connect_log_repository import ConnectLogRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectLogIngestionService:
+    """
+    Write-behind buffer for device connect/disconnect events. Each flush writes the
+    buffered events to `connect_logs` and the newest status per device to `devices`
+    in one transaction, so the EMQX auth hook never waits on the database.
+
+    The buffer is flushed when it reaches `CONNECT_LOG_BATCH_SIZE` events or every
+    `CONNECT_LOG_FLUSH_INTERVAL_SEC`, whichever comes first. Once
+    `CONNECT_LOG_MAX_PENDING` events are buffered new ones are dropped.
+
+    A batch that fails to be written goes back to the front of the buffer and is
+    retried with a backoff (see `FlushRetry`). It is dropped once the retries are
+    exhausted, or when keeping it would grow the buffer past twice
+    `CONNECT_LOG_MAX_PENDING`.
+    """
+
+    @inject
+    def __init__(
+        self,
+        connect_log_repository: ConnectLogRepository,
+        device_repository: DeviceRepository,
+    ) -> None:
+        self._connect_log_repository = connect_log_repository
+        self._device_repository = device_repository
+        self._batch_size = device_data_settings.CONNECT_LOG_BATCH_SIZE
+        self._flush_interval = device_data_settings.CONNECT_LOG_FLUSH_INTERVAL_SEC
+        self._max_pending = device_data_settings.CONNECT_LOG_MAX_PENDING
+        self._retry = FlushRetry(
+            max_retries=device_data_settings.FLUSH_MAX_RETRIES,
+            backoff=device_data_settings.FLUSH_RETRY_BACKOFF_SEC,
+            max_backoff=device_data_settings.FLUSH_MAX_RETRY_BACKOFF_SEC,
+        )
+
+        self._batch = ConnectLogBatch()
+        self._dropped = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        if self._batch:
+            logger.error(f"Dropped {len(self._batch)} connect events on shutdown, write failed")
+
+    def record(
+        self, *, device_id: UUID, ts: datetime, connect_status: ConnectStatus, ip: str
+    ) -> None:
+        if len(self._batch) >= self._max_pending:
+            self._dropped += 1
+            return
+
+        self._batch.append(device_id, ts, connect_status, ip)
+
+        if len(self._batch) >= self._batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if self._dropped:
+                logger.warning(f"Dropped {self._dropped} connect events, buffer was full")
+                self._dropped = 0
+            if not self._batch:
+                return
+            await self._retry.wait()
+            batch, self._batch = self._batch, ConnectLogBatch()
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self._requeue(batch, e)
+                return
+            self._retry.succeeded()
+
+    def _requeue(self, batch: ConnectLogBatch, error: Exception) -> None:
+        if len(batch) + len(self._batch) > 2 * self._max_pending:
+            logger.error(f"Dropped {len(batch)} connect events, buffer is full: {error}")
+            self._retry.succeeded()
+            return
+        if not self._retry.failed():
+            logger.error(f"Dropped {len(batch)} connect events after retries: {error}")
+            return
+        logger.warning(
+            f"Error while flushing {len(batch)} connect events "
+            f"(attempt {self._retry.failures}), will retry: {error}"
+        )
+        # Events recorded during the failed write go after the older ones
+        batch.extend_batch(self._batch)
+        self._batch = batch
+
+    async def _write(self, batch: ConnectLogBatch) -> None:
+        latest = batch.latest()
+        connected = [status == ConnectStatus.CONNECTED for status in latest.connect_status]
+        async with transactional_session():
+            await self._connect_log_repository.insert_batch(batch)
+            if latest:
+                await self._device_repository.update_connection_batch(
+                    device_ids=latest.device_id,
+                    statuses=[
+                        DeviceStatus.ONLINE if is_connected else DeviceStatus.OFFLINE
+                        for is_connected in connected
+                    ],
+                    ts=latest.ts,
+                    last_connections=[
+                        ts if is_connected else None
+                        for ts, is_connected in zip(latest.ts, connected, strict=True)
+                    ],
+                )
+
+    async def _run_flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
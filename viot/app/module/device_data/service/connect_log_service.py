@@ -3,7 +3,7 @@ from uuid import UUID
 
 from injector import inject
 
-from app.database.repository import Filter, Pageable, Sort
+from app.database.repository import Filter, KeysetPageable, Sort
 from app.database.repository.pagination import SortDirection
 from app.module.device.exception.device_exception import DeviceNotFoundException
 from app.module.device.repository.device_repository import DeviceRepository
@@ -25,8 +25,9 @@ class ConnectLogService:
         *,
         team_id: UUID,
         device_id: UUID,
-        page: int,
         page_size: int,
+        after: str | None,
+        with_total: bool,
         start_date: datetime | None,
         end_date: datetime | None,
         order_by: SortDirection | None,
@@ -40,12 +41,16 @@ class ConnectLogService:
         if end_date:
             filters.append(Filter(field="ts", operator="lte", value=end_date))
 
-        pageable = Pageable(page=page, page_size=page_size, filters=filters)
-
-        if order_by:
-            pageable.sorts.append(Sort(field="ts", direction=order_by))
+        pageable = KeysetPageable(
+            page_size=page_size,
+            sorts=[Sort(field="ts", direction=order_by or "desc")],
+            filters=filters,
+            after=after,
+            with_total=with_total,
+            count_strategy="estimate",
+        )
 
-        connect_log_page = await self._connect_log_repository.find_all_with_paging(pageable)
+        connect_log_page = await self._connect_log_repository.find_all_with_cursor(pageable)
         return PagingConnectLogDto.from_page(connect_log_page)
 
     async def delete_connect_logs(
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from asyncpg.exceptions import ForeignKeyViolationError, UniqueViolationError
+from injector import inject
+
+from app.database.session import transactional_session
+
+from ..batch import DeviceDataBatch, FlushRetry
+from ..config import device_data_settings
+from ..repository.device_data_latest_cache_repository import DeviceDataLatestCacheRepository
+from ..repository.device_data_latest_repository import DeviceDataLatestRepository
+from ..repository.device_data_repository import DeviceDataRepository
+from .device_data_stream_service import DeviceDataStreamService
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceDataIngestionService:
+    """
+    Buffers decoded telemetry and writes it to `device_data` in batches, keeping
+    `device_data_latest` and its Redis cache in sync once per batch. Written batches
+    are then published to live stream subscribers.
+
+    Sources (the EMQX HTTP bridge today, any broker consumer later) only call
+    `ingest`. The buffer is flushed when it reaches `INGEST_BATCH_SIZE` points or
+    every `INGEST_FLUSH_INTERVAL_SEC`, whichever comes first. Producers wait for a
+    flush once `INGEST_MAX_PENDING` points are buffered.
+
+    A batch that fails to be written goes back to the front of the buffer and is
+    retried with a backoff (see `FlushRetry`). It is dropped once the retries are
+    exhausted, or when keeping it would grow the buffer past twice
+    `INGEST_MAX_PENDING`.
+    """
+
+    @inject
+    def __init__(
+        self,
+        device_data_repository: DeviceDataRepository,
+        device_data_latest_repository: DeviceDataLatestRepository,
+        device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+        device_data_stream_service: DeviceDataStreamService,
+    ) -> None:
+        self._device_data_repository = device_data_repository
+        self._device_data_latest_repository = device_data_latest_repository
+        self._device_data_latest_cache_repository = device_data_latest_cache_repository
+        self._device_data_stream_service = device_data_stream_service
+        self._batch_size = device_data_settings.INGEST_BATCH_SIZE
+        self._flush_interval = device_data_settings.INGEST_FLUSH_INTERVAL_SEC
+        self._max_pending = device_data_settings.INGEST_MAX_PENDING
+        self._retry = FlushRetry(
+            max_retries=device_data_settings.FLUSH_MAX_RETRIES,
+            backoff=device_data_settings.FLUSH_RETRY_BACKOFF_SEC,
+            max_backoff=device_data_settings.FLUSH_MAX_RETRY_BACKOFF_SEC,
+        )
+
+        self._batch = DeviceDataBatch()
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        if self._batch:
+            logger.error(f"Dropped {len(self._batch)} data points on shutdown, write failed")
+
+    async def ingest(self, *, device_id: UUID, ts: datetime, payload: Mapping[str, Any]) -> None:
+        if len(self._batch) >= self._max_pending:
+            await self.flush()
+
+        self._batch.extend(device_id, ts, payload)
+
+        if len(self._batch) >= self._batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._batch:
+                return
+            await self._retry.wait()
+            batch, self._batch = self._batch, DeviceDataBatch()
+            try:
+                latest = await self._write(batch)
+            except Exception as e:
+                self._requeue(batch, e)
+                return
+            self._retry.succeeded()
+
+            try:
+                await self._device_data_latest_cache_repository.save_batch(latest)
+                await self._device_data_stream_service.publish(batch)
+            except Exception as e:
+                logger.error(f"Error while publishing {len(batch)} data points: {e}")
+
+    def _requeue(self, batch: DeviceDataBatch, error: Exception) -> None:
+        if len(batch) + len(self._batch) > 2 * self._max_pending:
+            logger.error(f"Dropped {len(batch)} data points, buffer is full: {error}")
+            self._retry.succeeded()
+            return
+        if not self._retry.failed():
+            logger.error(f"Dropped {len(batch)} data points after retries: {error}")
+            return
+        logger.warning(
+            f"Error while flushing {len(batch)} data points "
+            f"(attempt {self._retry.failures}), will retry: {error}"
+        )
+        # Points buffered during the failed write go after the older ones
+        batch.extend_batch(self._batch)
+        self._batch = batch
+
+    async def _write(self, batch: DeviceDataBatch) -> DeviceDataBatch:
+        latest = batch.latest()
+        # The upsert goes first: it opens the session transaction, so the COPY
+        # issued on the raw driver connection afterwards is part of it.
+        try:
+            async with transactional_session():
+                await self._device_data_latest_repository.upsert_batch(latest)
+                await self._device_data_repository.copy_batch(batch)
+        except (UniqueViolationError, ForeignKeyViolationError) as e:
+            # The insert skips duplicates, and points of devices deleted while they
+            # were buffered
+            logger.warning(f"Batch rejected by COPY ({e!r}), falling back to insert")
+            async with transactional_session():
+                await self._device_data_latest_repository.upsert_batch(latest)
+                await self._device_data_repository.insert_batch(batch)
+        return latest
+
+    async def _run_flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
@@ -1,19 +1,26 @@
-import asyncio
 from collections import defaultdict
+from collections.abc import AsyncIterator, Sequence
 from uuid import UUID
 
 from injector import inject
 
+from app.database.session import transactional_session
+
 from ..constants import Timezone
 from ..dto.device_data_dto import (
     AggregatedData,
     DataPointDto,
     LatestDataPointDto,
     TimeseriesAggregationQueryDto,
+    TimeseriesExportQueryDto,
 )
+from ..export import ExportEncoder, get_export_encoder
+from ..model.device_data_latest import DeviceDataLatest
 from ..repository.device_data_aggregation_repository import DeviceDataAggregationRepository
+from ..repository.device_data_latest_cache_repository import DeviceDataLatestCacheRepository
 from ..repository.device_data_latest_repository import DeviceDataLatestRepository
 from ..repository.device_data_repository import DeviceDataRepository
+from ..typed_value import decode_typed_values
 
 
 class DeviceDataService:
@@ -23,31 +30,50 @@ class DeviceDataService:
         device_data_repository: DeviceDataRepository,
         device_data_latest_repository: DeviceDataLatestRepository,
         device_data_aggregation_repository: DeviceDataAggregationRepository,
+        device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
     ) -> None:
         self._device_data_repository = device_data_repository
         self._device_data_latest_repository = device_data_latest_repository
         self._device_data_aggregation_repository = device_data_aggregation_repository
+        self._device_data_latest_cache_repository = device_data_latest_cache_repository
 
     async def get_all_keys(self, *, device_id: UUID) -> set[str]:
-        keys = await self._device_data_latest_repository.find_all_keys_by_device_id(
-            device_id=device_id
-        )
-        return set(keys)
+        cached = await self._device_data_latest_cache_repository.find_all(device_id)
+        if cached is not None:
+            return {d.key for d in cached}
+
+        data = await self._fill_latest_data_cache(device_id)
+        return {d.key for d in data}
 
     async def get_latest_data_by_keys(
         self, *, device_id: UUID, keys: set[str]
     ) -> list[LatestDataPointDto]:
-        data = await self._device_data_latest_repository.find_all_by_device_id_and_keys(
-            device_id=device_id, keys=keys
-        )
-        return [LatestDataPointDto.from_model(d) for d in data]
+        cached = await self._device_data_latest_cache_repository.find_by_keys(device_id, keys)
+        if cached is not None:
+            return [LatestDataPointDto(ts=d.ts, key=d.key, value=d.value) for d in cached]
+
+        data = await self._fill_latest_data_cache(device_id)
+        return [LatestDataPointDto.from_model(d) for d in data if d.key in keys]
 
     async def get_timeseries_data_by_keys(
         self, *, device_id: UUID, query_dto: TimeseriesAggregationQueryDto
     ) -> dict[str, list[DataPointDto]]:
         result_map: defaultdict[str, list[DataPointDto]] = defaultdict(list)
 
-        if not query_dto.is_aggregate_query:
+        if query_dto.downsample is not None:
+            downsampled_data = (
+                await self._device_data_repository.find_downsampled_data_by_device_id_and_keys(
+                    device_id=device_id,
+                    keys=query_dto.keys,
+                    start_date=query_dto.start_date,
+                    end_date=query_dto.end_date,
+                    method=query_dto.downsample,
+                    points=query_dto.points,
+                )
+            )
+            for key, values in downsampled_data.items():
+                result_map[key].extend([DataPointDto.from_model(v) for v in values])
+        elif not query_dto.is_aggregate_query:
             data = await self._device_data_repository.find_data_by_device_id_and_keys(
                 device_id=device_id,
                 keys=query_dto.keys,
@@ -57,8 +83,8 @@ class DeviceDataService:
                 order_by=query_dto.order_by,
             )
 
-            for i in data:
-                result_map[i.key].append(DataPointDto.from_model(i))
+            for i, value in zip(data, decode_typed_values(data), strict=True):
+                result_map[i.key].append(DataPointDto(ts=i.ts, value=value))
         else:
             aggregated_data = await self.find_aggregation_async(device_id, query_dto)
             for key, values in aggregated_data.items():
@@ -72,19 +98,46 @@ class DeviceDataService:
         if not query_dto.is_aggregate_query:
             raise ValueError("Query is not an aggregation query")
 
-        results = await asyncio.gather(
-            *[
-                self._device_data_aggregation_repository.find_aggregation(
-                    aggregation_type=query_dto.agg,  # type: ignore
-                    device_id=device_id,
-                    key=key,
-                    start_date=query_dto.start_date,
-                    end_date=query_dto.end_date,
-                    bucket_width=query_dto.interval_in_timedelta,
-                    timezone=query_dto.timezone or Timezone.UTC,
-                )
-                for key in query_dto.keys
-            ]
+        results = await self._device_data_aggregation_repository.find_aggregation(
+            aggregation_type=query_dto.agg,  # type: ignore
+            device_id=device_id,
+            keys=query_dto.keys,
+            start_date=query_dto.start_date,
+            end_date=query_dto.end_date,
+            bucket_width=query_dto.interval_in_timedelta,
+            timezone=query_dto.timezone or Timezone.UTC,
         )
 
-        return dict(zip(query_dto.keys, results, strict=True))
+        return {key: results.get(key, []) for key in query_dto.keys}
+
+    def export_timeseries_data(
+        self, *, device_id: UUID, query_dto: TimeseriesExportQueryDto
+    ) -> AsyncIterator[bytes]:
+        """
+        Return the export file as a stream of chunks.
+
+        The stream runs after the request session is closed, so it reads in a
+        session of its own. Errors about the format are raised here, before the
+        first chunk.
+        """
+        encode = get_export_encoder(query_dto.format)
+        return self._export_timeseries_data(encode, device_id, query_dto)
+
+    async def _export_timeseries_data(
+        self, encode: ExportEncoder, device_id: UUID, query_dto: TimeseriesExportQueryDto
+    ) -> AsyncIterator[bytes]:
+        async with transactional_session():
+            chunks = self._device_data_repository.stream_data_by_device_id_and_keys(
+                device_id=device_id,
+                keys=query_dto.keys,
+                start_date=query_dto.start_date,
+                end_date=query_dto.end_date,
+            )
+            async for data in encode(chunks):
+                yield data
+
+    async def _fill_latest_data_cache(self, device_id: UUID) -> Sequence[DeviceDataLatest]:
+        """Load every latest value of the device, so the cached hash becomes complete."""
+        data = await self._device_data_latest_repository.find_all_by_device_id(device_id)
+        await self._device_data_latest_cache_repository.save_all(device_id, data)
+        return data
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from injector import inject
+
+from app.database.session import transactional_session
+from app.extension.redis.client import RedisClient
+from app.module.team.exception.team_exception import TeamNotFoundException
+from app.module.team.repository.team_repository import TeamRepository
+
+from ..config import device_data_settings
+from ..dto.device_data_storage_dto import (
+    CompressionStatsDto,
+    DeviceDataRetentionDto,
+    DeviceDataRetentionUpdateDto,
+)
+from ..model.device_data_retention import DeviceDataRetention
+from ..repository.device_data_retention_repository import DeviceDataRetentionRepository
+from ..repository.device_data_storage_repository import DeviceDataStorageRepository
+
+logger = logging.getLogger(__name__)
+
+_POLICIES_LOCK_NAME = "device_data_storage_policies_lock"
+_RETENTION_LOCK_NAME = "device_data_retention_lock"
+
+
+class DeviceDataStorageService:
+    """
+    Manages compression and retention of `device_data`.
+
+    Compression and the global drop-after are TimescaleDB policies applied from the
+    settings at startup. Per-team retention cannot be expressed as a chunk policy
+    (chunks hold data of every team), so it is enforced by a periodic delete.
+
+    Both run in one worker only: whoever takes the Redis lock first. The retention
+    lock is held for `RETENTION_JOB_INTERVAL_SEC` and not released, so the delete
+    runs once per interval across all workers.
+    """
+
+    @inject
+    def __init__(
+        self,
+        device_data_storage_repository: DeviceDataStorageRepository,
+        device_data_retention_repository: DeviceDataRetentionRepository,
+        team_repository: TeamRepository,
+        redis_client: RedisClient,
+    ) -> None:
+        self._device_data_storage_repository = device_data_storage_repository
+        self._device_data_retention_repository = device_data_retention_repository
+        self._team_repository = team_repository
+        self._redis_client = redis_client
+        self._retention_job: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        try:
+            if await self._acquire(_POLICIES_LOCK_NAME, device_data_settings.POLICIES_LOCK_TTL_SEC):
+                async with transactional_session():
+                    await self.apply_policies()
+        except Exception as e:
+            logger.error(f"Error while applying device data storage policies: {e}")
+
+        if self._retention_job is None:
+            self._retention_job = asyncio.create_task(self._run_retention_job())
+
+    async def stop(self) -> None:
+        if self._retention_job is not None:
+            self._retention_job.cancel()
+            try:
+                await self._retention_job
+            except asyncio.CancelledError:
+                pass
+            self._retention_job = None
+
+    async def apply_policies(self) -> None:
+        await self._device_data_storage_repository.set_compression_policy(
+            timedelta(days=device_data_settings.COMPRESS_AFTER_DAYS)
+        )
+        drop_after_days = device_data_settings.DROP_AFTER_DAYS
+        await self._device_data_storage_repository.set_retention_policy(
+            timedelta(days=drop_after_days) if drop_after_days is not None else None
+        )
+
+    async def get_compression_stats(self) -> CompressionStatsDto:
+        row = await self._device_data_storage_repository.find_compression_stats()
+        return CompressionStatsDto.from_row(row)
+
+    async def get_team_retention(self, *, team_id: UUID) -> DeviceDataRetentionDto:
+        retention = await self._device_data_retention_repository.find(team_id)
+        return DeviceDataRetentionDto(
+            retention_days=retention.retention_days if retention is not None else None
+        )
+
+    async def update_team_retention(
+        self, *, team_id: UUID, retention_update_dto: DeviceDataRetentionUpdateDto
+    ) -> DeviceDataRetentionDto:
+        if not await self._team_repository.exists_by_id(team_id):
+            raise TeamNotFoundException
+
+        retention = await self._device_data_retention_repository.find(team_id)
+        retention_days = retention_update_dto.retention_days
+        if retention_days is None:
+            if retention is not None:
+                await self._device_data_retention_repository.delete(retention)
+        elif retention is None:
+            await self._device_data_retention_repository.save(
+                DeviceDataRetention(team_id=team_id, retention_days=retention_days)
+            )
+        else:
+            retention.retention_days = retention_days
+            await self._device_data_retention_repository.save(retention)
+
+        return DeviceDataRetentionDto(retention_days=retention_days)
+
+    async def enforce_retention(self) -> bool:
+        """
+        Delete the expired data of every team, unless another worker did within the
+        last `RETENTION_JOB_INTERVAL_SEC`.
+
+        Returns:
+            bool: Whether this worker ran the delete.
+        """
+        if not await self._acquire(
+            _RETENTION_LOCK_NAME, device_data_settings.RETENTION_JOB_INTERVAL_SEC
+        ):
+            return False
+        async with transactional_session():
+            await self.purge_expired_team_data()
+        return True
+
+    async def purge_expired_team_data(self) -> None:
+        now = datetime.now(UTC)
+        for retention in await self._device_data_retention_repository.find_all():
+            deleted = await self._device_data_storage_repository.delete_team_data_before(
+                team_id=retention.team_id, before=now - timedelta(days=retention.retention_days)
+            )
+            if deleted:
+                logger.info(f"Deleted {deleted} expired data points of team {retention.team_id}")
+
+    async def _run_retention_job(self) -> None:
+        while True:
+            try:
+                await self.enforce_retention()
+            except Exception as e:
+                logger.error(f"Error while enforcing device data retention: {e}")
+            await asyncio.sleep(device_data_settings.RETENTION_JOB_INTERVAL_SEC)
+
+    async def _acquire(self, name: str, ttl: float) -> bool:
+        # Left to expire: the holder is the leader until the TTL runs out
+        lock = self._redis_client.lock(name, timeout=ttl, blocking=False)
+        return bool(await lock.acquire())
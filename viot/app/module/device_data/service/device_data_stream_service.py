@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from app.extension.redis.client import RedisClient
+
+from ..batch import DeviceDataBatch
+from ..config import device_data_settings
+from ..typed_value import decode_typed_value
+
+logger = logging.getLogger(__name__)
+
+_json_encoder = msgspec.json.Encoder()
+
+
+def _channel(device_id: UUID) -> str:
+    return f"device_data_stream:{device_id}"
+
+
+class DeviceDataStreamService:
+    """
+    Publishes ingested data points to Redis and fans them out to live stream sockets.
+
+    Every flushed batch is published as one message per device, a JSON list of
+    `{"ts", "key", "value"}` points. Each worker holds a single pub/sub connection
+    and only subscribes to the channels of devices that have at least one local
+    socket. A message is forwarded as is to every socket of its device, so it is
+    decoded and encoded once per worker, not once per socket.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._queue_size = device_data_settings.STREAM_QUEUE_SIZE
+
+        self._pubsub: PubSub | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._subscribers: dict[UUID, set[asyncio.Queue[str]]] = {}
+
+    async def stop(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()  # type: ignore[attr-defined]
+            self._pubsub = None
+        self._subscribers.clear()
+
+    async def publish(self, batch: DeviceDataBatch) -> None:
+        points_by_device: dict[UUID, list[dict[str, Any]]] = {}
+        for device_id, ts, key, bool_v, str_v, long_v, double_v, json_v in batch.records():
+            value = (
+                msgspec.Raw(json_v)
+                if json_v is not None
+                else decode_typed_value(bool_v, str_v, long_v, double_v, None)
+            )
+            points_by_device.setdefault(device_id, []).append(
+                {"ts": ts, "key": key, "value": value}
+            )
+        if not points_by_device:
+            return
+
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                for device_id, points in points_by_device.items():
+                    pipe.publish(_channel(device_id), _json_encoder.encode(points))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Error while publishing device data stream: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, device_id: UUID) -> AsyncGenerator[asyncio.Queue[str], None]:
+        """
+        Receive the messages published for a device until the block exits.
+
+        The queue is bounded by `STREAM_QUEUE_SIZE`, a consumer that falls behind
+        loses the oldest messages instead of holding back the other sockets.
+        """
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self._queue_size)
+        subscribers = self._subscribers.get(device_id)
+        if subscribers is None:
+            subscribers = self._subscribers[device_id] = set()
+            try:
+                await self._get_pubsub().subscribe(_channel(device_id))
+            except BaseException:
+                # Not subscribed, the next socket of the device tries again
+                if self._subscribers.get(device_id) is subscribers:
+                    del self._subscribers[device_id]
+                raise
+            self._ensure_reader()
+        subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers.discard(queue)
+            if not subscribers and self._subscribers.get(device_id) is subscribers:
+                del self._subscribers[device_id]
+                try:
+                    await self._get_pubsub().unsubscribe(_channel(device_id))
+                except RedisError as e:
+                    logger.warning(f"Error while unsubscribing device data stream: {e}")
+
+    def _get_pubsub(self) -> PubSub:
+        if self._pubsub is None:
+            self._pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._run_reader())
+
+    def _dispatch(self, device_id: UUID, data: str) -> None:
+        for queue in self._subscribers.get(device_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(data)
+
+    async def _run_reader(self) -> None:
+        # Shared by every socket of the worker, so no error may end it
+        pubsub = self._get_pubsub()
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+                _, _, device_id = message["channel"].partition(":")
+                self._dispatch(UUID(device_id), message["data"])
+            except RedisError as e:
+                logger.error(f"Error while reading device data stream: {e}")
+                await asyncio.sleep(1.0)
+            except Exception as e:
+                logger.error(f"Error while dispatching device data stream message: {e!r}")
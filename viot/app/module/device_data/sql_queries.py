@@ -1,7 +1,7 @@
 FROM_WHERE_CLAUSE: str = """
     FROM device_data
     WHERE device_data.device_id = :device_id
-    AND device_data.key = :key
+    AND device_data.key = ANY(:keys)
     AND device_data.ts >= :start_date AND device_data.ts <= :end_date
     GROUP BY device_data.key, bucket
     ORDER BY device_data.key, bucket
@@ -9,6 +9,7 @@ FROM_WHERE_CLAUSE: str = """
 
 FIND_AVG_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     SUM(COALESCE(device_data.long_v, 0)) AS long_value,
@@ -20,6 +21,7 @@ FIND_AVG_QUERY: str = """
 
 FIND_MAX_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     MAX(COALESCE(device_data.long_v, -9223372036854775807)) AS long_value,
@@ -29,6 +31,7 @@ FIND_MAX_QUERY: str = """
 
 FIND_MIN_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     MIN(COALESCE(device_data.long_v, 9223372036854775807)) AS long_value,
@@ -38,6 +41,7 @@ FIND_MIN_QUERY: str = """
 
 FIND_SUM_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     SUM(COALESCE(device_data.long_v, 0)) AS long_value,
@@ -47,6 +51,7 @@ FIND_SUM_QUERY: str = """
 
 FIND_COUNT_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     SUM(CASE WHEN device_data.bool_v IS NULL THEN 0 ELSE 1 END) AS count_bool_value,
@@ -56,3 +61,167 @@ FIND_COUNT_QUERY: str = """
     SUM(CASE WHEN device_data.json_v IS NULL THEN 0 ELSE 1 END) AS count_json_value,
     MAX(device_data.ts) AS agg_values_last_ts
 """
+
+# Points of devices deleted while the batch was buffered are dropped by the join.
+INSERT_DEVICE_DATA_BATCH_QUERY: str = """
+    INSERT INTO device_data (device_id, ts, key, bool_v, str_v, long_v, double_v, json_v)
+    SELECT d.device_id, d.ts, d.key, d.bool_v, d.str_v, d.long_v, d.double_v, d.json_v
+    FROM unnest(
+        CAST(:device_id AS uuid[]),
+        CAST(:ts AS timestamptz[]),
+        CAST(:key AS text[]),
+        CAST(:bool_v AS boolean[]),
+        CAST(:str_v AS text[]),
+        CAST(:long_v AS bigint[]),
+        CAST(:double_v AS double precision[]),
+        CAST(:json_v AS json[])
+    ) AS d(device_id, ts, key, bool_v, str_v, long_v, double_v, json_v)
+    JOIN devices ON devices.id = d.device_id
+    ON CONFLICT (device_id, ts, key) DO NOTHING
+"""
+
+# Events of devices deleted while the batch was buffered are dropped by the join.
+INSERT_CONNECT_LOG_BATCH_QUERY: str = """
+    INSERT INTO connect_logs (device_id, ts, connect_status, ip)
+    SELECT l.device_id, l.ts, l.connect_status, l.ip
+    FROM unnest(
+        CAST(:device_id AS uuid[]),
+        CAST(:ts AS timestamptz[]),
+        CAST(:connect_status AS smallint[]),
+        CAST(:ip AS text[])
+    ) AS l(device_id, ts, connect_status, ip)
+    JOIN devices ON devices.id = l.device_id
+    ON CONFLICT (device_id, ts) DO NOTHING
+"""
+
+# Same join as INSERT_DEVICE_DATA_BATCH_QUERY.
+UPSERT_DEVICE_DATA_LATEST_BATCH_QUERY: str = """
+    INSERT INTO device_data_latest AS ddl
+        (device_id, ts, key, bool_v, str_v, long_v, double_v, json_v)
+    SELECT d.device_id, d.ts, d.key, d.bool_v, d.str_v, d.long_v, d.double_v, d.json_v
+    FROM unnest(
+        CAST(:device_id AS uuid[]),
+        CAST(:ts AS timestamptz[]),
+        CAST(:key AS text[]),
+        CAST(:bool_v AS boolean[]),
+        CAST(:str_v AS text[]),
+        CAST(:long_v AS bigint[]),
+        CAST(:double_v AS double precision[]),
+        CAST(:json_v AS json[])
+    ) AS d(device_id, ts, key, bool_v, str_v, long_v, double_v, json_v)
+    JOIN devices ON devices.id = d.device_id
+    ON CONFLICT (device_id, key) DO UPDATE SET
+        ts = excluded.ts,
+        bool_v = excluded.bool_v,
+        str_v = excluded.str_v,
+        long_v = excluded.long_v,
+        double_v = excluded.double_v,
+        json_v = excluded.json_v
+    WHERE excluded.ts > ddl.ts
+"""
+
+# Continuous aggregate (rollup) queries.
+#
+# `ROLLUP_SOURCE_CTE` reads whole rollup buckets in [start_date, rollup_end_date)
+# and the raw rows in the tail [rollup_end_date, end_date], shaping both like the
+# rollup so the FIND_*_ROLLUP_QUERY templates can re-bucket them together.
+ROLLUP_SOURCE_CTE: str = """
+    WITH source AS (
+        SELECT
+        key, bucket, sum_long, sum_double,
+        count_bool, count_str, count_long, count_double, count_json,
+        min_long, min_double, max_long, max_double, last_ts
+        FROM {rollup}
+        WHERE device_id = :device_id
+        AND key = ANY(:keys)
+        AND bucket >= :start_date AND bucket < :rollup_end_date
+        UNION ALL
+        SELECT
+        key, ts, long_v, double_v,
+        (bool_v IS NOT NULL)::int, (str_v IS NOT NULL)::int, (long_v IS NOT NULL)::int,
+        (double_v IS NOT NULL)::int, (json_v IS NOT NULL)::int,
+        long_v, double_v, long_v, double_v, ts
+        FROM device_data
+        WHERE device_id = :device_id
+        AND key = ANY(:keys)
+        AND ts >= :rollup_end_date AND ts <= :end_date
+    )
+"""
+
+ROLLUP_GROUP_CLAUSE: str = """
+    FROM source
+    GROUP BY source.key, bucket
+    ORDER BY source.key, bucket
+"""
+
+FIND_AVG_ROLLUP_QUERY: str = """
+    SELECT
+    source.key AS key,
+    time_bucket(:bucket_width, source.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(COALESCE(source.sum_long, 0)) AS long_value,
+    SUM(COALESCE(source.sum_double, 0)) AS double_value,
+    SUM(source.count_long) AS count_long_value,
+    SUM(source.count_double) AS count_double_value,
+    MAX(source.last_ts) AS agg_values_last_ts
+"""
+
+FIND_MAX_ROLLUP_QUERY: str = """
+    SELECT
+    source.key AS key,
+    time_bucket(:bucket_width, source.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    MAX(COALESCE(source.max_long, -9223372036854775807)) AS long_value,
+    MAX(COALESCE(source.max_double, -1.79769E+308)) AS double_value,
+    MAX(source.last_ts) AS agg_values_last_ts
+"""
+
+FIND_MIN_ROLLUP_QUERY: str = """
+    SELECT
+    source.key AS key,
+    time_bucket(:bucket_width, source.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    MIN(COALESCE(source.min_long, 9223372036854775807)) AS long_value,
+    MIN(COALESCE(source.min_double, 1.79769E+308)) AS double_value,
+    MAX(source.last_ts) AS agg_values_last_ts
+"""
+
+FIND_SUM_ROLLUP_QUERY: str = """
+    SELECT
+    source.key AS key,
+    time_bucket(:bucket_width, source.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(COALESCE(source.sum_long, 0)) AS long_value,
+    SUM(COALESCE(source.sum_double, 0.0)) AS double_value,
+    MAX(source.last_ts) AS agg_values_last_ts
+"""
+
+FIND_COUNT_ROLLUP_QUERY: str = """
+    SELECT
+    source.key AS key,
+    time_bucket(:bucket_width, source.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(source.count_bool) AS count_bool_value,
+    SUM(source.count_str) AS count_str_value,
+    SUM(source.count_long) AS count_long_value,
+    SUM(source.count_double) AS count_double_value,
+    SUM(source.count_json) AS count_json_value,
+    MAX(source.last_ts) AS agg_values_last_ts
+"""
+
+FIND_COMPRESSION_STATS_QUERY: str = """
+    SELECT
+    total_chunks,
+    number_compressed_chunks,
+    before_compression_total_bytes,
+    after_compression_total_bytes
+    FROM hypertable_compression_stats('device_data')
+"""
+
+DELETE_TEAM_DEVICE_DATA_BEFORE_QUERY: str = """
+    DELETE FROM device_data
+    USING devices
+    WHERE device_data.device_id = devices.id
+    AND devices.team_id = :team_id
+    AND device_data.ts < :before
+"""
@@ -1,8 +1,13 @@
 from injector import Binder, Module, SingletonScope
 
-from .service import EmailService, IEmailService
+from app.extension.notification.config import notification_settings
+
+from .service import EmailService, IEmailService, StreamEmailService
 
 
 class EmailModule(Module):
     def configure(self, binder: Binder) -> None:
-        binder.bind(IEmailService, EmailService, SingletonScope)  # type: ignore
+        if notification_settings.EMAIL_BACKEND == "stream":
+            binder.bind(IEmailService, StreamEmailService, SingletonScope)  # type: ignore
+        else:
+            binder.bind(IEmailService, EmailService, SingletonScope)  # type: ignore
@@ -1,9 +1,31 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from typing import Any, TypedDict
 
 from celery import Celery
 from injector import inject
 
+from app.celery_worker.config import celery_settings
 from app.celery_worker.tasks.enums import EmailTaskType
+from app.extension.email.enums import TemplateType
+from app.extension.notification.message import EmailNotification
+from app.extension.notification.publisher import NotificationPublisher
+
+
+class RuleAlertEmail(TypedDict):
+    email: str
+    rule_name: str
+    device_id: str
+    ts: str
+    payload: str
+
+
+class TeamInvitationEmail(TypedDict):
+    email: str
+    name: str
+    invitor_name: str
+    team_name: str
+    link: str
 
 
 class IEmailService(ABC):
@@ -21,11 +43,20 @@ class IEmailService(ABC):
     ) -> None:
         pass
 
+    @abstractmethod
+    def send_team_invitation_emails(self, *, invitations: Sequence[TeamInvitationEmail]) -> None:
+        pass
+
+    @abstractmethod
+    def send_rule_alert_emails(self, *, alerts: Sequence[RuleAlertEmail]) -> None:
+        pass
+
 
 class EmailService(IEmailService):
     @inject
     def __init__(self, celery_app: Celery) -> None:
         self._celery_app = celery_app
+        self._batch_size = celery_settings.EMAIL_BATCH_SIZE
 
     def send_verify_account_email(self, *, email: str, name: str, verify_url: str) -> None:
         """Send an email to verify the user's account"""
@@ -55,3 +86,71 @@ class EmailService(IEmailService):
                 "link": link,
             },
         )
+
+    def send_team_invitation_emails(self, *, invitations: Sequence[TeamInvitationEmail]) -> None:
+        """Send emails to invite users to a team, `EMAIL_BATCH_SIZE` per task"""
+        self._send_batches(TemplateType.TEAM_INVITATION, invitations)
+
+    def send_rule_alert_emails(self, *, alerts: Sequence[RuleAlertEmail]) -> None:
+        """Send rule alert emails, `EMAIL_BATCH_SIZE` per task"""
+        self._send_batches(TemplateType.RULE_ALERT, alerts)
+
+    def _send_batches(self, template: TemplateType, messages: Sequence[Mapping[str, Any]]) -> None:
+        for i in range(0, len(messages), self._batch_size):
+            self._celery_app.send_task(
+                EmailTaskType.BATCH,
+                kwargs={
+                    "template": template.name,
+                    "messages": [dict(message) for message in messages[i : i + self._batch_size]],
+                },
+            )
+
+
+class StreamEmailService(IEmailService):
+    """Hands emails to the asyncio notification worker, one stream message per email."""
+
+    @inject
+    def __init__(self, notification_publisher: NotificationPublisher) -> None:
+        self._notification_publisher = notification_publisher
+
+    def send_verify_account_email(self, *, email: str, name: str, verify_url: str) -> None:
+        """Send an email to verify the user's account"""
+        self._publish(
+            TemplateType.VERIFY_ACCOUNT, [{"email": email, "name": name, "url": verify_url}]
+        )
+
+    def send_reset_password_email(self, *, email: str, name: str, link: str) -> None:
+        """Send an email to reset the user's password"""
+        self._publish(TemplateType.RESET_PASSWORD, [{"email": email, "name": name, "link": link}])
+
+    def send_team_invitation_email(
+        self, *, email: str, name: str, invitor_name: str, team_name: str, link: str
+    ) -> None:
+        """Send an email to invite a user to a team"""
+        self._publish(
+            TemplateType.TEAM_INVITATION,
+            [
+                {
+                    "email": email,
+                    "name": name,
+                    "invitor_name": invitor_name,
+                    "team_name": team_name,
+                    "link": link,
+                }
+            ],
+        )
+
+    def send_team_invitation_emails(self, *, invitations: Sequence[TeamInvitationEmail]) -> None:
+        """Send emails to invite users to a team"""
+        self._publish(TemplateType.TEAM_INVITATION, invitations)
+
+    def send_rule_alert_emails(self, *, alerts: Sequence[RuleAlertEmail]) -> None:
+        """Send rule alert emails"""
+        self._publish(TemplateType.RULE_ALERT, alerts)
+
+    def _publish(self, template: TemplateType, messages: Sequence[Mapping[str, Any]]) -> None:
+        if messages:
+            self._notification_publisher.publish(
+                EmailNotification(template=template.name, to=message["email"], ctx=dict(message))
+                for message in messages
+            )
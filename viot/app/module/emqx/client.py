@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any
+
+from httpx import (
+    AsyncClient,
+    ConnectError,
+    ConnectTimeout,
+    Limits,
+    PoolTimeout,
+    Response,
+    Timeout,
+    TransportError,
+)
+
+from .config import emqx_settings
+from .exception.emqx_api_exception import EmqxUnavailableException
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT"})
+
+# Errors raised before the request reached EMQX, so it is safe to send it again
+# whatever the method
+_NOT_SENT_ERRORS = (ConnectError, ConnectTimeout, PoolTimeout)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. Once `failure_threshold` attempts fail in a
+    row the circuit opens and calls are rejected for `reset_timeout` seconds, after
+    which a single trial call is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, *, failure_threshold: int, reset_timeout: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._trial_in_flight or time.monotonic() - self._opened_at < self._reset_timeout:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                logger.warning(f"EMQX API circuit opened after {self._failures} failures")
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class EmqxApiClient:
+    """
+    Shared client for the EMQX management API. One pooled `AsyncClient` keeps
+    connections warm across calls, so bursts (e.g. subscribe calls on a device
+    connect storm) reuse the pool instead of opening a socket per call.
+
+    Transport errors and 502/503/504 responses are retried with exponential backoff
+    and jitter. POST and DELETE are not idempotent on the EMQX API (a repeated
+    create fails with "already exists", a repeated delete with 404), so they are
+    only retried when the request never reached EMQX: connect errors, pool
+    timeouts and 503 responses. Failures feed a circuit breaker; while it is open
+    calls fail fast with `EmqxUnavailableException`. Any other response is
+    returned to the caller, which owns the interpretation of its status code.
+    """
+
+    def __init__(self) -> None:
+        self._client: AsyncClient | None = None
+        self._max_retries = emqx_settings.API_MAX_RETRIES
+        self._retry_backoff = emqx_settings.API_RETRY_BACKOFF_SEC
+        self._circuit_breaker = CircuitBreaker(
+            failure_threshold=emqx_settings.API_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=emqx_settings.API_CIRCUIT_RESET_SEC,
+        )
+
+    async def open(self) -> None:
+        if self._client is None:
+            self._client = AsyncClient(
+                base_url=emqx_settings.API_URL,
+                auth=emqx_settings.BASIC_AUTH,
+                limits=Limits(
+                    max_connections=emqx_settings.API_MAX_CONNECTIONS,
+                    max_keepalive_connections=emqx_settings.API_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=Timeout(emqx_settings.API_TIMEOUT_SEC),
+                http2=emqx_settings.API_HTTP2,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str) -> Response:
+        return await self.request("GET", url)
+
+    async def post(self, url: str, *, json: Any = None) -> Response:
+        return await self.request("POST", url, json=json)
+
+    async def put(self, url: str, *, json: Any = None) -> Response:
+        return await self.request("PUT", url, json=json)
+
+    async def delete(self, url: str) -> Response:
+        return await self.request("DELETE", url)
+
+    async def request(self, method: str, url: str, *, json: Any = None) -> Response:
+        # Opened lazily as well, for processes that do not run the app lifespan
+        await self.open()
+        assert self._client is not None
+
+        idempotent = method.upper() in _IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            if not self._circuit_breaker.allow():
+                raise EmqxUnavailableException
+
+            try:
+                response = await self._client.request(method, url, json=json)
+            except TransportError as e:
+                self._circuit_breaker.record_failure()
+                retryable = idempotent or isinstance(e, _NOT_SENT_ERRORS)
+                if not retryable or attempt >= self._max_retries:
+                    logger.error(f"EMQX API {method} {url} failed: {e!r}")
+                    raise EmqxUnavailableException from e
+            except Exception:
+                self._circuit_breaker.record_failure()
+                raise
+            except BaseException:
+                self._circuit_breaker.release()
+                raise
+            else:
+                if response.status_code not in _RETRY_STATUS_CODES:
+                    self._circuit_breaker.record_success()
+                    return response
+                self._circuit_breaker.record_failure()
+                retryable = idempotent or response.status_code == 503
+                if not retryable or attempt >= self._max_retries:
+                    return response
+
+            await asyncio.sleep(self._retry_backoff * 2**attempt * (1 + random.random()))
+            attempt += 1
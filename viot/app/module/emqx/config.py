@@ -16,6 +16,25 @@ class EmqxSettings(BaseSettings):
 
     MQTT_WHITELIST_FILE_PATH: str = ""
 
+    API_MAX_CONNECTIONS: int = 100
+    """Upper bound on open connections to the management API."""
+    API_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    """Idle connections kept warm in the pool."""
+    API_TIMEOUT_SEC: float = 5.0
+    """Connect, read, write and pool timeout of a single attempt."""
+    API_HTTP2: bool = False
+    """Use HTTP/2 when the server supports it. Requires the `h2` package."""
+    API_MAX_RETRIES: int = 2
+    """Retries after a transport error or a 502/503/504 response."""
+    API_RETRY_BACKOFF_SEC: float = 0.2
+    """Base delay between retries, doubled on every attempt."""
+    API_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    """Consecutive failed attempts that open the circuit."""
+    API_CIRCUIT_RESET_SEC: float = 30.0
+    """How long an open circuit rejects calls before a trial call is let through."""
+    API_PAGE_LIMIT: int = 1000
+    """Items fetched per request from paged list endpoints."""
+
     @computed_field  # type: ignore
     @property
     def BASIC_AUTH(self) -> BasicAuth:
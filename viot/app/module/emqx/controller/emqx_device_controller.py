@@ -1,8 +1,10 @@
 import logging
+from datetime import datetime
 from typing import Annotated
+from uuid import UUID
 
 from classy_fastapi import post
-from fastapi import Body
+from fastapi import Body, Query, Request
 from injector import inject
 
 from app.common.controller import Controller
@@ -10,7 +12,12 @@ from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 
 from ..dto.emqx_auth_dto import EmqxAuthenRequestDto, EmqxAuthenResponseDto
-from ..dto.emqx_event_dto import DeviceConnectedEventDto, DeviceDisconnectedEventDto
+from ..dto.emqx_event_dto import (
+    DeviceConnectedEventDto,
+    DeviceDataEventDto,
+    DeviceDisconnectedEventDto,
+    RuleTriggeredEventDto,
+)
 from ..service.emqx_auth_service import EmqxDeviceAuthService
 from ..service.emqx_event_service import EmqxEventService
 
@@ -83,3 +90,50 @@ class EmqxDeviceController(Controller):
         """Event device disconnected from EMQX."""
         await self._emqx_event_service.handle_device_disconnected(event=body)
         return JSONResponse.no_content()
+
+    @post(
+        "/events/device-data",
+        summary="Event device data from EMQX",
+        status_code=200,
+    )
+    async def event_device_data(
+        self, *, body: Annotated[DeviceDataEventDto, Body(...)]
+    ) -> JSONResponse[None]:
+        """Telemetry published by a device on `v2/devices/me/data`, forwarded by EMQX."""
+        await self._emqx_event_service.handle_device_data(event=body)
+        return JSONResponse.no_content()
+
+    @post(
+        "/events/sub-device-data/{gateway_id}",
+        summary="Event sub-device data from EMQX",
+        status_code=200,
+    )
+    async def event_sub_device_data(
+        self, *, gateway_id: UUID, ts: Annotated[datetime, Query(...)], request: Request
+    ) -> JSONResponse[None]:
+        """
+        Telemetry published by a gateway on `v2/devices/sub/data`, forwarded by EMQX.
+
+        The body is the raw MQTT payload and is decoded without going through
+        pydantic, since a single message can carry data for hundreds of sub-devices.
+        """
+        await self._emqx_event_service.handle_sub_device_data(
+            gateway_id=gateway_id, ts=ts, data=await request.body()
+        )
+        return JSONResponse.no_content()
+
+    @post(
+        "/events/rule-triggered",
+        summary="Event rule triggered from EMQX",
+        status_code=200,
+    )
+    async def event_rule_triggered(
+        self, *, body: Annotated[RuleTriggeredEventDto, Body(...)]
+    ) -> JSONResponse[None]:
+        """
+        Message republished by a rule on `v2/private/trigger`, forwarded by EMQX.
+
+        The actions of the rule run in the background, this only queues the trigger.
+        """
+        await self._emqx_event_service.handle_rule_triggered(event=body)
+        return JSONResponse.no_content()
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 from app.common.dto import BaseInDto
@@ -12,3 +13,17 @@ class DeviceDisconnectedEventDto(BaseInDto):
     device_id: UUID
     ip_address: str
     disconnected_at: datetime
+
+
+class DeviceDataEventDto(BaseInDto):
+    device_id: UUID
+    ts: datetime
+    payload: dict[str, Any]
+
+
+class RuleTriggeredEventDto(BaseInDto):
+    device_id: UUID
+    rule_id: UUID
+    action_ids: list[UUID]
+    ts: datetime
+    payload: Any
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel
@@ -21,9 +22,20 @@ class EmqxCreateRuleDto(BaseModel):
     sql: str
     actions: list[EmqxActionDto]
     enable: bool
+    description: str = ""
 
 
 class EmqxUpdateRuleDto(BaseModel):
     sql: str
     actions: list[EmqxActionDto]
     enable: bool
+    description: str = ""
+
+
+class EmqxRuleDto(BaseModel):
+    """A rule as listed by the EMQX API, only the fields used to reconcile it."""
+
+    id: str
+    enable: bool = True
+    description: str = ""
+    created_at: datetime | None = None
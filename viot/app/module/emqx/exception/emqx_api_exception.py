@@ -0,0 +1,11 @@
+from app.common.exception import InternalServerException
+
+
+class EmqxUnavailableException(InternalServerException):
+    STATUS_CODE = 503
+
+    def __init__(self) -> None:
+        super().__init__(
+            code="EMQX_UNAVAILABLE",
+            message="EMQX management API is unavailable",
+        )
@@ -1,5 +1,6 @@
 from injector import Binder, Module, SingletonScope
 
+from .client import EmqxApiClient
 from .controller.emqx_device_controller import EmqxDeviceController
 from .service.emqx_auth_service import EmqxDeviceAuthService
 from .service.emqx_event_service import EmqxEventService
@@ -9,6 +10,8 @@ from .service.mqtt_whitelist_service import MqttWhitelistService
 
 class EmqxModule(Module):
     def configure(self, binder: Binder) -> None:
+        binder.bind(EmqxApiClient, to=EmqxApiClient, scope=SingletonScope)
+
         binder.bind(EmqxDeviceAuthService, to=EmqxDeviceAuthService, scope=SingletonScope)
         binder.bind(EmqxEventService, to=EmqxEventService, scope=SingletonScope)
         binder.bind(MqttWhitelistService, to=MqttWhitelistService, scope=SingletonScope)
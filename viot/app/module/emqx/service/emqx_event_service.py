@@ -1,17 +1,31 @@
 import logging
+from datetime import datetime
 from typing import Literal, TypedDict
 from uuid import UUID
 
-from httpx import AsyncClient
+import msgspec
 from injector import inject
 
 from app.common.exception import InternalServerException
+from app.module.device.service.gateway_service import GatewayService
 from app.module.device_data.constants import ConnectStatus
-from app.module.device_data.model.connect_log import ConnectLog
-from app.module.device_data.repository.connect_log_repository import ConnectLogRepository
-
-from ..config import emqx_settings
-from ..dto.emqx_event_dto import DeviceConnectedEventDto, DeviceDisconnectedEventDto
+from app.module.device_data.decoder import decode_sub_device_payload
+from app.module.device_data.service.connect_log_ingestion_service import (
+    ConnectLogIngestionService,
+)
+from app.module.device_data.service.device_data_ingestion_service import (
+    DeviceDataIngestionService,
+)
+from app.module.rule_action.executor.base import RuleTrigger
+from app.module.rule_action.service.rule_trigger_service import RuleTriggerService
+
+from ..client import EmqxApiClient
+from ..dto.emqx_event_dto import (
+    DeviceConnectedEventDto,
+    DeviceDataEventDto,
+    DeviceDisconnectedEventDto,
+    RuleTriggeredEventDto,
+)
 
 
 class Subscription(TypedDict):
@@ -27,8 +41,19 @@ logger = logging.getLogger(__name__)
 
 class EmqxEventService:
     @inject
-    def __init__(self, connect_log_repository: ConnectLogRepository) -> None:
-        self._connect_log_repository = connect_log_repository
+    def __init__(
+        self,
+        connect_log_ingestion_service: ConnectLogIngestionService,
+        device_data_ingestion_service: DeviceDataIngestionService,
+        gateway_service: GatewayService,
+        rule_trigger_service: RuleTriggerService,
+        emqx_api_client: EmqxApiClient,
+    ) -> None:
+        self._connect_log_ingestion_service = connect_log_ingestion_service
+        self._device_data_ingestion_service = device_data_ingestion_service
+        self._gateway_service = gateway_service
+        self._rule_trigger_service = rule_trigger_service
+        self._emqx_api_client = emqx_api_client
 
     async def handle_device_connected(self, *, event: DeviceConnectedEventDto) -> None:
         logger.info(f"Device connected with id: {event.device_id}")
@@ -38,22 +63,56 @@ class EmqxEventService:
     async def handle_device_disconnected(self, *, event: DeviceDisconnectedEventDto) -> None:
         logger.info(f"Device disconnected with id: {event.device_id}, ip: {event.ip_address}")
 
-        await self._connect_log_repository.save(
-            ConnectLog(
-                ts=event.disconnected_at,
+        self._connect_log_ingestion_service.record(
+            device_id=event.device_id,
+            ts=event.disconnected_at,
+            connect_status=ConnectStatus.DISCONNECTED,
+            ip=event.ip_address,
+        )
+
+    async def handle_device_data(self, *, event: DeviceDataEventDto) -> None:
+        await self._device_data_ingestion_service.ingest(
+            device_id=event.device_id, ts=event.ts, payload=event.payload
+        )
+
+    async def handle_sub_device_data(self, *, gateway_id: UUID, ts: datetime, data: bytes) -> None:
+        try:
+            payloads = decode_sub_device_payload(data)
+        except msgspec.DecodeError as e:
+            logger.warning(f"Invalid sub-device payload from gateway {gateway_id}: {e}")
+            return
+
+        owned_sub_device_ids = await self._gateway_service.filter_owned_sub_device_ids(
+            gateway_id, set(payloads)
+        )
+        if len(owned_sub_device_ids) < len(payloads):
+            logger.warning(
+                f"Gateway {gateway_id} published data for "
+                f"{len(payloads) - len(owned_sub_device_ids)} sub-devices it does not own"
+            )
+
+        for sub_device_id in owned_sub_device_ids:
+            await self._device_data_ingestion_service.ingest(
+                device_id=sub_device_id, ts=ts, payload=payloads[sub_device_id]
+            )
+
+    async def handle_rule_triggered(self, *, event: RuleTriggeredEventDto) -> None:
+        self._rule_trigger_service.submit(
+            RuleTrigger(
+                rule_id=event.rule_id,
                 device_id=event.device_id,
-                connect_status=ConnectStatus.DISCONNECTED,
-                ip=event.ip_address,
+                action_ids=tuple(event.action_ids),
+                ts=event.ts,
+                payload=event.payload,
             )
         )
 
     async def _subscribe_device_topics(self, device_id: UUID) -> None:
-        async with AsyncClient(auth=emqx_settings.BASIC_AUTH) as client:
-            url: str = f"{emqx_settings.API_URL}/clients/{device_id}/subscribe/bulk"
+        url: str = f"/clients/{device_id}/subscribe/bulk"
 
-            topics: list[Subscription] = []
+        topics: list[Subscription] = []
 
-            result = await client.post(url, json=topics)
+        result = await self._emqx_api_client.post(url, json=topics)
 
-            if result.status_code not in (200, 201):
-                raise InternalServerException(message="Error while subscribing to topics")
+        if result.status_code not in (200, 201):
+            raise InternalServerException(message="Error while subscribing to topics")
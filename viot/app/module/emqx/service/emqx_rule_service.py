@@ -1,36 +1,65 @@
 import logging
 
-from httpx import AsyncClient
+from injector import inject
 
 from app.common.exception import InternalServerException
 
+from ..client import EmqxApiClient
 from ..config import emqx_settings
-from ..dto.emqx_rule_dto import EmqxCreateRuleDto, EmqxUpdateRuleDto
+from ..dto.emqx_rule_dto import EmqxCreateRuleDto, EmqxRuleDto, EmqxUpdateRuleDto
 
 logger = logging.getLogger(__name__)
 
 
 class EmqxRuleService:
-    def __init__(self) -> None:
-        self._url: str = f"{emqx_settings.API_URL}/rules"
+    @inject
+    def __init__(self, emqx_api_client: EmqxApiClient) -> None:
+        self._emqx_api_client = emqx_api_client
+        self._url: str = "/rules"
+
+    async def get_all_rules(self) -> list[EmqxRuleDto]:
+        """Fetch every rule of the EMQX rule engine, `API_PAGE_LIMIT` per request."""
+        rules: list[EmqxRuleDto] = []
+        page = 1
+        while True:
+            response = await self._emqx_api_client.get(
+                f"{self._url}?page={page}&limit={emqx_settings.API_PAGE_LIMIT}"
+            )
+            if response.status_code != 200:
+                raise InternalServerException(message="Error while listing rules")
+
+            body = response.json()
+            rules.extend(EmqxRuleDto.model_validate(rule) for rule in body["data"])
+            if not body.get("meta", {}).get("hasnext"):
+                return rules
+            page += 1
 
     async def create_rule(self, *, dto: EmqxCreateRuleDto) -> None:
-        async with AsyncClient(auth=emqx_settings.BASIC_AUTH) as client:
-            response = await client.post(self._url, json=dto.model_dump())
+        response = await self._emqx_api_client.post(self._url, json=dto.model_dump())
 
-            if response.status_code not in (200, 201):
-                raise InternalServerException(message="Error while creating rule")
+        if response.status_code not in (200, 201):
+            raise InternalServerException(message="Error while creating rule")
 
     async def update_rule(self, *, rule_id: str, dto: EmqxUpdateRuleDto) -> None:
-        async with AsyncClient(auth=emqx_settings.BASIC_AUTH) as client:
-            response = await client.put(f"{self._url}/{rule_id}", json=dto.model_dump())
+        response = await self._emqx_api_client.put(f"{self._url}/{rule_id}", json=dto.model_dump())
+
+        if response.status_code not in (200, 201):
+            raise InternalServerException(message="Error while updating rule")
+
+    async def upsert_rule(self, *, dto: EmqxCreateRuleDto) -> None:
+        """Update the rule, or create it if EMQX does not know it. Safe to repeat."""
+        response = await self._emqx_api_client.put(
+            f"{self._url}/{dto.id}", json=dto.model_dump(exclude={"id"})
+        )
+        if response.status_code == 404:
+            response = await self._emqx_api_client.post(self._url, json=dto.model_dump())
 
-            if response.status_code not in (200, 201):
-                raise InternalServerException(message="Error while updating rule")
+        if response.status_code not in (200, 201):
+            raise InternalServerException(message="Error while upserting rule")
 
     async def delete_rule(self, *, rule_id: str) -> None:
-        async with AsyncClient(auth=emqx_settings.BASIC_AUTH) as client:
-            response = await client.delete(f"{self._url}/{rule_id}")
+        response = await self._emqx_api_client.delete(f"{self._url}/{rule_id}")
 
-            if response.status_code != 204:
-                raise InternalServerException(message="Error while deleting rule")
+        # Already deleted counts as deleted, so the call is safe to repeat
+        if response.status_code not in (204, 404):
+            raise InternalServerException(message="Error while deleting rule")
@@ -0,0 +1,99 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+class PointChunk:
+    """
+    Data points of a device as columns: `ts` (microseconds since the epoch), `key`,
+    `number` (`NaN` when the value is not numeric) and `string` (`None` when the
+    value is not a string). Points are sorted by `ts`.
+    """
+
+    __slots__ = ("ts", "key", "number", "string")
+
+    def __init__(
+        self,
+        ts: npt.NDArray[np.int64],
+        key: npt.NDArray[np.object_],
+        number: npt.NDArray[np.float64],
+        string: npt.NDArray[np.object_],
+    ) -> None:
+        self.ts = ts
+        self.key = key
+        self.number = number
+        self.string = string
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def empty(cls) -> "PointChunk":
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=object),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "PointChunk":
+        """Build a chunk from `(ts, key, number, string)` rows."""
+        ts, key, number, string = zip(*rows, strict=True)
+        return cls(
+            np.asarray(ts, dtype=np.int64),
+            np.asarray(key, dtype=object),
+            np.asarray(number, dtype=np.float64),
+            np.asarray(string, dtype=object),
+        )
+
+    def concat(self, other: "PointChunk") -> "PointChunk":
+        return PointChunk(
+            np.concatenate((self.ts, other.ts)),
+            np.concatenate((self.key, other.key)),
+            np.concatenate((self.number, other.number)),
+            np.concatenate((self.string, other.string)),
+        )
+
+    def split_last_ts(self) -> tuple["PointChunk", "PointChunk"]:
+        """
+        Split off the points of the last timestamp, which may continue in the next
+        chunk of a stream.
+        """
+        i = int(np.searchsorted(self.ts, self.ts[-1], side="left")) if len(self) else 0
+        return self._slice(slice(None, i)), self._slice(slice(i, None))
+
+    def pivot(
+        self, fields: Iterable[str]
+    ) -> tuple[npt.NDArray[np.int64], dict[str, npt.NDArray[Any]]]:
+        """
+        Pivot the points into one record per timestamp, as columns for
+        `CompiledCondition.evaluate_batch`.
+
+        A field holding only numbers becomes a `float64` column with `NaN` where it
+        is missing, a field holding strings an object column with `None`.
+        """
+        unique_ts, index = np.unique(self.ts, return_inverse=True)
+        columns: dict[str, npt.NDArray[Any]] = {}
+        for field in fields:
+            mask = self.key == field
+            if not mask.any():
+                continue
+
+            number, string = self.number[mask], self.string[mask]
+            is_string: npt.NDArray[np.bool_] = np.array([v is not None for v in string], dtype=bool)
+            if is_string.any():
+                values = np.where(is_string, string, number).astype(object)
+                values[~is_string & np.isnan(number)] = None
+                column: npt.NDArray[Any] = np.full(len(unique_ts), None, dtype=object)
+            else:
+                values = number
+                column = np.full(len(unique_ts), np.nan)
+            column[index[mask]] = values
+            columns[field] = column
+        return unique_ts, columns
+
+    def _slice(self, s: slice) -> "PointChunk":
+        return PointChunk(self.ts[s], self.key[s], self.number[s], self.string[s])
@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RuleActionSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="VIOT_RULE_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    TRIGGER_QUEUE_SIZE: int = 10000
+    """Triggers waiting to be dispatched. New ones are dropped once the queue is full."""
+    TRIGGER_MAX_CONCURRENCY: int = 64
+    """Triggers handled at the same time, across every team."""
+    TRIGGER_TEAM_CONCURRENCY: int = 4
+    """Triggers of a single team handled at the same time."""
+    TRIGGER_TEAM_MAX_PENDING: int = 256
+    """Triggers of a single team waiting for a slot. New ones are dropped past this."""
+    TRIGGER_COOLDOWN_SEC: float = 60
+    """A rule fires its actions at most once per this many seconds."""
+
+    CACHE_TTL_SEC: float = 300
+    """Rules and their actions stay cached this long for the trigger consumer."""
+    CACHE_SIZE: int = 10000
+    """Rules cached for the trigger consumer."""
+
+    EMAIL_BATCH_SIZE: int = 100
+    """Alert emails sent per Celery task."""
+    EMAIL_FLUSH_INTERVAL_SEC: float = 2.0
+    """Buffered alert emails are handed to Celery at least this often."""
+
+    RECONCILE_INTERVAL_SEC: float = 300
+    """EMQX rules are reconciled with the database at startup and then this often."""
+    RECONCILE_ORPHAN_GRACE_SEC: float = 60
+    """EMQX rules without a database row are only deleted once older than this, so
+    rules whose transaction has not committed yet are left alone."""
+    RECONCILE_LOCK_TTL_SEC: float = 120
+    """Expiry of the lock that keeps workers from reconciling at the same time."""
+
+    OUTBOX_BATCH_SIZE: int = 200
+    """Outbox entries claimed per dispatch."""
+    OUTBOX_POLL_INTERVAL_SEC: float = 5.0
+    """The outbox is checked at least this often, on top of the wake-up after a commit."""
+    OUTBOX_CLAIM_TTL_SEC: float = 300
+    """Claimed entries are left to the dispatcher that claimed them for this long, then
+    can be claimed by another one (e.g. if it died mid-dispatch)."""
+    OUTBOX_CONCURRENCY: int = 32
+    """EMQX API calls in flight at once while dispatching the outbox."""
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    """Attempts of an entry before it is dropped and left to the reconciliation."""
+    OUTBOX_RETRY_BACKOFF_SEC: float = 1.0
+    """Delay before retrying a failed entry, doubled on every attempt."""
+    OUTBOX_MAX_RETRY_BACKOFF_SEC: float = 300
+    """Upper bound of the delay between two attempts of an entry."""
+
+
+@lru_cache
+def get_rule_action_settings() -> RuleActionSettings:
+    return RuleActionSettings()
+
+
+rule_action_settings: RuleActionSettings = get_rule_action_settings()
@@ -9,9 +9,6 @@ MQTT_CONNECTED_EVENT_TOPIC = "$events/client_connected"
 MQTT_DISCONNECTED_EVENT_TOPIC = "$events/client_disconnected"
 MQTT_PRIVATE_TRIGGER_TOPIC = "v2/private/trigger"
 
-# EMQX where device key
-SUB_DEVICE_KEY = "sub_device_id"
-
 
 class EventType(IntEnum):
     """
@@ -25,6 +22,15 @@ class EventType(IntEnum):
     DISCONNECTED_EVENT = 4
 
 
+class EmqxRuleOperation(IntEnum):
+    """
+    Enum class for the EMQX side effect of a rule change
+    """
+
+    UPSERT = 0
+    DELETE = 1
+
+
 class RuleOperator(StrEnum):
     """
     Enum class for rule operator
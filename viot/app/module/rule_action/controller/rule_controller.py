@@ -7,25 +7,36 @@ from fastapi.params import Query
 from injector import inject
 
 from app.common.controller import Controller
-from app.common.dto.types import PageQuery, PageSizeQuery
+from app.common.dto.types import CursorQuery, PageSizeQuery, WithTotalQuery
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import RequireTeamPermission
 from app.module.auth.permission import TeamRulePermission
 
-from ..dto.rule_dto import RuleCreateDto, RulePagingDto, RuleResponseDto, RuleUpdateDto
+from ..dto.rule_dto import (
+    RuleBacktestQueryDto,
+    RuleBacktestResultDto,
+    RuleCreateDto,
+    RulePagingDto,
+    RuleResponseDto,
+    RuleUpdateDto,
+)
+from ..service.rule_backtest_service import RuleBacktestService
 from ..service.rule_service import RuleService
 
 
 class RuleController(Controller):
     @inject
-    def __init__(self, rule_service: RuleService) -> None:
+    def __init__(
+        self, rule_service: RuleService, rule_backtest_service: RuleBacktestService
+    ) -> None:
         super().__init__(
             prefix="/teams/{team_id}/rules",
             tags=["Rules & Actions"],
             dependencies=[DependSession],
         )
         self._rule_service = rule_service
+        self._rule_backtest_service = rule_backtest_service
 
     @get(
         "",
@@ -38,8 +49,9 @@ class RuleController(Controller):
         self,
         *,
         team_id: Annotated[UUID, Path(...)],
-        page: PageQuery,
         page_size: PageSizeQuery,
+        after: CursorQuery = None,
+        with_total: WithTotalQuery = False,
         device_id: Annotated[UUID | None, Query(..., description="Filter by device id")] = None,
     ) -> JSONResponse[RulePagingDto]:
         """
@@ -47,7 +59,11 @@ class RuleController(Controller):
         """
         return JSONResponse(
             content=await self._rule_service.get_paging_rules(
-                team_id=team_id, device_id=device_id, page=page, page_size=page_size
+                team_id=team_id,
+                device_id=device_id,
+                page_size=page_size,
+                after=after,
+                with_total=with_total,
             ),
             status_code=200,
         )
@@ -75,6 +91,34 @@ class RuleController(Controller):
             status_code=200,
         )
 
+    @get(
+        "/{rule_id}/backtest",
+        summary="Backtest a rule",
+        status_code=200,
+        responses={200: {"model": RuleBacktestResultDto}},
+        dependencies=[RequireTeamPermission(TeamRulePermission.READ)],
+    )
+    async def backtest_rule(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        rule_id: Annotated[UUID, Path(...)],
+        query_dto: Annotated[RuleBacktestQueryDto, Query(...)],
+    ) -> JSONResponse[RuleBacktestResultDto]:
+        """
+        Evaluate the rule condition against the device's stored telemetry over a date
+        range, and return how many times and when the rule would have fired.
+        """
+        return JSONResponse(
+            content=await self._rule_backtest_service.backtest_rule(
+                team_id=team_id,
+                rule_id=rule_id,
+                start_date=query_dto.start_date,
+                end_date=query_dto.end_date,
+            ),
+            status_code=200,
+        )
+
     @post(
         "",
         summary="Create a new rule",
@@ -1,11 +1,11 @@
 from datetime import datetime
-from typing import Any, Union
+from typing import Any, Self, Union
 from uuid import UUID
 
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 
-from app.common.dto import BaseInDto, BaseOutDto, PagingDto
-from app.database.repository.pagination import Page
+from app.common.dto import BaseInDto, BaseOutDto, CursorPagingDto
+from app.database.repository.pagination import CursorPage
 
 from ..constants import EventType, RuleLogic, RuleOperator
 from ..model.rule import Rule
@@ -20,7 +20,7 @@ class Condition(BaseInDto):
 
 class ConditionLogic(BaseInDto):
     logic: RuleLogic
-    conditions: list[Union[Condition, "ConditionLogic"]]
+    conditions: list[Union[Condition, "ConditionLogic"]] = Field(..., min_length=1)
 
 
 class BaseRuleDto(BaseInDto):
@@ -89,12 +89,49 @@ class RuleResponseDto(BaseOutDto):
         )
 
 
-class RulePagingDto(PagingDto[RuleResponseDto]):
+class RulePagingDto(CursorPagingDto[RuleResponseDto]):
     @classmethod
-    def from_page(cls, page: Page[Rule]) -> "RulePagingDto":
+    def from_page(cls, page: CursorPage[Rule]) -> "RulePagingDto":
         return RulePagingDto(
             items=[RuleResponseDto.from_model(rule) for rule in page.items],
-            total_items=page.total_items,
-            page=page.page,
             page_size=page.page_size,
+            next_cursor=page.next_cursor,
+            total_items=page.total_items,
+            approximate=page.approximate,
         )
+
+
+class RuleBacktestQueryDto(BaseInDto):
+    start_date: datetime = Field(
+        alias="startDate",
+        description="A string value representing the start date in ISO format, UTC.",
+    )
+    end_date: datetime = Field(
+        alias="endDate", description="A string value representing the end date in ISO format, UTC."
+    )
+
+    @field_validator("start_date", mode="before")
+    @classmethod
+    def transform_start_date(cls, value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+    @field_validator("end_date", mode="before")
+    @classmethod
+    def transform_end_date(cls, value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+    @model_validator(mode="after")
+    def validate_range(self) -> Self:
+        if self.start_date >= self.end_date:
+            raise ValueError("End date must be greater than start date")
+        return self
+
+
+class RuleBacktestResultDto(BaseOutDto):
+    rule_id: UUID
+    start_date: datetime
+    end_date: datetime
+    evaluated_points: int
+    fire_count: int
+    first_fired_at: datetime | None
+    last_fired_at: datetime | None
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import msgspec
+
+from ..snapshot import ActionSnapshot, RuleSnapshot
+
+
+class RuleTrigger(msgspec.Struct, frozen=True):
+    """A message matched by an EMQX rule and republished on `MQTT_PRIVATE_TRIGGER_TOPIC`."""
+
+    rule_id: UUID
+    device_id: UUID
+    action_ids: tuple[UUID, ...]
+    ts: datetime
+    payload: Any
+
+
+class ActionExecutor(ABC):
+    """Runs the actions of one `ActionType` for the trigger consumer."""
+
+    @abstractmethod
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop the executor, finishing the actions it has accepted."""
+
+    @abstractmethod
+    async def execute(
+        self, *, rule: RuleSnapshot, action: ActionSnapshot, trigger: RuleTrigger
+    ) -> None:
+        pass
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+
+import msgspec
+from injector import inject
+
+from app.module.email.service import IEmailService, RuleAlertEmail
+
+from ..config import rule_action_settings
+from ..snapshot import ActionSnapshot, RuleSnapshot
+from .base import ActionExecutor, RuleTrigger
+
+logger = logging.getLogger(__name__)
+
+
+class EmailActionExecutor(ActionExecutor):
+    """
+    Buffers alert emails and hands them to Celery in batches of `EMAIL_BATCH_SIZE`,
+    at least every `EMAIL_FLUSH_INTERVAL_SEC`, instead of one task per email.
+    """
+
+    @inject
+    def __init__(self, email_service: IEmailService) -> None:
+        self._email_service = email_service
+        self._batch_size = rule_action_settings.EMAIL_BATCH_SIZE
+        self._flush_interval = rule_action_settings.EMAIL_FLUSH_INTERVAL_SEC
+
+        self._alerts: list[RuleAlertEmail] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    async def execute(
+        self, *, rule: RuleSnapshot, action: ActionSnapshot, trigger: RuleTrigger
+    ) -> None:
+        payload = trigger.payload
+        self._alerts.append(
+            RuleAlertEmail(
+                email=action.config["email_address"],
+                rule_name=rule.name,
+                device_id=str(trigger.device_id),
+                ts=trigger.ts.isoformat(),
+                payload=payload
+                if isinstance(payload, str)
+                else msgspec.json.encode(payload).decode(),
+            )
+        )
+
+        if len(self._alerts) >= self._batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            alerts, self._alerts = self._alerts, []
+            for i in range(0, len(alerts), self._batch_size):
+                batch = alerts[i : i + self._batch_size]
+                try:
+                    self._email_service.send_rule_alert_emails(alerts=batch)
+                except Exception as e:
+                    logger.error(f"Error while sending {len(batch)} alert emails: {e}")
+
+    async def _run_flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
@@ -0,0 +1,33 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BIGINT, INTEGER, SMALLINT, DateTime, Index, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+from ..constants import EmqxRuleOperation
+
+
+class EmqxRuleOutbox(Base):
+    __tablename__ = "emqx_rule_outbox"
+
+    id: Mapped[int] = mapped_column(BIGINT, init=False, autoincrement=True, primary_key=True)
+    rule_id: Mapped[UUID]
+    version: Mapped[int] = mapped_column(INTEGER)
+    operation: Mapped[EmqxRuleOperation] = mapped_column(SMALLINT)
+    attempts: Mapped[int] = mapped_column(INTEGER, insert_default=0, init=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), insert_default=func.now(), init=False
+    )
+    # Set while a dispatcher syncs the rule of the entry, expires if it dies
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), init=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), insert_default=func.now(), init=False
+    )
+
+    __table_args__ = (
+        # Idempotency key of an entry
+        UniqueConstraint("rule_id", "version", name="emqx_rule_outbox_rule_id_version_key"),
+        Index("emqx_rule_outbox_next_attempt_at_idx", "next_attempt_at"),
+    )
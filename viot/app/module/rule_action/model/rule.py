@@ -1,7 +1,7 @@
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import SMALLINT, TEXT, Boolean, ForeignKey
+from sqlalchemy import INTEGER, SMALLINT, TEXT, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,7 +30,12 @@ class Rule(Base, DateTimeMixin):
     team_id: Mapped[UUID] = mapped_column(
         ForeignKey("teams.id", onupdate="CASCADE", ondelete="CASCADE")
     )
+    # Incremented in SQL on every update (see `RuleRepository.increment_version`), keys the
+    # EMQX sync and the compiled condition
+    version: Mapped[int] = mapped_column(INTEGER, insert_default=1, server_default="1", init=False)
 
     actions: Mapped[list[Action]] = relationship(
         secondary=RuleAction.__tablename__, backref="rules", lazy="joined"
     )
+
+    __table_args__ = (Index("rules_team_id_created_at_id_idx", "team_id", "created_at", "id"),)
@@ -1,16 +1,32 @@
 from injector import Binder, Module, SingletonScope
 
 from .controller.rule_controller import RuleController
+from .executor.email_action_executor import EmailActionExecutor
+from .repository.emqx_rule_outbox_repository import EmqxRuleOutboxRepository
+from .repository.rule_cache_repository import RuleCacheRepository
 from .repository.rule_repository import RuleRepository
 from .service.emqx_rule_builder_service import EmqxRuleBuilderService
+from .service.emqx_rule_outbox_service import EmqxRuleOutboxService
+from .service.emqx_rule_reconcile_service import EmqxRuleReconcileService
+from .service.rule_backtest_service import RuleBacktestService
+from .service.rule_evaluator_service import RuleEvaluatorService
 from .service.rule_service import RuleService
+from .service.rule_trigger_service import RuleTriggerService
 
 
 class RuleActionModule(Module):
     def configure(self, binder: Binder) -> None:
         binder.bind(RuleRepository, to=RuleRepository, scope=SingletonScope)
+        binder.bind(RuleCacheRepository, to=RuleCacheRepository, scope=SingletonScope)
+        binder.bind(EmqxRuleOutboxRepository, to=EmqxRuleOutboxRepository, scope=SingletonScope)
 
         binder.bind(RuleService, to=RuleService, scope=SingletonScope)
         binder.bind(EmqxRuleBuilderService, to=EmqxRuleBuilderService, scope=SingletonScope)
+        binder.bind(RuleEvaluatorService, to=RuleEvaluatorService, scope=SingletonScope)
+        binder.bind(RuleTriggerService, to=RuleTriggerService, scope=SingletonScope)
+        binder.bind(RuleBacktestService, to=RuleBacktestService, scope=SingletonScope)
+        binder.bind(EmqxRuleOutboxService, to=EmqxRuleOutboxService, scope=SingletonScope)
+        binder.bind(EmqxRuleReconcileService, to=EmqxRuleReconcileService, scope=SingletonScope)
+        binder.bind(EmailActionExecutor, to=EmailActionExecutor, scope=SingletonScope)
 
         binder.bind(RuleController, to=RuleController, scope=SingletonScope)
@@ -0,0 +1,97 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, exists, func, literal_column, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from app.database.repository import AsyncSqlalchemyRepository
+
+from ..constants import EmqxRuleOperation
+from ..model.emqx_rule_outbox import EmqxRuleOutbox
+
+# Rules of the oldest due entries, each locked until the transaction ends. Rules
+# claimed or locked by another transaction are skipped.
+_LOCK_DUE_RULES_QUERY = """
+    SELECT rule_id
+    FROM (
+        SELECT DISTINCT rule_id
+        FROM (
+            SELECT rule_id
+            FROM emqx_rule_outbox AS entry
+            WHERE next_attempt_at <= now()
+            AND NOT EXISTS (
+                SELECT 1
+                FROM emqx_rule_outbox AS claimed
+                WHERE claimed.rule_id = entry.rule_id AND claimed.claimed_until >= now()
+            )
+            ORDER BY id
+            LIMIT :limit
+        ) AS due
+    ) AS rules
+    WHERE pg_try_advisory_xact_lock(hashtext(CAST(rule_id AS text)))
+"""
+
+
+class EmqxRuleOutboxRepository(AsyncSqlalchemyRepository):
+    async def add(self, *, rule_id: UUID, version: int, operation: EmqxRuleOperation) -> None:
+        """Add an entry, unless one exists for this version of the rule."""
+        stmt = (
+            insert(EmqxRuleOutbox)
+            .values(rule_id=rule_id, version=version, operation=operation)
+            .on_conflict_do_nothing(index_elements=["rule_id", "version"])
+        )
+        await self.session.execute(stmt)
+
+    async def claim_due(self, *, limit: int, ttl_sec: float) -> Sequence[EmqxRuleOutbox]:
+        """
+        Claim the rules of the oldest due entries for `ttl_sec`, with every pending
+        entry of these rules. A rule is claimed by one transaction at a time, and not
+        at all while entries of it are claimed: the rule is synced by a single
+        dispatcher, so an older state of it can not be pushed after a newer one.
+        """
+        rule_ids = (
+            (await self.session.execute(text(_LOCK_DUE_RULES_QUERY), {"limit": limit}))
+            .scalars()
+            .all()
+        )
+        if not rule_ids:
+            return []
+
+        # A new statement, so claims committed before the rules were locked are seen
+        claimed = aliased(EmqxRuleOutbox)
+        stmt = (
+            update(EmqxRuleOutbox)
+            .where(
+                EmqxRuleOutbox.rule_id.in_(rule_ids),
+                ~exists().where(
+                    claimed.rule_id == EmqxRuleOutbox.rule_id,
+                    claimed.claimed_until >= func.now(),
+                ),
+            )
+            .values(claimed_until=func.now() + ttl_sec * literal_column("interval '1 second'"))
+            .returning(EmqxRuleOutbox)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def delete_by_ids(self, ids: Sequence[int]) -> None:
+        stmt = delete(EmqxRuleOutbox).where(EmqxRuleOutbox.id.in_(ids))
+        await self.session.execute(stmt)
+
+    async def reschedule_by_ids(
+        self, ids: Sequence[int], *, backoff_sec: float, max_backoff_sec: float
+    ) -> None:
+        """Count a failed attempt, release the claim and delay the next attempt exponentially."""
+        delay_sec = func.least(
+            backoff_sec * func.power(2, EmqxRuleOutbox.attempts), max_backoff_sec
+        )
+        stmt = (
+            update(EmqxRuleOutbox)
+            .where(EmqxRuleOutbox.id.in_(ids))
+            .values(
+                attempts=EmqxRuleOutbox.attempts + 1,
+                claimed_until=None,
+                next_attempt_at=func.now() + delay_sec * literal_column("interval '1 second'"),
+            )
+        )
+        await self.session.execute(stmt)
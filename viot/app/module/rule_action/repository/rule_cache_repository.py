@@ -0,0 +1,49 @@
+from uuid import UUID
+
+from injector import inject
+
+from app.common.cache import TTLCache
+from app.database.session import after_commit
+from app.extension.redis.client import RedisClient
+from app.extension.redis.eviction import EvictionChannel
+
+from ..config import rule_action_settings
+from ..snapshot import RuleSnapshot
+
+
+class RuleCacheRepository:
+    """
+    Rules and their actions, cached in process for the trigger consumer.
+
+    Nothing is stored in Redis, it only carries evictions (see `EvictionChannel`).
+    Evict a rule whenever it or one of its actions changes, or it is deleted.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._rules: TTLCache[UUID, RuleSnapshot] = TTLCache(
+            maxsize=rule_action_settings.CACHE_SIZE, ttl=rule_action_settings.CACHE_TTL_SEC
+        )
+        self._evictions = EvictionChannel(
+            redis_client,
+            "rule_evictions",
+            on_evict=lambda rule_id: self._rules.pop(UUID(rule_id)),
+            on_reset=self._rules.clear,
+        )
+
+    async def start(self) -> None:
+        await self._evictions.start()
+
+    async def stop(self) -> None:
+        await self._evictions.stop()
+        self._rules.clear()
+
+    def find(self, rule_id: UUID) -> RuleSnapshot | None:
+        return self._rules.get(rule_id)
+
+    def save(self, rule: RuleSnapshot) -> None:
+        self._rules.set(rule.id, rule)
+
+    async def evict(self, rule_id: UUID) -> None:
+        """Evict the rule in every process, once the current transaction commits."""
+        await after_commit(lambda: self._evictions.publish(str(rule_id)))
@@ -1,10 +1,13 @@
+from collections.abc import Sequence
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import Row, delete, func, select, update
 
 from app.database.repository import PageableRepository
 
 from ..model.rule import Rule
+from ..model.rule_action import RuleAction
 
 
 class RuleRepository(PageableRepository[Rule, UUID]):
@@ -12,6 +15,48 @@ class RuleRepository(PageableRepository[Rule, UUID]):
         stmt = select(Rule).where(Rule.team_id == team_id, Rule.id == rule_id)
         return (await self.session.execute(stmt)).scalar()
 
-    async def delete_by_team_id_and_rule_id(self, *, team_id: UUID, rule_id: UUID) -> None:
-        stmt = delete(Rule).where(Rule.team_id == team_id, Rule.id == rule_id)
-        await self.session.execute(stmt)
+    async def delete_by_team_id_and_rule_id(self, *, team_id: UUID, rule_id: UUID) -> int | None:
+        """Delete a rule, returning the version it had, `None` if it did not exist."""
+        stmt = (
+            delete(Rule).where(Rule.team_id == team_id, Rule.id == rule_id).returning(Rule.version)
+        )
+        version = (await self.session.execute(stmt)).scalar()
+        await self._invalidate_counts(Rule)
+        return version
+
+    async def increment_version(self, rule_id: UUID) -> int:
+        """
+        Bump the version of a rule in SQL and return it. The row lock serializes
+        concurrent updates, so each one gets its own version.
+        """
+        stmt = (
+            update(Rule)
+            .where(Rule.id == rule_id)
+            .values(version=Rule.version + 1)
+            .returning(Rule.version)
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def find_all_emqx_rules(
+        self, rule_ids: Sequence[UUID] | None = None
+    ) -> Sequence[Row[Any]]:
+        """
+        Find what every rule, or the rules of `rule_ids`, needs in EMQX, as
+        `(id, device_id, sql, enable, action_ids, version)` rows. `action_ids` is `None`
+        for a rule without actions.
+        """
+        stmt = (
+            select(
+                Rule.id,
+                Rule.device_id,
+                Rule.sql,
+                Rule.enable,
+                func.array_agg(RuleAction.action_id).filter(RuleAction.action_id.is_not(None)),
+                Rule.version,
+            )
+            .outerjoin(RuleAction, RuleAction.rule_id == Rule.id)
+            .group_by(Rule.id)
+        )
+        if rule_ids is not None:
+            stmt = stmt.where(Rule.id.in_(rule_ids))
+        return (await self.session.execute(stmt)).all()
@@ -1,11 +1,17 @@
+import hashlib
+import json
+from collections.abc import Iterable
 from uuid import UUID
 
+from app.module.device_data.constants import SUB_DEVICE_KEY
+from app.module.emqx.dto.emqx_rule_dto import EmqxActionDto, EmqxCreateRuleDto, RepublishArgsDto
+
 from ..constants import (
     MQTT_CONNECTED_EVENT_TOPIC,
     MQTT_DEVICE_DATA_TOPIC,
     MQTT_DISCONNECTED_EVENT_TOPIC,
+    MQTT_PRIVATE_TRIGGER_TOPIC,
     MQTT_SUB_DEVICE_DATA_TOPIC,
-    SUB_DEVICE_KEY,
     EventType,
     RuleOperator,
 )
@@ -49,6 +55,60 @@ class EmqxRuleBuilderService:
             f"AND {sql_condition}"
         )
 
+    def build_rule(
+        self,
+        *,
+        rule_id: UUID,
+        device_id: UUID,
+        sql: str,
+        enable: bool,
+        action_ids: Iterable[UUID],
+    ) -> EmqxCreateRuleDto:
+        """
+        Build the EMQX rule of a rule: its SQL, and a republish action that hands
+        matched messages to the trigger consumer.
+
+        The description holds a fingerprint of the SQL, actions and state of the
+        rule, so a rule listed from EMQX can be compared without fetching and
+        normalizing its actions.
+
+        Args:
+            rule_id (UUID): The ID of the rule.
+            device_id (UUID): The ID of the device of the rule.
+            sql (str): The EMQX SQL of the rule.
+            enable (bool): Whether the rule is enabled.
+            action_ids (Iterable[UUID]): The IDs of the actions of the rule.
+
+        Returns:
+            EmqxCreateRuleDto: The EMQX rule.
+        """
+        action = EmqxActionDto(
+            function="republish",
+            args=RepublishArgsDto(
+                topic=MQTT_PRIVATE_TRIGGER_TOPIC,
+                qos=2,
+                retain=True,
+                direct_dispatch=True,
+                payload=json.dumps(
+                    {
+                        "device_id": str(device_id),
+                        "rule_id": str(rule_id),
+                        "action_ids": sorted(str(action_id) for action_id in action_ids),
+                        "ts": "${ts}",
+                        "payload": "${payload}",
+                    }
+                ),
+            ),
+        )
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                {"sql": sql, "actions": [action.model_dump()], "enable": enable}, sort_keys=True
+            ).encode()
+        ).hexdigest()
+        return EmqxCreateRuleDto(
+            id=str(rule_id), sql=sql, actions=[action], enable=enable, description=fingerprint
+        )
+
     def get_mqtt_topic(self, event_type: EventType, is_sub_device: bool) -> str:
         """
         Build an MQTT topic based on the event type and whether the device is a sub-device.
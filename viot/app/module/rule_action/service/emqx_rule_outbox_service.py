@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from injector import inject
+
+from app.database.session import after_commit, transactional_session
+from app.module.emqx.service.emqx_rule_service import EmqxRuleService
+
+from ..config import rule_action_settings
+from ..constants import EmqxRuleOperation
+from ..repository.emqx_rule_outbox_repository import EmqxRuleOutboxRepository
+from ..repository.rule_repository import RuleRepository
+from .emqx_rule_builder_service import EmqxRuleBuilderService
+
+logger = logging.getLogger(__name__)
+
+
+class EmqxRuleOutboxService:
+    """
+    Transactional outbox of the EMQX side effects of rule changes.
+
+    `enqueue` writes an entry in the transaction of the change, so the request only
+    waits for the database. A background dispatcher claims due entries in batches
+    and pushes the current state of their rules to EMQX: an upsert, or a delete once
+    the rule is gone. Both calls are idempotent and entries are keyed by rule id and
+    version, so an entry applied twice or superseded by a newer one does no harm.
+
+    Workers share the work rule by rule: all the pending entries of a rule are
+    claimed together, and a rule is not claimed again until they are settled or
+    their claim expires after `OUTBOX_CLAIM_TTL_SEC`. A rule is thus never pushed by
+    two workers at once, where the one that read the older state could finish last.
+
+    Failed entries are retried with exponential backoff, and dropped after
+    `OUTBOX_MAX_ATTEMPTS`, leaving the rule to `EmqxRuleReconcileService`.
+    """
+
+    @inject
+    def __init__(
+        self,
+        emqx_rule_outbox_repository: EmqxRuleOutboxRepository,
+        rule_repository: RuleRepository,
+        emqx_rule_service: EmqxRuleService,
+        emqx_rule_builder_service: EmqxRuleBuilderService,
+    ) -> None:
+        self._emqx_rule_outbox_repository = emqx_rule_outbox_repository
+        self._rule_repository = rule_repository
+        self._emqx_rule_service = emqx_rule_service
+        self._emqx_rule_builder_service = emqx_rule_builder_service
+        self._batch_size = rule_action_settings.OUTBOX_BATCH_SIZE
+        self._poll_interval = rule_action_settings.OUTBOX_POLL_INTERVAL_SEC
+        self._max_attempts = rule_action_settings.OUTBOX_MAX_ATTEMPTS
+        self._claim_ttl = rule_action_settings.OUTBOX_CLAIM_TTL_SEC
+
+        self._dispatch_requested = asyncio.Event()
+        self._dispatcher: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._run_dispatcher())
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    async def enqueue(self, *, rule_id: UUID, version: int, operation: EmqxRuleOperation) -> None:
+        """
+        Record that a version of a rule must be synced to EMQX. Must be called in
+        the transaction that changed the rule.
+        """
+        await self._emqx_rule_outbox_repository.add(
+            rule_id=rule_id, version=version, operation=operation
+        )
+        await after_commit(self._request_dispatch)
+
+    async def dispatch(self) -> int:
+        """
+        Attempt a batch of due entries. They are claimed in a first transaction, and
+        settled in a second one once EMQX answered, so no transaction is held open
+        across the EMQX calls.
+
+        Returns:
+            int: The number of entries claimed.
+        """
+        async with transactional_session():
+            entries = await self._emqx_rule_outbox_repository.claim_due(
+                limit=self._batch_size, ttl_sec=self._claim_ttl
+            )
+        if not entries:
+            return 0
+
+        rule_ids = list({entry.rule_id for entry in entries})
+        failed_rule_ids = await self._sync_rules(rule_ids)
+
+        done: list[int] = []
+        retry: list[int] = []
+        exhausted: list[int] = []
+        for entry in entries:
+            if entry.rule_id not in failed_rule_ids:
+                done.append(entry.id)
+            elif entry.attempts + 1 >= self._max_attempts:
+                exhausted.append(entry.id)
+            else:
+                retry.append(entry.id)
+
+        if exhausted:
+            logger.error(
+                f"Dropped {len(exhausted)} EMQX rule outbox entries "
+                f"after {self._max_attempts} attempts"
+            )
+        async with transactional_session():
+            if done or exhausted:
+                await self._emqx_rule_outbox_repository.delete_by_ids(done + exhausted)
+            if retry:
+                await self._emqx_rule_outbox_repository.reschedule_by_ids(
+                    retry,
+                    backoff_sec=rule_action_settings.OUTBOX_RETRY_BACKOFF_SEC,
+                    max_backoff_sec=rule_action_settings.OUTBOX_MAX_RETRY_BACKOFF_SEC,
+                )
+        return len(entries)
+
+    async def _request_dispatch(self) -> None:
+        self._dispatch_requested.set()
+
+    async def _run_dispatcher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._dispatch_requested.wait(), timeout=self._poll_interval)
+            except TimeoutError:
+                pass
+            self._dispatch_requested.clear()
+            try:
+                while await self.dispatch() >= self._batch_size:
+                    pass
+            except Exception as e:
+                logger.error(f"Error while dispatching the EMQX rule outbox: {e}")
+
+    async def _sync_rules(self, rule_ids: list[UUID]) -> set[UUID]:
+        """
+        Push the current state of the rules to EMQX, one call per rule whatever the
+        number of its entries. Returns the rules that failed.
+        """
+        async with transactional_session():
+            rows = await self._rule_repository.find_all_emqx_rules(rule_ids)
+        rules = {
+            rule_id: self._emqx_rule_builder_service.build_rule(
+                rule_id=rule_id,
+                device_id=device_id,
+                sql=sql,
+                enable=enable,
+                action_ids=action_ids or (),
+            )
+            for rule_id, device_id, sql, enable, action_ids, _ in rows
+        }
+        slots = asyncio.Semaphore(rule_action_settings.OUTBOX_CONCURRENCY)
+        failed: set[UUID] = set()
+
+        async def sync(rule_id: UUID) -> None:
+            async with slots:
+                dto = rules.get(rule_id)
+                try:
+                    if dto is None:
+                        await self._emqx_rule_service.delete_rule(rule_id=str(rule_id))
+                    else:
+                        await self._emqx_rule_service.upsert_rule(dto=dto)
+                except Exception as e:
+                    logger.error(f"Error while syncing rule {rule_id} to EMQX: {e}")
+                    failed.add(rule_id)
+
+        await asyncio.gather(*(sync(rule_id) for rule_id in rule_ids))
+        return failed
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from injector import inject
+from redis.exceptions import LockError
+
+from app.database.session import transactional_session
+from app.extension.redis.client import RedisClient
+from app.module.emqx.dto.emqx_rule_dto import EmqxRuleDto
+from app.module.emqx.service.emqx_rule_service import EmqxRuleService
+
+from ..config import rule_action_settings
+from ..constants import EmqxRuleOperation
+from ..repository.rule_repository import RuleRepository
+from .emqx_rule_builder_service import EmqxRuleBuilderService
+from .emqx_rule_outbox_service import EmqxRuleOutboxService
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAME = "emqx_rule_reconcile_lock"
+# Versions of the rules start at 1, an orphan has no row to take one from
+_ORPHAN_VERSION = 0
+
+
+class ReconcileSummary(NamedTuple):
+    created: int
+    updated: int
+    deleted: int
+
+
+class EmqxRuleReconcileService:
+    """
+    Brings the EMQX rule engine back in line with the `rules` table, e.g. after the
+    broker lost its rule store or a call to EMQX failed after the database write.
+
+    A pass lists every EMQX rule, compares it by id and fingerprint (see
+    `EmqxRuleBuilderService.build_rule`) against the rules in the database, and
+    enqueues the rules that differ in the outbox rather than calling EMQX itself:
+    the dispatcher then pushes their current state, one dispatcher per rule, so a
+    pass can not overwrite a newer push with the state it read. Only rules whose id
+    is a UUID are managed, the rules provisioned with the broker are left alone.
+
+    Passes run at startup and every `RECONCILE_INTERVAL_SEC`, one worker at a time.
+    """
+
+    @inject
+    def __init__(
+        self,
+        rule_repository: RuleRepository,
+        emqx_rule_outbox_service: EmqxRuleOutboxService,
+        emqx_rule_service: EmqxRuleService,
+        emqx_rule_builder_service: EmqxRuleBuilderService,
+        redis_client: RedisClient,
+    ) -> None:
+        self._rule_repository = rule_repository
+        self._emqx_rule_outbox_service = emqx_rule_outbox_service
+        self._emqx_rule_service = emqx_rule_service
+        self._emqx_rule_builder_service = emqx_rule_builder_service
+        self._redis_client = redis_client
+        self._interval = rule_action_settings.RECONCILE_INTERVAL_SEC
+        self._orphan_grace = timedelta(seconds=rule_action_settings.RECONCILE_ORPHAN_GRACE_SEC)
+        self._reconciler: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._reconciler is None:
+            self._reconciler = asyncio.create_task(self._run_reconciler())
+
+    async def stop(self) -> None:
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            try:
+                await self._reconciler
+            except asyncio.CancelledError:
+                pass
+            self._reconciler = None
+
+    async def reconcile(self) -> ReconcileSummary | None:
+        """
+        Run a reconciliation pass, unless another worker is running one.
+
+        Returns:
+            ReconcileSummary | None: The rules the pass enqueued, `None` if it was skipped.
+        """
+        lock = self._redis_client.lock(
+            _LOCK_NAME, timeout=rule_action_settings.RECONCILE_LOCK_TTL_SEC, blocking=False
+        )
+        if not await lock.acquire():
+            return None
+        try:
+            return await self._reconcile()
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                pass
+
+    async def _run_reconciler(self) -> None:
+        while True:
+            try:
+                summary = await self.reconcile()
+            except Exception as e:
+                logger.error(f"Error while reconciling EMQX rules: {e}")
+            else:
+                if summary is not None and any(summary):
+                    logger.info(f"Reconciled EMQX rules: {summary._asdict()}")
+            await asyncio.sleep(self._interval)
+
+    async def _reconcile(self) -> ReconcileSummary:
+        # EMQX is listed before the database is read: a rule whose transaction has not
+        # committed yet shows up in EMQX only, and is spared by the orphan grace
+        emqx_rules = {
+            rule.id: rule
+            for rule in await self._emqx_rule_service.get_all_rules()
+            if _is_uuid(rule.id)
+        }
+        created = updated = 0
+        async with transactional_session():
+            rows = await self._rule_repository.find_all_emqx_rules()
+            for rule_id, device_id, sql, enable, action_ids, version in rows:
+                desired = self._emqx_rule_builder_service.build_rule(
+                    rule_id=rule_id,
+                    device_id=device_id,
+                    sql=sql,
+                    enable=enable,
+                    action_ids=action_ids or (),
+                )
+                current = emqx_rules.pop(desired.id, None)
+                if current is None:
+                    created += 1
+                elif current.description != desired.description:
+                    updated += 1
+                else:
+                    continue
+                await self._emqx_rule_outbox_service.enqueue(
+                    rule_id=rule_id, version=version, operation=EmqxRuleOperation.UPSERT
+                )
+
+            orphaned_before = datetime.now(UTC) - self._orphan_grace
+            orphans = [
+                UUID(rule.id)
+                for rule in emqx_rules.values()
+                if _created_before(rule, orphaned_before)
+            ]
+            for rule_id in orphans:
+                await self._emqx_rule_outbox_service.enqueue(
+                    rule_id=rule_id, version=_ORPHAN_VERSION, operation=EmqxRuleOperation.DELETE
+                )
+
+        return ReconcileSummary(created=created, updated=updated, deleted=len(orphans))
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _created_before(rule: EmqxRuleDto, before: datetime) -> bool:
+    if rule.created_at is None:
+        return True
+    created_at = rule.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+    return created_at < before
@@ -0,0 +1,194 @@
+import operator
+from collections.abc import Callable, Hashable, Mapping
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import TypeAdapter
+
+from app.common.cache import TTLCache
+
+from ..config import rule_action_settings
+from ..constants import RuleLogic, RuleOperator
+from ..dto.rule_dto import Condition, ConditionLogic
+
+Predicate = Callable[[Mapping[str, Any]], bool]
+BatchPredicate = Callable[[Mapping[str, npt.NDArray[Any]], int], npt.NDArray[np.bool_]]
+
+_OPERATORS: dict[RuleOperator, Callable[[Any, Any], Any]] = {
+    RuleOperator.gt: operator.gt,
+    RuleOperator.gte: operator.ge,
+    RuleOperator.lt: operator.lt,
+    RuleOperator.lte: operator.le,
+    RuleOperator.eq: operator.eq,
+    RuleOperator.neq: operator.ne,
+}
+
+_condition_adapter: TypeAdapter[ConditionLogic | Condition] = TypeAdapter(
+    ConditionLogic | Condition
+)
+
+
+class CompiledCondition:
+    """
+    A condition compiled to Python closures.
+
+    Call it with a decoded payload to evaluate one message, or use `evaluate_batch`
+    to evaluate many points at once over columns of values (one array per field,
+    `NaN` or `None` where the field is missing).
+
+    Semantics follow the EMQX SQL built by `EmqxRuleBuilderService`: a missing
+    field, `null` or a value of an incomparable type never matches.
+    """
+
+    __slots__ = ("fields", "_predicate", "_batch_predicate")
+
+    def __init__(
+        self, fields: frozenset[str], predicate: Predicate, batch_predicate: BatchPredicate
+    ) -> None:
+        self.fields = fields
+        """Payload fields the condition reads."""
+        self._predicate = predicate
+        self._batch_predicate = batch_predicate
+
+    def __call__(self, payload: Mapping[str, Any]) -> bool:
+        return self._predicate(payload)
+
+    def evaluate_batch(
+        self, columns: Mapping[str, npt.NDArray[Any]], size: int
+    ) -> npt.NDArray[np.bool_]:
+        return self._batch_predicate(columns, size)
+
+
+class RuleEvaluatorService:
+    def __init__(self) -> None:
+        self._compiled: TTLCache[tuple[UUID, Hashable], CompiledCondition] = TTLCache(
+            maxsize=rule_action_settings.CACHE_SIZE, ttl=rule_action_settings.CACHE_TTL_SEC
+        )
+
+    def compile(self, condition: ConditionLogic | Condition) -> CompiledCondition:
+        """
+        Compile a condition tree to an in-process predicate.
+
+        Args:
+            condition (ConditionLogic | Condition): The condition to compile.
+
+        Returns:
+            CompiledCondition: The compiled condition.
+
+        Raises:
+            ValueError: If an operator is not allowed for the type of its value.
+        """
+        return CompiledCondition(
+            self._collect_fields(condition),
+            self._compile(condition),
+            self._compile_batch(condition),
+        )
+
+    def get_compiled(
+        self, *, rule_id: UUID, version: Hashable, condition: Mapping[str, Any]
+    ) -> CompiledCondition:
+        """
+        Compile the stored condition of a rule, reusing the result as long as the
+        rule is at the same version.
+
+        Args:
+            rule_id (UUID): The ID of the rule.
+            version (Hashable): Changes whenever the condition of the rule may change.
+            condition (Mapping[str, Any]): The condition as stored on the rule.
+
+        Returns:
+            CompiledCondition: The compiled condition.
+        """
+        key = (rule_id, version)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self.compile(_condition_adapter.validate_python(condition))
+            self._compiled.set(key, compiled)
+        return compiled
+
+    def _collect_fields(self, condition: ConditionLogic | Condition) -> frozenset[str]:
+        if isinstance(condition, Condition):
+            return frozenset((condition.field,))
+        return frozenset().union(
+            *(self._collect_fields(sub_condition) for sub_condition in condition.conditions)
+        )
+
+    def _compile(self, condition: ConditionLogic | Condition) -> Predicate:
+        if isinstance(condition, Condition):
+            field = condition.field
+            compare = _OPERATORS[condition.operator]
+            value = self._validate_condition_value(condition)
+
+            def predicate(payload: Mapping[str, Any]) -> bool:
+                actual = payload.get(field)
+                if actual is None:
+                    return False
+                try:
+                    return bool(compare(actual, value))
+                except TypeError:
+                    return False
+
+            return predicate
+
+        children = tuple(self._compile(sub_condition) for sub_condition in condition.conditions)
+        if condition.logic == RuleLogic.AND:
+            return lambda payload: all(child(payload) for child in children)
+        return lambda payload: any(child(payload) for child in children)
+
+    def _compile_batch(self, condition: ConditionLogic | Condition) -> BatchPredicate:
+        if isinstance(condition, Condition):
+            field = condition.field
+            compare = _OPERATORS[condition.operator]
+            value = self._validate_condition_value(condition)
+            scalar = self._compile(condition)
+
+            def batch_predicate(
+                columns: Mapping[str, npt.NDArray[Any]], size: int
+            ) -> npt.NDArray[np.bool_]:
+                column = columns.get(field)
+                if column is None:
+                    return np.zeros(size, dtype=np.bool_)
+                if column.dtype.kind == "O":
+                    # Mixed or string values, compared one by one
+                    return np.fromiter(
+                        (scalar({field: v}) for v in column), dtype=np.bool_, count=len(column)
+                    )
+                try:
+                    with np.errstate(invalid="ignore"):
+                        matched = np.asarray(compare(column, value), dtype=np.bool_)
+                except TypeError:
+                    return np.zeros(size, dtype=np.bool_)
+                if column.dtype.kind == "f":
+                    matched &= ~np.isnan(column)
+                return matched
+
+            return batch_predicate
+
+        children = tuple(
+            self._compile_batch(sub_condition) for sub_condition in condition.conditions
+        )
+        reduce = np.logical_and if condition.logic == RuleLogic.AND else np.logical_or
+
+        def logic_batch_predicate(
+            columns: Mapping[str, npt.NDArray[Any]], size: int
+        ) -> npt.NDArray[np.bool_]:
+            matched = children[0](columns, size)
+            for child in children[1:]:
+                matched = reduce(matched, child(columns, size))
+            return matched
+
+        return logic_batch_predicate
+
+    def _validate_condition_value(self, condition: Condition) -> str | int | bool:
+        """Same rule as `EmqxRuleBuilderService`: strings only support `=` and `!=`."""
+        if isinstance(condition.value, str) and condition.operator not in (
+            RuleOperator.eq,
+            RuleOperator.neq,
+        ):
+            raise ValueError(
+                f"Operator '{condition.operator}' is not allowed "
+                f"for string values in field '{condition.field}'"
+            )
+        return condition.value
@@ -1,27 +1,21 @@
-import json
 from uuid import UUID
 
 from injector import inject
 
-from app.database.repository import Filter, Pageable
+from app.database.repository import Filter, KeysetPageable, Sort
 from app.module.device.constants import DeviceType
 from app.module.device.service.device_service import DeviceService
-from app.module.emqx.dto.emqx_rule_dto import (
-    EmqxActionDto,
-    EmqxCreateRuleDto,
-    EmqxUpdateRuleDto,
-    RepublishArgsDto,
-)
-from app.module.emqx.service.emqx_rule_service import EmqxRuleService
 from app.module.team.service.team_service import TeamService
 
-from ..constants import MQTT_PRIVATE_TRIGGER_TOPIC
+from ..constants import EmqxRuleOperation
 from ..dto.rule_dto import RuleCreateDto, RulePagingDto, RuleResponseDto, RuleUpdateDto
 from ..exception.rule_exception import RuleNotFoundException
 from ..model.action import Action
 from ..model.rule import Rule
+from ..repository.rule_cache_repository import RuleCacheRepository
 from ..repository.rule_repository import RuleRepository
 from .emqx_rule_builder_service import EmqxRuleBuilderService
+from .emqx_rule_outbox_service import EmqxRuleOutboxService
 
 
 class RuleService:
@@ -29,16 +23,18 @@ class RuleService:
     def __init__(
         self,
         rule_repository: RuleRepository,
-        emqx_rule_service: EmqxRuleService,
+        emqx_rule_outbox_service: EmqxRuleOutboxService,
         team_service: TeamService,
         device_service: DeviceService,
         emqx_rule_builder_service: EmqxRuleBuilderService,
+        rule_cache_repository: RuleCacheRepository,
     ) -> None:
         self._rule_repository = rule_repository
-        self._emqx_rule_service = emqx_rule_service
+        self._emqx_rule_outbox_service = emqx_rule_outbox_service
         self._team_service = team_service
         self._device_service = device_service
         self._emqx_rule_builder_service = emqx_rule_builder_service
+        self._rule_cache_repository = rule_cache_repository
 
     async def get_rule_by_id_and_team_id(self, *, team_id: UUID, rule_id: UUID) -> RuleResponseDto:
         rule = await self._rule_repository.find_by_team_id_and_rule_id(
@@ -50,14 +46,28 @@ class RuleService:
         return RuleResponseDto.from_model(rule)
 
     async def get_paging_rules(
-        self, *, team_id: UUID, device_id: UUID | None, page: int, page_size: int
+        self,
+        *,
+        team_id: UUID,
+        device_id: UUID | None,
+        page_size: int,
+        after: str | None,
+        with_total: bool,
     ) -> RulePagingDto:
         filters = [Filter("team_id", "eq", team_id)]
         if device_id:
             filters.append(Filter("device_id", "eq", device_id))
 
-        rule_pages = await self._rule_repository.find_all_with_paging(
-            pageable=Pageable(page=page, page_size=page_size, filters=filters), use_unique=True
+        rule_pages = await self._rule_repository.find_all_with_cursor(
+            pageable=KeysetPageable(
+                page_size=page_size,
+                sorts=[Sort("created_at", "desc")],
+                filters=filters,
+                after=after,
+                with_total=with_total,
+                count_strategy="cached",
+            ),
+            use_unique=True,
         )
         return RulePagingDto.from_page(rule_pages)
 
@@ -106,13 +116,9 @@ class RuleService:
         )
         rule = await self._rule_repository.save(rule)
 
-        emqx_rule_dto = EmqxCreateRuleDto(
-            id=str(rule.id),
-            sql=rule.sql,
-            actions=[self._create_emqx_action_dto(rule)],
-            enable=rule.enable,
+        await self._emqx_rule_outbox_service.enqueue(
+            rule_id=rule.id, version=rule.version, operation=EmqxRuleOperation.UPSERT
         )
-        await self._emqx_rule_service.create_rule(dto=emqx_rule_dto)
 
         return RuleResponseDto.from_model(rule)
 
@@ -174,36 +180,20 @@ class RuleService:
         rule.actions = actions
 
         rule = await self._rule_repository.save(rule)
-
-        emqx_rule_dto = EmqxUpdateRuleDto(
-            sql=rule.sql,
-            actions=[self._create_emqx_action_dto(rule)],
-            enable=rule.enable,
+        version = await self._rule_repository.increment_version(rule.id)
+        await self._rule_cache_repository.evict(rule.id)
+        await self._emqx_rule_outbox_service.enqueue(
+            rule_id=rule.id, version=version, operation=EmqxRuleOperation.UPSERT
         )
-        await self._emqx_rule_service.update_rule(rule_id=str(rule.id), dto=emqx_rule_dto)
 
         return RuleResponseDto.from_model(rule)
 
-    def _create_emqx_action_dto(self, rule: Rule) -> EmqxActionDto:
-        return EmqxActionDto(
-            function="republish",
-            args=RepublishArgsDto(
-                topic=MQTT_PRIVATE_TRIGGER_TOPIC,
-                qos=2,
-                retain=True,
-                direct_dispatch=True,
-                payload=json.dumps(
-                    {
-                        "device_id": str(rule.device_id),
-                        "rule_id": str(rule.id),
-                        "action_ids": [str(action.id) for action in rule.actions],
-                        "ts": "${ts}",
-                        "payload": "${payload}",
-                    }
-                ),
-            ),
-        )
-
     async def delete_rule(self, *, team_id: UUID, rule_id: UUID) -> None:
-        await self._rule_repository.delete_by_team_id_and_rule_id(team_id=team_id, rule_id=rule_id)
-        await self._emqx_rule_service.delete_rule(rule_id=str(rule_id))
+        version = await self._rule_repository.delete_by_team_id_and_rule_id(
+            team_id=team_id, rule_id=rule_id
+        )
+        await self._rule_cache_repository.evict(rule_id)
+        if version is not None:
+            await self._emqx_rule_outbox_service.enqueue(
+                rule_id=rule_id, version=version + 1, operation=EmqxRuleOperation.DELETE
+            )
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from collections import Counter
+from uuid import UUID
+
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.common.cache import TTLCache
+from app.database.session import transactional_session
+from app.extension.redis.client import RedisClient
+
+from ..config import rule_action_settings
+from ..constants import ActionType
+from ..executor.base import ActionExecutor, RuleTrigger
+from ..executor.email_action_executor import EmailActionExecutor
+from ..repository.rule_cache_repository import RuleCacheRepository
+from ..repository.rule_repository import RuleRepository
+from ..snapshot import RuleSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class RuleTriggerService:
+    """
+    Consumes rule triggers (messages republished by EMQX on `MQTT_PRIVATE_TRIGGER_TOPIC`)
+    and runs the actions of the matched rule with the executor of their type.
+
+    `submit` never waits: triggers are queued, and dropped once `TRIGGER_QUEUE_SIZE`
+    are pending. A rule fires at most once per `TRIGGER_COOLDOWN_SEC` across every
+    worker, later triggers are dropped. The cooldown is a Redis key, with a local copy
+    that skips the round trip for triggers of a rule this worker already fired; if
+    Redis is unreachable each worker only enforces its own cooldown.
+
+    At most `TRIGGER_MAX_CONCURRENCY` triggers run their actions at once, and at most
+    `TRIGGER_TEAM_CONCURRENCY` of a single team, so a noisy team only queues behind
+    itself. Past `TRIGGER_TEAM_MAX_PENDING` its triggers are dropped.
+    """
+
+    @inject
+    def __init__(
+        self,
+        rule_repository: RuleRepository,
+        rule_cache_repository: RuleCacheRepository,
+        email_action_executor: EmailActionExecutor,
+        redis_client: RedisClient,
+    ) -> None:
+        self._rule_repository = rule_repository
+        self._redis_client = redis_client
+        self._rule_cache_repository = rule_cache_repository
+        self._executors: dict[ActionType, ActionExecutor] = {
+            ActionType.EMAIL: email_action_executor,
+        }
+        self._team_concurrency = rule_action_settings.TRIGGER_TEAM_CONCURRENCY
+        self._team_max_pending = rule_action_settings.TRIGGER_TEAM_MAX_PENDING
+        self._cooldown_ms = int(rule_action_settings.TRIGGER_COOLDOWN_SEC * 1000)
+
+        self._queue: asyncio.Queue[RuleTrigger] = asyncio.Queue(
+            maxsize=rule_action_settings.TRIGGER_QUEUE_SIZE
+        )
+        self._cooldowns: TTLCache[UUID, bool] = TTLCache(
+            maxsize=rule_action_settings.CACHE_SIZE,
+            ttl=rule_action_settings.TRIGGER_COOLDOWN_SEC,
+        )
+        self._slots = asyncio.Semaphore(rule_action_settings.TRIGGER_MAX_CONCURRENCY)
+        self._team_slots: dict[UUID, asyncio.Semaphore] = {}
+        self._team_pending: Counter[UUID] = Counter()
+        self._handlers: set[asyncio.Task[None]] = set()
+        self._dispatcher: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        await self._rule_cache_repository.start()
+        for executor in self._executors.values():
+            await executor.start()
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._run_dispatcher())
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._queue.qsize():
+            logger.warning(f"Dropped {self._queue.qsize()} rule triggers on shutdown")
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        for executor in self._executors.values():
+            await executor.stop()
+        await self._rule_cache_repository.stop()
+
+    def submit(self, trigger: RuleTrigger) -> None:
+        try:
+            self._queue.put_nowait(trigger)
+        except asyncio.QueueFull:
+            logger.warning(f"Rule trigger queue is full, dropped trigger of rule {trigger.rule_id}")
+
+    async def _run_dispatcher(self) -> None:
+        while True:
+            trigger = await self._queue.get()
+            if self._cooldowns.get(trigger.rule_id):
+                continue
+            self._cooldowns.set(trigger.rule_id, True)
+
+            handler = asyncio.create_task(self._handle(trigger))
+            self._handlers.add(handler)
+            handler.add_done_callback(self._handlers.discard)
+
+    async def _handle(self, trigger: RuleTrigger) -> None:
+        if not await self._start_cooldown(trigger.rule_id):
+            return
+        # Loads are mostly cache hits, misses are bounded by the database pool. The
+        # global slot is taken after the team slot, so a noisy team waits without
+        # holding one
+        try:
+            rule = await self._get_rule(trigger.rule_id)
+        except Exception as e:
+            logger.error(f"Error while loading rule {trigger.rule_id}: {e}")
+            return
+        if rule is None or not rule.enable:
+            return
+
+        team_id = rule.team_id
+        if self._team_pending[team_id] >= self._team_max_pending:
+            logger.warning(f"Too many pending rule triggers for team {team_id}, dropped one")
+            return
+
+        self._team_pending[team_id] += 1
+        team_slots = self._team_slots.setdefault(team_id, asyncio.Semaphore(self._team_concurrency))
+        try:
+            async with team_slots, self._slots:
+                await self._execute(rule, trigger)
+        finally:
+            self._team_pending[team_id] -= 1
+            if not self._team_pending[team_id]:
+                del self._team_pending[team_id]
+                del self._team_slots[team_id]
+
+    async def _start_cooldown(self, rule_id: UUID) -> bool:
+        """Return False if the rule is cooling down after firing in another worker."""
+        try:
+            started = await self._redis_client.set(
+                f"rule_cooldown:{rule_id}", 1, nx=True, px=self._cooldown_ms
+            )
+        except RedisError as e:
+            logger.warning(f"Error while starting the cooldown of rule {rule_id}: {e}")
+            return True
+        return bool(started)
+
+    async def _get_rule(self, rule_id: UUID) -> RuleSnapshot | None:
+        rule = self._rule_cache_repository.find(rule_id)
+        if rule is None:
+            async with transactional_session():
+                model = await self._rule_repository.find(rule_id)
+                if model is None:
+                    return None
+                rule = RuleSnapshot.from_model(model)
+            self._rule_cache_repository.save(rule)
+        return rule
+
+    async def _execute(self, rule: RuleSnapshot, trigger: RuleTrigger) -> None:
+        for action in rule.actions:
+            if action.id not in trigger.action_ids:
+                continue
+            executor = self._executors.get(action.action_type)
+            if executor is None:
+                logger.warning(f"No executor for action type {action.action_type}")
+                continue
+            try:
+                await executor.execute(rule=rule, action=action, trigger=trigger)
+            except Exception as e:
+                logger.error(f"Error while executing action {action.id} of rule {rule.id}: {e}")
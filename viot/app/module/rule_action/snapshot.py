@@ -0,0 +1,43 @@
+from typing import Any
+from uuid import UUID
+
+import msgspec
+
+from .constants import ActionType
+from .model.action import Action
+from .model.rule import Rule
+
+
+class ActionSnapshot(msgspec.Struct, frozen=True):
+    id: UUID
+    name: str
+    action_type: ActionType
+    config: dict[str, Any]
+
+    @classmethod
+    def from_model(cls, action: Action) -> "ActionSnapshot":
+        return cls(
+            id=action.id, name=action.name, action_type=action.action_type, config=action.config
+        )
+
+
+class RuleSnapshot(msgspec.Struct, frozen=True):
+    """A rule and its actions, as much of them as the trigger consumer needs."""
+
+    id: UUID
+    name: str
+    enable: bool
+    device_id: UUID
+    team_id: UUID
+    actions: tuple[ActionSnapshot, ...]
+
+    @classmethod
+    def from_model(cls, rule: Rule) -> "RuleSnapshot":
+        return cls(
+            id=rule.id,
+            name=rule.name,
+            enable=rule.enable,
+            device_id=rule.device_id,
+            team_id=rule.team_id,
+            actions=tuple(ActionSnapshot.from_model(action) for action in rule.actions),
+        )
@@ -9,8 +9,8 @@ from app.common.controller import Controller
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import DependCurrentUser, RequireTeamPermission
-from app.module.auth.model.user import User
 from app.module.auth.permission import TeamProfilePermission
+from app.module.auth.principal import Principal
 
 from ..dto.team_dto import TeamCreateDto, TeamDto, TeamUpdateDto
 from ..service.team_service import TeamService
@@ -26,7 +26,7 @@ class TeamController(Controller):
     async def create_team(
         self,
         *,
-        current_user: Annotated[User, DependCurrentUser],
+        current_user: Annotated[Principal, DependCurrentUser],
         team_create_dto: Annotated[TeamCreateDto, Body(...)],
     ) -> JSONResponse[TeamDto]:
         """Create a team"""
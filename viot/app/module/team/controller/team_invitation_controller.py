@@ -10,8 +10,8 @@ from app.common.dto import PageQuery, PageSizeQuery
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import DependCurrentUser, RequireTeamPermission
-from app.module.auth.model.user import User
 from app.module.auth.permission import TeamInvitationPermission
+from app.module.auth.principal import Principal
 
 from ..dto.team_invitation_dto import (
     PagingTeamInvitationDto,
@@ -63,14 +63,14 @@ class TeamInvitationController(Controller):
     async def create_team_invitation(
         self,
         *,
-        current_user: Annotated[User, DependCurrentUser],
+        current_user: Annotated[Principal, DependCurrentUser],
         team_invitation_create_dto: Annotated[TeamInvitationCreateDto, Body(...)],
         team_id: Annotated[UUID, Path(...)],
     ) -> JSONResponse[TeamInvitationDto]:
         """Create a team invitation"""
         invitation = await self._team_invitation_service.create_team_invitation(
             team_id=team_id,
-            inviter=current_user,
+            inviter_id=current_user.id,
             team_invitation_create_dto=team_invitation_create_dto,
         )
         return JSONResponse(content=invitation, status_code=201)
@@ -38,6 +38,7 @@ class MemberPagingDto(PagingDto[MemberDto]):
         return MemberPagingDto(
             items=[MemberDto.from_model(user) for user in page.items],
             total_items=page.total_items,
+            approximate=page.approximate,
             page=page.page,
             page_size=page.page_size,
         )
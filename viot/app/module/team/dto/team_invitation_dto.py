@@ -51,6 +51,7 @@ class PagingTeamInvitationDto(PagingDto[TeamInvitationDto]):
         return cls(
             items=[TeamInvitationDto.from_model(invitation) for invitation in page.items],
             total_items=page.total_items,
+            approximate=page.approximate,
             page=page.page,
             page_size=page.page_size,
         )
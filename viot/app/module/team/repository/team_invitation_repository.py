@@ -15,7 +15,9 @@ class TeamInvitationRepository(PageableRepository[TeamInvitation, UUID]):
     async def delete_by_token(self, token: str) -> None:
         stmt = delete(TeamInvitation).where(TeamInvitation.token == token)
         await self.session.execute(stmt)
+        await self._invalidate_counts(TeamInvitation)
 
     async def delete_by_id(self, id: UUID) -> None:
         stmt = delete(TeamInvitation).where(TeamInvitation.id == id)
         await self.session.execute(stmt)
+        await self._invalidate_counts(TeamInvitation)
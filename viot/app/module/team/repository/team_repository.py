@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import NamedTuple
 from uuid import UUID
 
@@ -60,10 +61,12 @@ class TeamRepository(CrudRepository[Team, UUID]):
     async def delete_by_id(self, id: UUID) -> None:
         await self.session.execute(delete(Team).where(Team.id == id))
 
-    async def delete_all_by_user_id(self, user_id: UUID) -> None:
+    async def delete_all_by_user_id(self, user_id: UUID) -> Sequence[UUID]:
+        """Delete the teams of a user and return their ids."""
         stmt = (
             delete(Team)
             .where(Team.id == UserTeamRole.team_id)
             .where(UserTeamRole.user_id == user_id)
+            .returning(Team.id)
         )
-        await self.session.execute(stmt)
+        return (await self.session.scalars(stmt)).all()
@@ -8,6 +8,9 @@ from app.module.auth.constants import TEAM_ROLE_OWNER
 from app.module.auth.exception.role_exception import RoleIdNotFoundException
 from app.module.auth.exception.user_exception import UserNotFoundException
 from app.module.auth.model.user_team_role import UserTeamRole
+from app.module.auth.repository.permission_scope_cache_repository import (
+    PermissionScopeCacheRepository,
+)
 from app.module.auth.repository.role_repository import RoleRepository
 from app.module.auth.repository.user_repository import TeamMember, UserRepository
 from app.module.auth.repository.user_team_role_repository import UserTeamRoleRepository
@@ -23,10 +26,12 @@ class MemberService:
         user_repository: UserRepository,
         role_repository: RoleRepository,
         user_team_role_repository: UserTeamRoleRepository,
+        permission_scope_cache_repository: PermissionScopeCacheRepository,
     ) -> None:
         self._user_repository = user_repository
         self._role_repository = role_repository
         self._user_team_role_repository = user_team_role_repository
+        self._permission_scope_cache_repository = permission_scope_cache_repository
 
     async def find_paging_members(
         self,
@@ -42,6 +47,7 @@ class MemberService:
                 page=page,
                 page_size=page_size,
                 sorts=[Sort(UserTeamRole.created_at, sort_direction_joined_at)],
+                count_strategy="cached",
             ),
         )
         return MemberPagingDto.from_page(member_page)
@@ -81,12 +87,18 @@ class MemberService:
         await self._user_team_role_repository.update_role_id(
             user_id=member_id, team_id=team_id, role_id=member_update_dto.role_id
         )
+        await self._permission_scope_cache_repository.evict_member(
+            user_id=member_id, team_id=team_id
+        )
 
         member.role = role_name
         return MemberDto.from_model(member)
 
     async def delete_member(self, *, team_id: UUID, member_id: UUID) -> None:
         await self._user_repository.delete_user_by_id_and_team_id(member_id, team_id)
+        await self._permission_scope_cache_repository.evict_member(
+            user_id=member_id, team_id=team_id
+        )
 
     def validate_sensitive_role(self, *, role_name: str) -> None:
         """Validate sensitive role"""
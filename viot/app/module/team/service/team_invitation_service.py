@@ -7,8 +7,10 @@ from injector import inject
 from app.config import app_settings
 from app.database.repository import Filter, Pageable
 from app.module.auth.exception.user_exception import UserNotFoundException
-from app.module.auth.model.user import User
 from app.module.auth.model.user_team_role import UserTeamRole
+from app.module.auth.repository.permission_scope_cache_repository import (
+    PermissionScopeCacheRepository,
+)
 from app.module.auth.repository.role_repository import RoleRepository
 from app.module.auth.repository.user_repository import UserRepository
 from app.module.auth.repository.user_team_role_repository import UserTeamRoleRepository
@@ -43,6 +45,7 @@ class TeamInvitationService:
         team_invitation_repository: TeamInvitationRepository,
         user_team_role_repository: UserTeamRoleRepository,
         role_repository: RoleRepository,
+        permission_scope_cache_repository: PermissionScopeCacheRepository,
     ) -> None:
         self._email_service = email_service
         self._user_repository = user_repository
@@ -50,6 +53,7 @@ class TeamInvitationService:
         self._team_invitation_repository = team_invitation_repository
         self._user_team_role_repository = user_team_role_repository
         self._role_repository = role_repository
+        self._permission_scope_cache_repository = permission_scope_cache_repository
 
     async def get_pageable_team_invitations(
         self, team_id: UUID, page: int, page_size: int
@@ -58,13 +62,22 @@ class TeamInvitationService:
             page=page,
             page_size=page_size,
             filters=[Filter(field="team_id", operator="eq", value=team_id)],
+            count_strategy="cached",
         )
         team_invitation_page = await self._team_invitation_repository.find_all_with_paging(pageable)
         return PagingTeamInvitationDto.from_page(team_invitation_page)
 
     async def create_team_invitation(
-        self, *, team_id: UUID, inviter: User, team_invitation_create_dto: TeamInvitationCreateDto
+        self,
+        *,
+        team_id: UUID,
+        inviter_id: UUID,
+        team_invitation_create_dto: TeamInvitationCreateDto,
     ) -> TeamInvitationDto:
+        inviter = await self._user_repository.find(inviter_id)
+        if inviter is None:
+            raise UserNotFoundException
+
         invitee = await self._user_repository.find_by_email(team_invitation_create_dto.email)
         if invitee is None:
             raise UserNotFoundException
@@ -116,6 +129,9 @@ class TeamInvitationService:
         await self._user_team_role_repository.save(
             UserTeamRole(user_id=invitee_id, team_id=invitation.team_id, role_id=role_id)
         )
+        await self._permission_scope_cache_repository.evict_member(
+            user_id=invitee_id, team_id=invitation.team_id
+        )
 
         # Delete invitation
         await self._team_invitation_repository.delete(invitation)
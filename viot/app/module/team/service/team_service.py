@@ -10,6 +10,7 @@ from app.module.auth.model.user_team_role import UserTeamRole
 from app.module.auth.repository.permission_repository import PermissionRepository
 from app.module.auth.repository.user_team_role_repository import UserTeamRoleRepository
 from app.module.auth.service.team_role_service import TeamRoleService
+from app.module.device.service.device_credential_service import DeviceCredentialService
 
 from ..dto.team_dto import TeamCreateDto, TeamDto, TeamUpdateDto, TeamWithRoleAndPermissionsDto
 from ..exception.team_exception import TeamNotFoundException, TeamSlugAlreadyExistsException
@@ -28,11 +29,13 @@ class TeamService:
         team_role_service: TeamRoleService,
         permission_repository: PermissionRepository,
         user_team_role_repository: UserTeamRoleRepository,
+        device_credential_service: DeviceCredentialService,
     ) -> None:
         self._team_repository = team_repository
         self._team_role_service = team_role_service
         self._permission_repository = permission_repository
         self._user_team_role_repository = user_team_role_repository
+        self._device_credential_service = device_credential_service
 
     async def get_teams_with_role_by_user_id(
         self, *, user_id: UUID
@@ -107,6 +110,8 @@ class TeamService:
 
     async def delete_team_by_id(self, *, team_id: UUID) -> None:
         await self._team_repository.delete_by_id(team_id)
+        await self._device_credential_service.evict_team(team_id)
 
     async def delete_all_teams_by_user_id(self, *, user_id: UUID) -> None:
-        await self._team_repository.delete_all_by_user_id(user_id)
+        for team_id in await self._team_repository.delete_all_by_user_id(user_id):
+            await self._device_credential_service.evict_team(team_id)
@@ -0,0 +1,24 @@
+import asyncio
+import signal
+
+import uvloop
+
+from app.common.logging import setup_logging
+
+from .worker import NotificationWorker
+
+
+async def main() -> None:
+    worker = asyncio.create_task(NotificationWorker().run())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.cancel)
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+
+
+if __name__ == "__main__":
+    setup_logging()
+    uvloop.run(main())
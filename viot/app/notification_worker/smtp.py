@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from app.extension.email.config import email_settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection is reopened and the message sent again
+_RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class AsyncSmtpPool:
+    """
+    A fixed number of authenticated SMTP connections shared by every coroutine of
+    the worker. Connections are opened on first use and kept open, a message waits
+    for a free one.
+
+    Like `SmtpClient`, a connection the server dropped is reopened and the message
+    sent once more.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._idle: asyncio.Queue[aiosmtplib.SMTP | None] = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)
+
+    async def send(self, message: EmailMessage) -> None:
+        smtp = await self._idle.get()
+        try:
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._connect()
+            try:
+                await smtp.send_message(message)
+            except _RECONNECT_ERRORS as e:
+                logger.warning(f"SMTP connection lost ({e!r}), reconnecting")
+                await _quit(smtp)
+                smtp = None
+                smtp = await self._connect()
+                await smtp.send_message(message)
+        finally:
+            self._idle.put_nowait(smtp)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            smtp = self._idle.get_nowait()
+            if smtp is not None:
+                await _quit(smtp)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=email_settings.SMTP_HOST,
+            port=email_settings.SMTP_PORT,
+            use_tls=email_settings.SMTP_SSL,
+            start_tls=email_settings.SMTP_TLS and not email_settings.SMTP_SSL,
+            username=email_settings.SMTP_USER,
+            password=email_settings.SMTP_PASSWORD,
+            timeout=email_settings.SMTP_TIMEOUT_SEC,
+        )
+        await smtp.connect()
+        return smtp
+
+
+async def _quit(smtp: aiosmtplib.SMTP) -> None:
+    try:
+        await smtp.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        smtp.close()
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Any
+
+import httpx
+import msgspec
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.extension.email.enums import TemplateType
+from app.extension.email.smtp import build_message
+from app.extension.email.utils import get_template, render, subject_map
+from app.extension.notification.config import notification_settings
+from app.extension.notification.message import (
+    EmailNotification,
+    Notification,
+    WebhookNotification,
+    decoder,
+)
+from app.extension.redis.config import redis_settings
+
+from .smtp import AsyncSmtpPool
+
+logger = logging.getLogger(__name__)
+
+StreamFields = dict[bytes, bytes]
+
+
+class NotificationWorker:
+    """
+    Delivers the notifications of the Redis stream (see `NotificationPublisher`)
+    from a single event loop: up to `CONCURRENCY` at once over a pool of
+    `SMTP_POOL_SIZE` SMTP connections and a shared HTTP connection pool for
+    webhooks. It does the work of as many prefork Celery children, which mostly
+    wait on the network.
+
+    Workers share a consumer group, so a message goes to one of them. It is
+    acknowledged once delivered. A failed delivery is queued again with the time it
+    is due at, and moved to `DEAD_LETTER_STREAM` after `MAX_ATTEMPTS`. A worker
+    reading a retry before it is due holds it without taking a slot. Messages of a
+    worker that died before acknowledging them are taken over after `CLAIM_IDLE_SEC`.
+    """
+
+    def __init__(self) -> None:
+        self._redis = Redis(
+            host=redis_settings.SERVER,
+            port=redis_settings.PORT,
+        )
+        self._smtp_pool = AsyncSmtpPool(notification_settings.SMTP_POOL_SIZE)
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=notification_settings.WEBHOOK_MAX_CONNECTIONS),
+            timeout=notification_settings.WEBHOOK_TIMEOUT_SEC,
+        )
+        self._stream = notification_settings.STREAM
+        self._group = notification_settings.GROUP
+        self._consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._slots = asyncio.Semaphore(notification_settings.CONCURRENCY)
+        self._handlers: set[asyncio.Task[None]] = set()
+        self._waiting: set[asyncio.Task[None]] = set()
+
+    async def run(self) -> None:
+        """Consume the stream until cancelled, then finish the deliveries in flight."""
+        await self._create_group()
+        claimer = asyncio.create_task(self._run_claimer())
+        logger.info(f"Notification worker {self._consumer} consuming {self._stream}")
+        try:
+            while True:
+                response = await self._redis.xreadgroup(
+                    self._group,
+                    self._consumer,
+                    {self._stream: ">"},
+                    count=notification_settings.READ_COUNT,
+                    block=notification_settings.READ_BLOCK_MS,
+                )
+                for _, entries in response or ():
+                    for entry_id, fields in entries:
+                        await self._submit(entry_id, fields)
+        finally:
+            # Waiting retries stay pending, another worker claims them
+            for task in (claimer, *self._waiting):
+                task.cancel()
+            await asyncio.gather(claimer, *self._waiting, return_exceptions=True)
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._close()
+
+    async def _create_group(self) -> None:
+        try:
+            await self._redis.xgroup_create(self._stream, self._group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _close(self) -> None:
+        await self._smtp_pool.close()
+        await self._http_client.aclose()
+        await self._redis.close()
+
+    async def _submit(self, entry_id: bytes, fields: StreamFields) -> None:
+        delay = int(fields.get(b"not_before", 0)) / 1000 - time.time()
+        if delay > 0:
+            waiting = asyncio.create_task(self._submit_later(delay, entry_id, fields))
+            self._waiting.add(waiting)
+            waiting.add_done_callback(self._waiting.discard)
+        else:
+            await self._start_handler(entry_id, fields)
+
+    async def _submit_later(self, delay: float, entry_id: bytes, fields: StreamFields) -> None:
+        # Not checked against `not_before` again: the loop clock and the wall clock
+        # drift apart, which would only delay the message once more
+        await asyncio.sleep(delay)
+        await self._start_handler(entry_id, fields)
+
+    async def _start_handler(self, entry_id: bytes, fields: StreamFields) -> None:
+        # Waiting for a slot stops the reads, so a worker never holds more messages
+        # than it can deliver
+        await self._slots.acquire()
+        handler = asyncio.create_task(self._handle(entry_id, fields))
+        self._handlers.add(handler)
+        handler.add_done_callback(self._handlers.discard)
+
+    async def _handle(self, entry_id: bytes, fields: StreamFields) -> None:
+        try:
+            try:
+                notification = decoder.decode(fields[b"data"])
+            except (KeyError, msgspec.DecodeError) as e:
+                logger.error(f"Dropped malformed notification {entry_id!r}: {e!r}")
+                await self._redis.xack(self._stream, self._group, entry_id)
+                return
+
+            try:
+                await self._deliver(notification)
+            except Exception as e:
+                await self._retry(entry_id, fields, e)
+            else:
+                await self._redis.xack(self._stream, self._group, entry_id)
+        except Exception as e:
+            # Left pending, the message is claimed again later
+            logger.error(f"Error while handling notification {entry_id!r}: {e!r}")
+        finally:
+            self._slots.release()
+
+    async def _deliver(self, notification: Notification) -> None:
+        if isinstance(notification, EmailNotification):
+            await self._send_email(notification)
+        elif isinstance(notification, WebhookNotification):
+            await self._call_webhook(notification)
+
+    async def _send_email(self, notification: EmailNotification) -> None:
+        template_type = TemplateType[notification.template]
+        html_content = render(template=get_template(template_type), ctx=notification.ctx)
+        subject = subject_map[template_type].format(**notification.ctx)
+        await self._smtp_pool.send(
+            build_message(to=notification.to, subject=subject, html_content=html_content)
+        )
+        logger.info(f"Email sent to {notification.to}")
+
+    async def _call_webhook(self, notification: WebhookNotification) -> None:
+        response = await self._http_client.request(
+            notification.method,
+            notification.url,
+            headers=notification.headers,
+            json=notification.payload,
+        )
+        response.raise_for_status()
+
+    async def _retry(self, entry_id: bytes, fields: StreamFields, error: Exception) -> None:
+        attempts = int(fields.get(b"attempts", 0)) + 1
+        if attempts >= notification_settings.MAX_ATTEMPTS:
+            logger.error(
+                f"Moved notification {entry_id!r} to the dead letters "
+                f"after {attempts} attempts: {error!r}"
+            )
+            stream = notification_settings.DEAD_LETTER_STREAM
+            message: dict[str, Any] = {
+                "data": fields[b"data"],
+                "attempts": attempts,
+                "error": repr(error),
+            }
+        else:
+            backoff = min(
+                notification_settings.RETRY_BACKOFF_SEC * 2 ** (attempts - 1),
+                notification_settings.MAX_RETRY_BACKOFF_SEC,
+            )
+            logger.warning(
+                f"Error while delivering notification {entry_id!r}, "
+                f"will retry in {backoff}s: {error!r}"
+            )
+            stream = self._stream
+            message = {
+                "data": fields[b"data"],
+                "attempts": attempts,
+                "not_before": int((time.time() + backoff) * 1000),
+            }
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                stream,
+                message,
+                maxlen=notification_settings.STREAM_MAXLEN,
+                approximate=True,
+            )
+            pipe.xack(self._stream, self._group, entry_id)
+            await pipe.execute()
+
+    async def _run_claimer(self) -> None:
+        while True:
+            try:
+                await self._claim()
+            except Exception as e:
+                logger.error(f"Error while claiming pending notifications: {e!r}")
+            await asyncio.sleep(notification_settings.CLAIM_INTERVAL_SEC)
+
+    async def _claim(self) -> None:
+        start_id: bytes | str = "0-0"
+        while True:
+            start_id, entries, *_ = await self._redis.xautoclaim(
+                self._stream,
+                self._group,
+                self._consumer,
+                min_idle_time=notification_settings.CLAIM_IDLE_SEC * 1000,
+                start_id=start_id,
+                count=notification_settings.READ_COUNT,
+            )
+            for entry_id, fields in entries:
+                # Entries trimmed from the stream while pending
+                if fields is not None:
+                    await self._submit(entry_id, fields)
+            if start_id in (b"0-0", "0-0"):
+                return
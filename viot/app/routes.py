@@ -10,6 +10,12 @@ from app.module.auth.controller.user_controller import UserController
 from app.module.device.controller.device_controller import DeviceController
 from app.module.device_data.controller.connect_log_controller import ConnectLogController
 from app.module.device_data.controller.device_data_controller import DeviceDataController
+from app.module.device_data.controller.device_data_storage_controller import (
+    DeviceDataStorageController,
+)
+from app.module.device_data.controller.device_data_stream_controller import (
+    DeviceDataStreamController,
+)
 from app.module.emqx.controller.emqx_device_controller import EmqxDeviceController
 from app.module.rule_action.controller.rule_controller import RuleController
 from app.module.team.controller.member_controller import MemberController
@@ -31,6 +37,8 @@ api_router.include_router(injector.get(MemberController).router)
 api_router.include_router(injector.get(DeviceController).router)
 api_router.include_router(injector.get(ConnectLogController).router)
 api_router.include_router(injector.get(DeviceDataController).router)
+api_router.include_router(injector.get(DeviceDataStorageController).router)
+api_router.include_router(injector.get(DeviceDataStreamController).router)
 api_router.include_router(injector.get(RuleController).router)
 
 internal_api_router.include_router(injector.get(EmqxDeviceController).router)
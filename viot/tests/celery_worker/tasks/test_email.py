@@ -0,0 +1,62 @@
+from collections.abc import Generator
+from smtplib import SMTPServerDisconnected
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+from celery.exceptions import Retry
+
+from app.celery_worker.tasks.email import send_email_batch
+
+
+def _alert(email: str) -> dict[str, Any]:
+    return {"email": email, "rule_name": "Rule", "device_id": "device", "ts": 0, "payload": "{}"}
+
+
+@pytest.fixture
+def mock_send() -> Generator[Mock, None, None]:
+    with patch("app.extension.email.utils.send") as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_retry() -> Generator[Mock, None, None]:
+    with patch.object(send_email_batch, "retry", side_effect=Retry()) as mock:
+        yield mock
+
+
+def test_send_email_batch_retries_the_messages_that_failed(
+    mock_send: Mock, mock_retry: Mock
+) -> None:
+    # given
+    sent, failing = _alert("sent@example.com"), _alert("failing@example.com")
+    invalid = {"rule_name": "Rule"}
+
+    def send(*, to: str, **_: Any) -> None:
+        if to == failing["email"]:
+            raise SMTPServerDisconnected("Connection lost")
+
+    mock_send.side_effect = send
+
+    # when
+    with pytest.raises(Retry):
+        send_email_batch.run(template="RULE_ALERT", messages=[invalid, failing, sent])
+
+    # then
+    assert [c.kwargs["to"] for c in mock_send.call_args_list] == [failing["email"], sent["email"]]
+    assert mock_send.call_args_list[1].kwargs["subject"] == "Rule Rule triggered"
+    assert mock_retry.call_args.kwargs["kwargs"] == {
+        "template": "RULE_ALERT",
+        "messages": [failing],
+    }
+
+
+def test_send_email_batch_does_not_retry_when_every_message_is_sent(
+    mock_send: Mock, mock_retry: Mock
+) -> None:
+    # when
+    send_email_batch.run(template="RULE_ALERT", messages=[_alert("sent@example.com")])
+
+    # then
+    mock_send.assert_called_once()
+    mock_retry.assert_not_called()
@@ -0,0 +1,160 @@
+from contextvars import ContextVar
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.database.config import db_settings
+from app.database.context import session_ctx
+from app.database.repository.count import CountCache, CountResult, count_rows
+from app.database.repository.crud import CrudRepository
+from app.database.session import run_after_commit_callbacks
+
+
+class OrderTest(Base):
+    __tablename__ = "orders"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    status: Mapped[str]
+
+
+@pytest.fixture
+def mock_redis_client() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def count_cache(mock_redis_client: AsyncMock) -> CountCache:
+    return CountCache(mock_redis_client)
+
+
+class OrderTestRepository(CrudRepository[OrderTest, int]):
+    pass
+
+
+def _mock_session(*results: object) -> AsyncMock:
+    session = AsyncMock()
+    session.execute.side_effect = [MagicMock(scalar_one=MagicMock(return_value=r)) for r in results]
+    return session
+
+
+async def test_count_cache_returns_count_with_current_versions(
+    count_cache: CountCache, mock_redis_client: AsyncMock
+) -> None:
+    # given
+    mock_redis_client.mget.return_value = ["3,0:42", "3", None]
+
+    # when
+    cached, stamp = await count_cache.get("key", ["a", "b"])
+
+    # then
+    assert cached == 42
+    assert stamp == "3,0"
+    mock_redis_client.mget.assert_awaited_once_with(
+        ["count:key", "count_version:a", "count_version:b"]
+    )
+
+
+async def test_count_cache_ignores_count_of_older_versions(
+    count_cache: CountCache, mock_redis_client: AsyncMock
+) -> None:
+    # given
+    mock_redis_client.mget.return_value = ["3,0:42", "4", None]
+
+    # when
+    cached, stamp = await count_cache.get("key", ["a", "b"])
+
+    # then
+    assert cached is None
+    assert stamp == "4,0"
+
+
+async def test_count_rows_exact(count_cache: CountCache) -> None:
+    # given
+    session = _mock_session(7)
+
+    # when
+    result = await count_rows(session, select(OrderTest).limit(10), "exact", count_cache)
+
+    # then
+    assert result == CountResult(7)
+    stmt = session.execute.await_args.args[0]
+    assert "count(*)" in str(stmt)
+    assert "LIMIT" not in str(stmt)
+
+
+async def test_count_rows_estimate_above_threshold(count_cache: CountCache) -> None:
+    # given
+    estimate = db_settings.COUNT_ESTIMATE_THRESHOLD + 1
+    session = _mock_session([{"Plan": {"Plan Rows": estimate}}])
+
+    # when
+    result = await count_rows(session, select(OrderTest), "estimate", count_cache)
+
+    # then
+    assert result == CountResult(estimate, approximate=True)
+    assert str(session.execute.await_args.args[0]).startswith("EXPLAIN (FORMAT JSON)")
+
+
+async def test_count_rows_estimate_below_threshold_counts_exactly(count_cache: CountCache) -> None:
+    # given
+    session = _mock_session([{"Plan": {"Plan Rows": 5}}], 4)
+
+    # when
+    result = await count_rows(session, select(OrderTest), "estimate", count_cache)
+
+    # then
+    assert result == CountResult(4)
+    assert session.execute.await_count == 2
+
+
+async def test_count_rows_cached_hit(count_cache: CountCache, mock_redis_client: AsyncMock) -> None:
+    # given
+    mock_redis_client.mget.return_value = ["1:9", "1"]
+    session = _mock_session()
+
+    # when
+    result = await count_rows(session, select(OrderTest), "cached", count_cache)
+
+    # then
+    assert result == CountResult(9)
+    session.execute.assert_not_awaited()
+
+
+async def test_count_rows_cached_miss_stores_count(
+    count_cache: CountCache, mock_redis_client: AsyncMock
+) -> None:
+    # given
+    mock_redis_client.mget.return_value = [None, "2"]
+    session = _mock_session(5)
+
+    # when
+    result = await count_rows(session, select(OrderTest), "cached", count_cache)
+
+    # then
+    assert result == CountResult(5)
+    key = mock_redis_client.mget.await_args.args[0][0]
+    mock_redis_client.set.assert_awaited_once_with(key, "2:5", ex=db_settings.COUNT_CACHE_TTL_SEC)
+
+
+async def test_save_invalidates_counts_after_commit() -> None:
+    # given
+    mock_count_cache = AsyncMock()
+    session = AsyncMock(info={}, add=Mock())
+    token = session_ctx.set(session)
+    repository = OrderTestRepository(
+        session_ctx=ContextVar("session_ctx", default=session), count_cache=mock_count_cache
+    )
+
+    # when
+    try:
+        await repository.save(OrderTest(id=1, status="new"))
+    finally:
+        session_ctx.reset(token)
+
+    # then
+    mock_count_cache.invalidate.assert_not_awaited()
+    await run_after_commit_callbacks(session)
+    mock_count_cache.invalidate.assert_awaited_once_with(["orders"])
@@ -2,11 +2,20 @@ from typing import Any
 from unittest.mock import Mock
 
 import pytest
-from sqlalchemy import Select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.base import Base
-from app.database.repository.pagination import Filter, FilterOperator, Pageable, Sort
+from app.database.repository.pagination import (
+    Filter,
+    FilterOperator,
+    InvalidCursorError,
+    KeysetPageable,
+    Pageable,
+    Sort,
+    decode_cursor,
+    encode_cursor,
+)
 
 
 class ProductTest(Base):
@@ -83,3 +92,33 @@ def test_pageable() -> None:
 
     mock_query.where.assert_called_once()
     assert result is not None
+
+
+def test_keyset_pageable_orders_by_sorts_and_primary_key() -> None:
+    pageable = KeysetPageable(page_size=5, sorts=[Sort("name", "desc")])
+
+    query = pageable.apply(select(ProductTest), ProductTest)
+
+    assert [c.key for c in pageable.key_columns(ProductTest)] == ["name", "id"]
+    assert "ORDER BY products.name DESC, products.id DESC" in str(query)
+    assert query._limit == 6
+
+
+def test_keyset_pageable_seeks_after_cursor() -> None:
+    pageable = KeysetPageable(sorts=[Sort("name")], after=encode_cursor(["apple", 3]))
+
+    query = pageable.apply(select(ProductTest), ProductTest)
+
+    assert "(products.name, products.id) > (:param_1, :param_2)" in str(query)
+    assert decode_cursor(pageable.after, pageable.key_columns(ProductTest)) == ["apple", 3]  # type: ignore
+
+
+def test_keyset_pageable_rejects_mixed_directions() -> None:
+    with pytest.raises(ValueError):
+        KeysetPageable(sorts=[Sort("name", "asc"), Sort("description", "desc")])
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(["apple"]), "e30", "café"])
+def test_decode_cursor_rejects_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, KeysetPageable(sorts=[Sort("name")]).key_columns(ProductTest))
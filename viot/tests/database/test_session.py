@@ -0,0 +1,34 @@
+from unittest.mock import AsyncMock, Mock
+
+from app.database.context import session_ctx
+from app.database.session import after_commit, run_after_commit_callbacks
+
+
+async def test_after_commit_without_session_runs_callback() -> None:
+    # given
+    callback = AsyncMock()
+
+    # when
+    await after_commit(callback)
+
+    # then
+    callback.assert_awaited_once()
+
+
+async def test_after_commit_defers_callback_until_commit() -> None:
+    # given
+    callback = AsyncMock()
+    session = Mock(info={})
+    token = session_ctx.set(session)
+
+    # when
+    try:
+        await after_commit(callback)
+    finally:
+        session_ctx.reset(token)
+
+    # then
+    callback.assert_not_awaited()
+    await run_after_commit_callbacks(session)
+    callback.assert_awaited_once()
+    assert session.info == {}
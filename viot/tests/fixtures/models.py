@@ -164,6 +164,7 @@ def mock_rule(mock_action: Mock) -> Mock:
     mock.condition = {}
     mock.device_id = uuid4()
     mock.team_id = uuid4()
+    mock.version = 1
     mock.actions = [mock_action]
     mock.created_at = datetime.now()
     mock.updated_at = None
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.module.auth.repository.permission_scope_cache_repository import (
+    PermissionScopeCacheRepository,
+)
+
+
+@pytest.fixture
+def mock_redis_client() -> AsyncMock:
+    redis_client = AsyncMock()
+    redis_client.pubsub = MagicMock()
+    redis_client.pipeline = MagicMock()
+    redis_client.pipeline.return_value.__aenter__.return_value = MagicMock(execute=AsyncMock())
+    return redis_client
+
+
+@pytest.fixture
+def permission_scope_cache_repository(
+    mock_redis_client: AsyncMock,
+) -> PermissionScopeCacheRepository:
+    return PermissionScopeCacheRepository(mock_redis_client)
+
+
+async def test_find_from_redis_fills_local_cache(
+    permission_scope_cache_repository: PermissionScopeCacheRepository,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    user_id, team_id = uuid4(), uuid4()
+    mock_redis_client.hget.return_value = f'{int(time.time()) + 60}:["device:read"]'
+
+    # when
+    first = await permission_scope_cache_repository.find(user_id=user_id, team_id=team_id)
+    second = await permission_scope_cache_repository.find(user_id=user_id, team_id=team_id)
+
+    # then
+    assert first == second == frozenset({"device:read"})
+    mock_redis_client.hget.assert_awaited_once_with(
+        f"team_permission_scopes:{team_id}", str(user_id)
+    )
+
+
+async def test_find_ignores_expired_redis_entry(
+    permission_scope_cache_repository: PermissionScopeCacheRepository,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    mock_redis_client.hget.return_value = f'{int(time.time()) - 1}:["device:read"]'
+
+    # when
+    result = await permission_scope_cache_repository.find(user_id=uuid4(), team_id=uuid4())
+
+    # then
+    assert result is None
+
+
+async def test_evict_team_clears_local_cache(
+    permission_scope_cache_repository: PermissionScopeCacheRepository,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    user_id, team_id, other_team_id = uuid4(), uuid4(), uuid4()
+    scopes = frozenset({"device:read"})
+    await permission_scope_cache_repository.save(user_id=user_id, team_id=team_id, scopes=scopes)
+    await permission_scope_cache_repository.save(
+        user_id=user_id, team_id=other_team_id, scopes=scopes
+    )
+    mock_redis_client.hget.return_value = None
+
+    # when
+    await permission_scope_cache_repository.evict_team(team_id=team_id)
+
+    # then
+    assert await permission_scope_cache_repository.find(user_id=user_id, team_id=team_id) is None
+    assert (
+        await permission_scope_cache_repository.find(user_id=user_id, team_id=other_team_id)
+        == scopes
+    )
+    mock_redis_client.delete.assert_awaited_once_with(f"team_permission_scopes:{team_id}")
+    mock_redis_client.publish.assert_awaited_once_with("permission_scope_evictions", str(team_id))
+
+
+async def test_evict_member_publishes_eviction(
+    permission_scope_cache_repository: PermissionScopeCacheRepository,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    user_id, other_user_id, team_id = uuid4(), uuid4(), uuid4()
+    scopes = frozenset({"device:read"})
+    await permission_scope_cache_repository.save(user_id=user_id, team_id=team_id, scopes=scopes)
+    await permission_scope_cache_repository.save(
+        user_id=other_user_id, team_id=team_id, scopes=scopes
+    )
+    mock_redis_client.hget.return_value = None
+
+    # when
+    await permission_scope_cache_repository.evict_member(user_id=user_id, team_id=team_id)
+
+    # then
+    assert await permission_scope_cache_repository.find(user_id=user_id, team_id=team_id) is None
+    assert (
+        await permission_scope_cache_repository.find(user_id=other_user_id, team_id=team_id)
+        == scopes
+    )
+    mock_redis_client.hdel.assert_awaited_once_with(
+        f"team_permission_scopes:{team_id}", str(user_id)
+    )
+    mock_redis_client.publish.assert_awaited_once_with(
+        "permission_scope_evictions", f"{team_id}:{user_id}"
+    )
+
+
+async def test_reader_evicts_published_member(
+    permission_scope_cache_repository: PermissionScopeCacheRepository,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    user_id, team_id = uuid4(), uuid4()
+    await permission_scope_cache_repository.save(
+        user_id=user_id, team_id=team_id, scopes=frozenset({"device:read"})
+    )
+    mock_redis_client.hget.return_value = None
+    pubsub = mock_redis_client.pubsub.return_value = AsyncMock()
+    evicted = asyncio.Event()
+
+    async def get_message(**_: object) -> dict[str, str] | None:
+        if evicted.is_set():
+            await asyncio.sleep(1.0)
+            return None
+        evicted.set()
+        return {"type": "message", "data": f"{team_id}:{user_id}"}
+
+    pubsub.get_message.side_effect = get_message
+
+    # when
+    await permission_scope_cache_repository.start()
+    await evicted.wait()
+    await asyncio.sleep(0)
+    result = await permission_scope_cache_repository.find(user_id=user_id, team_id=team_id)
+    await permission_scope_cache_repository.stop()
+
+    # then
+    pubsub.subscribe.assert_awaited_once_with("permission_scope_evictions")
+    assert result is None
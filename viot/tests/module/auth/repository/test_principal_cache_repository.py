@@ -0,0 +1,98 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.module.auth.constants import ViotUserRole
+from app.module.auth.principal import Principal
+from app.module.auth.repository.principal_cache_repository import PrincipalCacheRepository
+
+
+@pytest.fixture
+def mock_redis_client() -> AsyncMock:
+    redis_client = AsyncMock()
+    redis_client.pubsub = MagicMock()
+    return redis_client
+
+
+@pytest.fixture
+def principal_cache_repository(mock_redis_client: AsyncMock) -> PrincipalCacheRepository:
+    return PrincipalCacheRepository(mock_redis_client)
+
+
+def _principal() -> Principal:
+    return Principal(id=uuid4(), role=ViotUserRole.USER, email_verified=True, disabled=False)
+
+
+def test_find_returns_saved_principal(
+    principal_cache_repository: PrincipalCacheRepository,
+) -> None:
+    # given
+    principal = _principal()
+
+    # when
+    principal_cache_repository.save(principal)
+
+    # then
+    assert principal_cache_repository.find(principal.id) == principal
+
+
+def test_find_ignores_expired_principal(
+    principal_cache_repository: PrincipalCacheRepository,
+) -> None:
+    # given
+    principal = _principal()
+    principal_cache_repository.save(principal)
+
+    # when
+    with patch("time.monotonic", return_value=float("inf")):
+        result = principal_cache_repository.find(principal.id)
+
+    # then
+    assert result is None
+
+
+async def test_evict_publishes_eviction(
+    principal_cache_repository: PrincipalCacheRepository, mock_redis_client: AsyncMock
+) -> None:
+    # given
+    principal = _principal()
+    principal_cache_repository.save(principal)
+
+    # when
+    await principal_cache_repository.evict(principal.id)
+
+    # then
+    assert principal_cache_repository.find(principal.id) is None
+    mock_redis_client.publish.assert_awaited_once_with("principal_evictions", str(principal.id))
+
+
+async def test_reader_evicts_published_principal(
+    principal_cache_repository: PrincipalCacheRepository, mock_redis_client: AsyncMock
+) -> None:
+    # given
+    principal = _principal()
+    principal_cache_repository.save(principal)
+    pubsub = mock_redis_client.pubsub.return_value = AsyncMock()
+    evicted = asyncio.Event()
+
+    async def get_message(**_: object) -> dict[str, str] | None:
+        if evicted.is_set():
+            await asyncio.sleep(1.0)
+            return None
+        evicted.set()
+        return {"type": "message", "data": str(principal.id)}
+
+    pubsub.get_message.side_effect = get_message
+
+    # when
+    await principal_cache_repository.start()
+    await evicted.wait()
+    await asyncio.sleep(0)
+    result = principal_cache_repository.find(principal.id)
+    await principal_cache_repository.stop()
+
+    # then
+    pubsub.subscribe.assert_awaited_once_with("principal_evictions")
+    assert result is None
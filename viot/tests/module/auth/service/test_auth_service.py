@@ -31,18 +31,25 @@ def mock_password_reset_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_principal_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def auth_service(
     mock_email_service: Mock,
     mock_user_repository: AsyncMock,
     mock_refresh_token_repository: AsyncMock,
     mock_password_reset_repository: AsyncMock,
+    mock_principal_cache_repository: AsyncMock,
 ) -> AuthService:
     return AuthService(
         email_service=mock_email_service,
         user_repository=mock_user_repository,
         refresh_token_repository=mock_refresh_token_repository,
         password_reset_repository=mock_password_reset_repository,
+        principal_cache_repository=mock_principal_cache_repository,
     )
 
 
@@ -36,16 +36,23 @@ def mock_password_reset_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_principal_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def password_reset_service(
     mock_email_service: Mock,
     mock_user_repository: AsyncMock,
     mock_password_reset_repository: AsyncMock,
+    mock_principal_cache_repository: AsyncMock,
 ) -> PasswordResetService:
     return PasswordResetService(
         email_service=mock_email_service,
         user_repository=mock_user_repository,
         password_reset_repository=mock_password_reset_repository,
+        principal_cache_repository=mock_principal_cache_repository,
     )
 
 
@@ -17,11 +17,22 @@ def mock_permission_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_permission_scope_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def permission_service(
-    mock_permission_repository: AsyncMock, mock_user_team_role_repository: AsyncMock
+    mock_permission_repository: AsyncMock,
+    mock_user_team_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> PermissionService:
-    return PermissionService(mock_permission_repository, mock_user_team_role_repository)
+    return PermissionService(
+        mock_permission_repository,
+        mock_user_team_role_repository,
+        mock_permission_scope_cache_repository,
+    )
 
 
 async def test_get_all_permissions(
@@ -41,12 +52,13 @@ async def test_get_all_permissions(
     assert result[0].description == mock_permission.description
 
 
-async def test_validate_user_access_team_resource(
+async def test_validate_user_access_team_resource_from_cache(
     permission_service: PermissionService,
     mock_user_team_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> None:
     # given
-    mock_user_team_role_repository.is_user_has_permission_in_team.return_value = True
+    mock_permission_scope_cache_repository.find.return_value = frozenset({"team:resource:read"})
 
     # when
     await permission_service.validate_user_access_team_resource(
@@ -55,13 +67,41 @@ async def test_validate_user_access_team_resource(
         permission_scope="team:resource:read",
     )
 
+    # then
+    mock_user_team_role_repository.find_permission_scopes_by_user_id_and_team_id.assert_not_called()
 
-async def test_validate_user_access_team_resource_when_user_does_not_have_permission(
+
+async def test_validate_user_access_team_resource_caches_scopes_on_miss(
     permission_service: PermissionService,
     mock_user_team_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
+) -> None:
+    # given
+    user_id, team_id = uuid4(), uuid4()
+    mock_permission_scope_cache_repository.find.return_value = None
+    mock_user_team_role_repository.find_permission_scopes_by_user_id_and_team_id.return_value = {
+        "team:resource:read"
+    }
+
+    # when
+    await permission_service.validate_user_access_team_resource(
+        user_id=user_id,
+        team_id=team_id,
+        permission_scope="team:resource:read",
+    )
+
+    # then
+    mock_permission_scope_cache_repository.save.assert_awaited_once_with(
+        user_id=user_id, team_id=team_id, scopes=frozenset({"team:resource:read"})
+    )
+
+
+async def test_validate_user_access_team_resource_when_user_does_not_have_permission(
+    permission_service: PermissionService,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> None:
     # given
-    mock_user_team_role_repository.is_user_has_permission_in_team.return_value = False
+    mock_permission_scope_cache_repository.find.return_value = frozenset({"team:resource:write"})
 
     # when
     with pytest.raises(ResourceAccessDeniedException):
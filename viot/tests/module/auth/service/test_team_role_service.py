@@ -40,18 +40,25 @@ def mock_role_permission_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_permission_scope_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def team_role_service(
     mock_role_repository: AsyncMock,
     mock_team_repository: AsyncMock,
     mock_permission_repository: AsyncMock,
     mock_role_permission_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> TeamRoleService:
     return TeamRoleService(
         role_repository=mock_role_repository,
         team_repository=mock_team_repository,
         permission_repository=mock_permission_repository,
         role_permission_repository=mock_role_permission_repository,
+        permission_scope_cache_repository=mock_permission_scope_cache_repository,
     )
 
 
@@ -292,10 +299,12 @@ async def test_validate_not_update_sensitive_permissions_raise_sensitive_scope(
 async def test_update_role(
     team_role_service: TeamRoleService,
     mock_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
     mock_permission: Mock,
     mock_role: Mock,
 ) -> None:
     # given
+    team_id = uuid4()
     mock_role_repository.find.return_value = mock_role
     mock_role_repository.find_role_name_by_id.return_value = "test"
     role_update_dto = Mock()
@@ -310,13 +319,14 @@ async def test_update_role(
         patch.object(TeamRoleService, "validate_permission_exists", return_value=[mock_permission]),
     ):
         result = await team_role_service.update_role(
-            role_id=1, team_id=uuid4(), role_update_dto=role_update_dto
+            role_id=1, team_id=team_id, role_update_dto=role_update_dto
         )
 
     # then
     assert result.name == mock_role.name
     assert result.description == mock_role.description
     assert result.scopes == mock_role.scopes
+    mock_permission_scope_cache_repository.evict_team.assert_awaited_once_with(team_id=team_id)
 
 
 async def test_update_role_raise_modify_owner_role(
@@ -382,13 +392,18 @@ async def test_update_role_raise_role_name_exists_in_team(
 async def test_delete_role(
     team_role_service: TeamRoleService,
     mock_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> None:
+    # given
+    team_id = uuid4()
+
     # when
     with patch.object(TeamRoleService, "validate_not_modify_owner_role", return_value=None):
-        await team_role_service.delete_role(role_id=1, team_id=uuid4())
+        await team_role_service.delete_role(role_id=1, team_id=team_id)
 
     # then
     mock_role_repository.delete_by_id_and_team_id.assert_called_once()
+    mock_permission_scope_cache_repository.evict_team.assert_awaited_once_with(team_id=team_id)
 
 
 async def test_delete_role_raise_modify_owner_role(
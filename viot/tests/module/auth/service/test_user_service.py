@@ -17,12 +17,25 @@ def mock_user_repository() -> AsyncMock:
 
 
 @pytest.fixture
-def user_service(mock_user_repository: AsyncMock) -> UserService:
-    return UserService(user_repository=mock_user_repository)
+def mock_principal_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def user_service(
+    mock_user_repository: AsyncMock, mock_principal_cache_repository: AsyncMock
+) -> UserService:
+    return UserService(
+        user_repository=mock_user_repository,
+        principal_cache_repository=mock_principal_cache_repository,
+    )
 
 
 async def test_change_password_correctly(
-    user_service: UserService, mock_user_repository: AsyncMock, mock_user: Mock
+    user_service: UserService,
+    mock_user_repository: AsyncMock,
+    mock_principal_cache_repository: AsyncMock,
+    mock_user: Mock,
 ) -> None:
     new_password = "!defDEF456"
     mock_user_repository.find.return_value = mock_user
@@ -36,6 +49,7 @@ async def test_change_password_correctly(
     )
 
     mock_user_repository.update_password.assert_awaited_once()
+    mock_principal_cache_repository.evict.assert_awaited_once_with(mock_user.id)
 
 
 async def test_change_password_raises_when_user_not_found(
@@ -0,0 +1,92 @@
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from contextvars import ContextVar
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import Mock
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.module.device.constants import DeviceStatus, UplinkProtocol
+from app.module.device.model.device import Device, Gateway, SubDevice
+from app.module.device.repository.device_repository import DeviceRepository
+from app.module.team.model.team import Team
+
+
+@pytest_asyncio.fixture(scope="function")  # type: ignore
+async def team(async_engine: AsyncEngine, async_session: AsyncSession) -> Team:
+    async with async_engine.begin() as conn:
+        for table in (Team.__table__, Device.__table__, Gateway.__table__, SubDevice.__table__):
+            await conn.run_sync(table.create, checkfirst=True)  # type: ignore
+    team = Team(
+        name="Device Repository Team",
+        slug=f"team-{datetime.now(UTC).timestamp()}",
+        description=None,
+        default=False,
+    )
+    async_session.add(team)
+    await async_session.commit()
+    return team
+
+
+@pytest_asyncio.fixture(scope="function")  # type: ignore
+async def device_repository(
+    async_session: AsyncSession,
+) -> AsyncGenerator[DeviceRepository, None]:
+    yield DeviceRepository(ContextVar("session", default=async_session), Mock())
+
+
+async def test_update_connection_batch_skips_connect_older_than_disconnect(
+    team: Team,
+    device_factory: Callable[..., Coroutine[Any, Any, Device]],
+    device_repository: DeviceRepository,
+    async_session: AsyncSession,
+) -> None:
+    # given
+    device = await device_factory(team_id=team.id)
+    connected_at = datetime.now(UTC)
+    disconnected_at = connected_at + timedelta(seconds=1)
+    await device_repository.update_connection_batch(
+        device_ids=[device.id],
+        statuses=[DeviceStatus.OFFLINE],
+        ts=[disconnected_at],
+        last_connections=[None],
+    )
+
+    # when
+    await device_repository.update_connection_batch(
+        device_ids=[device.id],
+        statuses=[DeviceStatus.ONLINE],
+        ts=[connected_at],
+        last_connections=[connected_at],
+    )
+    await async_session.commit()
+
+    # then
+    await async_session.refresh(device)
+    assert device.status == DeviceStatus.OFFLINE
+    assert device.status_changed_at == disconnected_at
+    assert device.last_connection is None
+
+
+async def test_find_gateway_id_by_device_id_and_team_id(
+    team: Team,
+    device_factory: Callable[..., Coroutine[Any, Any, Device]],
+    gateway_factory: Callable[..., Coroutine[Any, Any, Gateway]],
+    sub_device_factory: Callable[..., Coroutine[Any, Any, SubDevice]],
+    device_repository: DeviceRepository,
+) -> None:
+    # given
+    device = await device_factory(team_id=team.id)
+    gateway = await gateway_factory(team_id=team.id)
+    sub_device = await sub_device_factory(
+        team_id=team.id, gateway_id=gateway.id, uplink_protocol=UplinkProtocol.MODBUS
+    )
+
+    # when
+    find = device_repository.find_gateway_id_by_device_id_and_team_id
+
+    # then
+    assert await find(device.id, team.id) is None
+    assert await find(gateway.id, team.id) == gateway.id
+    assert await find(sub_device.id, team.id) == gateway.id
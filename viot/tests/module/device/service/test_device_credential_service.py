@@ -0,0 +1,132 @@
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, Mock
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.module.device.constants import DeviceType
+from app.module.device.repository.device_repository import DeviceCredential
+from app.module.device.service.device_credential_service import DeviceCredentialService
+
+
+@pytest.fixture
+def mock_device_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_redis_client() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def device_credential_service(
+    mock_device_repository: AsyncMock, mock_redis_client: AsyncMock
+) -> DeviceCredentialService:
+    return DeviceCredentialService(mock_device_repository, mock_redis_client)
+
+
+def _credential(team_id: UUID | None = None) -> DeviceCredential:
+    return DeviceCredential(
+        id=uuid4(),
+        token="token",
+        disabled=False,
+        device_type=DeviceType.DEVICE,
+        team_id=team_id or uuid4(),
+    )
+
+
+async def test_warm_answers_from_memory(
+    device_credential_service: DeviceCredentialService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    credentials = [_credential(), _credential()]
+
+    async def stream_credentials(_: int) -> AsyncGenerator[list[DeviceCredential], None]:
+        yield credentials
+
+    mock_device_repository.stream_credentials = Mock(side_effect=stream_credentials)
+
+    # when
+    await device_credential_service.warm()
+    result = await device_credential_service.get_credential(credentials[1].id)
+
+    # then
+    assert result == credentials[1]
+    mock_device_repository.find_credential_by_id.assert_not_called()
+
+
+async def test_get_credential_loads_missing_device_once(
+    device_credential_service: DeviceCredentialService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    credential = _credential()
+    mock_device_repository.find_credential_by_id.return_value = credential
+
+    # when
+    await device_credential_service.get_credential(credential.id)
+    result = await device_credential_service.get_credential(credential.id)
+
+    # then
+    assert result == credential
+    mock_device_repository.find_credential_by_id.assert_awaited_once_with(credential.id)
+
+
+async def test_get_credential_remembers_unknown_device(
+    device_credential_service: DeviceCredentialService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    device_id = uuid4()
+    mock_device_repository.find_credential_by_id.return_value = None
+
+    # when
+    await device_credential_service.get_credential(device_id)
+    result = await device_credential_service.get_credential(device_id)
+
+    # then
+    assert result is None
+    mock_device_repository.find_credential_by_id.assert_awaited_once_with(device_id)
+
+
+async def test_get_credential_does_not_cache_load_evicted_meanwhile(
+    device_credential_service: DeviceCredentialService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    credential = _credential()
+
+    async def find_credential_by_id(device_id: UUID) -> DeviceCredential:
+        # The device is deleted while its row is being read
+        await device_credential_service.evict(device_id)
+        return credential
+
+    mock_device_repository.find_credential_by_id.side_effect = find_credential_by_id
+
+    # when
+    await device_credential_service.get_credential(credential.id)
+    await device_credential_service.get_credential(credential.id)
+
+    # then
+    assert mock_device_repository.find_credential_by_id.await_count == 2
+
+
+async def test_evict_team_drops_devices_of_team(
+    device_credential_service: DeviceCredentialService,
+    mock_device_repository: AsyncMock,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    evicted, kept = _credential(team_id), _credential()
+    await device_credential_service.save(evicted)
+    await device_credential_service.save(kept)
+    mock_device_repository.find_credential_by_id.return_value = None
+
+    # when
+    await device_credential_service.evict_team(team_id)
+
+    # then
+    assert await device_credential_service.get_credential(evicted.id) is None
+    assert await device_credential_service.get_credential(kept.id) == kept
+    mock_redis_client.publish.assert_awaited_once_with(
+        "device_credential_evictions", f"team:{team_id}"
+    )
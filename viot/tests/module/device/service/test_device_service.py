@@ -3,7 +3,7 @@ from uuid import uuid4
 
 import pytest
 
-from app.database.repository.pagination import Page
+from app.database.repository.pagination import CursorPage
 from app.module.device.constants import DeviceType
 from app.module.device.dto.device_dto import DeviceCreateDto
 from app.module.device.exception.device_exception import DeviceNotFoundException
@@ -21,14 +21,28 @@ def mock_team_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_gateway_service() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_credential_service() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def device_service(
     mock_device_repository: AsyncMock,
     mock_team_repository: AsyncMock,
+    mock_gateway_service: AsyncMock,
+    mock_device_credential_service: AsyncMock,
 ) -> DeviceService:
     return DeviceService(
         device_repository=mock_device_repository,
         team_repository=mock_team_repository,
+        gateway_service=mock_gateway_service,
+        device_credential_service=mock_device_credential_service,
     )
 
 
@@ -79,23 +93,30 @@ async def test_get_all_devices_belong_to_team(
 ) -> None:
     # given
     team_id = uuid4()
-    page = 1
     page_size = 10
     device_type = DeviceType.DEVICE
-    mock_device_repository.find_all_with_paging.return_value = Page(
-        items=[mock_device, mock_device], total_items=2, page=0, page_size=20
+    mock_device_repository.find_all_with_cursor.return_value = CursorPage(
+        items=[mock_device, mock_device], page_size=10, next_cursor="cursor", total_items=2
     )
 
     # when
     result = await device_service.get_all_devices_belong_to_team(
-        team_id=team_id, page=page, page_size=page_size, device_type=device_type
+        team_id=team_id,
+        page_size=page_size,
+        after="previous",
+        with_total=True,
+        device_type=device_type,
     )
 
     # then
+    pageable = mock_device_repository.find_all_with_cursor.await_args.args[0]
+    assert pageable.after == "previous"
+    assert pageable.with_total is True
     assert len(result.items) == 2
     assert result.total_items == 2
-    assert result.page == 0
-    assert result.page_size == 20
+    assert result.next_cursor == "cursor"
+    assert result.has_next_page is True
+    assert result.page_size == 10
     assert result.items[0].id == mock_device.id
     assert result.items[0].name == mock_device.name
     assert result.items[0].description == mock_device.description
@@ -162,10 +183,13 @@ async def test_create_device_raise_team_not_found(
 async def test_delete_device_by_id_and_team_id(
     device_service: DeviceService,
     mock_device_repository: AsyncMock,
+    mock_gateway_service: AsyncMock,
+    mock_device_credential_service: AsyncMock,
 ) -> None:
     # given
     device_id = uuid4()
     team_id = uuid4()
+    mock_device_repository.find_gateway_id_by_device_id_and_team_id.return_value = None
 
     # when
     await device_service.delete_device_by_id_and_team_id(device_id=device_id, team_id=team_id)
@@ -174,3 +198,24 @@ async def test_delete_device_by_id_and_team_id(
     mock_device_repository.delete_by_device_id_and_team_id.assert_called_once_with(
         device_id, team_id
     )
+    mock_gateway_service.evict.assert_not_awaited()
+    mock_device_credential_service.evict.assert_awaited_once_with(device_id)
+
+
+async def test_delete_sub_device_evicts_its_gateway(
+    device_service: DeviceService,
+    mock_device_repository: AsyncMock,
+    mock_gateway_service: AsyncMock,
+) -> None:
+    # given
+    device_id, team_id, gateway_id = uuid4(), uuid4(), uuid4()
+    mock_device_repository.find_gateway_id_by_device_id_and_team_id.return_value = gateway_id
+
+    # when
+    await device_service.delete_device_by_id_and_team_id(device_id=device_id, team_id=team_id)
+
+    # then
+    mock_device_repository.find_gateway_id_by_device_id_and_team_id.assert_awaited_once_with(
+        device_id, team_id
+    )
+    mock_gateway_service.evict.assert_awaited_once_with(gateway_id)
@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.module.device.service.gateway_service import GatewayService
+
+
+@pytest.fixture
+def mock_device_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_redis_client() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def gateway_service(
+    mock_device_repository: AsyncMock, mock_redis_client: AsyncMock
+) -> GatewayService:
+    return GatewayService(device_repository=mock_device_repository, redis_client=mock_redis_client)
+
+
+async def test_get_sub_device_ids_is_cached(
+    gateway_service: GatewayService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    gateway_id, sub_device_id = uuid4(), uuid4()
+    mock_device_repository.find_sub_device_ids_by_gateway_id.return_value = [sub_device_id]
+
+    # when
+    first = await gateway_service.get_sub_device_ids(gateway_id)
+    second = await gateway_service.get_sub_device_ids(gateway_id)
+
+    # then
+    assert first == second == frozenset({sub_device_id})
+    mock_device_repository.find_sub_device_ids_by_gateway_id.assert_awaited_once_with(gateway_id)
+
+
+async def test_filter_owned_sub_device_ids(
+    gateway_service: GatewayService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    gateway_id, owned_id, foreign_id = uuid4(), uuid4(), uuid4()
+    mock_device_repository.find_sub_device_ids_by_gateway_id.return_value = [owned_id]
+
+    # when
+    owned = await gateway_service.filter_owned_sub_device_ids(gateway_id, {owned_id, foreign_id})
+
+    # then
+    assert owned == {owned_id}
+
+
+async def test_filter_owned_sub_device_ids_reloads_once_on_unknown_id(
+    gateway_service: GatewayService, mock_device_repository: AsyncMock
+) -> None:
+    # given
+    gateway_id, old_id, new_id = uuid4(), uuid4(), uuid4()
+    mock_device_repository.find_sub_device_ids_by_gateway_id.return_value = [old_id]
+    await gateway_service.get_sub_device_ids(gateway_id)
+    gateway_service._reloaded.clear()  # type: ignore
+    mock_device_repository.find_sub_device_ids_by_gateway_id.return_value = [old_id, new_id]
+
+    # when
+    owned = await gateway_service.filter_owned_sub_device_ids(gateway_id, {new_id})
+    await gateway_service.filter_owned_sub_device_ids(gateway_id, {uuid4()})
+
+    # then
+    assert owned == {new_id}
+    assert mock_device_repository.find_sub_device_ids_by_gateway_id.await_count == 2
+
+
+async def test_evict_drops_only_the_gateway(
+    gateway_service: GatewayService,
+    mock_device_repository: AsyncMock,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    gateway_id, other_gateway_id = uuid4(), uuid4()
+    mock_device_repository.find_sub_device_ids_by_gateway_id.return_value = []
+    await gateway_service.get_sub_device_ids(gateway_id)
+    await gateway_service.get_sub_device_ids(other_gateway_id)
+
+    # when
+    await gateway_service.evict(gateway_id)
+    await gateway_service.get_sub_device_ids(gateway_id)
+    await gateway_service.get_sub_device_ids(other_gateway_id)
+
+    # then
+    assert mock_device_repository.find_sub_device_ids_by_gateway_id.await_count == 3
+    mock_redis_client.publish.assert_awaited_once_with(
+        "gateway_sub_device_evictions", str(gateway_id)
+    )
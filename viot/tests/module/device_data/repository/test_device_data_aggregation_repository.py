@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.module.device_data.constants import Timezone
+from app.module.device_data.repository.device_data_aggregation_repository import select_rollup
+
+
+@pytest.mark.parametrize(
+    "bucket_width, start_date, end_date, timezone, expected",
+    [
+        (
+            timedelta(days=7),
+            datetime(2024, 1, 1),
+            datetime(2024, 12, 31),
+            Timezone.UTC,
+            "device_data_daily",
+        ),
+        (
+            timedelta(hours=6),
+            datetime(2024, 1, 1, 3),
+            datetime(2024, 1, 8),
+            Timezone.UTC,
+            "device_data_hourly",
+        ),
+        (
+            timedelta(days=1),
+            datetime(2024, 1, 1, 3),
+            datetime(2024, 1, 8),
+            Timezone.UTC,
+            "device_data_hourly",
+        ),
+        (
+            timedelta(minutes=30),
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 8),
+            Timezone.UTC,
+            None,
+        ),
+        (
+            timedelta(hours=1),
+            datetime(2024, 1, 1, 0, 15),
+            datetime(2024, 1, 8),
+            Timezone.UTC,
+            None,
+        ),
+        (
+            timedelta(days=1),
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 8),
+            Timezone.VIETNAM,
+            None,
+        ),
+        (
+            timedelta(hours=1),
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 1, 0, 30),
+            Timezone.UTC,
+            None,
+        ),
+    ],
+)
+def test_select_rollup(
+    bucket_width: timedelta,
+    start_date: datetime,
+    end_date: datetime,
+    timezone: Timezone,
+    expected: str | None,
+) -> None:
+    # when
+    rollup = select_rollup(
+        bucket_width=bucket_width, start_date=start_date, end_date=end_date, timezone=timezone
+    )
+
+    # then
+    assert (rollup[1] if rollup else None) == expected
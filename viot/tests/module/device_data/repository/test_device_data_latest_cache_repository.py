@@ -0,0 +1,143 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.module.device_data.repository.device_data_latest_cache_repository import (
+    COMPLETE_FIELD,
+    DeviceDataLatestCacheRepository,
+)
+
+
+@pytest.fixture
+def mock_redis_client() -> Mock:
+    return Mock(hgetall=AsyncMock(), hmget=AsyncMock())
+
+
+@pytest.fixture
+def device_data_latest_cache_repository(
+    mock_redis_client: Mock,
+) -> DeviceDataLatestCacheRepository:
+    return DeviceDataLatestCacheRepository(redis_client=mock_redis_client)
+
+
+async def test_find_all_returns_none_when_not_complete(
+    device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+    mock_redis_client: Mock,
+) -> None:
+    # given
+    mock_redis_client.hgetall.return_value = {"temperature": "1729900800000000:25.5"}
+
+    # when
+    result = await device_data_latest_cache_repository.find_all(uuid4())
+
+    # then
+    assert result is None
+
+
+async def test_find_all(
+    device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+    mock_redis_client: Mock,
+) -> None:
+    # given
+    mock_redis_client.hgetall.return_value = {
+        "temperature": "1729900800000000:25.5",
+        COMPLETE_FIELD: "1",
+    }
+
+    # when
+    result = await device_data_latest_cache_repository.find_all(uuid4())
+
+    # then
+    assert result is not None
+    assert len(result) == 1
+    assert result[0].key == "temperature"
+    assert result[0].ts == datetime(2024, 10, 26, tzinfo=UTC)
+    assert result[0].value == 25.5
+
+
+async def test_find_by_keys_serves_partial_hash(
+    device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+    mock_redis_client: Mock,
+) -> None:
+    # given
+    mock_redis_client.hmget.return_value = ['1729900800000000:{"a":1}', None]
+
+    # when
+    result = await device_data_latest_cache_repository.find_by_keys(uuid4(), ["meta"])
+
+    # then
+    assert result is not None
+    assert result[0].value == {"a": 1}
+
+
+async def test_find_by_keys_misses_unknown_key_of_partial_hash(
+    device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+    mock_redis_client: Mock,
+) -> None:
+    # given
+    mock_redis_client.hmget.return_value = ["1729900800000000:25.5", None, None]
+
+    # when
+    result = await device_data_latest_cache_repository.find_by_keys(
+        uuid4(), ["temperature", "humidity"]
+    )
+
+    # then
+    assert result is None
+
+
+async def test_find_by_keys_skips_unknown_key_of_complete_hash(
+    device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+    mock_redis_client: Mock,
+) -> None:
+    # given
+    mock_redis_client.hmget.return_value = ["1729900800000000:25.5", None, "1"]
+
+    # when
+    result = await device_data_latest_cache_repository.find_by_keys(
+        uuid4(), ["temperature", "humidity"]
+    )
+
+    # then
+    assert result is not None
+    assert [d.key for d in result] == ["temperature"]
+
+
+async def test_find_by_keys_misses_on_redis_error(
+    device_data_latest_cache_repository: DeviceDataLatestCacheRepository,
+    mock_redis_client: Mock,
+) -> None:
+    # given
+    mock_redis_client.hmget.side_effect = ConnectionError()
+
+    # when
+    result = await device_data_latest_cache_repository.find_by_keys(uuid4(), ["temperature"])
+
+    # then
+    assert result is None
+
+
+async def test_save_all_stores_naive_timestamp_as_utc(mock_redis_client: Mock) -> None:
+    # given
+    save_script = mock_redis_client.register_script.return_value = AsyncMock()
+    device_data_latest_cache_repository = DeviceDataLatestCacheRepository(
+        redis_client=mock_redis_client
+    )
+    naive = datetime(2024, 10, 25, 10, 0, 0)
+
+    # when
+    await device_data_latest_cache_repository.save_all(
+        uuid4(), [Mock(key="temperature", ts=naive, value=25.5)]
+    )
+    mock_redis_client.hgetall.return_value = {
+        COMPLETE_FIELD: "1",
+        "temperature": save_script.await_args.kwargs["args"][3],
+    }
+    result = await device_data_latest_cache_repository.find_all(uuid4())
+
+    # then
+    assert result is not None
+    assert result[0].ts == naive.replace(tzinfo=UTC)
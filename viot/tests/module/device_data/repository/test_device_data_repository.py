@@ -0,0 +1,66 @@
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
+
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.module.device.model.device import Device
+from app.module.device_data.batch import DeviceDataBatch
+from app.module.device_data.model.device_data import DeviceData
+from app.module.device_data.model.device_data_latest import DeviceDataLatest
+from app.module.device_data.repository.device_data_latest_repository import (
+    DeviceDataLatestRepository,
+)
+from app.module.device_data.repository.device_data_repository import DeviceDataRepository
+from app.module.team.model.team import Team
+
+
+@pytest_asyncio.fixture(scope="function")  # type: ignore
+async def team(async_engine: AsyncEngine, async_session: AsyncSession) -> Team:
+    async with async_engine.begin() as conn:
+        for table in (
+            Team.__table__,
+            Device.__table__,
+            DeviceData.__table__,
+            DeviceDataLatest.__table__,
+        ):
+            await conn.run_sync(table.create, checkfirst=True)  # type: ignore
+    team = Team(
+        name="Device Data Repository Team",
+        slug=f"team-{datetime.now(UTC).timestamp()}",
+        description=None,
+        default=False,
+    )
+    async_session.add(team)
+    await async_session.commit()
+    return team
+
+
+async def test_batch_writes_skip_points_of_deleted_devices(
+    team: Team,
+    device_factory: Callable[..., Coroutine[Any, Any, Device]],
+    async_session: AsyncSession,
+) -> None:
+    # given
+    device = await device_factory(team_id=team.id)
+    deleted_device_id = uuid4()
+    batch = DeviceDataBatch()
+    ts = datetime.now(UTC)
+    batch.extend(device.id, ts, {"temperature": 25.5})
+    batch.extend(deleted_device_id, ts, {"temperature": 30.0})
+    session_ctx = ContextVar("session", default=async_session)
+
+    # when
+    await DeviceDataLatestRepository(session_ctx).upsert_batch(batch.latest())
+    await DeviceDataRepository(session_ctx).insert_batch(batch)
+    await async_session.commit()
+
+    # then
+    data = (await async_session.execute(select(DeviceData.device_id))).scalars().all()
+    latest = (await async_session.execute(select(DeviceDataLatest.device_id))).scalars().all()
+    assert deleted_device_id not in data and device.id in data
+    assert deleted_device_id not in latest and device.id in latest
@@ -0,0 +1,220 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.module.device.constants import DeviceStatus
+from app.module.device_data.batch import FlushRetry
+from app.module.device_data.constants import ConnectStatus
+from app.module.device_data.service.connect_log_ingestion_service import (
+    ConnectLogIngestionService,
+)
+
+
+@pytest.fixture
+def mock_connect_log_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def connect_log_ingestion_service(
+    mock_connect_log_repository: AsyncMock, mock_device_repository: AsyncMock
+) -> ConnectLogIngestionService:
+    return ConnectLogIngestionService(
+        connect_log_repository=mock_connect_log_repository,
+        device_repository=mock_device_repository,
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_transactional_session():  # type: ignore
+    with patch(
+        "app.module.device_data.service.connect_log_ingestion_service.transactional_session",
+        MagicMock(),
+    ) as mock:
+        yield mock
+
+
+async def test_flush_writes_logs_and_newest_device_status(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
+) -> None:
+    # given
+    device_id, other_device_id = uuid4(), uuid4()
+    older = datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC)
+    newer = datetime(2024, 10, 25, 10, 0, 1, tzinfo=UTC)
+    connect_log_ingestion_service.record(
+        device_id=device_id, ts=older, connect_status=ConnectStatus.CONNECTED, ip="10.0.0.1"
+    )
+    connect_log_ingestion_service.record(
+        device_id=device_id, ts=newer, connect_status=ConnectStatus.DISCONNECTED, ip="10.0.0.1"
+    )
+    connect_log_ingestion_service.record(
+        device_id=other_device_id, ts=newer, connect_status=ConnectStatus.CONNECTED, ip="10.0.0.2"
+    )
+
+    # when
+    await connect_log_ingestion_service.flush()
+
+    # then
+    mock_connect_log_repository.insert_batch.assert_awaited_once()
+    assert len(mock_connect_log_repository.insert_batch.await_args.args[0]) == 3
+    mock_device_repository.update_connection_batch.assert_awaited_once_with(
+        device_ids=[device_id, other_device_id],
+        statuses=[DeviceStatus.OFFLINE, DeviceStatus.ONLINE],
+        ts=[newer, newer],
+        last_connections=[None, newer],
+    )
+
+
+async def test_flush_skips_status_update_for_failed_attempts(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
+) -> None:
+    # given
+    connect_log_ingestion_service.record(
+        device_id=uuid4(),
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.FAILED,
+        ip="10.0.0.1",
+    )
+
+    # when
+    await connect_log_ingestion_service.flush()
+
+    # then
+    mock_connect_log_repository.insert_batch.assert_awaited_once()
+    mock_device_repository.update_connection_batch.assert_not_awaited()
+
+
+async def test_flush_skips_empty_batch(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+) -> None:
+    # when
+    await connect_log_ingestion_service.flush()
+
+    # then
+    mock_connect_log_repository.insert_batch.assert_not_awaited()
+
+
+async def test_flush_requeues_batch_on_write_error(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+) -> None:
+    # given
+    connect_log_ingestion_service._retry = FlushRetry(max_retries=2, backoff=0, max_backoff=0)  # type: ignore
+    mock_connect_log_repository.insert_batch.side_effect = [ConnectionError(), None]
+    first_device_id, second_device_id = uuid4(), uuid4()
+    connect_log_ingestion_service.record(
+        device_id=first_device_id,
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.CONNECTED,
+        ip="10.0.0.1",
+    )
+
+    # when
+    await connect_log_ingestion_service.flush()
+    connect_log_ingestion_service.record(
+        device_id=second_device_id,
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.CONNECTED,
+        ip="10.0.0.2",
+    )
+    await connect_log_ingestion_service.flush()
+
+    # then
+    assert mock_connect_log_repository.insert_batch.await_count == 2
+    batch = mock_connect_log_repository.insert_batch.await_args.args[0]
+    assert batch.device_id == [first_device_id, second_device_id]
+    assert len(connect_log_ingestion_service._batch) == 0  # type: ignore
+
+
+async def test_flush_drops_batch_after_retries(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+) -> None:
+    # given
+    connect_log_ingestion_service._retry = FlushRetry(max_retries=2, backoff=0, max_backoff=0)  # type: ignore
+    mock_connect_log_repository.insert_batch.side_effect = ConnectionError()
+    connect_log_ingestion_service.record(
+        device_id=uuid4(),
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.CONNECTED,
+        ip="10.0.0.1",
+    )
+
+    # when
+    for _ in range(4):
+        await connect_log_ingestion_service.flush()
+
+    # then
+    assert mock_connect_log_repository.insert_batch.await_count == 3
+    assert len(connect_log_ingestion_service._batch) == 0  # type: ignore
+
+
+async def test_record_requests_flush_when_batch_is_full(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+) -> None:
+    # given
+    connect_log_ingestion_service._batch_size = 1  # type: ignore
+
+    # when
+    connect_log_ingestion_service.record(
+        device_id=uuid4(),
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.CONNECTED,
+        ip="10.0.0.1",
+    )
+
+    # then
+    assert connect_log_ingestion_service._flush_requested.is_set()  # type: ignore
+
+
+async def test_record_drops_events_when_buffer_is_full(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+) -> None:
+    # given
+    connect_log_ingestion_service._max_pending = 1  # type: ignore
+
+    # when
+    for _ in range(3):
+        connect_log_ingestion_service.record(
+            device_id=uuid4(),
+            ts=datetime.now(UTC),
+            connect_status=ConnectStatus.CONNECTED,
+            ip="10.0.0.1",
+        )
+    await connect_log_ingestion_service.flush()
+
+    # then
+    assert len(mock_connect_log_repository.insert_batch.await_args.args[0]) == 1
+
+
+async def test_stop_flushes_remaining_events(
+    connect_log_ingestion_service: ConnectLogIngestionService,
+    mock_connect_log_repository: AsyncMock,
+) -> None:
+    # given
+    await connect_log_ingestion_service.start()
+    connect_log_ingestion_service.record(
+        device_id=uuid4(),
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.CONNECTED,
+        ip="10.0.0.1",
+    )
+
+    # when
+    await connect_log_ingestion_service.stop()
+
+    # then
+    mock_connect_log_repository.insert_batch.assert_awaited_once()
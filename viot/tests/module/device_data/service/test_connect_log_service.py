@@ -4,7 +4,7 @@ from uuid import uuid4
 
 import pytest
 
-from app.database.repository import Page
+from app.database.repository import CursorPage
 from app.database.repository.pagination import SortDirection
 from app.module.device.exception.device_exception import DeviceNotFoundException
 from app.module.device_data.service.connect_log_service import ConnectLogService
@@ -39,35 +39,39 @@ async def test_get_connect_logs(
     # given
     team_id = uuid4()
     device_id = mock_connect_log.device_id
-    page = 1
     page_size = 10
     start_date = datetime(2021, 1, 1)
     end_date = datetime(2021, 1, 2)
     order_by: SortDirection = "asc"
-    connect_log_page = Page(
+    connect_log_page = CursorPage(
         items=[mock_connect_log, mock_connect_log],
-        page=1,
         page_size=10,
-        total_items=2,
+        next_cursor=None,
+        total_items=None,
     )
-    mock_connect_log_repository.find_all_with_paging.return_value = connect_log_page
+    mock_connect_log_repository.find_all_with_cursor.return_value = connect_log_page
 
     # when
     result = await connect_log_service.get_connect_logs(
         team_id=team_id,
         device_id=device_id,
-        page=page,
         page_size=page_size,
+        after=None,
+        with_total=False,
         start_date=start_date,
         end_date=end_date,
         order_by=order_by,
     )
 
     # then
+    pageable = mock_connect_log_repository.find_all_with_cursor.await_args.args[0]
+    assert pageable.direction == "asc"
+    assert len(pageable.filters) == 3
     assert len(result.items) == 2
-    assert result.page == 1
     assert result.page_size == 10
-    assert result.total_items == 2
+    assert result.next_cursor is None
+    assert result.has_next_page is False
+    assert result.total_items is None
 
 
 async def test_delete_connect_logs(
@@ -0,0 +1,250 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from asyncpg.exceptions import ForeignKeyViolationError, UniqueViolationError
+
+from app.module.device_data.batch import FlushRetry
+from app.module.device_data.service.device_data_ingestion_service import (
+    DeviceDataIngestionService,
+)
+
+
+@pytest.fixture
+def mock_device_data_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_latest_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_latest_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_stream_service() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def device_data_ingestion_service(
+    mock_device_data_repository: AsyncMock,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache_repository: AsyncMock,
+    mock_device_data_stream_service: AsyncMock,
+) -> DeviceDataIngestionService:
+    return DeviceDataIngestionService(
+        device_data_repository=mock_device_data_repository,
+        device_data_latest_repository=mock_device_data_latest_repository,
+        device_data_latest_cache_repository=mock_device_data_latest_cache_repository,
+        device_data_stream_service=mock_device_data_stream_service,
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_transactional_session():  # type: ignore
+    with patch(
+        "app.module.device_data.service.device_data_ingestion_service.transactional_session",
+        MagicMock(),
+    ) as mock:
+        yield mock
+
+
+async def test_flush_copies_buffered_batch(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"temperature": 25.5, "humidity": 60}
+    )
+
+    # when
+    await device_data_ingestion_service.flush()
+
+    # then
+    mock_device_data_repository.copy_batch.assert_awaited_once()
+    batch = mock_device_data_repository.copy_batch.await_args.args[0]
+    assert len(batch) == 2
+    mock_device_data_repository.insert_batch.assert_not_awaited()
+
+
+async def test_flush_publishes_whole_batch(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+    mock_device_data_stream_service: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    await device_data_ingestion_service.ingest(
+        device_id=device_id, ts=datetime.now(UTC), payload={"temperature": 25.5, "humidity": 60}
+    )
+
+    # when
+    await device_data_ingestion_service.flush()
+
+    # then
+    batch = mock_device_data_repository.copy_batch.await_args.args[0]
+    mock_device_data_stream_service.publish.assert_awaited_once_with(batch)
+
+
+async def test_flush_upserts_newest_point_per_key(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache_repository: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    newer = datetime(2024, 10, 25, 10, 0, 1, tzinfo=UTC)
+    older = datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC)
+    await device_data_ingestion_service.ingest(
+        device_id=device_id, ts=newer, payload={"temperature": 26.0}
+    )
+    await device_data_ingestion_service.ingest(
+        device_id=device_id, ts=older, payload={"temperature": 25.0}
+    )
+
+    # when
+    await device_data_ingestion_service.flush()
+
+    # then
+    mock_device_data_latest_repository.upsert_batch.assert_awaited_once()
+    latest = mock_device_data_latest_repository.upsert_batch.await_args.args[0]
+    mock_device_data_latest_cache_repository.save_batch.assert_awaited_once_with(latest)
+    assert list(latest.records()) == [
+        (device_id, newer, "temperature", None, None, None, 26.0, None)
+    ]
+
+
+async def test_flush_skips_empty_batch(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # when
+    await device_data_ingestion_service.flush()
+
+    # then
+    mock_device_data_repository.copy_batch.assert_not_awaited()
+
+
+async def test_flush_falls_back_to_insert_on_duplicate(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_repository.copy_batch.side_effect = UniqueViolationError()
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"temperature": 25.5}
+    )
+
+    # when
+    await device_data_ingestion_service.flush()
+
+    # then
+    mock_device_data_repository.insert_batch.assert_awaited_once()
+
+
+async def test_flush_falls_back_to_insert_for_point_of_deleted_device(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+    mock_device_data_stream_service: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_repository.copy_batch.side_effect = ForeignKeyViolationError()
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"temperature": 25.5}
+    )
+
+    # when
+    await device_data_ingestion_service.flush()
+
+    # then
+    mock_device_data_repository.insert_batch.assert_awaited_once()
+    mock_device_data_stream_service.publish.assert_awaited_once()
+    assert len(device_data_ingestion_service._batch) == 0  # type: ignore
+
+
+async def test_flush_requeues_batch_on_write_error(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+    mock_device_data_stream_service: AsyncMock,
+) -> None:
+    # given
+    device_data_ingestion_service._retry = FlushRetry(max_retries=2, backoff=0, max_backoff=0)  # type: ignore
+    mock_device_data_repository.copy_batch.side_effect = [ConnectionError(), None]
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"temperature": 25.5}
+    )
+
+    # when
+    await device_data_ingestion_service.flush()
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"humidity": 60}
+    )
+    await device_data_ingestion_service.flush()
+
+    # then
+    assert mock_device_data_repository.copy_batch.await_count == 2
+    batch = mock_device_data_repository.copy_batch.await_args.args[0]
+    assert batch.key == ["temperature", "humidity"]
+    mock_device_data_stream_service.publish.assert_awaited_once_with(batch)
+    assert len(device_data_ingestion_service._batch) == 0  # type: ignore
+
+
+async def test_flush_drops_batch_after_retries(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+    mock_device_data_stream_service: AsyncMock,
+) -> None:
+    # given
+    device_data_ingestion_service._retry = FlushRetry(max_retries=2, backoff=0, max_backoff=0)  # type: ignore
+    mock_device_data_repository.copy_batch.side_effect = ConnectionError()
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"temperature": 25.5}
+    )
+
+    # when
+    for _ in range(4):
+        await device_data_ingestion_service.flush()
+
+    # then
+    assert mock_device_data_repository.copy_batch.await_count == 3
+    assert len(device_data_ingestion_service._batch) == 0  # type: ignore
+    mock_device_data_stream_service.publish.assert_not_awaited()
+
+
+async def test_ingest_requests_flush_when_batch_is_full(
+    device_data_ingestion_service: DeviceDataIngestionService,
+) -> None:
+    # given
+    device_data_ingestion_service._batch_size = 2  # type: ignore
+
+    # when
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"a": 1, "b": 2}
+    )
+
+    # then
+    assert device_data_ingestion_service._flush_requested.is_set()  # type: ignore
+
+
+async def test_stop_flushes_remaining_data(
+    device_data_ingestion_service: DeviceDataIngestionService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    await device_data_ingestion_service.start()
+    await device_data_ingestion_service.ingest(
+        device_id=uuid4(), ts=datetime.now(UTC), payload={"temperature": 25.5}
+    )
+
+    # when
+    await device_data_ingestion_service.stop()
+
+    # then
+    mock_device_data_repository.copy_batch.assert_awaited_once()
@@ -1,11 +1,17 @@
 from datetime import datetime
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from uuid import uuid4
 
 import pytest
 
-from app.module.device_data.constants import AggregationType, IntervalType
-from app.module.device_data.dto.device_data_dto import AggregatedData, TimeseriesAggregationQueryDto
+from app.module.device_data.constants import AggregationType, DownsampleMethod, IntervalType
+from app.module.device_data.dto.device_data_dto import (
+    AggregatedData,
+    TimeseriesAggregationQueryDto,
+    TimeseriesExportQueryDto,
+)
+from app.module.device_data.model.device_data import DeviceData
+from app.module.device_data.repository.device_data_latest_cache_repository import CachedDataPoint
 from app.module.device_data.service.device_data_service import DeviceDataService
 
 
@@ -24,35 +30,66 @@ def mock_device_data_aggregation_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_device_data_latest_cache_repository() -> AsyncMock:
+    mock = AsyncMock()
+    mock.find_all.return_value = None
+    mock.find_by_keys.return_value = None
+    return mock
+
+
 @pytest.fixture
 def device_data_service(
     mock_device_data_repository: AsyncMock,
     mock_device_data_latest_repository: AsyncMock,
     mock_device_data_aggregation_repository: AsyncMock,
+    mock_device_data_latest_cache_repository: AsyncMock,
 ) -> DeviceDataService:
     return DeviceDataService(
         device_data_repository=mock_device_data_repository,
         device_data_latest_repository=mock_device_data_latest_repository,
         device_data_aggregation_repository=mock_device_data_aggregation_repository,
+        device_data_latest_cache_repository=mock_device_data_latest_cache_repository,
     )
 
 
 async def test_get_all_keys(
     device_data_service: DeviceDataService,
     mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache_repository: AsyncMock,
 ) -> None:
     # given
     device_id = uuid4()
-    mock_device_data_latest_repository.find_all_keys_by_device_id.return_value = [
-        "key1",
-        "key2",
+    data = [
+        Mock(device_id=device_id, key="key1", value=1, ts=datetime.now()),
+        Mock(device_id=device_id, key="key2", value=2, ts=datetime.now()),
     ]
+    mock_device_data_latest_repository.find_all_by_device_id.return_value = data
 
     # when
     result = await device_data_service.get_all_keys(device_id=device_id)
 
     # then
     assert result == {"key1", "key2"}
+    mock_device_data_latest_cache_repository.save_all.assert_awaited_once_with(device_id, data)
+
+
+async def test_get_all_keys_from_cache(
+    device_data_service: DeviceDataService,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_latest_cache_repository.find_all.return_value = [
+        CachedDataPoint(ts=datetime.now(), key="key1", value=1)
+    ]
+
+    # when
+    result = await device_data_service.get_all_keys(device_id=uuid4())
+
+    # then
+    assert result == {"key1"}
+    mock_device_data_latest_repository.find_all_by_device_id.assert_not_awaited()
 
 
 async def test_get_latest_data_by_keys(
@@ -62,9 +99,10 @@ async def test_get_latest_data_by_keys(
     # given
     device_id = uuid4()
     keys = {"key1", "key2"}
-    mock_device_data_latest_repository.find_all_by_device_id_and_keys.return_value = [
+    mock_device_data_latest_repository.find_all_by_device_id.return_value = [
         Mock(device_id=device_id, key="key1", value=1, ts=datetime.now()),
         Mock(device_id=device_id, key="key2", value=2, ts=datetime.now()),
+        Mock(device_id=device_id, key="key3", value=3, ts=datetime.now()),
     ]
 
     # when
@@ -81,6 +119,25 @@ async def test_get_latest_data_by_keys(
     assert result[1].value == 2
 
 
+async def test_get_latest_data_by_keys_from_cache(
+    device_data_service: DeviceDataService,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_latest_cache_repository.find_by_keys.return_value = [
+        CachedDataPoint(ts=datetime.now(), key="key1", value=1)
+    ]
+
+    # when
+    result = await device_data_service.get_latest_data_by_keys(device_id=uuid4(), keys={"key1"})
+
+    # then
+    assert len(result) == 1
+    assert result[0].value == 1
+    mock_device_data_latest_repository.find_all_by_device_id.assert_not_awaited()
+
+
 async def test_get_timeseries_data_by_keys_without_aggregate(
     device_data_service: DeviceDataService,
     mock_device_data_repository: AsyncMock,
@@ -99,8 +156,8 @@ async def test_get_timeseries_data_by_keys_without_aggregate(
         agg=None,
     )
     mock_device_data_repository.find_data_by_device_id_and_keys.return_value = [
-        Mock(device_id=device_id, key="key1", value=1, ts=datetime.now()),
-        Mock(device_id=device_id, key="key2", value=2, ts=datetime.now()),
+        DeviceData(device_id=device_id, key="key1", long_v=1, ts=datetime.now()),
+        DeviceData(device_id=device_id, key="key2", long_v=2, ts=datetime.now()),
     ]
 
     # when
@@ -117,6 +174,46 @@ async def test_get_timeseries_data_by_keys_without_aggregate(
     assert result["key2"][0].value == 2
 
 
+async def test_get_timeseries_data_by_keys_with_downsample(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate="2024-10-01T00:00:00",  # type: ignore
+        endDate="2024-10-31T00:00:00",  # type: ignore
+        downsample=DownsampleMethod.LTTB,
+        points=100,
+    )
+    mock_device_data_repository.find_downsampled_data_by_device_id_and_keys.return_value = {
+        "key1": [
+            AggregatedData(ts=datetime.now(), value=1.0),
+            AggregatedData(ts=datetime.now(), value=2.0),
+        ],
+    }
+
+    # when
+    result = await device_data_service.get_timeseries_data_by_keys(
+        device_id=device_id,
+        query_dto=query_dto,
+    )
+
+    # then
+    mock_device_data_repository.find_downsampled_data_by_device_id_and_keys.assert_awaited_once_with(
+        device_id=device_id,
+        keys={"key1", "key2"},
+        start_date=query_dto.start_date,
+        end_date=query_dto.end_date,
+        method=DownsampleMethod.LTTB,
+        points=100,
+    )
+    mock_device_data_repository.find_data_by_device_id_and_keys.assert_not_awaited()
+    assert [d.value for d in result["key1"]] == [1.0, 2.0]
+    assert "key2" not in result
+
+
 async def test_get_timeseries_data_by_keys_with_aggregate(
     device_data_service: DeviceDataService,
     mock_device_data_aggregation_repository: AsyncMock,
@@ -134,10 +231,13 @@ async def test_get_timeseries_data_by_keys_with_aggregate(
         interval=1,
         agg=AggregationType.AVG,
     )
-    mock_device_data_aggregation_repository.find_aggregation.return_value = [
-        AggregatedData(ts=datetime.now(), value=1),
-        AggregatedData(ts=datetime.now(), value=2),
-    ]
+    mock_device_data_aggregation_repository.find_aggregation.return_value = {
+        "key1": [AggregatedData(ts=datetime.now(), value=1)],
+        "key2": [
+            AggregatedData(ts=datetime.now(), value=1),
+            AggregatedData(ts=datetime.now(), value=2),
+        ],
+    }
 
     # when
     result = await device_data_service.get_timeseries_data_by_keys(
@@ -147,7 +247,7 @@ async def test_get_timeseries_data_by_keys_with_aggregate(
 
     # then
     assert len(result) == 2
-    assert len(result["key1"]) == 2
+    assert len(result["key1"]) == 1
     assert result["key1"][0].value == 1
     assert result["key2"][1].value == 2
     assert len(result["key2"]) == 2
@@ -172,10 +272,13 @@ async def test_find_aggregation_async(
         interval=1,
         agg=AggregationType.AVG,
     )
-    mock_device_data_aggregation_repository.find_aggregation.return_value = [
-        AggregatedData(ts=datetime.now(), value=1),
-        AggregatedData(ts=datetime.now(), value=2),
-    ]
+    mock_device_data_aggregation_repository.find_aggregation.return_value = {
+        "key1": [AggregatedData(ts=datetime.now(), value=1)],
+        "key2": [
+            AggregatedData(ts=datetime.now(), value=1),
+            AggregatedData(ts=datetime.now(), value=2),
+        ],
+    }
 
     # when
     result = await device_data_service.find_aggregation_async(
@@ -184,6 +287,7 @@ async def test_find_aggregation_async(
     )
 
     # then
+    mock_device_data_aggregation_repository.find_aggregation.assert_awaited_once()
     assert len(result) == 2
     assert result["key1"][0].value == 1
     assert result["key2"][1].value == 2
@@ -192,6 +296,36 @@ async def test_find_aggregation_async(
     assert result["key2"][1].value == 2
 
 
+async def test_find_aggregation_async_fills_keys_without_data(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+) -> None:
+    # given
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate=str(datetime.now()),  # type: ignore
+        endDate=str(datetime.now()),  # type: ignore
+        limit=0,
+        orderBy=None,
+        timezone=None,
+        intervalType=IntervalType.DAY,
+        interval=1,
+        agg=AggregationType.AVG,
+    )
+    mock_device_data_aggregation_repository.find_aggregation.return_value = {
+        "key1": [AggregatedData(ts=datetime.now(), value=1)],
+    }
+
+    # when
+    result = await device_data_service.find_aggregation_async(
+        device_id=uuid4(),
+        query_dto=query_dto,
+    )
+
+    # then
+    assert result["key2"] == []
+
+
 async def test_find_aggregation_raise_value_error_missing_agg(
     device_data_service: DeviceDataService,
 ) -> None:
@@ -266,3 +400,36 @@ async def test_find_aggregation_raise_value_error_missing_interval(
             device_id=device_id,
             query_dto=query_dto,
         )
+
+
+async def test_export_timeseries_data(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    query_dto = TimeseriesExportQueryDto(
+        keys="key1",
+        startDate="2024-10-01T00:00:00",  # type: ignore
+        endDate="2024-10-31T00:00:00",  # type: ignore
+        format="csv",
+    )
+
+    async def stream_data(**_):  # type: ignore
+        yield [(datetime(2024, 10, 2), "key1", None, None, 1, None, None)]
+
+    mock_device_data_repository.stream_data_by_device_id_and_keys = stream_data
+
+    # when
+    with patch(
+        "app.module.device_data.service.device_data_service.transactional_session", MagicMock()
+    ):
+        result = [
+            chunk
+            async for chunk in device_data_service.export_timeseries_data(
+                device_id=device_id, query_dto=query_dto
+            )
+        ]
+
+    # then
+    assert b"".join(result) == b"ts,key,value\r\n2024-10-02T00:00:00,key1,1\r\n"
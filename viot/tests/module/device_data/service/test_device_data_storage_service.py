@@ -0,0 +1,230 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.module.device_data.dto.device_data_storage_dto import DeviceDataRetentionUpdateDto
+from app.module.device_data.model.device_data_retention import DeviceDataRetention
+from app.module.device_data.service.device_data_storage_service import DeviceDataStorageService
+from app.module.team.exception.team_exception import TeamNotFoundException
+
+
+@pytest.fixture
+def mock_device_data_storage_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_retention_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_team_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_lock() -> AsyncMock:
+    mock = AsyncMock()
+    mock.acquire.return_value = True
+    return mock
+
+
+@pytest.fixture
+def mock_redis_client(mock_lock: AsyncMock) -> Mock:
+    return Mock(lock=Mock(return_value=mock_lock))
+
+
+@pytest.fixture
+def device_data_storage_service(
+    mock_device_data_storage_repository: AsyncMock,
+    mock_device_data_retention_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+    mock_redis_client: Mock,
+) -> DeviceDataStorageService:
+    return DeviceDataStorageService(
+        device_data_storage_repository=mock_device_data_storage_repository,
+        device_data_retention_repository=mock_device_data_retention_repository,
+        team_repository=mock_team_repository,
+        redis_client=mock_redis_client,
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_transactional_session():  # type: ignore
+    with patch(
+        "app.module.device_data.service.device_data_storage_service.transactional_session",
+        MagicMock(),
+    ) as mock:
+        yield mock
+
+
+@patch("app.module.device_data.service.device_data_storage_service.device_data_settings")
+async def test_apply_policies(
+    mock_settings: Mock,
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_storage_repository: AsyncMock,
+) -> None:
+    # given
+    mock_settings.COMPRESS_AFTER_DAYS = 7
+    mock_settings.DROP_AFTER_DAYS = 365
+
+    # when
+    await device_data_storage_service.apply_policies()
+
+    # then
+    mock_device_data_storage_repository.set_compression_policy.assert_awaited_once_with(
+        timedelta(days=7)
+    )
+    mock_device_data_storage_repository.set_retention_policy.assert_awaited_once_with(
+        timedelta(days=365)
+    )
+
+
+async def test_get_compression_stats(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_storage_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_storage_repository.find_compression_stats.return_value = Mock(
+        total_chunks=10,
+        number_compressed_chunks=8,
+        before_compression_total_bytes=1000,
+        after_compression_total_bytes=100,
+    )
+
+    # when
+    stats = await device_data_storage_service.get_compression_stats()
+
+    # then
+    assert stats.compressed_chunks == 8
+    assert stats.compression_ratio == 10.0
+
+
+async def test_get_compression_stats_without_compressed_chunks(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_storage_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_storage_repository.find_compression_stats.return_value = None
+
+    # when
+    stats = await device_data_storage_service.get_compression_stats()
+
+    # then
+    assert stats.total_chunks == 0
+    assert stats.compression_ratio is None
+
+
+async def test_update_team_retention_creates_setting(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    mock_team_repository.exists_by_id.return_value = True
+    mock_device_data_retention_repository.find.return_value = None
+
+    # when
+    result = await device_data_storage_service.update_team_retention(
+        team_id=team_id, retention_update_dto=DeviceDataRetentionUpdateDto(retention_days=30)
+    )
+
+    # then
+    assert result.retention_days == 30
+    saved = mock_device_data_retention_repository.save.await_args.args[0]
+    assert saved.team_id == team_id
+    assert saved.retention_days == 30
+
+
+async def test_update_team_retention_removes_setting(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    retention = DeviceDataRetention(team_id=team_id, retention_days=30)
+    mock_team_repository.exists_by_id.return_value = True
+    mock_device_data_retention_repository.find.return_value = retention
+
+    # when
+    result = await device_data_storage_service.update_team_retention(
+        team_id=team_id, retention_update_dto=DeviceDataRetentionUpdateDto(retention_days=None)
+    )
+
+    # then
+    assert result.retention_days is None
+    mock_device_data_retention_repository.delete.assert_awaited_once_with(retention)
+
+
+async def test_update_team_retention_raises_when_team_not_found(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_team_repository: AsyncMock,
+) -> None:
+    # given
+    mock_team_repository.exists_by_id.return_value = False
+
+    # when / then
+    with pytest.raises(TeamNotFoundException):
+        await device_data_storage_service.update_team_retention(
+            team_id=uuid4(), retention_update_dto=DeviceDataRetentionUpdateDto(retention_days=30)
+        )
+
+
+async def test_purge_expired_team_data(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_storage_repository: AsyncMock,
+    mock_device_data_retention_repository: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    mock_device_data_retention_repository.find_all.return_value = [
+        DeviceDataRetention(team_id=team_id, retention_days=30)
+    ]
+    mock_device_data_storage_repository.delete_team_data_before.return_value = 5
+
+    # when
+    await device_data_storage_service.purge_expired_team_data()
+
+    # then
+    kwargs = mock_device_data_storage_repository.delete_team_data_before.await_args.kwargs
+    assert kwargs["team_id"] == team_id
+
+
+async def test_enforce_retention_skipped_when_another_worker_holds_the_lock(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_repository: AsyncMock,
+    mock_lock: AsyncMock,
+) -> None:
+    # given
+    mock_lock.acquire.return_value = False
+
+    # when
+    ran = await device_data_storage_service.enforce_retention()
+
+    # then
+    assert ran is False
+    mock_device_data_retention_repository.find_all.assert_not_awaited()
+
+
+async def test_enforce_retention_keeps_the_lock_for_the_interval(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_repository: AsyncMock,
+    mock_redis_client: Mock,
+    mock_lock: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_retention_repository.find_all.return_value = []
+
+    # when
+    ran = await device_data_storage_service.enforce_retention()
+
+    # then
+    assert ran is True
+    mock_device_data_retention_repository.find_all.assert_awaited_once()
+    assert mock_redis_client.lock.call_args.kwargs["blocking"] is False
+    mock_lock.release.assert_not_called()
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, Mock
+from uuid import uuid4
+
+import msgspec
+import pytest
+
+from app.module.device_data.batch import DeviceDataBatch
+from app.module.device_data.service.device_data_stream_service import DeviceDataStreamService
+
+
+@pytest.fixture
+def mock_pubsub() -> Mock:
+    return Mock(subscribe=AsyncMock(), unsubscribe=AsyncMock(), aclose=AsyncMock())
+
+
+@pytest.fixture
+def mock_pipeline() -> MagicMock:
+    pipe = MagicMock(execute=AsyncMock())
+    pipe.__aenter__.return_value = pipe
+    return pipe
+
+
+@pytest.fixture
+def mock_redis_client(mock_pubsub: Mock, mock_pipeline: MagicMock) -> Mock:
+    return Mock(pubsub=Mock(return_value=mock_pubsub), pipeline=Mock(return_value=mock_pipeline))
+
+
+@pytest.fixture
+async def device_data_stream_service(mock_redis_client: Mock) -> DeviceDataStreamService:
+    service = DeviceDataStreamService(redis_client=mock_redis_client)
+    # Keep the reader task out of the way, messages are dispatched by hand.
+    service._ensure_reader = Mock()  # type: ignore
+    return service
+
+
+async def test_publish_one_message_per_device(
+    device_data_stream_service: DeviceDataStreamService,
+    mock_pipeline: MagicMock,
+) -> None:
+    # given
+    device_id, other_device_id = uuid4(), uuid4()
+    ts = datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC)
+    batch = DeviceDataBatch()
+    batch.extend(device_id, ts, {"temperature": 25.5, "location": {"lat": 1}})
+    batch.extend(other_device_id, ts, {"on": True})
+
+    # when
+    await device_data_stream_service.publish(batch)
+
+    # then
+    assert mock_pipeline.publish.call_count == 2
+    channel, data = mock_pipeline.publish.call_args_list[0].args
+    assert channel == f"device_data_stream:{device_id}"
+    assert msgspec.json.decode(data) == [
+        {"ts": "2024-10-25T10:00:00Z", "key": "temperature", "value": 25.5},
+        {"ts": "2024-10-25T10:00:00Z", "key": "location", "value": {"lat": 1}},
+    ]
+    mock_pipeline.execute.assert_awaited_once()
+
+
+async def test_subscribe_shares_one_channel_subscription(
+    device_data_stream_service: DeviceDataStreamService,
+    mock_pubsub: Mock,
+) -> None:
+    # given
+    device_id = uuid4()
+
+    # when
+    async with device_data_stream_service.subscribe(device_id) as first:
+        async with device_data_stream_service.subscribe(device_id) as second:
+            device_data_stream_service._dispatch(device_id, "message")
+
+            # then
+            mock_pubsub.subscribe.assert_awaited_once_with(f"device_data_stream:{device_id}")
+            assert first.get_nowait() == "message"
+            assert second.get_nowait() == "message"
+        mock_pubsub.unsubscribe.assert_not_awaited()
+    mock_pubsub.unsubscribe.assert_awaited_once_with(f"device_data_stream:{device_id}")
+
+
+async def test_dispatch_drops_oldest_message_when_queue_full(
+    device_data_stream_service: DeviceDataStreamService,
+) -> None:
+    # given
+    device_id = uuid4()
+    device_data_stream_service._queue_size = 2
+
+    # when
+    async with device_data_stream_service.subscribe(device_id) as queue:
+        for message in ("1", "2", "3"):
+            device_data_stream_service._dispatch(device_id, message)
+
+        # then
+        assert [queue.get_nowait(), queue.get_nowait()] == ["2", "3"]
+        with pytest.raises(asyncio.QueueEmpty):
+            queue.get_nowait()
+
+
+async def test_subscribe_failure_leaves_no_registration(
+    device_data_stream_service: DeviceDataStreamService,
+    mock_pubsub: Mock,
+) -> None:
+    # given
+    device_id = uuid4()
+    mock_pubsub.subscribe.side_effect = [ConnectionError(), None]
+
+    # when
+    with pytest.raises(ConnectionError):
+        async with device_data_stream_service.subscribe(device_id):
+            pass
+
+    # then
+    assert device_id not in device_data_stream_service._subscribers
+    async with device_data_stream_service.subscribe(device_id):
+        assert mock_pubsub.subscribe.await_count == 2
+
+
+async def test_reader_survives_malformed_message(
+    mock_redis_client: Mock, mock_pubsub: Mock
+) -> None:
+    # given
+    service = DeviceDataStreamService(redis_client=mock_redis_client)
+    device_id = uuid4()
+    messages = [
+        {"type": "message", "channel": "device_data_stream:not-a-uuid", "data": "bad"},
+        {"type": "message", "channel": f"device_data_stream:{device_id}", "data": "good"},
+    ]
+
+    async def get_message(**_: Any) -> dict[str, str] | None:
+        await asyncio.sleep(0.01)
+        return messages.pop(0) if messages else None
+
+    mock_pubsub.get_message = get_message
+
+    # when
+    async with service.subscribe(device_id) as queue:
+        message = await asyncio.wait_for(queue.get(), timeout=1.0)
+
+    # then
+    assert message == "good"
+    assert service._reader is not None and not service._reader.done()
+    await service.stop()
@@ -0,0 +1,105 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from app.module.device_data.batch import ConnectLogBatch, DeviceDataBatch
+from app.module.device_data.constants import ConnectStatus
+
+
+def test_append_routes_value_to_typed_column() -> None:
+    # given
+    batch = DeviceDataBatch()
+    device_id = uuid4()
+    ts = datetime.now(UTC)
+
+    # when
+    batch.append(device_id, ts, "enabled", True)
+    batch.append(device_id, ts, "count", 10)
+    batch.append(device_id, ts, "temperature", 25.5)
+    batch.append(device_id, ts, "status", "ok")
+    batch.append(device_id, ts, "meta", {"a": 1})
+
+    # then
+    assert len(batch) == 5
+    assert batch.bool_v == [True, None, None, None, None]
+    assert batch.long_v == [None, 10, None, None, None]
+    assert batch.double_v == [None, None, 25.5, None, None]
+    assert batch.str_v == [None, None, None, "ok", None]
+    assert batch.json_v == [None, None, None, None, '{"a":1}']
+
+
+def test_append_stores_out_of_range_int_as_double() -> None:
+    # given
+    batch = DeviceDataBatch()
+
+    # when
+    batch.append(uuid4(), datetime.now(UTC), "big", 2**64)
+
+    # then
+    assert batch.long_v == [None]
+    assert batch.double_v == [float(2**64)]
+
+
+def test_extend_skips_null_values() -> None:
+    # given
+    batch = DeviceDataBatch()
+
+    # when
+    batch.extend(uuid4(), datetime.now(UTC), {"temperature": 25.5, "humidity": None})
+
+    # then
+    assert batch.key == ["temperature"]
+
+
+def test_latest_keeps_newest_point_per_device_and_key() -> None:
+    # given
+    batch = DeviceDataBatch()
+    device_id, other_device_id = uuid4(), uuid4()
+    older = datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC)
+    newer = datetime(2024, 10, 25, 10, 0, 1, tzinfo=UTC)
+    batch.append(device_id, newer, "temperature", 26.0)
+    batch.append(device_id, older, "temperature", 25.0)
+    batch.append(other_device_id, older, "temperature", 20.0)
+
+    # when
+    latest = batch.latest()
+
+    # then
+    assert len(latest) == 2
+    assert latest.device_id == [device_id, other_device_id]
+    assert latest.ts == [newer, older]
+    assert latest.double_v == [26.0, 20.0]
+
+
+def test_records() -> None:
+    # given
+    batch = DeviceDataBatch()
+    device_id = uuid4()
+    ts = datetime.now(UTC)
+    batch.append(device_id, ts, "temperature", 25.5)
+
+    # when
+    records = list(batch.records())
+
+    # then
+    assert records == [(device_id, ts, "temperature", None, None, None, 25.5, None)]
+
+
+def test_connect_log_latest_keeps_newest_status_change_per_device() -> None:
+    # given
+    batch = ConnectLogBatch()
+    device_id, other_device_id = uuid4(), uuid4()
+    older = datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC)
+    newer = datetime(2024, 10, 25, 10, 0, 1, tzinfo=UTC)
+    batch.append(device_id, older, ConnectStatus.CONNECTED, "10.0.0.1")
+    batch.append(device_id, newer, ConnectStatus.DISCONNECTED, "10.0.0.1")
+    batch.append(other_device_id, older, ConnectStatus.CONNECTED, "10.0.0.2")
+    batch.append(other_device_id, newer, ConnectStatus.FAILED, "10.0.0.2")
+
+    # when
+    latest = batch.latest()
+
+    # then
+    assert len(latest) == 2
+    assert latest.device_id == [device_id, other_device_id]
+    assert latest.ts == [newer, older]
+    assert latest.connect_status == [ConnectStatus.DISCONNECTED, ConnectStatus.CONNECTED]
@@ -0,0 +1,53 @@
+from uuid import uuid4
+
+import msgspec
+import pytest
+
+from app.module.device_data.decoder import decode_sub_device_payload
+
+
+def test_decode_sub_device_payload_array() -> None:
+    # given
+    first_id, second_id = uuid4(), uuid4()
+    data = (
+        f'[{{"sub_device_id": "{first_id}", "temperature": 25.5}},'
+        f'{{"sub_device_id": "{second_id}", "humidity": 60}},'
+        f'{{"sub_device_id": "{first_id}", "pressure": 1013}}]'
+    ).encode()
+
+    # when
+    payloads = decode_sub_device_payload(data)
+
+    # then
+    assert payloads == {
+        first_id: {"temperature": 25.5, "pressure": 1013},
+        second_id: {"humidity": 60},
+    }
+
+
+def test_decode_sub_device_payload_single_object() -> None:
+    # given
+    sub_device_id = uuid4()
+    data = f'{{"sub_device_id": "{sub_device_id}", "temperature": 25.5}}'.encode()
+
+    # when
+    payloads = decode_sub_device_payload(data)
+
+    # then
+    assert payloads == {sub_device_id: {"temperature": 25.5}}
+
+
+def test_decode_sub_device_payload_skips_invalid_sub_device_id() -> None:
+    # given
+    data = b'[{"sub_device_id": "invalid", "temperature": 25.5}, {"temperature": 1}]'
+
+    # when
+    payloads = decode_sub_device_payload(data)
+
+    # then
+    assert payloads == {}
+
+
+def test_decode_sub_device_payload_raises_on_invalid_json() -> None:
+    with pytest.raises(msgspec.DecodeError):
+        decode_sub_device_payload(b"[1, 2]")
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.module.device_data.downsample import lttb, minmax
+
+
+@pytest.mark.parametrize("downsample", [lttb, minmax])
+def test_downsample_keeps_short_series(downsample) -> None:  # type: ignore
+    # given
+    x = np.arange(10)
+    y = np.arange(10, dtype=np.float64)
+
+    # when
+    result = downsample(x, y, 20)
+
+    # then
+    assert result.tolist() == list(range(10))
+
+
+def test_lttb_keeps_endpoints_and_count() -> None:
+    # given
+    x = np.arange(10_000)
+    y = np.sin(x / 100)
+
+    # when
+    result = lttb(x, y, 100)
+
+    # then
+    assert len(result) == 100
+    assert result[0] == 0
+    assert result[-1] == 9_999
+    assert np.all(np.diff(result) > 0)
+
+
+def test_lttb_keeps_spike() -> None:
+    # given
+    x = np.arange(1_000)
+    y = np.zeros(1_000)
+    y[437] = 50.0
+
+    # when
+    result = lttb(x, y, 10)
+
+    # then
+    assert 437 in result
+
+
+def test_minmax_keeps_extremes_of_every_bucket() -> None:
+    # given
+    x = np.arange(8)
+    y = np.array([1.0, 5.0, 3.0, 0.0, 2.0, 2.0, 9.0, -1.0])
+
+    # when
+    result = minmax(x, y, 4)
+
+    # then
+    # Buckets [0, 4) and [4, 8): min/max at 3/1 and 7/6
+    assert result.tolist() == [1, 3, 6, 7]
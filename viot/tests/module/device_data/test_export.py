@@ -0,0 +1,76 @@
+import io
+import sys
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+import msgspec
+import pytest
+
+from app.module.device_data.constants import ExportFormat
+from app.module.device_data.exception.device_data_exception import (
+    ExportFormatUnavailableException,
+)
+from app.module.device_data.export import ExportRows, get_export_encoder
+
+TS = datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC)
+ROWS = [
+    (TS, "temperature", None, None, None, 25.5, None),
+    (TS, "on", True, None, None, None, None),
+    (TS, "location", None, None, None, None, '{"lat": 1}'),
+]
+
+
+async def _chunks() -> AsyncIterator[ExportRows]:
+    yield ROWS[:2]
+    yield ROWS[2:]
+
+
+async def _export(format: ExportFormat) -> bytes:
+    return b"".join([chunk async for chunk in get_export_encoder(format)(_chunks())])
+
+
+async def test_export_ndjson() -> None:
+    # when
+    result = await _export(ExportFormat.NDJSON)
+
+    # then
+    assert [msgspec.json.decode(line) for line in result.splitlines()] == [
+        {"ts": "2024-10-25T10:00:00Z", "key": "temperature", "value": 25.5},
+        {"ts": "2024-10-25T10:00:00Z", "key": "on", "value": True},
+        {"ts": "2024-10-25T10:00:00Z", "key": "location", "value": {"lat": 1}},
+    ]
+
+
+async def test_export_csv() -> None:
+    # when
+    result = await _export(ExportFormat.CSV)
+
+    # then
+    assert result.decode().splitlines() == [
+        "ts,key,value",
+        "2024-10-25T10:00:00+00:00,temperature,25.5",
+        "2024-10-25T10:00:00+00:00,on,true",
+        '2024-10-25T10:00:00+00:00,location,"{""lat"": 1}"',
+    ]
+
+
+async def test_export_parquet() -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    # when
+    result = await _export(ExportFormat.PARQUET)
+
+    # then
+    table = pq.read_table(io.BytesIO(result))
+    assert table.num_rows == 3
+    assert table.column("double_v").to_pylist() == [25.5, None, None]
+    assert table.column("json_v").to_pylist() == [None, None, '{"lat": 1}']
+
+
+def test_export_parquet_without_pyarrow(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    # when / then
+    with pytest.raises(ExportFormatUnavailableException):
+        get_export_encoder(ExportFormat.PARQUET)
@@ -101,3 +101,19 @@ def test_map_from_count_rows_with_json_value(mock_sample_row: Mock) -> None:
     result = AggregatedDataMapper.map_from_count_rows(rows)
     assert len(result) == 1
     assert result[0].value == 9
+
+
+def test_map_rows_by_key() -> None:
+    first_row = Mock(key="key1", bucket=datetime(2023, 1, 1), interval=timedelta(hours=1))
+    second_row = Mock(key="key1", bucket=datetime(2023, 1, 1, 1), interval=timedelta(hours=1))
+    third_row = Mock(key="key2", bucket=datetime(2023, 1, 1), interval=timedelta(hours=1))
+    rows = [first_row, second_row, third_row]
+    convert_method = Mock(
+        side_effect=lambda rows: [AggregatedData(ts=r.bucket, value=1) for r in rows]
+    )
+
+    result = AggregatedDataMapper.map_rows_by_key(rows, convert_method)
+
+    assert list(result) == ["key1", "key2"]
+    assert len(result["key1"]) == 2
+    assert len(result["key2"]) == 1
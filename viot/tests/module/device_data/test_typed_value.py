@@ -0,0 +1,62 @@
+from unittest.mock import Mock
+
+from app.module.device_data.typed_value import (
+    decode_typed_value,
+    decode_typed_values,
+    encode_typed_values,
+)
+
+
+def test_encode_typed_values() -> None:
+    # given
+    payload = {
+        "enabled": True,
+        "status": "ok",
+        "count": 10,
+        "temperature": 25.5,
+        "meta": {"a": 1},
+        "missing": None,
+        "big": 2**64,
+    }
+
+    # when
+    columns = encode_typed_values(payload)
+
+    # then
+    assert columns.key == ["enabled", "status", "count", "temperature", "meta", "big"]
+    assert columns.bool_v == [True, None, None, None, None, None]
+    assert columns.str_v == [None, "ok", None, None, None, None]
+    assert columns.long_v == [None, None, 10, None, None, None]
+    assert columns.double_v == [None, None, None, 25.5, None, float(2**64)]
+    assert columns.json_v == [None, None, None, None, {"a": 1}, None]
+
+
+def test_encode_typed_values_with_json_encoder() -> None:
+    # when
+    columns = encode_typed_values({"tags": ["a", "b"]}, json_encoder=str)
+
+    # then
+    assert columns.json_v == ["['a', 'b']"]
+
+
+def test_decode_typed_value() -> None:
+    assert decode_typed_value(False, None, None, None, None) is False
+    assert decode_typed_value(None, None, 0, None, None) == 0
+    assert decode_typed_value(None, None, None, 1.5, None) == 1.5
+    assert decode_typed_value(None, None, None, None, {"a": 1}) == {"a": 1}
+    assert decode_typed_value(None, None, None, None, None) is None
+
+
+def test_decode_typed_values() -> None:
+    # given
+    models = [
+        Mock(bool_v=None, str_v="ok", long_v=None, double_v=None, json_v=None),
+        Mock(bool_v=None, str_v=None, long_v=None, double_v=2.5, json_v=None),
+        Mock(bool_v=None, str_v=None, long_v=None, double_v=None, json_v=None),
+    ]
+
+    # when
+    values = decode_typed_values(models)
+
+    # then
+    assert values == ["ok", 2.5, None]
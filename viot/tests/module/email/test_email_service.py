@@ -0,0 +1,117 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.celery_worker.tasks.enums import EmailTaskType
+from app.extension.notification.message import EmailNotification
+from app.module.email.service import (
+    EmailService,
+    RuleAlertEmail,
+    StreamEmailService,
+    TeamInvitationEmail,
+)
+
+
+@pytest.fixture
+def mock_celery_app() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def mock_notification_publisher() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def stream_email_service(mock_notification_publisher: Mock) -> StreamEmailService:
+    return StreamEmailService(notification_publisher=mock_notification_publisher)
+
+
+@pytest.fixture
+def email_service(mock_celery_app: Mock) -> EmailService:
+    with patch("app.module.email.service.celery_settings.EMAIL_BATCH_SIZE", 2):
+        return EmailService(celery_app=mock_celery_app)
+
+
+def test_send_team_invitation_emails_sends_one_task_per_batch(
+    email_service: EmailService, mock_celery_app: Mock
+) -> None:
+    # given
+    invitations = [
+        TeamInvitationEmail(
+            email=f"user{i}@example.com",
+            name="name",
+            invitor_name="invitor",
+            team_name="team",
+            link="https://example.com",
+        )
+        for i in range(5)
+    ]
+
+    # when
+    email_service.send_team_invitation_emails(invitations=invitations)
+
+    # then
+    calls = mock_celery_app.send_task.call_args_list
+    assert [len(call.kwargs["kwargs"]["messages"]) for call in calls] == [2, 2, 1]
+    assert all(call.args[0] == EmailTaskType.BATCH for call in calls)
+    assert all(call.kwargs["kwargs"]["template"] == "TEAM_INVITATION" for call in calls)
+    assert calls[2].kwargs["kwargs"]["messages"][0]["email"] == "user4@example.com"
+
+
+def test_send_rule_alert_emails_sends_nothing_without_alerts(
+    email_service: EmailService, mock_celery_app: Mock
+) -> None:
+    # when
+    email_service.send_rule_alert_emails(alerts=list[RuleAlertEmail]())
+
+    # then
+    mock_celery_app.send_task.assert_not_called()
+
+
+def test_stream_send_verify_account_email_publishes_email_notification(
+    stream_email_service: StreamEmailService, mock_notification_publisher: Mock
+) -> None:
+    # when
+    stream_email_service.send_verify_account_email(
+        email="user@example.com", name="name", verify_url="https://example.com/verify"
+    )
+
+    # then
+    (notifications,) = mock_notification_publisher.publish.call_args.args
+    assert list(notifications) == [
+        EmailNotification(
+            template="VERIFY_ACCOUNT",
+            to="user@example.com",
+            ctx={"email": "user@example.com", "name": "name", "url": "https://example.com/verify"},
+        )
+    ]
+
+
+def test_stream_send_rule_alert_emails_publishes_one_notification_per_alert(
+    stream_email_service: StreamEmailService, mock_notification_publisher: Mock
+) -> None:
+    # given
+    alerts = [
+        RuleAlertEmail(
+            email=f"user{i}@example.com",
+            rule_name="rule",
+            device_id="device",
+            ts="2024-11-04T09:30:00Z",
+            payload="{}",
+        )
+        for i in range(3)
+    ]
+
+    # when
+    stream_email_service.send_rule_alert_emails(alerts=alerts)
+    stream_email_service.send_rule_alert_emails(alerts=list[RuleAlertEmail]())
+
+    # then
+    mock_notification_publisher.publish.assert_called_once()
+    notifications = list(mock_notification_publisher.publish.call_args.args[0])
+    assert [notification.to for notification in notifications] == [
+        alert["email"] for alert in alerts
+    ]
+    assert all(notification.template == "RULE_ALERT" for notification in notifications)
+    assert notifications[0].ctx["rule_name"] == "rule"
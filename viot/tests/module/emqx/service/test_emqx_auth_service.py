@@ -5,12 +5,14 @@ import pytest
 
 from app.module.device.constants import DeviceType
 from app.module.device.exception.device_exception import DeviceNotFoundException
+from app.module.device.repository.device_repository import DeviceCredential
+from app.module.device_data.constants import ConnectStatus
 from app.module.emqx.dto.emqx_auth_dto import EmqxAuthenRequestDto
 from app.module.emqx.exception.emqx_auth_exception import (
     DeviceCredentialException,
     DeviceDisabledException,
 )
-from app.module.emqx.service.emqx_auth_service import EmqxDeviceAuthService
+from app.module.emqx.service.emqx_auth_service import _DEVICE_ACLS, EmqxDeviceAuthService
 from app.module.rule_action.constants import (
     MQTT_DEVICE_ATTRIBUTES_TOPIC,
     MQTT_DEVICE_DATA_TOPIC,
@@ -20,13 +22,13 @@ from app.module.rule_action.constants import (
 
 
 @pytest.fixture
-def mock_device_repository() -> AsyncMock:
+def mock_device_credential_service() -> AsyncMock:
     return AsyncMock()
 
 
 @pytest.fixture
-def mock_connect_log_repository() -> AsyncMock:
-    return AsyncMock()
+def mock_connect_log_ingestion_service() -> Mock:
+    return Mock()
 
 
 @pytest.fixture
@@ -36,13 +38,13 @@ def mock_mqtt_whitelist_service() -> Mock:
 
 @pytest.fixture
 def emqx_device_auth_service(
-    mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
+    mock_connect_log_ingestion_service: Mock,
     mock_mqtt_whitelist_service: Mock,
 ) -> EmqxDeviceAuthService:
     return EmqxDeviceAuthService(
-        device_repository=mock_device_repository,
-        connect_log_repository=mock_connect_log_repository,
+        device_credential_service=mock_device_credential_service,
+        connect_log_ingestion_service=mock_connect_log_ingestion_service,
         mqtt_whitelist_service=mock_mqtt_whitelist_service,
     )
 
@@ -57,9 +59,19 @@ def emqx_authen_request_dto() -> EmqxAuthenRequestDto:
     )
 
 
+def _credential(*, disabled: bool = False) -> DeviceCredential:
+    return DeviceCredential(
+        id=uuid4(),
+        token="valid_token",
+        disabled=disabled,
+        device_type=DeviceType.DEVICE,
+        team_id=uuid4(),
+    )
+
+
 async def test_authenticate_device_in_whitelist(
     emqx_device_auth_service: EmqxDeviceAuthService,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_ingestion_service: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
@@ -74,17 +86,17 @@ async def test_authenticate_device_in_whitelist(
     assert response.is_superuser is True
 
     # then
-    mock_connect_log_repository.save.assert_not_called()
+    mock_connect_log_ingestion_service.record.assert_not_called()
 
 
 async def test_authenticate_device_not_found(
     emqx_device_auth_service: EmqxDeviceAuthService,
-    mock_device_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
     # given
-    mock_device_repository.find = AsyncMock(return_value=None)
+    mock_device_credential_service.get_credential.return_value = None
     mock_mqtt_whitelist_service.check_is_in_whitelist = Mock(return_value=False)
 
     # when
@@ -94,57 +106,62 @@ async def test_authenticate_device_not_found(
 
 async def test_authenticate_device_credentials_invalid(
     emqx_device_auth_service: EmqxDeviceAuthService,
-    mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
+    mock_connect_log_ingestion_service: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
     # given
     mock_mqtt_whitelist_service.check_is_in_whitelist = Mock(return_value=False)
-    mock_device_repository.find = AsyncMock(id=uuid4(), token="valid_token", disabled=False)
+    mock_device_credential_service.get_credential.return_value = _credential()
+    emqx_authen_request_dto.username = emqx_authen_request_dto.password = "invalid_token"
 
     # when
     with pytest.raises(DeviceCredentialException):
         await emqx_device_auth_service.authenticate(request_dto=emqx_authen_request_dto)
 
     # then
-    mock_connect_log_repository.save.assert_called_once()
+    mock_connect_log_ingestion_service.record.assert_called_once()
+    assert (
+        mock_connect_log_ingestion_service.record.call_args.kwargs["connect_status"]
+        == ConnectStatus.FAILED
+    )
 
 
 async def test_authenticate_device_disabled(
     emqx_device_auth_service: EmqxDeviceAuthService,
-    mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
+    mock_connect_log_ingestion_service: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
     # given
     mock_mqtt_whitelist_service.check_is_in_whitelist = Mock(return_value=False)
-    mock_device_repository.find = AsyncMock(
-        return_value=Mock(id=uuid4(), token="valid_token", disabled=True)
-    )
+    mock_device_credential_service.get_credential.return_value = _credential(disabled=True)
 
     # when
     with pytest.raises(DeviceDisabledException):
         await emqx_device_auth_service.authenticate(request_dto=emqx_authen_request_dto)
 
     # then
-    mock_connect_log_repository.save.assert_called_once()
+    mock_connect_log_ingestion_service.record.assert_called_once()
+    assert (
+        mock_connect_log_ingestion_service.record.call_args.kwargs["connect_status"]
+        == ConnectStatus.FAILED
+    )
 
 
 async def test_authenticate_success(
     emqx_device_auth_service: EmqxDeviceAuthService,
-    mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
+    mock_connect_log_ingestion_service: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
     # given
     mock_mqtt_whitelist_service.check_is_in_whitelist = Mock(return_value=False)
-    mock_device_repository.find = AsyncMock(
-        return_value=Mock(id=uuid4(), token="valid_token", disabled=False)
-    )
-    mock_connect_log_repository.save = AsyncMock()
+    credential = _credential()
+    mock_device_credential_service.get_credential.return_value = credential
 
     # when
     response = await emqx_device_auth_service.authenticate(request_dto=emqx_authen_request_dto)
@@ -152,8 +169,12 @@ async def test_authenticate_success(
     # then
     assert response.result == "allow"
     assert response.is_superuser is False
+    assert response.acl == _DEVICE_ACLS[DeviceType.DEVICE]
 
-    mock_connect_log_repository.save.assert_called_once()
+    mock_connect_log_ingestion_service.record.assert_called_once()
+    kwargs = mock_connect_log_ingestion_service.record.call_args.kwargs
+    assert kwargs["device_id"] == emqx_authen_request_dto.device_id
+    assert kwargs["connect_status"] == ConnectStatus.CONNECTED
 
 
 @pytest.mark.parametrize(
@@ -188,13 +209,5 @@ async def test_authenticate_success(
         ),
     ],  # type: ignore
 )
-def test__get_device_acl(
-    emqx_device_auth_service: EmqxDeviceAuthService,
-    device_type: DeviceType,
-    expected_acl: list[dict[str, str]],
-) -> None:
-    # When
-    acl = emqx_device_auth_service._get_device_acl(device_type)  # type: ignore
-
-    # Then
-    assert acl == expected_acl
+def test_device_acls(device_type: DeviceType, expected_acl: list[dict[str, str]]) -> None:
+    assert _DEVICE_ACLS[device_type] == expected_acl
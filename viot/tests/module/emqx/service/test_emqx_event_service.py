@@ -1,23 +1,60 @@
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
 
 from app.common.exception.base import InternalServerException
-from app.module.emqx.config import emqx_settings
-from app.module.emqx.dto.emqx_event_dto import DeviceConnectedEventDto, DeviceDisconnectedEventDto
+from app.module.device_data.constants import ConnectStatus
+from app.module.emqx.dto.emqx_event_dto import (
+    DeviceConnectedEventDto,
+    DeviceDataEventDto,
+    DeviceDisconnectedEventDto,
+    RuleTriggeredEventDto,
+)
 from app.module.emqx.service.emqx_event_service import EmqxEventService
 
 
 @pytest.fixture
-def mock_connect_log_repository() -> AsyncMock:
+def mock_connect_log_ingestion_service() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def mock_device_data_ingestion_service() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_gateway_service() -> AsyncMock:
     return AsyncMock()
 
 
 @pytest.fixture
-def emqx_event_service(mock_connect_log_repository: AsyncMock) -> EmqxEventService:
-    return EmqxEventService(connect_log_repository=mock_connect_log_repository)
+def mock_rule_trigger_service() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def mock_emqx_api_client() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def emqx_event_service(
+    mock_connect_log_ingestion_service: Mock,
+    mock_device_data_ingestion_service: AsyncMock,
+    mock_gateway_service: AsyncMock,
+    mock_rule_trigger_service: Mock,
+    mock_emqx_api_client: AsyncMock,
+) -> EmqxEventService:
+    return EmqxEventService(
+        connect_log_ingestion_service=mock_connect_log_ingestion_service,
+        device_data_ingestion_service=mock_device_data_ingestion_service,
+        gateway_service=mock_gateway_service,
+        rule_trigger_service=mock_rule_trigger_service,
+        emqx_api_client=mock_emqx_api_client,
+    )
 
 
 async def test_handle_device_connected(emqx_event_service: EmqxEventService) -> None:
@@ -34,7 +71,7 @@ async def test_handle_device_connected(emqx_event_service: EmqxEventService) ->
 
 
 async def test_handle_device_disconnected(
-    emqx_event_service: EmqxEventService, mock_connect_log_repository: AsyncMock
+    emqx_event_service: EmqxEventService, mock_connect_log_ingestion_service: Mock
 ) -> None:
     # given
     device_id = uuid4()
@@ -47,35 +84,114 @@ async def test_handle_device_disconnected(
     await emqx_event_service.handle_device_disconnected(event=event)
 
     # then
-    mock_connect_log_repository.save.assert_awaited_once()
+    mock_connect_log_ingestion_service.record.assert_called_once_with(
+        device_id=device_id,
+        ts=event.disconnected_at,
+        connect_status=ConnectStatus.DISCONNECTED,
+        ip=ip_address,
+    )
 
 
-@patch("app.module.emqx.service.emqx_event_service.AsyncClient")
-async def test_subscribe_device_topics(mock_async_client: AsyncMock) -> None:
+async def test_handle_device_data(
+    emqx_event_service: EmqxEventService, mock_device_data_ingestion_service: AsyncMock
+) -> None:
+    # given
+    device_id = uuid4()
+    ts = datetime.now(UTC)
+    event = DeviceDataEventDto(device_id=device_id, ts=ts, payload={"temperature": 25.5})
+
+    # when
+    await emqx_event_service.handle_device_data(event=event)
+
+    # then
+    mock_device_data_ingestion_service.ingest.assert_awaited_once_with(
+        device_id=device_id, ts=ts, payload={"temperature": 25.5}
+    )
+
+
+async def test_handle_sub_device_data_ingests_owned_sub_devices(
+    emqx_event_service: EmqxEventService,
+    mock_device_data_ingestion_service: AsyncMock,
+    mock_gateway_service: AsyncMock,
+) -> None:
+    # given
+    gateway_id, owned_id, foreign_id = uuid4(), uuid4(), uuid4()
+    ts = datetime.now(UTC)
+    data = (
+        f'[{{"sub_device_id": "{owned_id}", "temperature": 25.5}},'
+        f'{{"sub_device_id": "{foreign_id}", "temperature": 24.1}}]'
+    ).encode()
+    mock_gateway_service.filter_owned_sub_device_ids.return_value = {owned_id}
+
+    # when
+    await emqx_event_service.handle_sub_device_data(gateway_id=gateway_id, ts=ts, data=data)
+
+    # then
+    mock_gateway_service.filter_owned_sub_device_ids.assert_awaited_once_with(
+        gateway_id, {owned_id, foreign_id}
+    )
+    mock_device_data_ingestion_service.ingest.assert_awaited_once_with(
+        device_id=owned_id, ts=ts, payload={"temperature": 25.5}
+    )
+
+
+async def test_handle_sub_device_data_ignores_invalid_payload(
+    emqx_event_service: EmqxEventService,
+    mock_device_data_ingestion_service: AsyncMock,
+) -> None:
+    # when
+    await emqx_event_service.handle_sub_device_data(
+        gateway_id=uuid4(), ts=datetime.now(UTC), data=b"not json"
+    )
+
+    # then
+    mock_device_data_ingestion_service.ingest.assert_not_awaited()
+
+
+async def test_handle_rule_triggered_submits_trigger(
+    emqx_event_service: EmqxEventService, mock_rule_trigger_service: Mock
+) -> None:
+    # given
+    rule_id, device_id, action_id = uuid4(), uuid4(), uuid4()
+    event = RuleTriggeredEventDto(
+        device_id=device_id,
+        rule_id=rule_id,
+        action_ids=[action_id],
+        ts=datetime.now(UTC),
+        payload={"temperature": 40},
+    )
+
+    # when
+    await emqx_event_service.handle_rule_triggered(event=event)
+
+    # then
+    trigger = mock_rule_trigger_service.submit.call_args.args[0]
+    assert trigger.rule_id == rule_id
+    assert trigger.action_ids == (action_id,)
+
+
+async def test_subscribe_device_topics(
+    emqx_event_service: EmqxEventService, mock_emqx_api_client: AsyncMock
+) -> None:
     # given
-    emqx_event_service = EmqxEventService(connect_log_repository=AsyncMock())
     device_id = uuid4()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.post.return_value
-    mock_response.status_code = 201
+    mock_emqx_api_client.post.return_value.status_code = 201
 
     # when
     await emqx_event_service._subscribe_device_topics(device_id)  # type: ignore
 
     # then
-    mock_async_client.return_value.__aenter__.return_value.post.assert_awaited_once_with(
-        f"{emqx_settings.API_URL}/clients/{device_id}/subscribe/bulk", json=[]
+    mock_emqx_api_client.post.assert_awaited_once_with(
+        f"/clients/{device_id}/subscribe/bulk", json=[]
     )
 
 
-@patch("app.module.emqx.service.emqx_event_service.AsyncClient")
 async def test_subscribe_device_topics_throws_exception_on_failure(
-    mock_async_client: AsyncMock,
+    emqx_event_service: EmqxEventService, mock_emqx_api_client: AsyncMock
 ) -> None:
     # given
-    emqx_event_service = EmqxEventService(connect_log_repository=AsyncMock())
     device_id = uuid4()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.post.return_value
-    mock_response.status_code = 500
+    mock_emqx_api_client.post.return_value.status_code = 500
 
     # when / then
     with pytest.raises(InternalServerException, match="Error while subscribing to topics"):
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
@@ -8,12 +8,19 @@ from app.module.emqx.dto.emqx_rule_dto import EmqxCreateRuleDto, EmqxUpdateRuleD
 from app.module.emqx.service.emqx_rule_service import EmqxRuleService
 
 
-@patch("app.module.emqx.service.emqx_rule_service.AsyncClient")
-async def test_create_rule(mock_async_client: AsyncMock) -> None:
+@pytest.fixture
+def mock_emqx_api_client() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def emqx_service(mock_emqx_api_client: AsyncMock) -> EmqxRuleService:
+    return EmqxRuleService(emqx_api_client=mock_emqx_api_client)
+
+
+async def test_create_rule(emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock) -> None:
     # given
-    emqx_service = EmqxRuleService()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.post.return_value
-    mock_response.status_code = 201
+    mock_emqx_api_client.post.return_value.status_code = 201
 
     rule_dto = EmqxCreateRuleDto(
         id="test_rule",
@@ -26,18 +33,17 @@ async def test_create_rule(mock_async_client: AsyncMock) -> None:
     await emqx_service.create_rule(dto=rule_dto)
 
     # then
-    mock_async_client.return_value.__aenter__.return_value.post.assert_called_once_with(
+    mock_emqx_api_client.post.assert_awaited_once_with(
         f"{emqx_service._url}",  # type: ignore
         json=rule_dto.model_dump(),
     )
 
 
-@patch("app.module.emqx.service.emqx_rule_service.AsyncClient")
-async def test_create_rule_throws_exception_on_failure(mock_async_client: AsyncMock) -> None:
+async def test_create_rule_throws_exception_on_failure(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
     # given
-    emqx_service = EmqxRuleService()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.post.return_value
-    mock_response.status_code = 500
+    mock_emqx_api_client.post.return_value.status_code = 500
 
     rule_dto = EmqxCreateRuleDto(
         id="test_rule",
@@ -50,12 +56,9 @@ async def test_create_rule_throws_exception_on_failure(mock_async_client: AsyncM
         await emqx_service.create_rule(dto=rule_dto)
 
 
-@patch("app.module.emqx.service.emqx_rule_service.AsyncClient")
-async def test_update_rule(mock_async_client: AsyncMock) -> None:
+async def test_update_rule(emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock) -> None:
     # given
-    emqx_service = EmqxRuleService()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.put.return_value
-    mock_response.status_code = 200
+    mock_emqx_api_client.put.return_value.status_code = 200
 
     rule_id = str(uuid4())
     rule_update_dto = EmqxUpdateRuleDto(sql="SELECT * FROM updated_test", actions=[], enable=True)
@@ -64,18 +67,17 @@ async def test_update_rule(mock_async_client: AsyncMock) -> None:
     await emqx_service.update_rule(rule_id=rule_id, dto=rule_update_dto)
 
     # then
-    mock_async_client.return_value.__aenter__.return_value.put.assert_called_once_with(
+    mock_emqx_api_client.put.assert_awaited_once_with(
         f"{emqx_service._url}/{rule_id}",  # type: ignore
         json=rule_update_dto.model_dump(),
     )
 
 
-@patch("app.module.emqx.service.emqx_rule_service.AsyncClient")
-async def test_update_rule_throws_exception_on_failure(mock_async_client: AsyncMock) -> None:
+async def test_update_rule_throws_exception_on_failure(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
     # given
-    emqx_service = EmqxRuleService()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.put.return_value
-    mock_response.status_code = 500
+    mock_emqx_api_client.put.return_value.status_code = 500
 
     rule_id = str(uuid4())
     rule_update_dto = EmqxUpdateRuleDto(sql="SELECT * FROM updated_test", actions=[], enable=True)
@@ -85,12 +87,9 @@ async def test_update_rule_throws_exception_on_failure(mock_async_client: AsyncM
         await emqx_service.update_rule(rule_id=rule_id, dto=rule_update_dto)
 
 
-@patch("app.module.emqx.service.emqx_rule_service.AsyncClient")
-async def test_delete_rule(mock_async_client: AsyncMock) -> None:
+async def test_delete_rule(emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock) -> None:
     # given
-    emqx_service = EmqxRuleService()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.delete.return_value
-    mock_response.status_code = 204
+    mock_emqx_api_client.delete.return_value.status_code = 204
 
     rule_id = str(uuid4())
 
@@ -98,20 +97,125 @@ async def test_delete_rule(mock_async_client: AsyncMock) -> None:
     await emqx_service.delete_rule(rule_id=rule_id)
 
     # then
-    mock_async_client.return_value.__aenter__.return_value.delete.assert_called_once_with(
+    mock_emqx_api_client.delete.assert_awaited_once_with(
         f"{emqx_service._url}/{rule_id}"  # type: ignore
     )
 
 
-@patch("app.module.emqx.service.emqx_rule_service.AsyncClient")
-async def test_delete_rule_throws_exception_on_failure(mock_async_client: AsyncMock) -> None:
+async def test_delete_rule_throws_exception_on_failure(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
     # given
-    emqx_service = EmqxRuleService()
-    mock_response = mock_async_client.return_value.__aenter__.return_value.delete.return_value
-    mock_response.status_code = 500
+    mock_emqx_api_client.delete.return_value.status_code = 500
 
     rule_id = str(uuid4())
 
     # when / then
     with pytest.raises(InternalServerException, match="Error while deleting rule"):
         await emqx_service.delete_rule(rule_id=rule_id)
+
+
+async def test_get_all_rules_follows_pages(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
+    # given
+    rule_ids = [str(uuid4()), str(uuid4())]
+    mock_emqx_api_client.get.side_effect = [
+        Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "data": [{"id": rule_ids[0], "sql": "SELECT 1", "description": "a"}],
+                    "meta": {"page": 1, "hasnext": True},
+                }
+            ),
+        ),
+        Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "data": [{"id": rule_ids[1], "enable": False}],
+                    "meta": {"page": 2, "hasnext": False},
+                }
+            ),
+        ),
+    ]
+
+    # when
+    rules = await emqx_service.get_all_rules()
+
+    # then
+    assert [rule.id for rule in rules] == rule_ids
+    assert rules[0].description == "a"
+    assert rules[1].enable is False
+    assert mock_emqx_api_client.get.await_count == 2
+    assert "page=2" in mock_emqx_api_client.get.await_args.args[0]
+
+
+async def test_get_all_rules_throws_exception_on_failure(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
+    # given
+    mock_emqx_api_client.get.return_value.status_code = 500
+
+    # when / then
+    with pytest.raises(InternalServerException, match="Error while listing rules"):
+        await emqx_service.get_all_rules()
+
+
+async def test_delete_rule_ignores_missing_rule(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
+    # given
+    mock_emqx_api_client.delete.return_value.status_code = 404
+
+    # when / then
+    await emqx_service.delete_rule(rule_id=str(uuid4()))
+
+
+async def test_upsert_rule_updates_existing_rule(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
+    # given
+    mock_emqx_api_client.put.return_value.status_code = 200
+    rule_dto = EmqxCreateRuleDto(id=str(uuid4()), enable=True, sql="SELECT 1", actions=[])
+
+    # when
+    await emqx_service.upsert_rule(dto=rule_dto)
+
+    # then
+    mock_emqx_api_client.put.assert_awaited_once_with(
+        f"{emqx_service._url}/{rule_dto.id}",  # type: ignore
+        json=rule_dto.model_dump(exclude={"id"}),
+    )
+    mock_emqx_api_client.post.assert_not_awaited()
+
+
+async def test_upsert_rule_creates_missing_rule(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
+    # given
+    mock_emqx_api_client.put.return_value.status_code = 404
+    mock_emqx_api_client.post.return_value.status_code = 201
+    rule_dto = EmqxCreateRuleDto(id=str(uuid4()), enable=True, sql="SELECT 1", actions=[])
+
+    # when
+    await emqx_service.upsert_rule(dto=rule_dto)
+
+    # then
+    mock_emqx_api_client.post.assert_awaited_once_with(
+        f"{emqx_service._url}",  # type: ignore
+        json=rule_dto.model_dump(),
+    )
+
+
+async def test_upsert_rule_throws_exception_on_failure(
+    emqx_service: EmqxRuleService, mock_emqx_api_client: AsyncMock
+) -> None:
+    # given
+    mock_emqx_api_client.put.return_value.status_code = 500
+    rule_dto = EmqxCreateRuleDto(id=str(uuid4()), enable=True, sql="SELECT 1", actions=[])
+
+    # when / then
+    with pytest.raises(InternalServerException, match="Error while upserting rule"):
+        await emqx_service.upsert_rule(dto=rule_dto)
@@ -0,0 +1,211 @@
+import asyncio
+from collections.abc import Callable
+
+import pytest
+from httpx import (
+    AsyncClient,
+    ConnectError,
+    DecodingError,
+    MockTransport,
+    ReadTimeout,
+    Request,
+    Response,
+)
+
+from app.module.emqx.client import CircuitBreaker, EmqxApiClient
+from app.module.emqx.exception.emqx_api_exception import EmqxUnavailableException
+
+
+def _emqx_api_client(handler: Callable[[Request], Response]) -> EmqxApiClient:
+    client = EmqxApiClient()
+    client._client = AsyncClient(base_url="http://emqx", transport=MockTransport(handler))  # type: ignore
+    client._retry_backoff = 0  # type: ignore
+    client._max_retries = 2  # type: ignore
+    client._circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)  # type: ignore
+    return client
+
+
+async def test_request_returns_response() -> None:
+    # given
+    client = _emqx_api_client(lambda request: Response(201, json={"path": request.url.path}))
+
+    # when
+    response = await client.post("/rules", json={"id": "rule"})
+
+    # then
+    assert response.status_code == 201
+    assert response.json() == {"path": "/rules"}
+
+
+async def test_request_retries_unavailable_response() -> None:
+    # given
+    responses = iter([Response(503), Response(200)])
+    client = _emqx_api_client(lambda _: next(responses))
+
+    # when
+    response = await client.get("/rules")
+
+    # then
+    assert response.status_code == 200
+
+
+async def test_request_does_not_retry_client_error() -> None:
+    # given
+    calls = 0
+
+    def handler(_: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        return Response(400)
+
+    client = _emqx_api_client(handler)
+
+    # when
+    response = await client.delete("/rules/rule")
+
+    # then
+    assert response.status_code == 400
+    assert calls == 1
+
+
+async def test_request_raises_after_transport_errors() -> None:
+    # given
+    def handler(request: Request) -> Response:
+        raise ConnectError("refused", request=request)
+
+    client = _emqx_api_client(handler)
+
+    # when / then
+    with pytest.raises(EmqxUnavailableException):
+        await client.get("/rules")
+
+
+async def test_request_retries_post_when_connection_is_refused() -> None:
+    # given
+    calls = 0
+
+    def handler(request: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectError("refused", request=request)
+        return Response(201)
+
+    client = _emqx_api_client(handler)
+
+    # when
+    response = await client.post("/rules", json={"id": "rule"})
+
+    # then
+    assert response.status_code == 201
+    assert calls == 2
+
+
+async def test_request_does_not_retry_post_on_read_timeout() -> None:
+    # given
+    calls = 0
+
+    def handler(request: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        raise ReadTimeout("timed out", request=request)
+
+    client = _emqx_api_client(handler)
+
+    # when
+    with pytest.raises(EmqxUnavailableException):
+        await client.post("/rules", json={"id": "rule"})
+
+    # then
+    assert calls == 1
+
+
+async def test_request_retries_get_on_read_timeout() -> None:
+    # given
+    calls = 0
+
+    def handler(request: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        raise ReadTimeout("timed out", request=request)
+
+    client = _emqx_api_client(handler)
+
+    # when
+    with pytest.raises(EmqxUnavailableException):
+        await client.get("/rules")
+
+    # then
+    assert calls == 3
+
+
+async def test_request_does_not_retry_delete_on_bad_gateway() -> None:
+    # given
+    calls = 0
+
+    def handler(_: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        return Response(502)
+
+    client = _emqx_api_client(handler)
+
+    # when
+    response = await client.delete("/rules/rule")
+
+    # then
+    assert response.status_code == 502
+    assert calls == 1
+
+
+async def test_open_circuit_fails_fast() -> None:
+    # given
+    calls = 0
+
+    def handler(request: Request) -> Response:
+        nonlocal calls
+        calls += 1
+        raise ConnectError("refused", request=request)
+
+    client = _emqx_api_client(handler)
+    with pytest.raises(EmqxUnavailableException):
+        await client.get("/rules")
+
+    # when
+    with pytest.raises(EmqxUnavailableException):
+        await client.get("/rules")
+
+    # then
+    assert calls == 3
+
+
+def test_circuit_breaker_lets_one_trial_call_through_after_reset_timeout() -> None:
+    # given
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    circuit_breaker.record_failure()
+
+    # when
+    first, second = circuit_breaker.allow(), circuit_breaker.allow()
+    circuit_breaker.record_success()
+
+    # then
+    assert (first, second) == (True, False)
+    assert not circuit_breaker.is_open
+
+
+@pytest.mark.parametrize("error", [DecodingError("bad body"), asyncio.CancelledError()])
+async def test_trial_call_ending_with_other_error_frees_the_circuit(error: BaseException) -> None:
+    # given
+    def handler(_: Request) -> Response:
+        raise error
+
+    client = _emqx_api_client(handler)
+    client._circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)  # type: ignore
+    client._circuit_breaker.record_failure()  # type: ignore
+
+    # when
+    with pytest.raises(type(error)):
+        await client.get("/rules")
+
+    # then
+    assert client._circuit_breaker.allow()  # type: ignore
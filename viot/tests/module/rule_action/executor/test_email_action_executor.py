@@ -0,0 +1,100 @@
+from datetime import UTC, datetime
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from app.module.rule_action.constants import ActionType
+from app.module.rule_action.executor.base import RuleTrigger
+from app.module.rule_action.executor.email_action_executor import EmailActionExecutor
+from app.module.rule_action.snapshot import ActionSnapshot, RuleSnapshot
+
+
+@pytest.fixture
+def mock_email_service() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def email_action_executor(mock_email_service: Mock) -> EmailActionExecutor:
+    return EmailActionExecutor(email_service=mock_email_service)
+
+
+def _rule_and_action(email_address: str) -> tuple[RuleSnapshot, ActionSnapshot]:
+    action = ActionSnapshot(
+        id=uuid4(),
+        name="Send Email",
+        action_type=ActionType.EMAIL,
+        config={"email_address": email_address},
+    )
+    rule = RuleSnapshot(
+        id=uuid4(),
+        name="Temperature Alert",
+        enable=True,
+        device_id=uuid4(),
+        team_id=uuid4(),
+        actions=(action,),
+    )
+    return rule, action
+
+
+def _trigger(rule: RuleSnapshot) -> RuleTrigger:
+    return RuleTrigger(
+        rule_id=rule.id,
+        device_id=rule.device_id,
+        action_ids=tuple(action.id for action in rule.actions),
+        ts=datetime(2024, 10, 25, 10, 0, 0, tzinfo=UTC),
+        payload={"temperature": 40},
+    )
+
+
+async def test_flush_sends_buffered_alerts_in_batches(
+    email_action_executor: EmailActionExecutor, mock_email_service: Mock
+) -> None:
+    # given
+    email_action_executor._batch_size = 2  # type: ignore
+    for i in range(3):
+        rule, action = _rule_and_action(f"user{i}@example.com")
+        await email_action_executor.execute(rule=rule, action=action, trigger=_trigger(rule))
+
+    # when
+    await email_action_executor.flush()
+
+    # then
+    assert [
+        len(call.kwargs["alerts"])
+        for call in mock_email_service.send_rule_alert_emails.call_args_list
+    ] == [2, 1]
+    alert = mock_email_service.send_rule_alert_emails.call_args_list[0].kwargs["alerts"][0]
+    assert alert["email"] == "user0@example.com"
+    assert alert["rule_name"] == "Temperature Alert"
+    assert alert["payload"] == '{"temperature":40}'
+
+
+async def test_execute_requests_flush_when_batch_is_full(
+    email_action_executor: EmailActionExecutor,
+) -> None:
+    # given
+    email_action_executor._batch_size = 1  # type: ignore
+    rule, action = _rule_and_action("user@example.com")
+
+    # when
+    await email_action_executor.execute(rule=rule, action=action, trigger=_trigger(rule))
+
+    # then
+    assert email_action_executor._flush_requested.is_set()  # type: ignore
+
+
+async def test_stop_flushes_remaining_alerts(
+    email_action_executor: EmailActionExecutor, mock_email_service: Mock
+) -> None:
+    # given
+    await email_action_executor.start()
+    rule, action = _rule_and_action("user@example.com")
+    await email_action_executor.execute(rule=rule, action=action, trigger=_trigger(rule))
+
+    # when
+    await email_action_executor.stop()
+
+    # then
+    mock_email_service.send_rule_alert_emails.assert_called_once()
@@ -0,0 +1,82 @@
+from collections.abc import AsyncGenerator
+from contextvars import ContextVar
+from uuid import uuid4
+
+import pytest_asyncio
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.module.rule_action.constants import EmqxRuleOperation
+from app.module.rule_action.model.emqx_rule_outbox import EmqxRuleOutbox
+from app.module.rule_action.repository.emqx_rule_outbox_repository import (
+    EmqxRuleOutboxRepository,
+)
+
+
+@pytest_asyncio.fixture(scope="function")  # type: ignore
+async def outbox_engine(async_engine: AsyncEngine) -> AsyncGenerator[AsyncEngine, None]:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(EmqxRuleOutbox.__table__.create, checkfirst=True)  # type: ignore
+    yield async_engine
+    async with async_engine.begin() as conn:
+        await conn.execute(delete(EmqxRuleOutbox))
+
+
+def _repository(session: AsyncSession) -> EmqxRuleOutboxRepository:
+    return EmqxRuleOutboxRepository(ContextVar("session", default=session))
+
+
+async def test_claim_due_claims_a_rule_in_a_single_transaction(
+    outbox_engine: AsyncEngine,
+) -> None:
+    # given
+    rule_id, other_rule_id = uuid4(), uuid4()
+    async with AsyncSession(outbox_engine, expire_on_commit=False) as session:
+        async with session.begin():
+            for entry_rule_id in (rule_id, other_rule_id):
+                await _repository(session).add(
+                    rule_id=entry_rule_id, version=1, operation=EmqxRuleOperation.UPSERT
+                )
+
+    # when
+    async with (
+        AsyncSession(outbox_engine, expire_on_commit=False) as first,
+        AsyncSession(outbox_engine, expire_on_commit=False) as second,
+        first.begin(),
+        second.begin(),
+    ):
+        first_entries = await _repository(first).claim_due(limit=1, ttl_sec=60)
+        second_entries = await _repository(second).claim_due(limit=10, ttl_sec=60)
+
+    # then
+    assert [entry.rule_id for entry in first_entries] == [rule_id]
+    assert [entry.rule_id for entry in second_entries] == [other_rule_id]
+
+
+async def test_claim_due_skips_rule_with_claimed_entries_until_they_are_settled(
+    outbox_engine: AsyncEngine,
+) -> None:
+    # given
+    rule_id = uuid4()
+    async with AsyncSession(outbox_engine, expire_on_commit=False) as session:
+        repository = _repository(session)
+        async with session.begin():
+            await repository.add(rule_id=rule_id, version=1, operation=EmqxRuleOperation.UPSERT)
+        async with session.begin():
+            claimed = await repository.claim_due(limit=10, ttl_sec=60)
+        async with session.begin():
+            await repository.add(rule_id=rule_id, version=2, operation=EmqxRuleOperation.UPSERT)
+
+        # when
+        async with session.begin():
+            while_claimed = await repository.claim_due(limit=10, ttl_sec=60)
+        async with session.begin():
+            await repository.reschedule_by_ids(
+                [entry.id for entry in claimed], backoff_sec=0, max_backoff_sec=0
+            )
+        async with session.begin():
+            once_settled = await repository.claim_due(limit=10, ttl_sec=60)
+
+    # then
+    assert while_claimed == []
+    assert sorted(entry.version for entry in once_settled) == [1, 2]
@@ -0,0 +1,79 @@
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import Mock
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.module.device.model.device import Device
+from app.module.rule_action.constants import EventType
+from app.module.rule_action.model.action import Action
+from app.module.rule_action.model.rule import Rule
+from app.module.rule_action.model.rule_action import RuleAction
+from app.module.rule_action.repository.rule_repository import RuleRepository
+from app.module.team.model.team import Team
+
+
+@pytest_asyncio.fixture(scope="function")  # type: ignore
+async def team(async_engine: AsyncEngine, async_session: AsyncSession) -> Team:
+    async with async_engine.begin() as conn:
+        for table in (
+            Team.__table__,
+            Device.__table__,
+            Action.__table__,
+            Rule.__table__,
+            RuleAction.__table__,
+        ):
+            await conn.run_sync(table.create, checkfirst=True)  # type: ignore
+    team = Team(
+        name="Rule Repository Team",
+        slug=f"team-{datetime.now(UTC).timestamp()}",
+        description=None,
+        default=False,
+    )
+    async_session.add(team)
+    await async_session.commit()
+    return team
+
+
+@pytest_asyncio.fixture(scope="function")  # type: ignore
+async def rule_repository(
+    async_session: AsyncSession,
+) -> AsyncGenerator[RuleRepository, None]:
+    yield RuleRepository(ContextVar("session", default=async_session), Mock())
+
+
+async def test_increment_version_returns_a_new_version_per_update(
+    team: Team,
+    device_factory: Callable[..., Coroutine[Any, Any, Device]],
+    rule_repository: RuleRepository,
+    async_session: AsyncSession,
+) -> None:
+    # given
+    device = await device_factory(team_id=team.id)
+    rule = Rule(
+        name="Rule",
+        description=None,
+        enable=True,
+        event_type=EventType.DATA_EVENT,
+        sql="SELECT * FROM test",
+        topic="test/topic",
+        condition={},
+        device_id=device.id,
+        team_id=team.id,
+        actions=[],
+    )
+    async_session.add(rule)
+    await async_session.commit()
+
+    # when
+    first = await rule_repository.increment_version(rule.id)
+    second = await rule_repository.increment_version(rule.id)
+    await async_session.commit()
+
+    # then
+    assert (first, second) == (2, 3)
+    await async_session.refresh(rule)
+    assert rule.version == 3
@@ -1,9 +1,11 @@
+import json
 from uuid import uuid4
 
 import pytest
 
 from app.module.rule_action.constants import (
     MQTT_DEVICE_DATA_TOPIC,
+    MQTT_PRIVATE_TRIGGER_TOPIC,
     MQTT_SUB_DEVICE_DATA_TOPIC,
     EventType,
     RuleLogic,
@@ -274,3 +276,53 @@ def test_get_mqtt_topic_with_sub_device(emqx_sql_builder_service: EmqxRuleBuilde
 
     # then
     assert topic == MQTT_SUB_DEVICE_DATA_TOPIC
+
+
+def test_build_rule(emqx_sql_builder_service: EmqxRuleBuilderService) -> None:
+    # given
+    rule_id, device_id = uuid4(), uuid4()
+    action_ids = [uuid4(), uuid4()]
+
+    # when
+    rule = emqx_sql_builder_service.build_rule(
+        rule_id=rule_id,
+        device_id=device_id,
+        sql="SELECT * FROM test",
+        enable=True,
+        action_ids=action_ids,
+    )
+
+    # then
+    assert rule.id == str(rule_id)
+    assert rule.sql == "SELECT * FROM test"
+    assert rule.enable is True
+    assert len(rule.actions) == 1
+    action = rule.actions[0]
+    assert action.function == "republish"
+    assert action.args.topic == MQTT_PRIVATE_TRIGGER_TOPIC
+    assert action.args.qos == 2
+    assert action.args.retain is True
+    assert action.args.direct_dispatch is True
+    payload = json.loads(action.args.payload)
+    assert payload["device_id"] == str(device_id)
+    assert payload["rule_id"] == str(rule_id)
+    assert payload["action_ids"] == sorted(str(action_id) for action_id in action_ids)
+    assert payload["payload"] == "${payload}"
+    assert payload["ts"] == "${ts}"
+
+
+def test_build_rule_fingerprint_changes_with_rule(
+    emqx_sql_builder_service: EmqxRuleBuilderService,
+) -> None:
+    # given
+    rule_id, device_id, action_id = uuid4(), uuid4(), uuid4()
+
+    def build(sql: str, enable: bool) -> str:
+        return emqx_sql_builder_service.build_rule(
+            rule_id=rule_id, device_id=device_id, sql=sql, enable=enable, action_ids=[action_id]
+        ).description
+
+    # when / then
+    assert build("SELECT 1", True) == build("SELECT 1", True)
+    assert build("SELECT 1", True) != build("SELECT 2", True)
+    assert build("SELECT 1", True) != build("SELECT 1", False)
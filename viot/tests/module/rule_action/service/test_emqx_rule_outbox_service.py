@@ -0,0 +1,185 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.module.rule_action.config import rule_action_settings
+from app.module.rule_action.constants import EmqxRuleOperation
+from app.module.rule_action.service.emqx_rule_builder_service import EmqxRuleBuilderService
+from app.module.rule_action.service.emqx_rule_outbox_service import EmqxRuleOutboxService
+
+
+@pytest.fixture
+def mock_emqx_rule_outbox_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_rule_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_emqx_rule_service() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def emqx_rule_outbox_service(
+    mock_emqx_rule_outbox_repository: AsyncMock,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> EmqxRuleOutboxService:
+    return EmqxRuleOutboxService(
+        emqx_rule_outbox_repository=mock_emqx_rule_outbox_repository,
+        rule_repository=mock_rule_repository,
+        emqx_rule_service=mock_emqx_rule_service,
+        emqx_rule_builder_service=EmqxRuleBuilderService(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_transactional_session():  # type: ignore
+    with patch(
+        "app.module.rule_action.service.emqx_rule_outbox_service.transactional_session",
+        MagicMock(),
+    ) as mock:
+        yield mock
+
+
+def _entry(rule_id=None, attempts=0):  # type: ignore
+    return Mock(id=id(object()), rule_id=rule_id or uuid4(), attempts=attempts)
+
+
+async def test_enqueue_adds_entry_and_wakes_dispatcher_after_commit(
+    emqx_rule_outbox_service: EmqxRuleOutboxService,
+    mock_emqx_rule_outbox_repository: AsyncMock,
+) -> None:
+    # given
+    rule_id = uuid4()
+
+    # when
+    with patch(
+        "app.module.rule_action.service.emqx_rule_outbox_service.after_commit", AsyncMock()
+    ) as mock_after_commit:
+        await emqx_rule_outbox_service.enqueue(
+            rule_id=rule_id, version=2, operation=EmqxRuleOperation.UPSERT
+        )
+
+    # then
+    mock_emqx_rule_outbox_repository.add.assert_awaited_once_with(
+        rule_id=rule_id, version=2, operation=EmqxRuleOperation.UPSERT
+    )
+    mock_after_commit.assert_awaited_once()
+
+
+async def test_dispatch_syncs_each_rule_once_with_its_current_state(
+    emqx_rule_outbox_service: EmqxRuleOutboxService,
+    mock_emqx_rule_outbox_repository: AsyncMock,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> None:
+    # given
+    rule_id, deleted_rule_id = uuid4(), uuid4()
+    entries = [_entry(rule_id), _entry(rule_id), _entry(deleted_rule_id)]
+    mock_emqx_rule_outbox_repository.claim_due.return_value = entries
+    mock_rule_repository.find_all_emqx_rules.return_value = [
+        (rule_id, uuid4(), "SELECT 1", True, None, 1)
+    ]
+
+    # when
+    claimed = await emqx_rule_outbox_service.dispatch()
+
+    # then
+    assert claimed == 3
+    mock_emqx_rule_service.upsert_rule.assert_awaited_once()
+    assert mock_emqx_rule_service.upsert_rule.await_args.kwargs["dto"].id == str(rule_id)
+    mock_emqx_rule_service.delete_rule.assert_awaited_once_with(rule_id=str(deleted_rule_id))
+    mock_emqx_rule_outbox_repository.delete_by_ids.assert_awaited_once_with(
+        [entry.id for entry in entries]
+    )
+    mock_emqx_rule_outbox_repository.reschedule_by_ids.assert_not_awaited()
+
+
+async def test_dispatch_reschedules_failed_entries_and_drops_exhausted_ones(
+    emqx_rule_outbox_service: EmqxRuleOutboxService,
+    mock_emqx_rule_outbox_repository: AsyncMock,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> None:
+    # given
+    retried = _entry()
+    exhausted = _entry(attempts=rule_action_settings.OUTBOX_MAX_ATTEMPTS - 1)
+    mock_emqx_rule_outbox_repository.claim_due.return_value = [retried, exhausted]
+    mock_rule_repository.find_all_emqx_rules.return_value = []
+    mock_emqx_rule_service.delete_rule.side_effect = Exception("EMQX error")
+
+    # when
+    await emqx_rule_outbox_service.dispatch()
+
+    # then
+    mock_emqx_rule_outbox_repository.delete_by_ids.assert_awaited_once_with([exhausted.id])
+    mock_emqx_rule_outbox_repository.reschedule_by_ids.assert_awaited_once()
+    assert mock_emqx_rule_outbox_repository.reschedule_by_ids.await_args.args[0] == [retried.id]
+
+
+async def test_dispatch_calls_emqx_outside_of_transactions(
+    emqx_rule_outbox_service: EmqxRuleOutboxService,
+    mock_emqx_rule_outbox_repository: AsyncMock,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> None:
+    # given
+    rule_id = uuid4()
+    mock_emqx_rule_outbox_repository.claim_due.return_value = [_entry(rule_id)]
+    mock_rule_repository.find_all_emqx_rules.return_value = [
+        (rule_id, uuid4(), "SELECT 1", True, None, 1)
+    ]
+    in_transaction = False
+    transactions = 0
+
+    @asynccontextmanager
+    async def transactional_session() -> AsyncGenerator[None, None]:
+        nonlocal in_transaction, transactions
+        in_transaction = True
+        transactions += 1
+        try:
+            yield
+        finally:
+            in_transaction = False
+
+    async def upsert_rule(**_: object) -> None:
+        assert not in_transaction
+
+    mock_emqx_rule_service.upsert_rule.side_effect = upsert_rule
+
+    # when
+    with patch(
+        "app.module.rule_action.service.emqx_rule_outbox_service.transactional_session",
+        transactional_session,
+    ):
+        await emqx_rule_outbox_service.dispatch()
+
+    # then
+    mock_emqx_rule_service.upsert_rule.assert_awaited_once()
+    assert transactions == 3
+    mock_emqx_rule_outbox_repository.delete_by_ids.assert_awaited_once()
+
+
+async def test_dispatch_returns_zero_when_outbox_is_empty(
+    emqx_rule_outbox_service: EmqxRuleOutboxService,
+    mock_emqx_rule_outbox_repository: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> None:
+    # given
+    mock_emqx_rule_outbox_repository.claim_due.return_value = []
+
+    # when
+    claimed = await emqx_rule_outbox_service.dispatch()
+
+    # then
+    assert claimed == 0
+    mock_emqx_rule_service.upsert_rule.assert_not_awaited()
+    mock_emqx_rule_service.delete_rule.assert_not_awaited()
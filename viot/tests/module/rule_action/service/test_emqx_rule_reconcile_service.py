@@ -0,0 +1,148 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
+from uuid import uuid4
+
+import pytest
+
+from app.module.emqx.dto.emqx_rule_dto import EmqxRuleDto
+from app.module.rule_action.constants import EmqxRuleOperation
+from app.module.rule_action.service.emqx_rule_builder_service import EmqxRuleBuilderService
+from app.module.rule_action.service.emqx_rule_reconcile_service import (
+    EmqxRuleReconcileService,
+    ReconcileSummary,
+)
+
+
+@pytest.fixture
+def mock_rule_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_emqx_rule_outbox_service() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_emqx_rule_service() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_lock() -> AsyncMock:
+    mock = AsyncMock()
+    mock.acquire.return_value = True
+    return mock
+
+
+@pytest.fixture
+def mock_redis_client(mock_lock: AsyncMock) -> Mock:
+    return Mock(lock=Mock(return_value=mock_lock))
+
+
+@pytest.fixture
+def emqx_rule_builder_service() -> EmqxRuleBuilderService:
+    return EmqxRuleBuilderService()
+
+
+@pytest.fixture
+def emqx_rule_reconcile_service(
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+    emqx_rule_builder_service: EmqxRuleBuilderService,
+    mock_redis_client: Mock,
+) -> EmqxRuleReconcileService:
+    return EmqxRuleReconcileService(
+        rule_repository=mock_rule_repository,
+        emqx_rule_outbox_service=mock_emqx_rule_outbox_service,
+        emqx_rule_service=mock_emqx_rule_service,
+        emqx_rule_builder_service=emqx_rule_builder_service,
+        redis_client=mock_redis_client,
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_transactional_session():  # type: ignore
+    with patch(
+        "app.module.rule_action.service.emqx_rule_reconcile_service.transactional_session",
+        MagicMock(),
+    ) as mock:
+        yield mock
+
+
+async def test_reconcile_enqueues_the_diff(
+    emqx_rule_reconcile_service: EmqxRuleReconcileService,
+    emqx_rule_builder_service: EmqxRuleBuilderService,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> None:
+    # given
+    in_sync, drifted, missing = ((uuid4(), uuid4(), "SELECT 1", True, None, 3) for _ in range(3))
+    old = datetime.now(UTC) - timedelta(hours=1)
+    orphan, fresh_orphan = uuid4(), uuid4()
+    mock_rule_repository.find_all_emqx_rules.return_value = [in_sync, drifted, missing]
+    mock_emqx_rule_service.get_all_rules.return_value = [
+        EmqxRuleDto(
+            id=str(in_sync[0]),
+            description=emqx_rule_builder_service.build_rule(
+                rule_id=in_sync[0], device_id=in_sync[1], sql="SELECT 1", enable=True, action_ids=()
+            ).description,
+        ),
+        EmqxRuleDto(id=str(drifted[0]), description="outdated"),
+        EmqxRuleDto(id=str(orphan), created_at=old),
+        EmqxRuleDto(id=str(fresh_orphan), created_at=datetime.now(UTC)),
+        EmqxRuleDto(id="device_connected", created_at=old),
+    ]
+
+    # when
+    summary = await emqx_rule_reconcile_service.reconcile()
+
+    # then
+    assert summary == ReconcileSummary(created=1, updated=1, deleted=1)
+    assert mock_emqx_rule_outbox_service.enqueue.await_args_list == [
+        call(rule_id=drifted[0], version=3, operation=EmqxRuleOperation.UPSERT),
+        call(rule_id=missing[0], version=3, operation=EmqxRuleOperation.UPSERT),
+        call(rule_id=orphan, version=0, operation=EmqxRuleOperation.DELETE),
+    ]
+
+
+async def test_reconcile_leaves_emqx_writes_to_the_outbox(
+    emqx_rule_reconcile_service: EmqxRuleReconcileService,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_service: AsyncMock,
+) -> None:
+    # given
+    mock_rule_repository.find_all_emqx_rules.return_value = [
+        (uuid4(), uuid4(), "SELECT 1", True, [uuid4()], 1),
+    ]
+    mock_emqx_rule_service.get_all_rules.return_value = [
+        EmqxRuleDto(id=str(uuid4()), created_at=datetime.now(UTC) - timedelta(hours=1))
+    ]
+
+    # when
+    await emqx_rule_reconcile_service.reconcile()
+
+    # then
+    mock_emqx_rule_service.create_rule.assert_not_awaited()
+    mock_emqx_rule_service.update_rule.assert_not_awaited()
+    mock_emqx_rule_service.upsert_rule.assert_not_awaited()
+    mock_emqx_rule_service.delete_rule.assert_not_awaited()
+
+
+async def test_reconcile_skips_when_locked(
+    emqx_rule_reconcile_service: EmqxRuleReconcileService,
+    mock_emqx_rule_service: AsyncMock,
+    mock_lock: AsyncMock,
+) -> None:
+    # given
+    mock_lock.acquire.return_value = False
+
+    # when
+    summary = await emqx_rule_reconcile_service.reconcile()
+
+    # then
+    assert summary is None
+    mock_emqx_rule_service.get_all_rules.assert_not_awaited()
+    mock_lock.release.assert_not_awaited()
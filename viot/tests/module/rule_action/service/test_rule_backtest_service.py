@@ -0,0 +1,155 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+
+from app.module.rule_action.exception.rule_exception import RuleNotFoundException
+from app.module.rule_action.service.rule_backtest_service import RuleBacktestService
+from app.module.rule_action.service.rule_evaluator_service import RuleEvaluatorService
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 2, 1)
+T0 = 1_704_067_200_000_000  # 2024-01-01 in microseconds since the epoch
+
+
+@pytest.fixture
+def mock_rule_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_repository() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def rule_backtest_service(
+    mock_rule_repository: AsyncMock, mock_device_data_repository: Mock
+) -> RuleBacktestService:
+    return RuleBacktestService(
+        rule_repository=mock_rule_repository,
+        device_data_repository=mock_device_data_repository,
+        rule_evaluator_service=RuleEvaluatorService(),
+    )
+
+
+def _rule(condition: dict[str, Any]) -> Mock:
+    return Mock(id=uuid4(), device_id=uuid4(), condition=condition, version=1)
+
+
+def _stream(*chunks: Sequence[tuple[int, str, float | None, str | None]]) -> Mock:
+    async def stream(**kwargs: Any) -> AsyncIterator[Sequence[Any]]:
+        for chunk in chunks:
+            yield chunk
+
+    return Mock(side_effect=stream)
+
+
+async def test_backtest_rule_should_count_fires_per_timestamp(
+    rule_backtest_service: RuleBacktestService,
+    mock_rule_repository: AsyncMock,
+    mock_device_data_repository: Mock,
+) -> None:
+    # given
+    rule = _rule(
+        {
+            "logic": "AND",
+            "conditions": [
+                {"field": "temperature", "operator": ">", "value": 30},
+                {"field": "status", "operator": "=", "value": "on"},
+            ],
+        }
+    )
+    mock_rule_repository.find_by_team_id_and_rule_id.return_value = rule
+    # The points of T0 + 2 are split across two chunks
+    mock_device_data_repository.stream_points_by_device_id_and_keys = _stream(
+        [
+            (T0, "temperature", 31.0, None),
+            (T0, "status", None, "on"),
+            (T0 + 1, "temperature", 35.0, None),
+            (T0 + 2, "temperature", 40.0, None),
+        ],
+        [
+            (T0 + 2, "status", None, "on"),
+            (T0 + 3, "temperature", 20.0, None),
+            (T0 + 3, "status", None, "on"),
+        ],
+    )
+
+    # when
+    result = await rule_backtest_service.backtest_rule(
+        team_id=uuid4(), rule_id=rule.id, start_date=START, end_date=END
+    )
+
+    # then
+    assert result.evaluated_points == 4
+    assert result.fire_count == 2
+    assert result.first_fired_at == datetime(2024, 1, 1)
+    assert result.last_fired_at == datetime(2024, 1, 1, 0, 0, 0, 2)
+    stream_kwargs = mock_device_data_repository.stream_points_by_device_id_and_keys.call_args
+    assert stream_kwargs.kwargs["device_id"] == rule.device_id
+    assert stream_kwargs.kwargs["keys"] == {"temperature", "status"}
+
+
+async def test_backtest_rule_should_return_no_fires_when_no_data(
+    rule_backtest_service: RuleBacktestService,
+    mock_rule_repository: AsyncMock,
+    mock_device_data_repository: Mock,
+) -> None:
+    # given
+    rule = _rule({"field": "temperature", "operator": ">", "value": 30})
+    mock_rule_repository.find_by_team_id_and_rule_id.return_value = rule
+    mock_device_data_repository.stream_points_by_device_id_and_keys = _stream()
+
+    # when
+    result = await rule_backtest_service.backtest_rule(
+        team_id=uuid4(), rule_id=rule.id, start_date=START, end_date=END
+    )
+
+    # then
+    assert result.evaluated_points == 0
+    assert result.fire_count == 0
+    assert result.first_fired_at is None
+    assert result.last_fired_at is None
+
+
+async def test_backtest_rule_should_match_mixed_values_of_a_field(
+    rule_backtest_service: RuleBacktestService,
+    mock_rule_repository: AsyncMock,
+    mock_device_data_repository: Mock,
+) -> None:
+    # given
+    rule = _rule({"field": "level", "operator": "!=", "value": "low"})
+    mock_rule_repository.find_by_team_id_and_rule_id.return_value = rule
+    mock_device_data_repository.stream_points_by_device_id_and_keys = _stream(
+        [
+            (T0, "level", None, "low"),
+            (T0 + 1, "level", 3.0, None),
+            (T0 + 2, "level", None, "high"),
+        ],
+    )
+
+    # when
+    result = await rule_backtest_service.backtest_rule(
+        team_id=uuid4(), rule_id=rule.id, start_date=START, end_date=END
+    )
+
+    # then
+    assert result.evaluated_points == 3
+    assert result.fire_count == 2
+
+
+async def test_backtest_rule_should_raise_when_rule_not_found(
+    rule_backtest_service: RuleBacktestService, mock_rule_repository: AsyncMock
+) -> None:
+    # given
+    mock_rule_repository.find_by_team_id_and_rule_id.return_value = None
+
+    # when / then
+    with pytest.raises(RuleNotFoundException):
+        await rule_backtest_service.backtest_rule(
+            team_id=uuid4(), rule_id=uuid4(), start_date=START, end_date=END
+        )
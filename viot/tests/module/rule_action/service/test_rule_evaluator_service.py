@@ -0,0 +1,147 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.module.rule_action.constants import RuleLogic, RuleOperator
+from app.module.rule_action.dto.rule_dto import Condition, ConditionLogic
+from app.module.rule_action.service.rule_evaluator_service import RuleEvaluatorService
+
+
+@pytest.fixture
+def rule_evaluator_service() -> RuleEvaluatorService:
+    return RuleEvaluatorService()
+
+
+@pytest.fixture
+def condition() -> ConditionLogic:
+    return ConditionLogic(
+        logic=RuleLogic.OR,
+        conditions=[
+            ConditionLogic(
+                logic=RuleLogic.AND,
+                conditions=[
+                    Condition(field="temperature", operator=RuleOperator.gt, value=25),
+                    Condition(field="humidity", operator=RuleOperator.lt, value=60),
+                ],
+            ),
+            Condition(field="status", operator=RuleOperator.eq, value="alarm"),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ({"temperature": 30, "humidity": 50}, True),
+        ({"temperature": 30, "humidity": 70}, False),
+        ({"temperature": 20, "humidity": 50, "status": "alarm"}, True),
+        ({"humidity": 50}, False),
+        ({"temperature": None, "humidity": 50}, False),
+        ({"temperature": "hot", "humidity": 50}, False),
+    ],
+)
+def test_compiled_condition_evaluates_payload(
+    rule_evaluator_service: RuleEvaluatorService,
+    condition: ConditionLogic,
+    payload: dict[str, object],
+    expected: bool,
+) -> None:
+    # given
+    compiled = rule_evaluator_service.compile(condition)
+
+    # when
+    result = compiled(payload)
+
+    # then
+    assert result is expected
+    assert compiled.fields == {"temperature", "humidity", "status"}
+
+
+def test_compile_raises_for_string_value_with_ordering_operator(
+    rule_evaluator_service: RuleEvaluatorService,
+) -> None:
+    # given
+    condition = Condition(field="status", operator=RuleOperator.gt, value="alarm")
+
+    # when / then
+    with pytest.raises(ValueError, match="not allowed for string values"):
+        rule_evaluator_service.compile(condition)
+
+
+def test_get_compiled_rejects_empty_condition_logic(
+    rule_evaluator_service: RuleEvaluatorService,
+) -> None:
+    # given
+    stored = {"logic": RuleLogic.AND, "conditions": []}
+
+    # when / then
+    with pytest.raises(ValidationError, match="at least 1 item"):
+        rule_evaluator_service.get_compiled(rule_id=uuid4(), version=1, condition=stored)
+
+
+def test_evaluate_batch_matches_scalar_evaluation(
+    rule_evaluator_service: RuleEvaluatorService, condition: ConditionLogic
+) -> None:
+    # given
+    compiled = rule_evaluator_service.compile(condition)
+    columns = {
+        "temperature": np.array([30.0, 30.0, 20.0, np.nan]),
+        "humidity": np.array([50.0, 70.0, 50.0, 50.0]),
+        "status": np.array([None, None, "alarm", "ok"], dtype=object),
+    }
+
+    # when
+    matched = compiled.evaluate_batch(columns, 4)
+
+    # then
+    assert matched.tolist() == [True, False, True, False]
+
+
+def test_evaluate_batch_treats_missing_column_as_no_match(
+    rule_evaluator_service: RuleEvaluatorService,
+) -> None:
+    # given
+    compiled = rule_evaluator_service.compile(
+        Condition(field="temperature", operator=RuleOperator.neq, value=25)
+    )
+
+    # when
+    matched = compiled.evaluate_batch({}, 3)
+
+    # then
+    assert matched.tolist() == [False, False, False]
+
+
+def test_evaluate_batch_ignores_nan_with_not_equal(
+    rule_evaluator_service: RuleEvaluatorService,
+) -> None:
+    # given
+    compiled = rule_evaluator_service.compile(
+        Condition(field="temperature", operator=RuleOperator.neq, value=25)
+    )
+
+    # when
+    matched = compiled.evaluate_batch({"temperature": np.array([25.0, 26.0, np.nan])}, 3)
+
+    # then
+    assert matched.tolist() == [False, True, False]
+
+
+def test_get_compiled_reuses_compiled_condition_per_version(
+    rule_evaluator_service: RuleEvaluatorService, condition: ConditionLogic
+) -> None:
+    # given
+    rule_id = uuid4()
+    stored = condition.model_dump()
+
+    # when
+    first = rule_evaluator_service.get_compiled(rule_id=rule_id, version=1, condition=stored)
+    second = rule_evaluator_service.get_compiled(rule_id=rule_id, version=1, condition=stored)
+    third = rule_evaluator_service.get_compiled(rule_id=rule_id, version=2, condition=stored)
+
+    # then
+    assert first is second
+    assert third is not first
+    assert third({"status": "alarm"}) is True
@@ -1,14 +1,13 @@
-import json
 from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
 
-from app.database.repository import Page
+from app.database.repository import CursorPage
 from app.module.device.constants import DeviceType
 from app.module.rule_action.constants import (
-    MQTT_PRIVATE_TRIGGER_TOPIC,
     ActionType,
+    EmqxRuleOperation,
     EventType,
     RuleOperator,
 )
@@ -28,7 +27,7 @@ def mock_rule_repository() -> AsyncMock:
 
 
 @pytest.fixture
-def mock_emqx_rule_service() -> AsyncMock:
+def mock_emqx_rule_outbox_service() -> AsyncMock:
     return AsyncMock()
 
 
@@ -47,20 +46,27 @@ def mock_team_service() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_rule_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def rule_service(
     mock_rule_repository: AsyncMock,
-    mock_emqx_rule_service: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
     mock_emqx_rule_builder_service: Mock,
     mock_device_service: AsyncMock,
     mock_team_service: AsyncMock,
+    mock_rule_cache_repository: AsyncMock,
 ) -> RuleService:
     return RuleService(
         rule_repository=mock_rule_repository,
-        emqx_rule_service=mock_emqx_rule_service,
+        emqx_rule_outbox_service=mock_emqx_rule_outbox_service,
         emqx_rule_builder_service=mock_emqx_rule_builder_service,
         device_service=mock_device_service,
         team_service=mock_team_service,
+        rule_cache_repository=mock_rule_cache_repository,
     )
 
 
@@ -102,24 +108,25 @@ async def test_get_paging_rules(
 ) -> None:
     # given
     team_id = uuid4()
-    mock_page = Page(
+    mock_page = CursorPage(
         items=[mock_rule, mock_rule],
-        page=1,
         page_size=10,
+        next_cursor="cursor",
         total_items=2,
     )
-    mock_rule_repository.find_all_with_paging.return_value = mock_page
+    mock_rule_repository.find_all_with_cursor.return_value = mock_page
 
     # Act
     result = await rule_service.get_paging_rules(
         team_id=team_id,
         device_id=None,
-        page=1,
         page_size=10,
+        after=None,
+        with_total=True,
     )
 
     # Assert
-    assert result.page == 1
+    assert result.next_cursor == "cursor"
     assert result.page_size == 10
     assert result.total_items == 2
     assert len(result.items) == 2
@@ -130,12 +137,13 @@ async def test_get_paging_rules(
     result = await rule_service.get_paging_rules(
         team_id=team_id,
         device_id=uuid4(),
-        page=1,
         page_size=10,
+        after=None,
+        with_total=True,
     )
 
     # Assert
-    assert result.page == 1
+    assert result.next_cursor == "cursor"
     assert result.page_size == 10
     assert result.total_items == 2
     assert len(result.items) == 2
@@ -146,7 +154,7 @@ async def test_get_paging_rules(
 async def test_create_rule(
     rule_service: RuleService,
     mock_rule_repository: AsyncMock,
-    mock_emqx_rule_service: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
     mock_emqx_rule_builder_service: Mock,
     mock_device_service: AsyncMock,
     mock_rule: Mock,
@@ -179,13 +187,15 @@ async def test_create_rule(
     # then
     assert result.id == mock_rule.id
     mock_rule_repository.save.assert_called_once()
-    mock_emqx_rule_service.create_rule.assert_called_once()
+    mock_emqx_rule_outbox_service.enqueue.assert_awaited_once_with(
+        rule_id=mock_rule.id, version=mock_rule.version, operation=EmqxRuleOperation.UPSERT
+    )
 
 
 async def test_update_rule(
     rule_service: RuleService,
     mock_rule_repository: AsyncMock,
-    mock_emqx_rule_service: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
     mock_emqx_rule_builder_service: Mock,
     mock_rule: Mock,
 ) -> None:
@@ -220,13 +230,13 @@ async def test_update_rule(
     # then
     assert result is not None
     mock_rule_repository.save.assert_called_once()
-    mock_emqx_rule_service.update_rule.assert_called_once()
+    mock_emqx_rule_outbox_service.enqueue.assert_awaited_once()
 
 
 async def test_update_rule_existing_action(
     rule_service: RuleService,
     mock_rule_repository: AsyncMock,
-    mock_emqx_rule_service: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
     mock_emqx_rule_builder_service: Mock,
     mock_rule: Mock,
     mock_action: Mock,
@@ -253,6 +263,7 @@ async def test_update_rule_existing_action(
 
     mock_rule_repository.find_by_team_id_and_rule_id.return_value = mock_rule
     mock_rule_repository.save.return_value = mock_rule
+    mock_rule_repository.increment_version.return_value = 2
     mock_emqx_rule_builder_service.build_sql.return_value = "SELECT * FROM updated_test"
     mock_emqx_rule_builder_service.get_mqtt_topic.return_value = "test/topic"
 
@@ -264,7 +275,10 @@ async def test_update_rule_existing_action(
     # Then
     assert result is not None
     mock_rule_repository.save.assert_called_once()
-    mock_emqx_rule_service.update_rule.assert_called_once()
+    mock_rule_repository.increment_version.assert_awaited_once_with(mock_rule.id)
+    mock_emqx_rule_outbox_service.enqueue.assert_awaited_once_with(
+        rule_id=mock_rule.id, version=2, operation=EmqxRuleOperation.UPSERT
+    )
 
     assert mock_action.name == "Updated Action"
     assert mock_action.config == ActionEmailConfigDto(email_address="new@example.com").model_dump()
@@ -303,53 +317,39 @@ async def test_update_rule_raise_rule_not_found(
         )
 
 
-def test__create_emqx_action_dto(rule_service: RuleService, mock_rule: Mock) -> None:
-    # Given
-    mock_rule.device_id = 1
-    mock_rule.id = 123
-    mock_rule.actions = [Mock(id=10), Mock(id=20)]  # Mock action objects with ids
-
-    # When
-    result = rule_service._create_emqx_action_dto(mock_rule)  # type: ignore
-
-    # Then
-    assert result is not None
-    assert result.function == "republish"
-
-    args = result.args
-    assert args.topic == MQTT_PRIVATE_TRIGGER_TOPIC
-    assert args.qos == 2
-    assert args.retain is True
-    assert args.direct_dispatch is True
-
-    # Check payload
-    payload_json = args.payload
-    assert payload_json is not None
-
-    # Parse the payload JSON to dictionary for further validation
-    payload_dict = json.loads(payload_json)
-
-    assert payload_dict["device_id"] == str(mock_rule.device_id)
-    assert payload_dict["rule_id"] == str(mock_rule.id)
-    assert payload_dict["action_ids"] == [str(action.id) for action in mock_rule.actions]
-    assert payload_dict["payload"] == "${payload}"
-    assert payload_dict["ts"] == "${ts}"
-
-
 async def test_delete_rule(
     rule_service: RuleService,
     mock_rule_repository: AsyncMock,
-    mock_emqx_rule_service: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
+    mock_rule_cache_repository: AsyncMock,
     mock_rule: Mock,
 ) -> None:
     # given
     team_id = uuid4()
     rule_id = uuid4()
-    mock_rule_repository.delete_by_team_id_and_rule_id.return_value = None
+    mock_rule_repository.delete_by_team_id_and_rule_id.return_value = 3
 
     # when
     await rule_service.delete_rule(team_id=team_id, rule_id=rule_id)
 
     # then
     mock_rule_repository.delete_by_team_id_and_rule_id.assert_called_once()
-    mock_emqx_rule_service.delete_rule.assert_called_once()
+    mock_rule_cache_repository.evict.assert_awaited_once_with(rule_id)
+    mock_emqx_rule_outbox_service.enqueue.assert_awaited_once_with(
+        rule_id=rule_id, version=4, operation=EmqxRuleOperation.DELETE
+    )
+
+
+async def test_delete_rule_not_found(
+    rule_service: RuleService,
+    mock_rule_repository: AsyncMock,
+    mock_emqx_rule_outbox_service: AsyncMock,
+) -> None:
+    # given
+    mock_rule_repository.delete_by_team_id_and_rule_id.return_value = None
+
+    # when
+    await rule_service.delete_rule(team_id=uuid4(), rule_id=uuid4())
+
+    # then
+    mock_emqx_rule_outbox_service.enqueue.assert_not_awaited()
@@ -0,0 +1,269 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.module.rule_action.constants import ActionType
+from app.module.rule_action.executor.base import RuleTrigger
+from app.module.rule_action.service.rule_trigger_service import RuleTriggerService
+from app.module.rule_action.snapshot import ActionSnapshot, RuleSnapshot
+
+
+@pytest.fixture
+def mock_rule_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_rule_cache_repository() -> AsyncMock:
+    mock = AsyncMock()
+    mock.find = Mock(return_value=None)
+    mock.save = Mock()
+    return mock
+
+
+@pytest.fixture
+def mock_email_action_executor() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_redis_client() -> AsyncMock:
+    mock = AsyncMock()
+    mock.set.return_value = True
+    return mock
+
+
+@pytest.fixture
+def rule_trigger_service(
+    mock_rule_repository: AsyncMock,
+    mock_rule_cache_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+    mock_redis_client: AsyncMock,
+) -> RuleTriggerService:
+    return RuleTriggerService(
+        rule_repository=mock_rule_repository,
+        rule_cache_repository=mock_rule_cache_repository,
+        email_action_executor=mock_email_action_executor,
+        redis_client=mock_redis_client,
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_transactional_session():  # type: ignore
+    with patch(
+        "app.module.rule_action.service.rule_trigger_service.transactional_session",
+        MagicMock(),
+    ) as mock:
+        yield mock
+
+
+def _rule(*, team_id: UUID | None = None, enable: bool = True) -> RuleSnapshot:
+    return RuleSnapshot(
+        id=uuid4(),
+        name="Temperature Alert",
+        enable=enable,
+        device_id=uuid4(),
+        team_id=team_id or uuid4(),
+        actions=(
+            ActionSnapshot(
+                id=uuid4(),
+                name="Send Email",
+                action_type=ActionType.EMAIL,
+                config={"email_address": "user@example.com"},
+            ),
+        ),
+    )
+
+
+def _trigger(rule: RuleSnapshot) -> RuleTrigger:
+    return RuleTrigger(
+        rule_id=rule.id,
+        device_id=rule.device_id,
+        action_ids=tuple(action.id for action in rule.actions),
+        ts=datetime.now(UTC),
+        payload={"temperature": 40},
+    )
+
+
+async def _drain(rule_trigger_service: RuleTriggerService) -> None:
+    await rule_trigger_service.start()
+    while rule_trigger_service._queue.qsize():  # type: ignore
+        await asyncio.sleep(0)
+    await rule_trigger_service.stop()
+
+
+async def test_trigger_executes_actions_of_cached_rule(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_rule_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+) -> None:
+    # given
+    rule = _rule()
+    mock_rule_cache_repository.find.return_value = rule
+    trigger = _trigger(rule)
+
+    # when
+    rule_trigger_service.submit(trigger)
+    await _drain(rule_trigger_service)
+
+    # then
+    mock_rule_repository.find.assert_not_awaited()
+    mock_email_action_executor.execute.assert_awaited_once_with(
+        rule=rule, action=rule.actions[0], trigger=trigger
+    )
+
+
+async def test_trigger_loads_and_caches_rule_on_miss(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_rule_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+) -> None:
+    # given
+    rule = _rule()
+    action = Mock(id=rule.actions[0].id, action_type=ActionType.EMAIL, config={})
+    action.name = rule.actions[0].name
+    model = Mock(
+        id=rule.id, enable=True, device_id=rule.device_id, team_id=rule.team_id, actions=[action]
+    )
+    model.name = rule.name
+    mock_rule_repository.find.return_value = model
+
+    # when
+    rule_trigger_service.submit(_trigger(rule))
+    await _drain(rule_trigger_service)
+
+    # then
+    mock_rule_cache_repository.save.assert_called_once()
+    mock_email_action_executor.execute.assert_awaited_once()
+
+
+async def test_trigger_skips_disabled_rule(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+) -> None:
+    # given
+    rule = _rule(enable=False)
+    mock_rule_cache_repository.find.return_value = rule
+
+    # when
+    rule_trigger_service.submit(_trigger(rule))
+    await _drain(rule_trigger_service)
+
+    # then
+    mock_email_action_executor.execute.assert_not_awaited()
+
+
+async def test_rule_fires_once_per_cooldown(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+) -> None:
+    # given
+    rule = _rule()
+    mock_rule_cache_repository.find.return_value = rule
+
+    # when
+    for _ in range(3):
+        rule_trigger_service.submit(_trigger(rule))
+    await _drain(rule_trigger_service)
+
+    # then
+    mock_email_action_executor.execute.assert_awaited_once()
+
+
+async def test_rule_cooling_down_in_another_worker_does_not_fire(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    rule = _rule()
+    mock_rule_cache_repository.find.return_value = rule
+    mock_redis_client.set.return_value = None
+
+    # when
+    rule_trigger_service.submit(_trigger(rule))
+    await _drain(rule_trigger_service)
+
+    # then
+    mock_redis_client.set.assert_awaited_once_with(
+        f"rule_cooldown:{rule.id}",
+        1,
+        nx=True,
+        px=rule_trigger_service._cooldown_ms,  # type: ignore
+    )
+    mock_email_action_executor.execute.assert_not_awaited()
+
+
+async def test_rule_fires_when_cooldown_cannot_be_shared(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+    mock_redis_client: AsyncMock,
+) -> None:
+    # given
+    rule = _rule()
+    mock_rule_cache_repository.find.return_value = rule
+    mock_redis_client.set.side_effect = RedisConnectionError()
+
+    # when
+    rule_trigger_service.submit(_trigger(rule))
+    await _drain(rule_trigger_service)
+
+    # then
+    mock_email_action_executor.execute.assert_awaited_once()
+
+
+async def test_noisy_team_is_limited_to_team_concurrency(
+    rule_trigger_service: RuleTriggerService,
+    mock_rule_cache_repository: AsyncMock,
+    mock_email_action_executor: AsyncMock,
+) -> None:
+    # given
+    rule_trigger_service._team_concurrency = 1  # type: ignore
+    team_id = uuid4()
+    rules = {rule.id: rule for rule in (_rule(team_id=team_id) for _ in range(3))}
+    mock_rule_cache_repository.find.side_effect = rules.get
+
+    running = max_running = 0
+
+    async def execute(**_: object) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    mock_email_action_executor.execute.side_effect = execute
+
+    # when
+    for rule in rules.values():
+        rule_trigger_service.submit(_trigger(rule))
+    await _drain(rule_trigger_service)
+
+    # then
+    assert mock_email_action_executor.execute.await_count == 3
+    assert max_running == 1
+
+
+def test_submit_drops_trigger_when_queue_is_full(
+    rule_trigger_service: RuleTriggerService,
+) -> None:
+    # given
+    rule_trigger_service._queue = asyncio.Queue(maxsize=1)  # type: ignore
+    rule = _rule()
+
+    # when
+    rule_trigger_service.submit(_trigger(rule))
+    rule_trigger_service.submit(_trigger(rule))
+
+    # then
+    assert rule_trigger_service._queue.qsize() == 1  # type: ignore
@@ -29,16 +29,23 @@ def mock_user_team_role_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_permission_scope_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def member_service(
     mock_user_repository: AsyncMock,
     mock_role_repository: AsyncMock,
     mock_user_team_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> MemberService:
     return MemberService(
         user_repository=mock_user_repository,
         role_repository=mock_role_repository,
         user_team_role_repository=mock_user_team_role_repository,
+        permission_scope_cache_repository=mock_permission_scope_cache_repository,
     )
 
 
@@ -123,7 +130,10 @@ async def test_get_member_by_id_and_team_id(
 
 
 async def test_update_member(
-    member_service: MemberService, mock_role_repository: AsyncMock, mock_user: Mock
+    member_service: MemberService,
+    mock_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
+    mock_user: Mock,
 ) -> None:
     # given
     team_id = uuid4()
@@ -147,6 +157,9 @@ async def test_update_member(
     # then
     assert result.id == mock_user.id
     assert result.role == role_name
+    mock_permission_scope_cache_repository.evict_member.assert_awaited_once_with(
+        user_id=member_id, team_id=team_id
+    )
 
 
 async def test_update_member_no_role_id(member_service: MemberService, mock_user: Mock) -> None:
@@ -220,7 +233,9 @@ async def test_update_member_same_role(
 
 
 async def test_delete_member(
-    member_service: MemberService, mock_user_repository: AsyncMock
+    member_service: MemberService,
+    mock_user_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> None:
     # given
     team_id = uuid4()
@@ -231,6 +246,9 @@ async def test_delete_member(
 
     # then
     mock_user_repository.delete_user_by_id_and_team_id.assert_called_once()
+    mock_permission_scope_cache_repository.evict_member.assert_awaited_once_with(
+        user_id=member_id, team_id=team_id
+    )
 
 
 async def test_validate_sensitive_role(
@@ -40,6 +40,11 @@ def mock_role_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_permission_scope_cache_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def team_invitation_service(
     mock_email_service: Mock,
@@ -48,6 +53,7 @@ def team_invitation_service(
     mock_team_repository: AsyncMock,
     mock_user_team_role_repository: AsyncMock,
     mock_role_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
 ) -> TeamInvitationService:
     return TeamInvitationService(
         email_service=mock_email_service,
@@ -56,6 +62,7 @@ def team_invitation_service(
         team_repository=mock_team_repository,
         user_team_role_repository=mock_user_team_role_repository,
         role_repository=mock_role_repository,
+        permission_scope_cache_repository=mock_permission_scope_cache_repository,
     )
 
 
@@ -124,6 +131,7 @@ async def test_create_team_invitation_correctly(
     mock_team_invitation: Mock,
 ) -> None:
     # given
+    mock_user_repository.find.return_value = mock_user
     mock_user_repository.find_by_email.return_value = mock_user
     mock_team_repository.find.return_value = mock_team
     mock_team_invitation_repository.save.return_value = mock_team_invitation
@@ -136,7 +144,7 @@ async def test_create_team_invitation_correctly(
     )
     await team_invitation_service.create_team_invitation(
         team_id=mock_team.id,
-        inviter=mock_user,
+        inviter_id=mock_user.id,
         team_invitation_create_dto=team_invitation_create_dto,
     )
 
@@ -167,7 +175,7 @@ async def test_create_team_invitation_raises_when_invitee_not_found(
     with pytest.raises(UserNotFoundException):
         await team_invitation_service.create_team_invitation(
             team_id=mock_team.id,
-            inviter=mock_user,
+            inviter_id=mock_user.id,
             team_invitation_create_dto=team_invitation_create_dto,
         )
 
@@ -199,7 +207,7 @@ async def test_create_team_invitation_raises_when_team_not_found(
     with pytest.raises(TeamNotFoundException):
         await team_invitation_service.create_team_invitation(
             team_id=mock_team.id,
-            inviter=mock_user,
+            inviter_id=mock_user.id,
             team_invitation_create_dto=team_invitation_create_dto,
         )
 
@@ -214,6 +222,7 @@ async def test_accept_team_invitation_correctly(
     team_invitation_service: TeamInvitationService,
     mock_team_invitation_repository: AsyncMock,
     mock_user_repository: AsyncMock,
+    mock_permission_scope_cache_repository: AsyncMock,
     mock_user: Mock,
     mock_team_invitation: Mock,
 ) -> None:
@@ -230,6 +239,9 @@ async def test_accept_team_invitation_correctly(
     )
     mock_user_repository.find_id_by_email.assert_called_once_with(mock_team_invitation.email)
     mock_team_invitation_repository.delete.assert_called_once_with(mock_team_invitation)
+    mock_permission_scope_cache_repository.evict_member.assert_awaited_once_with(
+        user_id=mock_user.id, team_id=mock_team_invitation.team_id
+    )
 
 
 async def test_accept_team_invitation_raises_when_invitation_not_found(
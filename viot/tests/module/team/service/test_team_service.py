@@ -32,18 +32,25 @@ def mock_user_team_role_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_device_credential_service() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def team_service(
     mock_team_repository: AsyncMock,
     mock_permission_repository: AsyncMock,
     mock_user_team_role_repository: AsyncMock,
     mock_team_role_service: AsyncMock,
+    mock_device_credential_service: AsyncMock,
 ) -> TeamService:
     return TeamService(
         team_repository=mock_team_repository,
         team_role_service=mock_team_role_service,
         permission_repository=mock_permission_repository,
         user_team_role_repository=mock_user_team_role_repository,
+        device_credential_service=mock_device_credential_service,
     )
 
 
@@ -247,8 +254,31 @@ async def test_update_team_correctly_when_slug_already_exists(
 
 
 async def test_delete_team_correctly(
-    team_service: TeamService, mock_team_repository: AsyncMock, mock_team: Mock
+    team_service: TeamService,
+    mock_team_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
+    mock_team: Mock,
 ) -> None:
     await team_service.delete_team_by_id(team_id=mock_team.id)
 
     mock_team_repository.delete_by_id.assert_called_once_with(mock_team.id)
+    mock_device_credential_service.evict_team.assert_awaited_once_with(mock_team.id)
+
+
+async def test_delete_all_teams_by_user_id_evicts_only_deleted_teams(
+    team_service: TeamService,
+    mock_team_repository: AsyncMock,
+    mock_device_credential_service: AsyncMock,
+) -> None:
+    # given
+    user_id, team_ids = uuid4(), [uuid4(), uuid4()]
+    mock_team_repository.delete_all_by_user_id.return_value = team_ids
+
+    # when
+    await team_service.delete_all_teams_by_user_id(user_id=user_id)
+
+    # then
+    mock_team_repository.delete_all_by_user_id.assert_awaited_once_with(user_id)
+    assert [
+        call.args[0] for call in mock_device_credential_service.evict_team.await_args_list
+    ] == team_ids
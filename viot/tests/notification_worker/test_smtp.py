@@ -0,0 +1,94 @@
+from email.message import EmailMessage
+from typing import Any
+from unittest.mock import patch
+
+import aiosmtplib
+
+from app.notification_worker.smtp import AsyncSmtpPool
+
+
+class FakeSmtp:
+    """Records what is sent, and drops the connection on the first `fail_sends` sends."""
+
+    instances: list["FakeSmtp"] = []
+    fail_sends = 0
+
+    def __init__(self, **_: Any) -> None:
+        self.is_connected = False
+        self.sent: list[EmailMessage] = []
+        self.quit_called = False
+        FakeSmtp.instances.append(self)
+
+    async def connect(self) -> None:
+        self.is_connected = True
+
+    async def send_message(self, message: EmailMessage) -> None:
+        if FakeSmtp.fail_sends:
+            FakeSmtp.fail_sends -= 1
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+        self.sent.append(message)
+
+    async def quit(self) -> None:
+        self.quit_called = True
+        self.is_connected = False
+
+    def close(self) -> None:
+        self.is_connected = False
+
+
+def _fake_smtp(fail_sends: int = 0) -> Any:
+    FakeSmtp.instances = []
+    FakeSmtp.fail_sends = fail_sends
+    return patch("app.notification_worker.smtp.aiosmtplib.SMTP", FakeSmtp)
+
+
+def _message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = to
+    return message
+
+
+async def test_send_reuses_the_connection() -> None:
+    # given
+    pool = AsyncSmtpPool(1)
+
+    # when
+    with _fake_smtp():
+        await pool.send(_message("first@example.com"))
+        await pool.send(_message("second@example.com"))
+
+    # then
+    assert len(FakeSmtp.instances) == 1
+    assert [message["To"] for message in FakeSmtp.instances[0].sent] == [
+        "first@example.com",
+        "second@example.com",
+    ]
+
+
+async def test_send_reconnects_when_the_server_dropped_the_connection() -> None:
+    # given
+    pool = AsyncSmtpPool(1)
+
+    # when
+    with _fake_smtp(fail_sends=1):
+        await pool.send(_message("user@example.com"))
+
+    # then
+    dropped, reconnected = FakeSmtp.instances
+    assert dropped.quit_called
+    assert dropped.sent == []
+    assert [message["To"] for message in reconnected.sent] == ["user@example.com"]
+
+
+async def test_close_quits_open_connections() -> None:
+    # given
+    pool = AsyncSmtpPool(2)
+    with _fake_smtp():
+        await pool.send(_message("user@example.com"))
+
+    # when
+    await pool.close()
+
+    # then
+    assert FakeSmtp.instances[0].quit_called
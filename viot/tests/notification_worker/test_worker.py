@@ -0,0 +1,180 @@
+import asyncio
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from app.extension.notification.config import notification_settings
+from app.extension.notification.message import EmailNotification, encoder
+from app.notification_worker.worker import NotificationWorker
+
+
+@pytest.fixture
+def mock_pipeline() -> MagicMock:
+    pipeline = MagicMock()
+    pipeline.__aenter__.return_value = pipeline
+    pipeline.execute = AsyncMock()
+    return pipeline
+
+
+@pytest.fixture
+def mock_redis(mock_pipeline: MagicMock) -> AsyncMock:
+    redis = AsyncMock()
+    redis.pipeline = Mock(return_value=mock_pipeline)
+    return redis
+
+
+@pytest.fixture
+def mock_smtp_pool() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def worker(mock_redis: AsyncMock, mock_smtp_pool: AsyncMock) -> NotificationWorker:
+    worker = NotificationWorker()
+    worker._redis = mock_redis  # type: ignore
+    worker._smtp_pool = mock_smtp_pool  # type: ignore
+    return worker
+
+
+def _fields(attempts: int = 0, **extra: Any) -> dict[bytes, bytes]:
+    notification = EmailNotification(
+        template="VERIFY_ACCOUNT",
+        to="user@example.com",
+        ctx={"name": "User", "verify_url": "https://example.com"},
+    )
+    return {
+        b"data": encoder.encode(notification),
+        b"attempts": str(attempts).encode(),
+        **{key.encode(): str(value).encode() for key, value in extra.items()},
+    }
+
+
+async def _wait_for_handlers(worker: NotificationWorker) -> None:
+    await asyncio.gather(*worker._handlers)  # type: ignore
+
+
+async def test_delivered_notification_is_acknowledged(
+    worker: NotificationWorker, mock_redis: AsyncMock, mock_smtp_pool: AsyncMock
+) -> None:
+    # when
+    await worker._submit(b"1-0", _fields())
+    await _wait_for_handlers(worker)
+
+    # then
+    mock_smtp_pool.send.assert_awaited_once()
+    assert mock_smtp_pool.send.await_args.args[0]["To"] == "user@example.com"
+    mock_redis.xack.assert_awaited_once_with(
+        notification_settings.STREAM, notification_settings.GROUP, b"1-0"
+    )
+
+
+async def test_malformed_notification_is_acknowledged_without_delivery(
+    worker: NotificationWorker, mock_redis: AsyncMock, mock_smtp_pool: AsyncMock
+) -> None:
+    # when
+    await worker._submit(b"1-0", {b"data": b"not json"})
+    await _wait_for_handlers(worker)
+
+    # then
+    mock_smtp_pool.send.assert_not_awaited()
+    mock_redis.xack.assert_awaited_once()
+
+
+async def test_failed_delivery_is_queued_again_with_a_due_time(
+    worker: NotificationWorker,
+    mock_smtp_pool: AsyncMock,
+    mock_pipeline: MagicMock,
+) -> None:
+    # given
+    mock_smtp_pool.send.side_effect = ConnectionError()
+    before = time.time()
+
+    # when
+    await worker._submit(b"1-0", _fields(attempts=1))
+    await _wait_for_handlers(worker)
+
+    # then
+    stream, message = mock_pipeline.xadd.call_args.args
+    assert stream == notification_settings.STREAM
+    assert message["attempts"] == 2
+    backoff = notification_settings.RETRY_BACKOFF_SEC * 2
+    assert message["not_before"] >= (before + backoff) * 1000
+    mock_pipeline.xack.assert_called_once_with(
+        notification_settings.STREAM, notification_settings.GROUP, b"1-0"
+    )
+    mock_pipeline.execute.assert_awaited_once()
+    assert worker._slots._value == notification_settings.CONCURRENCY  # type: ignore
+
+
+async def test_failed_delivery_goes_to_dead_letters_after_max_attempts(
+    worker: NotificationWorker,
+    mock_smtp_pool: AsyncMock,
+    mock_pipeline: MagicMock,
+) -> None:
+    # given
+    mock_smtp_pool.send.side_effect = ConnectionError()
+
+    # when
+    await worker._submit(b"1-0", _fields(attempts=notification_settings.MAX_ATTEMPTS - 1))
+    await _wait_for_handlers(worker)
+
+    # then
+    stream, message = mock_pipeline.xadd.call_args.args
+    assert stream == notification_settings.DEAD_LETTER_STREAM
+    assert message["attempts"] == notification_settings.MAX_ATTEMPTS
+    assert "ConnectionError" in message["error"]
+    mock_pipeline.xack.assert_called_once()
+
+
+async def test_retry_waits_until_due_without_taking_a_slot(
+    worker: NotificationWorker, mock_smtp_pool: AsyncMock
+) -> None:
+    # given
+    not_before = int((time.time() + 0.05) * 1000)
+
+    # when
+    await worker._submit(b"1-0", _fields(attempts=1, not_before=not_before))
+    waiting_slots = worker._slots._value  # type: ignore
+    await asyncio.gather(*worker._waiting)  # type: ignore
+    await _wait_for_handlers(worker)
+
+    # then
+    assert waiting_slots == notification_settings.CONCURRENCY
+    mock_smtp_pool.send.assert_awaited_once()
+
+
+async def test_error_while_acknowledging_leaves_the_message_pending(
+    worker: NotificationWorker, mock_redis: AsyncMock
+) -> None:
+    # given
+    mock_redis.xack.side_effect = ConnectionError()
+
+    # when
+    await worker._submit(b"1-0", _fields())
+    await _wait_for_handlers(worker)
+
+    # then
+    mock_redis.xack.assert_awaited_once()
+    assert worker._slots._value == notification_settings.CONCURRENCY  # type: ignore
+
+
+async def test_claim_takes_over_pending_messages_of_dead_consumers(
+    worker: NotificationWorker, mock_redis: AsyncMock, mock_smtp_pool: AsyncMock
+) -> None:
+    # given
+    mock_redis.xautoclaim.side_effect = [
+        (b"2-0", [(b"1-0", _fields()), (b"1-1", None)], []),
+        (b"0-0", [(b"2-0", _fields())], []),
+    ]
+
+    # when
+    await worker._claim()
+    await _wait_for_handlers(worker)
+
+    # then
+    assert mock_redis.xautoclaim.await_count == 2
+    assert mock_redis.xautoclaim.await_args_list[1].kwargs["start_id"] == b"2-0"
+    assert mock_smtp_pool.send.await_count == 2
+    assert [call.args[2] for call in mock_redis.xack.await_args_list] == [b"1-0", b"2-0"]
@@ -1,4 +1,6 @@
-from app.module.email.service import IEmailService
+from collections.abc import Sequence
+
+from app.module.email.service import IEmailService, RuleAlertEmail, TeamInvitationEmail
 
 
 class MockEmailService(IEmailService):
@@ -12,3 +14,9 @@ class MockEmailService(IEmailService):
         self, *, email: str, name: str, invitor_name: str, team_name: str, link: str
     ) -> None:
         pass
+
+    def send_team_invitation_emails(self, *, invitations: Sequence[TeamInvitationEmail]) -> None:
+        pass
+
+    def send_rule_alert_emails(self, *, alerts: Sequence[RuleAlertEmail]) -> None:
+        pass